@@ -245,8 +245,10 @@ def _register_periodic_jobs(scheduler_service) -> None:
     if not scheduler_service._scheduler:
         return
 
+    from .db.bot_sla import delete_old_sla_buckets
     from .db.webhook_dedup import cleanup_expired_keys
     from .services.agent_conversation_service import AgentConversationService
+    from .services.pipeline_tracer import PipelineTracer
     from .services.project_workspace_service import ProjectWorkspaceService
     from .services.session_collection_service import SessionCollectionService
 
@@ -266,6 +268,8 @@ def _register_periodic_jobs(scheduler_service) -> None:
             "stale_conversation_cleanup",
         ),
         (cleanup_expired_keys, {"seconds": 60}, "webhook_dedup_cleanup"),
+        (PipelineTracer.flush, {"seconds": 10}, "pipeline_trace_flush"),
+        (delete_old_sla_buckets, {"hours": 24}, "bot_sla_bucket_cleanup"),
         (process_pending_extractions, {"seconds": 30}, "kg_entity_extraction"),
         (run_consolidation_check, {"minutes": 5}, "memory_consolidation_check"),
         (run_decay_all, {"hours": 24}, "knowledge_decay"),
@@ -319,16 +323,6 @@ def _register_cleanup_handlers() -> None:
         )
         _startup_warnings.append(f"workflow_stale_cleanup: {_wf_cleanup_err}")
 
-    try:
-        from .services.execution_service import ExecutionService
-
-        ExecutionService.restore_pending_retries()
-    except Exception as _retry_restore_err:
-        _sess_log.error(
-            "Pending retry restore failed on startup: %s", _retry_restore_err, exc_info=True
-        )
-        _startup_warnings.append(f"pending_retry_restore: {_retry_restore_err}")
-
     from .services.execution_queue_service import ExecutionQueueService
 
     ExecutionQueueService.start_dispatcher()
@@ -339,6 +333,14 @@ def _register_cleanup_handlers() -> None:
     AgentMessageBusService.start()
     atexit.register(AgentMessageBusService.stop)
 
+    from .services.pipeline_tracer import PipelineTracer
+
+    atexit.register(PipelineTracer.flush)
+
+    from .services.provider_usage_client import close_http_clients
+
+    atexit.register(close_http_clients)
+
     _proxy_log = _log.getLogger(__name__)
     try:
         from .services.cliproxy_manager import CLIProxyManager
@@ -410,7 +412,8 @@ def create_app(config=None):
                 return None
 
         # Bootstrap mode: no keys in DB and no env var = auth disabled
-        from .db.rbac import has_any_keys, get_role_for_api_key
+        from .db.rbac import has_any_keys
+        from .services.rbac_service import get_role_for_request
 
         db_has_keys = has_any_keys()
         env_key = os.environ.get("AGENTED_API_KEY", "")
@@ -423,8 +426,9 @@ def create_app(config=None):
         if not provided_key:
             return jsonify({"error": "Unauthorized"}), 401
 
-        # Check DB first (primary), then env var (backward compat fallback)
-        if db_has_keys and get_role_for_api_key(provided_key):
+        # Check DB first (primary), then env var (backward compat fallback).
+        # The role is kept on flask.g for require_role() on the route.
+        if db_has_keys and get_role_for_request():
             return None
 
         if env_key and hmac.compare_digest(provided_key, env_key):
@@ -25,6 +25,17 @@ MAX_RETRY_ATTEMPTS = 5
 MAX_RETRY_DELAY = 3600  # 1 hour ceiling for exponential backoff
 WEBHOOK_DEDUP_WINDOW = 10  # seconds
 
+# Per-stage spans for executions, queue dispatch and workflow nodes (see
+# PipelineTracer). Spans are buffered and written in batches.
+PIPELINE_TRACING_ENABLED = os.environ.get("AGENTED_PIPELINE_TRACING", "1") != "0"
+
+# --- Auth ---
+
+# HMAC key for stored API-key hashes (user_roles.key_hash). When unset it is
+# derived from the per-install SECRET_KEY (see app.db.rbac). Changing either
+# invalidates every stored key, so set it once per deployment.
+API_KEY_HASH_SECRET = os.environ.get("AGENTED_API_KEY_HASH_SECRET", "")
+
 # --- SSE ---
 
 SSE_REPLAY_LIMIT = int(os.environ.get("SSE_REPLAY_LIMIT", "500"))
@@ -46,3 +57,16 @@ DEFAULT_WEEKLY_TOKEN_LIMIT = 1_000_000
 
 CLONE_TIMEOUT = 300  # 5 minutes
 GIT_OP_TIMEOUT = 120  # 2 minutes
+
+# Bare mirrors that execution clones are made from (see RepoMirrorCache).
+# Least-recently-used mirrors are evicted once the cache exceeds the budget;
+# a budget of 0 disables the cache and every clone goes straight to GitHub.
+REPO_MIRROR_DIR = os.environ.get(
+    "AGENTED_REPO_MIRROR_DIR", os.path.join(PROJECT_ROOT, "repo_mirrors")
+)
+REPO_MIRROR_BUDGET_MB = int(os.environ.get("AGENTED_REPO_MIRROR_BUDGET_MB", "10240"))
+REPO_MIRROR_FRESH_SECONDS = 30  # skip re-fetching a mirror fetched this recently
+
+# Cap (in approximate tokens) on the PR diff context injected into prompts;
+# lowest-value hunks are dropped first. 0 means no cap.
+PR_DIFF_TOKEN_BUDGET = int(os.environ.get("AGENTED_PR_DIFF_TOKEN_BUDGET", "0"))
@@ -133,6 +133,9 @@ from .budgets import (  # noqa: F401
     update_execution_token_data,
 )
 
+# Bulk operations (set-based, single-transaction batches)
+from .bulk import BULK_ENTITIES, bulk_delete, bulk_insert, bulk_update  # noqa: F401
+
 # Campaigns (multi-repo campaign orchestration)
 from .campaigns import (  # noqa: F401
     create_campaign,
@@ -149,9 +152,12 @@ from .campaigns import (  # noqa: F401
 from .chunk_results import (  # noqa: F401
     create_chunk_result,
     create_chunked_execution,
+    delete_expired_chunk_cache,
+    get_cached_chunk_outputs,
     get_chunk_results,
     get_chunked_execution,
     increment_completed_chunks,
+    put_cached_chunk_output,
     update_chunk_result,
     update_chunked_execution_status,
 )
@@ -170,13 +176,17 @@ from .connection import get_connection, safe_set_clause  # noqa: F401
 
 # Conversation branches (tree-structured conversation branching)
 from .conversation_branches import (  # noqa: F401
+    append_message,
     count_messages_for_branch,
     create_branch,
     create_message,
+    create_root_branch,
     get_branch,
     get_branches_for_conversation,
     get_message,
+    get_message_at,
     get_messages_for_branch,
+    sync_root_branch,
     update_branch_status,
 )
 
@@ -231,6 +241,20 @@ from .health_alerts import (  # noqa: F401
     get_recent_alerts,
 )
 
+# Per-trigger rolling health stats
+from .trigger_health import (  # noqa: F401
+    get_all_trigger_health_stats,
+    get_trigger_health_stats,
+    record_execution_outcome,
+)
+
+# Per-bot hourly SLA buckets
+from .bot_sla import (  # noqa: F401
+    delete_old_sla_buckets,
+    get_sla_buckets,
+    record_sla_sample,
+)
+
 # Hooks
 from .hooks import (  # noqa: F401
     count_hooks,
@@ -424,25 +448,28 @@ from .migrations import init_db  # noqa: F401
 
 # Monitoring (rate limit snapshots, monitoring config, setup executions)
 from .monitoring import (  # noqa: F401
+    # Rate limit time series
+    SERIES_5MIN,
+    SERIES_HOURLY,
+    SERIES_RAW,
+    compact_rate_limit_series,
     # Setup executions
     create_setup_execution,
     delete_old_snapshots,
-    # Pending rate-limit retries
-    delete_pending_retry,
-    get_all_pending_retries,
     get_latest_snapshots,
     # Monitoring config
     get_monitoring_config,
-    get_pending_retries_due,
+    get_rate_limit_series,
     get_rate_limit_stats_by_period,
     get_setup_execution,
     get_setup_executions_for_project,
     get_snapshot_history,
     # Rate limit snapshots
     insert_rate_limit_snapshot,
+    insert_rate_limit_snapshots,
+    is_reported_window_type,
     save_monitoring_config,
     update_setup_execution,
-    upsert_pending_retry,
 )
 
 # Plugins (includes components, marketplaces, sync state, exports)
@@ -534,6 +561,7 @@ from .prompt_snippets import (  # noqa: F401
     get_all_snippets,
     get_snippet,
     get_snippet_by_name,
+    get_snippets_by_names,
     update_snippet,
 )
 
@@ -615,6 +643,7 @@ from .secrets import (  # noqa: F401
     create_secret,
     get_secret,
     get_secret_by_name,
+    get_secret_values,
     list_secrets,
     update_last_accessed,
 )
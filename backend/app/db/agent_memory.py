@@ -305,13 +305,13 @@ def vector_recall(
     from ..services.embedding_service import (
         cosine_similarity_batch,
         deserialize_embedding,
-        embed_text,
+        embed_query,
         is_available,
     )
 
     if not is_available():
         return []
-    query_embedding = embed_text(query)
+    query_embedding = embed_query(query)
     if query_embedding is None:
         return []
 
@@ -384,8 +384,6 @@ def hybrid_recall(
 
     RRF formula: score = alpha/(k + rank_fts) + (1-alpha)/(k + rank_vec)
     """
-    K = 60  # RRF constant
-
     # Get FTS results
     fts_results = recall_messages(
         thread_id=thread_id,
@@ -405,12 +403,33 @@ def hybrid_recall(
         top_k=top_k * 2,
     )
 
+    scored = fuse_rankings(fts_results, vec_results, top_k, alpha)
+    results = [msg for msg, _score in scored[:top_k]]
+
+    # Expand with context if needed
+    if message_range > 0 and results:
+        return _expand_with_context(results, message_range)
+    return results
+
+
+def fuse_rankings(
+    fts_results: list[dict],
+    vec_results: list[tuple[dict, float]],
+    top_k: int,
+    alpha: float = 0.4,
+) -> list[tuple[dict, float]]:
+    """Fuse FTS5 and vector rankings with RRF. Returns (message, score) pairs, best first.
+
+    Both rankings are expected to be over-fetched to ``top_k * 2``; a message
+    missing from one of them is scored at rank ``top_k * 2 + 1`` there.
+    """
+    K = 60  # RRF constant
+
     # Build rank maps
     fts_ranks = {msg["id"]: rank for rank, msg in enumerate(fts_results)}
     vec_ranks = {msg["id"]: rank for rank, (msg, _score) in enumerate(vec_results)}
 
-    # Merge all message IDs
-    all_msg_ids = set(fts_ranks.keys()) | set(vec_ranks.keys())
+    # Merge candidates, preferring the FTS copy of a message found by both
     msg_map: dict[str, dict] = {}
     for msg in fts_results:
         msg_map[msg["id"]] = msg
@@ -421,19 +440,14 @@ def hybrid_recall(
     # Compute RRF scores
     scored = []
     max_rank = top_k * 2 + 1  # Default rank for missing results
-    for msg_id in all_msg_ids:
+    for msg_id, msg in msg_map.items():
         fts_rank = fts_ranks.get(msg_id, max_rank)
         vec_rank = vec_ranks.get(msg_id, max_rank)
         rrf_score = alpha / (K + fts_rank) + (1 - alpha) / (K + vec_rank)
-        scored.append((msg_map[msg_id], rrf_score))
+        scored.append((msg, rrf_score))
 
     scored.sort(key=lambda x: x[1], reverse=True)
-    results = [msg for msg, _score in scored[:top_k]]
-
-    # Expand with context if needed
-    if message_range > 0 and results:
-        return _expand_with_context(results, message_range)
-    return results
+    return scored
 
 
 def _expand_with_context(matches: list[dict], message_range: int) -> list[dict]:
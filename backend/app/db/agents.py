@@ -2,7 +2,7 @@
 
 import logging
 import sqlite3
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from .connection import get_connection, safe_set_clause
 from .ids import _get_unique_agent_id, _get_unique_conversation_id
@@ -22,7 +22,7 @@ VALID_CONVERSATION_STATUSES = {"active", "completed", "abandoned"}
 # =============================================================================
 
 
-def create_agent(
+def agent_row(
     name: str,
     description: str = None,
     role: str = None,
@@ -47,8 +47,8 @@ def create_agent(
     matched_skills: str = None,
     preferred_model: str = None,
     effort_level: str = "medium",
-) -> Optional[str]:
-    """Add a new agent. Returns agent_id (string) on success, None on failure."""
+) -> dict:
+    """Build the column values for a new agent, applying the create defaults."""
     if backend_type not in VALID_BACKENDS:
         backend_type = "claude"
     if creation_status not in VALID_AGENT_STATUSES:
@@ -56,44 +56,95 @@ def create_agent(
     if effort_level not in VALID_EFFORT_LEVELS:
         effort_level = "medium"
 
+    return {
+        "name": name,
+        "description": description,
+        "role": role,
+        "goals": goals,
+        "context": context,
+        "backend_type": backend_type,
+        "skills": skills,
+        "documents": documents,
+        "system_prompt": system_prompt,
+        "creation_conversation_id": creation_conversation_id,
+        "creation_status": creation_status,
+        "triggers": triggers,
+        "color": color,
+        "icon": icon,
+        "model": model,
+        "temperature": temperature,
+        "tools": tools,
+        "autonomous": autonomous,
+        "allowed_tools": allowed_tools,
+        "layer": layer,
+        "detected_role": detected_role,
+        "matched_skills": matched_skills,
+        "preferred_model": preferred_model,
+        "effort_level": effort_level,
+    }
+
+
+def create_agent(
+    name: str,
+    description: str = None,
+    role: str = None,
+    goals: str = None,
+    context: str = None,
+    backend_type: str = "claude",
+    skills: str = None,
+    documents: str = None,
+    system_prompt: str = None,
+    creation_conversation_id: str = None,
+    creation_status: str = "completed",
+    triggers: str = None,
+    color: str = None,
+    icon: str = None,
+    model: str = None,
+    temperature: float = None,
+    tools: str = None,
+    autonomous: int = 0,
+    allowed_tools: str = None,
+    layer: str = None,
+    detected_role: str = None,
+    matched_skills: str = None,
+    preferred_model: str = None,
+    effort_level: str = "medium",
+) -> Optional[str]:
+    """Add a new agent. Returns agent_id (string) on success, None on failure."""
+    row = agent_row(
+        name=name,
+        description=description,
+        role=role,
+        goals=goals,
+        context=context,
+        backend_type=backend_type,
+        skills=skills,
+        documents=documents,
+        system_prompt=system_prompt,
+        creation_conversation_id=creation_conversation_id,
+        creation_status=creation_status,
+        triggers=triggers,
+        color=color,
+        icon=icon,
+        model=model,
+        temperature=temperature,
+        tools=tools,
+        autonomous=autonomous,
+        allowed_tools=allowed_tools,
+        layer=layer,
+        detected_role=detected_role,
+        matched_skills=matched_skills,
+        preferred_model=preferred_model,
+        effort_level=effort_level,
+    )
+
     with get_connection() as conn:
         try:
             agent_id = _get_unique_agent_id(conn)
             conn.execute(
-                """
-                INSERT INTO agents (id, name, description, role, goals, context, backend_type,
-                                    skills, documents, system_prompt, creation_conversation_id, creation_status,
-                                    triggers, color, icon, model, temperature, tools, autonomous, allowed_tools,
-                                    layer, detected_role, matched_skills, preferred_model, effort_level)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    agent_id,
-                    name,
-                    description,
-                    role,
-                    goals,
-                    context,
-                    backend_type,
-                    skills,
-                    documents,
-                    system_prompt,
-                    creation_conversation_id,
-                    creation_status,
-                    triggers,
-                    color,
-                    icon,
-                    model,
-                    temperature,
-                    tools,
-                    autonomous,
-                    allowed_tools,
-                    layer,
-                    detected_role,
-                    matched_skills,
-                    preferred_model,
-                    effort_level,
-                ),
+                f"INSERT INTO agents (id, {', '.join(row)}) "
+                f"VALUES ({', '.join('?' * (len(row) + 1))})",
+                (agent_id, *row.values()),
             )
             conn.commit()
             return agent_id
@@ -101,8 +152,7 @@ def create_agent(
             return None
 
 
-def update_agent(
-    agent_id: str,
+def agent_update_clauses(
     name: str = None,
     description: str = None,
     role: str = None,
@@ -124,8 +174,8 @@ def update_agent(
     allowed_tools: str = None,
     preferred_model: str = None,
     effort_level: str = None,
-) -> bool:
-    """Update agent fields. Returns True on success."""
+) -> Tuple[List[str], list]:
+    """Build the SET expressions and values for an agent update."""
     updates = []
     values = []
 
@@ -193,10 +243,62 @@ def update_agent(
         updates.append("effort_level = ?")
         values.append(effort_level)
 
+    if updates:
+        updates.append("updated_at = CURRENT_TIMESTAMP")
+    return updates, values
+
+
+def update_agent(
+    agent_id: str,
+    name: str = None,
+    description: str = None,
+    role: str = None,
+    goals: str = None,
+    context: str = None,
+    backend_type: str = None,
+    enabled: int = None,
+    skills: str = None,
+    documents: str = None,
+    system_prompt: str = None,
+    creation_status: str = None,
+    triggers: str = None,
+    color: str = None,
+    icon: str = None,
+    model: str = None,
+    temperature: float = None,
+    tools: str = None,
+    autonomous: int = None,
+    allowed_tools: str = None,
+    preferred_model: str = None,
+    effort_level: str = None,
+) -> bool:
+    """Update agent fields. Returns True on success."""
+    updates, values = agent_update_clauses(
+        name=name,
+        description=description,
+        role=role,
+        goals=goals,
+        context=context,
+        backend_type=backend_type,
+        enabled=enabled,
+        skills=skills,
+        documents=documents,
+        system_prompt=system_prompt,
+        creation_status=creation_status,
+        triggers=triggers,
+        color=color,
+        icon=icon,
+        model=model,
+        temperature=temperature,
+        tools=tools,
+        autonomous=autonomous,
+        allowed_tools=allowed_tools,
+        preferred_model=preferred_model,
+        effort_level=effort_level,
+    )
     if not updates:
         return False
 
-    updates.append("updated_at = CURRENT_TIMESTAMP")
     values.append(agent_id)
 
     with get_connection() as conn:
@@ -0,0 +1,106 @@
+"""Per-bot SLA buckets: run counts plus quantile sketches per UTC hour.
+
+Each finished execution folds into its trigger's current hour bucket. Any
+rolling window is answered by merging that window's buckets, so SLA queries
+never scan ``execution_logs``.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from ..utils.quantile_sketch import QuantileSketch
+from .connection import get_connection
+
+logger = logging.getLogger(__name__)
+
+BUCKET_FORMAT = "%Y-%m-%d %H:00:00"
+
+# Statuses that count against the success rate (cancelled runs count toward neither)
+FAILED_STATUSES = ("failed", "timeout")
+
+
+def bucket_start(moment: Optional[datetime] = None) -> str:
+    """Return the UTC hour bucket key for ``moment`` (default: now)."""
+    moment = moment or datetime.now(timezone.utc)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    return moment.strftime(BUCKET_FORMAT)
+
+
+def record_sla_sample(
+    trigger_id: str,
+    status: str,
+    duration_ms: Optional[int] = None,
+    queue_wait_ms: Optional[int] = None,
+    finished_at: Optional[datetime] = None,
+) -> bool:
+    """Fold one finished execution into its trigger's hourly SLA bucket.
+
+    Returns False if the trigger no longer exists.
+    """
+    bucket = bucket_start(finished_at)
+    with get_connection() as conn:
+        # Serialize writers: the sketches are read, merged and written back
+        conn.execute("BEGIN IMMEDIATE")
+        if not conn.execute("SELECT 1 FROM triggers WHERE id = ?", (trigger_id,)).fetchone():
+            conn.rollback()
+            return False
+        row = conn.execute(
+            "SELECT duration_sketch, queue_wait_sketch FROM bot_sla_buckets "
+            "WHERE trigger_id = ? AND bucket_start = ?",
+            (trigger_id, bucket),
+        ).fetchone()
+        durations = QuantileSketch.from_json(row["duration_sketch"] if row else None)
+        waits = QuantileSketch.from_json(row["queue_wait_sketch"] if row else None)
+        if duration_ms is not None:
+            durations.add(duration_ms)
+        if queue_wait_ms is not None:
+            waits.add(queue_wait_ms)
+        conn.execute(
+            """
+            INSERT INTO bot_sla_buckets
+                (trigger_id, bucket_start, total_runs, success_runs, failed_runs,
+                 duration_sketch, queue_wait_sketch)
+            VALUES (?, ?, 1, ?, ?, ?, ?)
+            ON CONFLICT(trigger_id, bucket_start) DO UPDATE SET
+                total_runs = total_runs + 1,
+                success_runs = success_runs + excluded.success_runs,
+                failed_runs = failed_runs + excluded.failed_runs,
+                duration_sketch = excluded.duration_sketch,
+                queue_wait_sketch = excluded.queue_wait_sketch
+            """,
+            (
+                trigger_id,
+                bucket,
+                1 if status == "success" else 0,
+                1 if status in FAILED_STATUSES else 0,
+                durations.to_json(),
+                waits.to_json(),
+            ),
+        )
+        conn.commit()
+        return True
+
+
+def get_sla_buckets(since: datetime) -> Dict[str, List[dict]]:
+    """Return SLA buckets at or after ``since``, grouped by trigger, oldest first."""
+    with get_connection() as conn:
+        cursor = conn.execute(
+            "SELECT * FROM bot_sla_buckets WHERE bucket_start >= ? "
+            "ORDER BY trigger_id, bucket_start",
+            (bucket_start(since),),
+        )
+        grouped: Dict[str, List[dict]] = {}
+        for row in cursor.fetchall():
+            grouped.setdefault(row["trigger_id"], []).append(dict(row))
+        return grouped
+
+
+def delete_old_sla_buckets(days: int = 90) -> int:
+    """Delete SLA buckets older than ``days``. Returns the number deleted."""
+    cutoff = bucket_start(datetime.now(timezone.utc) - timedelta(days=days))
+    with get_connection() as conn:
+        cursor = conn.execute("DELETE FROM bot_sla_buckets WHERE bucket_start < ?", (cutoff,))
+        conn.commit()
+        return cursor.rowcount
@@ -0,0 +1,156 @@
+"""Set-based bulk writes for agents, triggers, plugins and hooks (API-05).
+
+Every function applies a whole batch on one connection inside a single
+``BEGIN IMMEDIATE`` transaction: rows the batch refers to are checked with one
+``IN (...)`` query, writes go through ``executemany`` and the batch commits
+once. When any row is rejected nothing is written; the connection closes
+without committing, which rolls the transaction back.
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .connection import get_connection, safe_set_clause
+from .ids import generate_agent_id, generate_plugin_id, generate_trigger_id
+
+# entity_type -> (table, label used in errors, id generator; None for AUTOINCREMENT ids)
+BULK_ENTITIES: Dict[str, Tuple[str, str, Optional[Callable[[], str]]]] = {
+    "agent": ("agents", "Agent", generate_agent_id),
+    "trigger": ("triggers", "Trigger", generate_trigger_id),
+    "plugin": ("plugins", "Plugin", generate_plugin_id),
+    "hook": ("hooks", "Hook", None),
+}
+
+
+def _placeholders(count: int) -> str:
+    return ", ".join("?" * count)
+
+
+def _unique_ids(conn, table: str, generate: Callable[[], str], count: int) -> List[str]:
+    """Generate ``count`` distinct IDs absent from ``table``, checking each round in one query."""
+    ids: Dict[str, None] = {}
+    while len(ids) < count:
+        candidates = {generate() for _ in range(count - len(ids))} - ids.keys()
+        taken = {
+            row["id"]
+            for row in conn.execute(
+                f"SELECT id FROM {table} WHERE id IN ({_placeholders(len(candidates))})",
+                list(candidates),
+            )
+        }
+        ids.update(dict.fromkeys(candidates - taken))
+    return list(ids)
+
+
+def _existing_rows(conn, table: str, ids: Sequence) -> Dict[object, dict]:
+    """Fetch the rows of ``table`` among ``ids`` in one query, keyed by id."""
+    if not ids:
+        return {}
+    rows = conn.execute(
+        f"SELECT * FROM {table} WHERE id IN ({_placeholders(len(ids))})", list(ids)
+    ).fetchall()
+    return {row["id"]: dict(row) for row in rows}
+
+
+def bulk_insert(entity_type: str, rows: List[dict]) -> list:
+    """Insert ``rows`` (dicts with identical column keys) in one transaction.
+
+    Returns:
+        The new IDs, in the order of ``rows``.
+    """
+    if not rows:
+        return []
+    table, _, generate = BULK_ENTITIES[entity_type]
+    columns = list(rows[0])
+
+    with get_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        if generate is not None:
+            ids = _unique_ids(conn, table, generate, len(rows))
+            conn.executemany(
+                f"INSERT INTO {table} (id, {', '.join(columns)}) "
+                f"VALUES ({_placeholders(len(columns) + 1)})",
+                [(new_id, *(row[c] for c in columns)) for new_id, row in zip(ids, rows)],
+            )
+        else:
+            conn.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({_placeholders(len(columns))})",
+                [tuple(row[c] for c in columns) for row in rows],
+            )
+            # AUTOINCREMENT ids only grow and the write lock is held, so the
+            # newest len(rows) ids are exactly this batch's
+            ids = [
+                row["id"]
+                for row in conn.execute(
+                    f"SELECT id FROM {table} ORDER BY id DESC LIMIT ?", (len(rows),)
+                )
+            ][::-1]
+        conn.commit()
+    return ids
+
+
+def bulk_update(entity_type: str, changes: List[Tuple[object, List[str], list]]) -> Dict[int, str]:
+    """Apply ``(id, set_expressions, values)`` changes in one transaction.
+
+    Changes with the same SET expressions run as one ``executemany`` statement.
+
+    Returns:
+        ``{position: error}`` for changes whose row does not exist. When non-empty,
+        nothing was written.
+
+    Raises:
+        ValueError: If a SET expression is not a plain ``column = ?`` assignment;
+            raised before any statement runs.
+    """
+    if not changes:
+        return {}
+    table, label, _ = BULK_ENTITIES[entity_type]
+
+    statements: Dict[str, list] = {}
+    for item_id, updates, values in changes:
+        statements.setdefault(safe_set_clause(updates), []).append([*values, item_id])
+
+    with get_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        existing = _existing_rows(conn, table, [item_id for item_id, _, _ in changes])
+        errors = {
+            pos: f"{label} not found"
+            for pos, (item_id, _, _) in enumerate(changes)
+            if item_id not in existing
+        }
+        if errors:
+            return errors
+
+        for set_clause, params in statements.items():
+            conn.executemany(f"UPDATE {table} SET {set_clause} WHERE id = ?", params)
+        conn.commit()
+    return {}
+
+
+def bulk_delete(entity_type: str, ids: List) -> Dict[int, str]:
+    """Delete ``ids`` in one transaction. Predefined triggers are never deleted.
+
+    Returns:
+        ``{position: error}`` for missing or protected rows. When non-empty,
+        nothing was deleted.
+    """
+    if not ids:
+        return {}
+    table, label, _ = BULK_ENTITIES[entity_type]
+
+    with get_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        existing = _existing_rows(conn, table, ids)
+        errors = {}
+        for pos, item_id in enumerate(ids):
+            row = existing.get(item_id)
+            if row is None:
+                errors[pos] = f"{label} not found"
+            elif row.get("is_predefined"):
+                errors[pos] = f"Cannot delete predefined {label.lower()}"
+        if errors:
+            return errors
+
+        conn.executemany(f"DELETE FROM {table} WHERE id = ?", [(item_id,) for item_id in ids])
+        conn.commit()
+    return {}
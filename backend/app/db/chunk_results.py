@@ -1,7 +1,8 @@
 """Chunked execution and chunk results CRUD operations.
 
 Stores per-chunk bot outputs and overall chunked execution state
-for the smart chunking pipeline (EXE-03).
+for the smart chunking pipeline (EXE-03), plus the content-hash result
+cache that lets re-runs skip chunks a bot has already analysed.
 """
 
 import logging
@@ -122,19 +123,24 @@ def update_chunk_result(
     bot_output: str,
     token_count: int,
     status: str = "completed",
+    cached: bool = False,
 ) -> bool:
-    """Update a chunk result with bot output."""
+    """Update a chunk result with bot output.
+
+    ``cached`` marks results served from chunk_result_cache instead of a bot run.
+    """
     with get_connection() as conn:
         try:
             conn.execute(
                 """UPDATE chunk_results
                    SET bot_output = ?, token_count = ?, status = ?,
-                       completed_at = ?
+                       cached = ?, completed_at = ?
                    WHERE id = ?""",
                 (
                     bot_output,
                     token_count,
                     status,
+                    int(cached),
                     datetime.now(timezone.utc).isoformat(),
                     chunk_result_id,
                 ),
@@ -158,15 +164,15 @@ def get_chunk_results(chunked_execution_id: str) -> list[dict]:
         return [dict(row) for row in rows]
 
 
-def increment_completed_chunks(chunked_execution_id: str) -> int:
-    """Atomically increment completed_chunks. Returns new count."""
+def increment_completed_chunks(chunked_execution_id: str, count: int = 1) -> int:
+    """Atomically increment completed_chunks by ``count``. Returns new count."""
     with get_connection() as conn:
         try:
             conn.execute(
                 """UPDATE chunked_executions
-                   SET completed_chunks = completed_chunks + 1
+                   SET completed_chunks = completed_chunks + ?
                    WHERE id = ?""",
-                (chunked_execution_id,),
+                (count, chunked_execution_id),
             )
             conn.commit()
             row = conn.execute(
@@ -177,3 +183,85 @@ def increment_completed_chunks(chunked_execution_id: str) -> int:
         except Exception as e:
             logger.error("Failed to increment completed chunks: %s", e)
             return 0
+
+
+# =============================================================================
+# Chunk result cache
+# =============================================================================
+
+# Keep IN (...) lists well under SQLite's host-parameter limit
+_CACHE_LOOKUP_BATCH = 500
+
+
+def get_cached_chunk_outputs(
+    bot_id: str, prompt_hash: str, chunk_hashes: list[str]
+) -> dict[str, dict]:
+    """Return unexpired cached outputs keyed by chunk_hash.
+
+    Each value has ``bot_output`` and ``token_count``. Hashes without a live
+    cache entry are absent from the result.
+    """
+    found: dict[str, dict] = {}
+    unique = list(dict.fromkeys(chunk_hashes))
+    with get_connection() as conn:
+        for start in range(0, len(unique), _CACHE_LOOKUP_BATCH):
+            batch = unique[start : start + _CACHE_LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = conn.execute(
+                f"""SELECT chunk_hash, bot_output, token_count FROM chunk_result_cache
+                    WHERE bot_id = ? AND prompt_hash = ?
+                      AND chunk_hash IN ({placeholders})
+                      AND expires_at > datetime('now')""",
+                (bot_id, prompt_hash, *batch),
+            ).fetchall()
+            for row in rows:
+                found[row["chunk_hash"]] = {
+                    "bot_output": row["bot_output"],
+                    "token_count": row["token_count"],
+                }
+    return found
+
+
+def put_cached_chunk_output(
+    bot_id: str,
+    prompt_hash: str,
+    chunk_hash: str,
+    bot_output: str,
+    token_count: int,
+    ttl_seconds: int,
+) -> bool:
+    """Insert or refresh a cached chunk output that expires after ``ttl_seconds``."""
+    with get_connection() as conn:
+        try:
+            conn.execute(
+                """INSERT INTO chunk_result_cache
+                       (bot_id, prompt_hash, chunk_hash, bot_output, token_count,
+                        created_at, expires_at)
+                   VALUES (?, ?, ?, ?, ?, datetime('now'), datetime('now', ?))
+                   ON CONFLICT(bot_id, prompt_hash, chunk_hash) DO UPDATE SET
+                       bot_output = excluded.bot_output,
+                       token_count = excluded.token_count,
+                       created_at = excluded.created_at,
+                       expires_at = excluded.expires_at""",
+                (
+                    bot_id,
+                    prompt_hash,
+                    chunk_hash,
+                    bot_output,
+                    token_count,
+                    f"+{int(ttl_seconds)} seconds",
+                ),
+            )
+            conn.commit()
+            return True
+        except Exception as e:
+            logger.error("Failed to cache chunk output: %s", e)
+            return False
+
+
+def delete_expired_chunk_cache() -> int:
+    """Delete expired chunk cache entries. Returns the number removed."""
+    with get_connection() as conn:
+        cursor = conn.execute("DELETE FROM chunk_result_cache WHERE expires_at <= datetime('now')")
+        conn.commit()
+        return cursor.rowcount
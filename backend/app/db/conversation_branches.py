@@ -3,6 +3,14 @@
 Tree-structured messages for conversation branching based on
 ContextBranch paper (arXiv:2512.13914). Each message has a
 parent_message_id forming a tree, with branches navigable independently.
+
+Branches are copy-on-write: a fork stores only the messages added after it,
+plus a reference to its parent branch and the ``fork_index`` of the last
+inherited message. A branch's transcript is resolved through its ancestry in
+one recursive query, and ``message_count`` is kept on the branch row.
+``diverged_index`` records the first message added to a branch outside
+``sync_root_branch``, so a main branch that diverged from the transcript is
+never mistaken for a copy of it.
 """
 
 import logging
@@ -19,6 +27,21 @@ BRANCH_ID_LENGTH = 6
 MSG_ID_PREFIX = "msg-"
 MSG_ID_LENGTH = 8
 
+# Ancestors of branch ?, each with the highest message_index it contributes
+# (``upto`` is NULL for the branch itself: all of its own messages are visible)
+_ANCESTRY_CTE = """
+    WITH RECURSIVE chain(branch_id, parent_id, fork_index, upto) AS (
+        SELECT id, parent_branch_id, fork_index, NULL
+        FROM conversation_branches WHERE id = ?
+        UNION ALL
+        SELECT b.id, b.parent_branch_id, b.fork_index,
+               CASE WHEN c.upto IS NULL OR c.fork_index < c.upto
+                    THEN c.fork_index ELSE c.upto END
+        FROM conversation_branches b JOIN chain c ON b.id = c.parent_id
+        WHERE c.fork_index IS NOT NULL
+    )
+"""
+
 
 def _generate_branch_id() -> str:
     """Generate a unique branch ID with branch- prefix."""
@@ -35,16 +58,31 @@ def create_branch(
     parent_branch_id: Optional[str] = None,
     fork_message_id: Optional[str] = None,
     name: Optional[str] = None,
+    fork_index: Optional[int] = None,
 ) -> Optional[str]:
-    """Create a conversation branch. Returns branch_id on success."""
+    """Create a conversation branch. Returns branch_id on success.
+
+    With ``parent_branch_id`` and ``fork_index`` the branch inherits the
+    parent's messages up to and including ``fork_index`` without copying them.
+    """
+    message_count = fork_index + 1 if fork_index is not None else 0
     with get_connection() as conn:
         try:
             branch_id = _generate_branch_id()
             conn.execute(
                 """INSERT INTO conversation_branches
-                   (id, conversation_id, parent_branch_id, fork_message_id, name)
-                   VALUES (?, ?, ?, ?, ?)""",
-                (branch_id, conversation_id, parent_branch_id, fork_message_id, name),
+                   (id, conversation_id, parent_branch_id, fork_message_id, fork_index,
+                    name, message_count)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    branch_id,
+                    conversation_id,
+                    parent_branch_id,
+                    fork_message_id,
+                    fork_index,
+                    name,
+                    message_count,
+                ),
             )
             conn.commit()
             return branch_id
@@ -53,6 +91,175 @@ def create_branch(
             return None
 
 
+def create_root_branch(conversation_id: str, messages: list[dict], name: str = "main") -> str:
+    """Create a root branch holding ``messages`` (role/content dicts) in one transaction."""
+    with get_connection() as conn:
+        branch_id = _generate_branch_id()
+        conn.execute(
+            """INSERT INTO conversation_branches (id, conversation_id, name)
+               VALUES (?, ?, ?)""",
+            (branch_id, conversation_id, name),
+        )
+        _append_messages(conn, conversation_id, branch_id, messages, 0, None)
+        conn.commit()
+        return branch_id
+
+
+def sync_root_branch(conversation_id: str, messages: list[dict]) -> dict:
+    """Return the conversation's main branch, mirroring ``messages`` into it.
+
+    The latest main branch is reused when it never diverged and its last
+    message still matches the transcript at the same index, so the check costs
+    one indexed lookup rather than a scan of the transcript. Only branches
+    named 'main' that are roots or forks of another main branch are considered,
+    so a root branch copied before branches became copy-on-write is never
+    written to. A main branch that diverged from the transcript through
+    ``add_message`` is left as is: the new main branch forks it after the last
+    message both still share (never past ``diverged_index``, even when the added
+    message repeats the transcript) and holds only the transcript messages past
+    that point.
+    """
+    with get_connection() as conn:
+        # Serialize with concurrent forks so the main branch is created once
+        conn.execute("BEGIN IMMEDIATE")
+        main = conn.execute(
+            """SELECT b.id, b.message_count, b.diverged_index FROM conversation_branches b
+               WHERE b.conversation_id = ? AND b.name = 'main'
+                 AND (b.parent_branch_id IS NULL OR EXISTS (
+                      SELECT 1 FROM conversation_branches p
+                      WHERE p.id = b.parent_branch_id AND p.name = 'main'))
+               ORDER BY b.created_at DESC, b.rowid DESC LIMIT 1""",
+            (conversation_id,),
+        ).fetchone()
+        shared, last, diverged = 0, None, False
+        if main is not None:
+            diverged = main["diverged_index"] is not None
+            synced = main["diverged_index"] if diverged else main["message_count"]
+            shared = _shared_prefix_length(conn, main["id"], synced, messages)
+            if shared:
+                last = _visible_message_at(conn, main["id"], shared - 1)
+        if main is not None and not diverged and shared == main["message_count"]:
+            branch_id = main["id"]
+        elif shared:
+            branch_id = _insert_main_fork(conn, conversation_id, main["id"], shared, last["id"])
+        else:
+            branch_id = _generate_branch_id()
+            conn.execute(
+                """INSERT INTO conversation_branches (id, conversation_id, name)
+                   VALUES (?, ?, 'main')""",
+                (branch_id, conversation_id),
+            )
+        if len(messages) > shared:
+            _append_messages(
+                conn,
+                conversation_id,
+                branch_id,
+                messages[shared:],
+                shared,
+                last["id"] if last else None,
+            )
+        conn.commit()
+        row = conn.execute(
+            "SELECT * FROM conversation_branches WHERE id = ?", (branch_id,)
+        ).fetchone()
+        return dict(row)
+
+
+def _visible_message_at(conn, branch_id: str, message_index: int):
+    """Fetch the message visible at ``message_index`` on a branch, or None."""
+    return conn.execute(
+        _ANCESTRY_CTE
+        + """SELECT m.id, m.role, m.content FROM conversation_messages m
+             JOIN chain c ON m.branch_id = c.branch_id
+             WHERE m.message_index = ?
+               AND (c.upto IS NULL OR m.message_index <= c.upto)""",
+        (branch_id, message_index),
+    ).fetchone()
+
+
+def _shared_prefix_length(conn, branch_id: str, count: int, messages: list[dict]) -> int:
+    """Number of leading messages a branch of ``count`` messages shares with ``messages``.
+
+    The transcript only grows and a branch diverges from it at one point, so a
+    match at index i implies the messages before it match too. The common case
+    (the branch's last message still matches) takes a single lookup; a
+    diverged branch is bisected in O(log n) lookups.
+    """
+
+    def matches(index: int) -> bool:
+        row = _visible_message_at(conn, branch_id, index)
+        msg = messages[index]
+        return (
+            row is not None
+            and row["role"] == msg.get("role", "user")
+            and row["content"] == msg.get("content", "")
+        )
+
+    hi = min(count, len(messages))
+    if hi == 0 or matches(hi - 1):
+        return hi
+    lo, hi = 0, hi - 1
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if matches(mid - 1):
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _insert_main_fork(
+    conn, conversation_id: str, parent_branch_id: str, shared: int, fork_message_id: str
+) -> str:
+    """Insert a main branch inheriting the first ``shared`` messages of its parent."""
+    branch_id = _generate_branch_id()
+    conn.execute(
+        """INSERT INTO conversation_branches
+           (id, conversation_id, parent_branch_id, fork_message_id, fork_index,
+            name, message_count)
+           VALUES (?, ?, ?, ?, ?, 'main', ?)""",
+        (branch_id, conversation_id, parent_branch_id, fork_message_id, shared - 1, shared),
+    )
+    return branch_id
+
+
+def _append_messages(
+    conn,
+    conversation_id: str,
+    branch_id: str,
+    messages: list[dict],
+    start_index: int,
+    parent_message_id: Optional[str],
+) -> None:
+    """Insert a run of chained messages and bump the branch's message_count."""
+    rows = []
+    for offset, msg in enumerate(messages):
+        message_id = _generate_msg_id()
+        rows.append(
+            (
+                message_id,
+                conversation_id,
+                branch_id,
+                parent_message_id,
+                start_index + offset,
+                msg.get("role", "user"),
+                msg.get("content", ""),
+            )
+        )
+        parent_message_id = message_id
+    conn.executemany(
+        """INSERT INTO conversation_messages
+           (id, conversation_id, branch_id, parent_message_id,
+            message_index, role, content)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        rows,
+    )
+    conn.execute(
+        "UPDATE conversation_branches SET message_count = message_count + ? WHERE id = ?",
+        (len(rows), branch_id),
+    )
+
+
 def get_branch(branch_id: str) -> Optional[dict]:
     """Get a single branch by ID."""
     with get_connection() as conn:
@@ -116,6 +323,13 @@ def create_message(
                     content,
                 ),
             )
+            conn.execute(
+                """UPDATE conversation_branches
+                   SET message_count = message_count + 1,
+                       diverged_index = COALESCE(diverged_index, ?)
+                   WHERE id = ?""",
+                (message_index, branch_id),
+            )
             conn.commit()
             return message_id
         except Exception as e:
@@ -123,18 +337,84 @@ def create_message(
             return None
 
 
+def append_message(branch_id: str, role: str, content: str) -> Optional[str]:
+    """Append a message to the end of a branch, linked to its last visible message.
+
+    Returns the new message_id, or None if the branch does not exist.
+    """
+    with get_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        branch = conn.execute(
+            "SELECT conversation_id, message_count FROM conversation_branches WHERE id = ?",
+            (branch_id,),
+        ).fetchone()
+        if not branch:
+            conn.rollback()
+            return None
+        last = conn.execute(
+            _ANCESTRY_CTE
+            + """SELECT m.id FROM conversation_messages m
+                 JOIN chain c ON m.branch_id = c.branch_id
+                 WHERE c.upto IS NULL OR m.message_index <= c.upto
+                 ORDER BY m.message_index DESC LIMIT 1""",
+            (branch_id,),
+        ).fetchone()
+        message_id = _generate_msg_id()
+        conn.execute(
+            """INSERT INTO conversation_messages
+               (id, conversation_id, branch_id, parent_message_id,
+                message_index, role, content)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (
+                message_id,
+                branch["conversation_id"],
+                branch_id,
+                last["id"] if last else None,
+                branch["message_count"],
+                role,
+                content,
+            ),
+        )
+        conn.execute(
+            """UPDATE conversation_branches
+               SET message_count = message_count + 1,
+                   diverged_index = COALESCE(diverged_index, message_count)
+               WHERE id = ?""",
+            (branch_id,),
+        )
+        conn.commit()
+        return message_id
+
+
 def get_messages_for_branch(branch_id: str, conversation_id: str) -> list[dict]:
-    """Get all messages for a branch, ordered by message_index."""
+    """Get all messages visible on a branch, inherited ones included, by message_index."""
     with get_connection() as conn:
         rows = conn.execute(
-            """SELECT * FROM conversation_messages
-               WHERE branch_id = ? AND conversation_id = ?
-               ORDER BY message_index ASC""",
+            _ANCESTRY_CTE
+            + """SELECT m.* FROM conversation_messages m
+                 JOIN chain c ON m.branch_id = c.branch_id
+                 WHERE m.conversation_id = ?
+                   AND (c.upto IS NULL OR m.message_index <= c.upto)
+                 ORDER BY m.message_index ASC""",
             (branch_id, conversation_id),
         ).fetchall()
         return [dict(row) for row in rows]
 
 
+def get_message_at(branch_id: str, message_index: int) -> Optional[dict]:
+    """Get the message visible at ``message_index`` on a branch."""
+    with get_connection() as conn:
+        row = conn.execute(
+            _ANCESTRY_CTE
+            + """SELECT m.* FROM conversation_messages m
+                 JOIN chain c ON m.branch_id = c.branch_id
+                 WHERE m.message_index = ?
+                   AND (c.upto IS NULL OR m.message_index <= c.upto)""",
+            (branch_id, message_index),
+        ).fetchone()
+        return dict(row) if row else None
+
+
 def get_message(message_id: str) -> Optional[dict]:
     """Get a single message by ID."""
     with get_connection() as conn:
@@ -145,10 +425,10 @@ def get_message(message_id: str) -> Optional[dict]:
 
 
 def count_messages_for_branch(branch_id: str) -> int:
-    """Count messages in a branch."""
+    """Count messages visible on a branch (inherited ones included)."""
     with get_connection() as conn:
         row = conn.execute(
-            "SELECT COUNT(*) FROM conversation_messages WHERE branch_id = ?",
+            "SELECT message_count FROM conversation_branches WHERE id = ?",
             (branch_id,),
         ).fetchone()
         return row[0] if row else 0
@@ -1,14 +1,16 @@
 """Cross-team insights aggregation queries.
 
 Provides per-team execution counts, success rates, week-over-week changes,
-and most active trigger for the cross-team insights dashboard.
+and most active trigger for the cross-team insights dashboard. All teams are
+computed from one grouped query over ``execution_daily_stats``, the daily
+per-trigger counts that triggers on ``execution_logs`` keep current.
 Findings and repo-risk data are not yet stored in the DB — those fields
 return empty lists with data_available: false.
 """
 
 import logging
 import sqlite3
-from typing import List
+from typing import Dict
 
 from .connection import get_connection
 from .teams import get_all_teams
@@ -26,103 +28,70 @@ def get_cross_team_insights() -> dict:
           - top_risky_repos: [] (data_available: false — no findings DB yet)
     """
     teams = get_all_teams()
-    team_insights = []
-
-    with get_connection() as conn:
-        for team in teams:
-            team_id = team["id"]
-            insight = _build_team_insight(conn, team)
-            team_insights.append(insight)
+    stats = _get_team_trigger_stats()
 
     return {
-        "teams": team_insights,
+        "teams": [_build_team_insight(team, stats.get(team["id"], [])) for team in teams],
         "org_findings": [],
         "top_risky_repos": [],
         "data_available": False,
     }
 
 
-def _build_team_insight(conn, team: dict) -> dict:
-    """Build a single team's insight dict from the DB.
+def _get_team_trigger_stats() -> Dict[str, list]:
+    """Per-trigger execution counts of every team-owned trigger, keyed by team_id.
 
-    Queries execution_logs joined through triggers (via team_id).
+    Week boundaries are whole days, as in ``date('now', '-7 days')``.
     """
-    team_id = team["id"]
-
-    # Total executions and success rate for all time
     try:
-        row = conn.execute(
-            """
-            SELECT
-                COUNT(*) as total_executions,
-                COALESCE(
-                    CAST(SUM(CASE WHEN el.status = 'success' THEN 1 ELSE 0 END) AS REAL)
-                    / NULLIF(COUNT(*), 0) * 100,
-                    0
-                ) as success_rate
-            FROM execution_logs el
-            JOIN triggers t ON el.trigger_id = t.id
-            WHERE t.team_id = ?
-            """,
-            (team_id,),
-        ).fetchone()
-        total_executions = row["total_executions"] if row else 0
-        success_rate = round(row["success_rate"] or 0.0, 1) if row else 0.0
+        with get_connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT t.team_id, t.name,
+                       SUM(s.runs) AS total,
+                       SUM(CASE WHEN s.status = 'success' THEN s.runs ELSE 0 END) AS success,
+                       SUM(CASE WHEN s.day >= date('now', '-7 days') THEN s.runs ELSE 0 END)
+                           AS last_week,
+                       SUM(CASE WHEN s.day >= date('now', '-14 days')
+                                 AND s.day < date('now', '-7 days') THEN s.runs ELSE 0 END)
+                           AS prior_week
+                FROM execution_daily_stats s
+                JOIN triggers t ON t.id = s.trigger_id
+                WHERE t.team_id IS NOT NULL
+                GROUP BY s.trigger_id
+                """
+            ).fetchall()
     except sqlite3.Error as e:
-        logger.error("Error fetching execution stats for team %s: %s", team_id, e)
-        total_executions = 0
-        success_rate = 0.0
+        logger.error("Error fetching cross-team execution stats: %s", e)
+        return {}
+
+    stats: Dict[str, list] = {}
+    for row in rows:
+        stats.setdefault(row["team_id"], []).append(dict(row))
+    return stats
+
+
+def _build_team_insight(team: dict, trigger_stats: list) -> dict:
+    """Build a single team's insight dict from its triggers' execution counts."""
+    total_executions = sum(s["total"] for s in trigger_stats)
+    success = sum(s["success"] for s in trigger_stats)
+    success_rate = round(success / total_executions * 100, 1) if total_executions else 0.0
 
     # Week-over-week change: last 7 days vs prior 7 days
-    try:
-        wow_row = conn.execute(
-            """
-            SELECT
-                SUM(CASE WHEN date(el.started_at) >= date('now', '-7 days') THEN 1 ELSE 0 END)
-                    as last_week,
-                SUM(CASE WHEN date(el.started_at) >= date('now', '-14 days')
-                          AND date(el.started_at) < date('now', '-7 days') THEN 1 ELSE 0 END)
-                    as prior_week
-            FROM execution_logs el
-            JOIN triggers t ON el.trigger_id = t.id
-            WHERE t.team_id = ?
-              AND date(el.started_at) >= date('now', '-14 days')
-            """,
-            (team_id,),
-        ).fetchone()
-        last_week = wow_row["last_week"] or 0 if wow_row else 0
-        prior_week = wow_row["prior_week"] or 0 if wow_row else 0
-        if prior_week > 0:
-            week_over_week_change = round(((last_week - prior_week) / prior_week) * 100)
-        elif last_week > 0:
-            week_over_week_change = 100
-        else:
-            week_over_week_change = 0
-    except sqlite3.Error as e:
-        logger.error("Error fetching WoW stats for team %s: %s", team_id, e)
+    last_week = sum(s["last_week"] for s in trigger_stats)
+    prior_week = sum(s["prior_week"] for s in trigger_stats)
+    if prior_week > 0:
+        week_over_week_change = round(((last_week - prior_week) / prior_week) * 100)
+    elif last_week > 0:
+        week_over_week_change = 100
+    else:
         week_over_week_change = 0
 
-    # Most active trigger name
-    try:
-        trig_row = conn.execute(
-            """
-            SELECT t.name, COUNT(*) as cnt
-            FROM execution_logs el
-            JOIN triggers t ON el.trigger_id = t.id
-            WHERE t.team_id = ?
-            GROUP BY el.trigger_id
-            ORDER BY cnt DESC
-            LIMIT 1
-            """,
-            (team_id,),
-        ).fetchone()
-        most_active_trigger_name = trig_row["name"] if trig_row else None
-    except sqlite3.Error as e:
-        logger.error("Error fetching most active trigger for team %s: %s", team_id, e)
-        most_active_trigger_name = None
+    most_active = max(trigger_stats, key=lambda s: s["total"], default=None)
+    most_active_trigger_name = most_active["name"] if most_active and most_active["total"] else None
 
     return {
-        "teamId": team_id,
+        "teamId": team["id"],
         "teamName": team["name"],
         "totalExecutions": total_executions,
         "activeBots": team.get("member_count", 0),
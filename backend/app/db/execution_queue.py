@@ -2,6 +2,8 @@
 
 SQLite-backed execution queue for per-trigger concurrency control.
 Entries persist across server restarts, enabling durable dispatch.
+Entries may carry a ``not_before`` timestamp (delayed delivery) and an ``attempt``
+counter; rate-limit retries are queued this way instead of held in memory.
 """
 
 import logging
@@ -27,6 +29,8 @@ def enqueue_execution(
     message_text: str = "",
     event_data: str = "{}",
     priority: int = 0,
+    delay_seconds: float = 0,
+    attempt: int = 0,
 ) -> str:
     """Insert a new execution into the queue. Returns the queue entry ID.
 
@@ -36,26 +40,42 @@ def enqueue_execution(
         message_text: Rendered message/prompt text.
         event_data: JSON-serialized event payload.
         priority: Priority level (0 = normal). Higher values dispatch first.
+        delay_seconds: If > 0, the entry is not dispatched until this many seconds from now.
+        attempt: Retry attempt number (0 = first delivery).
 
     Returns:
         The generated queue entry ID (qe-XXXXXX).
     """
     entry_id = _generate_queue_entry_id()
+    # datetime('now', NULL) yields NULL, i.e. immediately due
+    delay_modifier = f"+{delay_seconds:.3f} seconds" if delay_seconds > 0 else None
     with get_connection() as conn:
         conn.execute(
             """
             INSERT INTO execution_queue
-                (id, trigger_id, trigger_type, message_text, event_data, priority, status, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, 'pending', datetime('now'))
+                (id, trigger_id, trigger_type, message_text, event_data, priority, status,
+                 created_at, not_before, attempt)
+            VALUES (?, ?, ?, ?, ?, ?, 'pending', datetime('now'), datetime('now', ?), ?)
             """,
-            (entry_id, trigger_id, trigger_type, message_text, event_data, priority),
+            (
+                entry_id,
+                trigger_id,
+                trigger_type,
+                message_text,
+                event_data,
+                priority,
+                delay_modifier,
+                attempt,
+            ),
         )
         conn.commit()
     return entry_id
 
 
 def get_pending_entries(limit: int = 10) -> List[dict]:
-    """Return pending queue entries in FIFO order (priority DESC, created_at ASC).
+    """Return due pending queue entries in FIFO order (priority DESC, created_at ASC).
+
+    Entries whose ``not_before`` is still in the future are skipped.
 
     Args:
         limit: Maximum number of entries to return.
@@ -68,6 +88,7 @@ def get_pending_entries(limit: int = 10) -> List[dict]:
             """
             SELECT * FROM execution_queue
             WHERE status = 'pending'
+              AND (not_before IS NULL OR not_before <= datetime('now'))
             ORDER BY priority DESC, created_at ASC
             LIMIT ?
             """,
@@ -212,6 +233,68 @@ def cancel_pending_entries(trigger_id: Optional[str] = None) -> int:
         return cursor.rowcount
 
 
+def get_retry_attempt(trigger_id: str) -> int:
+    """Return the highest attempt number among a trigger's pending/dispatching entries.
+
+    A dispatching retry entry reports its own attempt, so a retry scheduled while it
+    runs continues the sequence. Returns 0 when no retry is in flight.
+
+    Args:
+        trigger_id: The trigger to inspect.
+    """
+    with get_connection() as conn:
+        cursor = conn.execute(
+            """
+            SELECT COALESCE(MAX(attempt), 0) FROM execution_queue
+            WHERE trigger_id = ? AND status IN ('pending', 'dispatching')
+            """,
+            (trigger_id,),
+        )
+        return cursor.fetchone()[0]
+
+
+def cancel_pending_retries(trigger_id: str) -> int:
+    """Cancel a trigger's pending retry entries (attempt > 0).
+
+    Args:
+        trigger_id: The trigger whose queued retries should be superseded.
+
+    Returns:
+        Number of entries cancelled.
+    """
+    with get_connection() as conn:
+        cursor = conn.execute(
+            """
+            UPDATE execution_queue
+            SET status = 'cancelled', completed_at = datetime('now')
+            WHERE status = 'pending' AND attempt > 0 AND trigger_id = ?
+            """,
+            (trigger_id,),
+        )
+        conn.commit()
+        return cursor.rowcount
+
+
+def get_pending_retry_entries() -> List[dict]:
+    """Return pending retry entries (attempt > 0) ordered by when they become due.
+
+    Each row includes ``delay_seconds``, the scheduled delay between enqueue and
+    ``not_before``.
+    """
+    with get_connection() as conn:
+        cursor = conn.execute(
+            """
+            SELECT *,
+                   CAST(ROUND((julianday(not_before) - julianday(created_at)) * 86400)
+                        AS INTEGER) AS delay_seconds
+            FROM execution_queue
+            WHERE status = 'pending' AND attempt > 0
+            ORDER BY not_before ASC
+            """
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+
 def cleanup_completed_entries(max_age_hours: int = 24) -> int:
     """Remove old completed/failed/cancelled entries from the queue.
 
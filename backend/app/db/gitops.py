@@ -1,5 +1,6 @@
 """GitOps repository configuration and sync state CRUD operations."""
 
+import json
 import logging
 from typing import Optional
 
@@ -124,26 +125,53 @@ def delete_gitops_repo(repo_id: str) -> bool:
     return cursor.rowcount > 0
 
 
-def update_sync_state(repo_id: str, commit_sha: str, synced_at: str) -> bool:
+def update_sync_state(
+    repo_id: str,
+    commit_sha: str,
+    synced_at: str,
+    pending_files: Optional[list[str]] = None,
+    full_sync_at: Optional[str] = None,
+) -> bool:
     """Update the last sync state for a repo.
 
     Args:
         repo_id: The repo ID.
         commit_sha: The commit SHA that was synced.
         synced_at: ISO timestamp of sync.
+        pending_files: Config file names that failed to apply and must be
+            re-processed on the next sync. None or empty clears the list.
+        full_sync_at: ISO timestamp of this sync if it processed every config
+            file; None keeps the previous value.
 
     Returns:
         True if the repo was found and updated.
     """
     with get_connection() as conn:
         cursor = conn.execute(
-            "UPDATE gitops_repos SET last_commit_sha = ?, last_sync_at = ? WHERE id = ?",
-            (commit_sha, synced_at, repo_id),
+            """UPDATE gitops_repos
+               SET last_commit_sha = ?, last_sync_at = ?, pending_files = ?,
+                   last_full_sync_at = COALESCE(?, last_full_sync_at)
+               WHERE id = ?""",
+            (
+                commit_sha,
+                synced_at,
+                json.dumps(pending_files) if pending_files else None,
+                full_sync_at,
+                repo_id,
+            ),
         )
         conn.commit()
     return cursor.rowcount > 0
 
 
+def get_pending_files(repo: dict) -> list[str]:
+    """Return the config file names a repo row has queued for retry."""
+    try:
+        return json.loads(repo.get("pending_files") or "[]")
+    except (TypeError, ValueError):
+        return []
+
+
 def add_sync_log(
     repo_id: str,
     commit_sha: Optional[str],
@@ -2,13 +2,34 @@
 
 import logging
 import sqlite3
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from .connection import get_connection, safe_set_clause
 
 logger = logging.getLogger(__name__)
 
 
+def hook_row(
+    name: str,
+    event: str,
+    description: Optional[str] = None,
+    content: Optional[str] = None,
+    enabled: bool = True,
+    project_id: Optional[str] = None,
+    source_path: Optional[str] = None,
+) -> dict:
+    """Build the column values for a new hook, applying the create defaults."""
+    return {
+        "name": name,
+        "event": event,
+        "description": description,
+        "content": content,
+        "enabled": 1 if enabled else 0,
+        "project_id": project_id,
+        "source_path": source_path,
+    }
+
+
 def create_hook(
     name: str,
     event: str,
@@ -19,14 +40,20 @@ def create_hook(
     source_path: Optional[str] = None,
 ) -> Optional[int]:
     """Add a new hook."""
+    row = hook_row(
+        name=name,
+        event=event,
+        description=description,
+        content=content,
+        enabled=enabled,
+        project_id=project_id,
+        source_path=source_path,
+    )
     with get_connection() as conn:
         try:
             cursor = conn.execute(
-                """
-                INSERT INTO hooks (name, event, description, content, enabled, project_id, source_path)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-                (name, event, description, content, 1 if enabled else 0, project_id, source_path),
+                f"INSERT INTO hooks ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+                tuple(row.values()),
             )
             conn.commit()
             return cursor.lastrowid
@@ -35,6 +62,36 @@ def create_hook(
             return None
 
 
+def hook_update_clauses(
+    name: Optional[str] = None,
+    event: Optional[str] = None,
+    description: Optional[str] = None,
+    content: Optional[str] = None,
+    enabled: Optional[bool] = None,
+) -> Tuple[List[str], list]:
+    """Build the SET expressions and values for a hook update."""
+    updates = []
+    values = []
+    if name is not None:
+        updates.append("name = ?")
+        values.append(name)
+    if event is not None:
+        updates.append("event = ?")
+        values.append(event)
+    if description is not None:
+        updates.append("description = ?")
+        values.append(description)
+    if content is not None:
+        updates.append("content = ?")
+        values.append(content)
+    if enabled is not None:
+        updates.append("enabled = ?")
+        values.append(1 if enabled else 0)
+    if updates:
+        updates.append("updated_at = CURRENT_TIMESTAMP")
+    return updates, values
+
+
 def update_hook(
     hook_id: int,
     name: Optional[str] = None,
@@ -44,28 +101,13 @@ def update_hook(
     enabled: Optional[bool] = None,
 ) -> bool:
     """Update an existing hook."""
+    updates, values = hook_update_clauses(
+        name=name, event=event, description=description, content=content, enabled=enabled
+    )
+    if not updates:
+        return False
+    values.append(hook_id)
     with get_connection() as conn:
-        updates = []
-        values = []
-        if name is not None:
-            updates.append("name = ?")
-            values.append(name)
-        if event is not None:
-            updates.append("event = ?")
-            values.append(event)
-        if description is not None:
-            updates.append("description = ?")
-            values.append(description)
-        if content is not None:
-            updates.append("content = ?")
-            values.append(content)
-        if enabled is not None:
-            updates.append("enabled = ?")
-            values.append(1 if enabled else 0)
-        if not updates:
-            return False
-        updates.append("updated_at = CURRENT_TIMESTAMP")
-        values.append(hook_id)
         cursor = conn.execute(f"UPDATE hooks SET {safe_set_clause(updates)} WHERE id = ?", values)
         conn.commit()
         return cursor.rowcount > 0
@@ -9,6 +9,135 @@ from .ids import generate_kg_entity_id, generate_kg_relation_id
 logger = logging.getLogger(__name__)
 
 
+# Rows per multi-row INSERT (keeps bound parameters well under SQLite's limit)
+_BULK_ROWS = 500
+
+_ENTITY_UPSERT_SQL = """INSERT INTO kg_entities
+       (id, agent_id, name, entity_type, properties, mention_count)
+   VALUES {values}
+   ON CONFLICT(agent_id, name, entity_type) DO UPDATE SET
+       mention_count = kg_entities.mention_count + excluded.mention_count,
+       last_seen = CURRENT_TIMESTAMP,
+       properties = CASE
+           WHEN excluded.properties != '{{}}' THEN excluded.properties
+           ELSE kg_entities.properties
+       END
+   RETURNING *"""
+
+_RELATION_UPSERT_SQL = """INSERT INTO kg_relations
+       (id, agent_id, source_id, target_id, relation_type, properties, confidence,
+        mention_count)
+   VALUES {values}
+   ON CONFLICT(agent_id, source_id, target_id, relation_type) DO UPDATE SET
+       mention_count = kg_relations.mention_count + excluded.mention_count,
+       last_seen = CURRENT_TIMESTAMP,
+       confidence = MAX(kg_relations.confidence, excluded.confidence)
+   RETURNING *"""
+
+
+def _entity_key(name: str, entity_type: str) -> tuple[str, str]:
+    return name.lower().strip(), entity_type
+
+
+def _upsert_entities(conn, agent_id: str, entities: dict) -> dict:
+    """Multi-row UPSERT of ``{(name, type): (mentions, props_json)}``.
+
+    Runs on the caller's connection without committing. Returns the
+    resulting rows keyed by ``(name, type)``.
+    """
+    rows: dict = {}
+    items = list(entities.items())
+    for start in range(0, len(items), _BULK_ROWS):
+        batch = items[start : start + _BULK_ROWS]
+        params: list = []
+        for (name, entity_type), (mentions, props_json) in batch:
+            params.extend(
+                (generate_kg_entity_id(), agent_id, name, entity_type, props_json, mentions)
+            )
+        sql = _ENTITY_UPSERT_SQL.format(values=",".join(["(?, ?, ?, ?, ?, ?)"] * len(batch)))
+        for row in conn.execute(sql, params).fetchall():
+            rows[(row["name"], row["entity_type"])] = row
+    return rows
+
+
+def _upsert_relations(conn, agent_id: str, relations: dict) -> dict:
+    """Multi-row UPSERT of ``{(source_id, target_id, type): (mentions, confidence, props)}``.
+
+    Runs on the caller's connection without committing. Returns the
+    resulting rows keyed by ``(source_id, target_id, relation_type)``.
+    """
+    rows: dict = {}
+    items = list(relations.items())
+    for start in range(0, len(items), _BULK_ROWS):
+        batch = items[start : start + _BULK_ROWS]
+        params: list = []
+        for (source_id, target_id, relation_type), (mentions, confidence, props) in batch:
+            params.extend(
+                (
+                    generate_kg_relation_id(),
+                    agent_id,
+                    source_id,
+                    target_id,
+                    relation_type,
+                    props,
+                    confidence,
+                    mentions,
+                )
+            )
+        sql = _RELATION_UPSERT_SQL.format(
+            values=",".join(["(?, ?, ?, ?, ?, ?, ?, ?)"] * len(batch))
+        )
+        for row in conn.execute(sql, params).fetchall():
+            rows[(row["source_id"], row["target_id"], row["relation_type"])] = row
+    return rows
+
+
+def _ingest_agent_graph(conn, agent_id: str, entities: list[dict], relations: list[dict]):
+    """Accumulate and upsert one agent's entities/relations on ``conn``.
+
+    Each listed entity counts as one mention; relation endpoints that are not
+    listed are upserted as a mention too. Returns ``(entity_rows, relation_rows)``.
+    """
+    entity_counts: dict = {}
+
+    def _mention(name: str, entity_type: str, props_json: str = "{}") -> tuple[str, str]:
+        key = _entity_key(name, entity_type)
+        mentions, existing_props = entity_counts.get(key, (0, "{}"))
+        entity_counts[key] = (mentions + 1, props_json if props_json != "{}" else existing_props)
+        return key
+
+    for entity in entities:
+        props = entity.get("properties")
+        _mention(
+            entity["name"], entity.get("type", "concept"), json.dumps(props) if props else "{}"
+        )
+
+    listed = set(entity_counts)
+    relation_keys = []
+    for rel in relations:
+        source_key = _entity_key(rel["source"], rel.get("source_type", "concept"))
+        target_key = _entity_key(rel["target"], rel.get("target_type", "concept"))
+        for key in (source_key, target_key):
+            if key not in listed:
+                _mention(*key)
+        relation_keys.append((source_key, target_key, rel))
+
+    entity_rows = _upsert_entities(conn, agent_id, entity_counts)
+
+    relation_counts: dict = {}
+    for source_key, target_key, rel in relation_keys:
+        key = (entity_rows[source_key]["id"], entity_rows[target_key]["id"], rel["relation_type"])
+        mentions, confidence, props = relation_counts.get(key, (0, 0.0, "{}"))
+        rel_props = rel.get("properties")
+        relation_counts[key] = (
+            mentions + 1,
+            max(confidence, rel.get("confidence", 0.5)),
+            json.dumps(rel_props) if rel_props else props,
+        )
+    relation_rows = _upsert_relations(conn, agent_id, relation_counts)
+    return entity_rows, relation_rows
+
+
 def upsert_entity(
     agent_id: str,
     name: str,
@@ -17,27 +146,12 @@ def upsert_entity(
 ) -> dict:
     """Insert or update a KG entity. Increments mention_count on conflict."""
     props_json = json.dumps(properties) if properties else "{}"
-    entity_id = generate_kg_entity_id()
+    key = _entity_key(name, entity_type)
     with get_connection() as conn:
-        conn.execute(
-            """INSERT INTO kg_entities (id, agent_id, name, entity_type, properties)
-               VALUES (?, ?, ?, ?, ?)
-               ON CONFLICT(agent_id, name, entity_type) DO UPDATE SET
-                   mention_count = kg_entities.mention_count + 1,
-                   last_seen = CURRENT_TIMESTAMP,
-                   properties = CASE
-                       WHEN excluded.properties != '{}' THEN excluded.properties
-                       ELSE kg_entities.properties
-                   END""",
-            (entity_id, agent_id, name.lower().strip(), entity_type, props_json),
-        )
+        rows = _upsert_entities(conn, agent_id, {key: (1, props_json)})
         conn.commit()
-        cursor = conn.execute(
-            "SELECT * FROM kg_entities WHERE agent_id = ? AND name = ? AND entity_type = ?",
-            (agent_id, name.lower().strip(), entity_type),
-        )
-        row = cursor.fetchone()
-        return _entity_row_to_dict(row) if row else {}
+    row = rows.get(key)
+    return _entity_row_to_dict(row) if row else {}
 
 
 def upsert_relation(
@@ -50,55 +164,58 @@ def upsert_relation(
     confidence: float = 0.5,
     properties: dict | None = None,
 ) -> dict | None:
-    """Create or update a relation between two entities."""
-    # Ensure both entities exist
-    source = upsert_entity(agent_id, source_name, source_type)
-    target = upsert_entity(agent_id, target_name, target_type)
-    if not source or not target:
-        return None
-
-    props_json = json.dumps(properties) if properties else "{}"
-    relation_id = generate_kg_relation_id()
+    """Create or update a relation between two entities (upserting both entities)."""
+    relation = {
+        "source": source_name,
+        "source_type": source_type,
+        "target": target_name,
+        "target_type": target_type,
+        "relation_type": relation_type,
+        "confidence": confidence,
+        "properties": properties,
+    }
     with get_connection() as conn:
-        # Check for existing relation
-        cursor = conn.execute(
-            """SELECT id, mention_count FROM kg_relations
-               WHERE agent_id = ? AND source_id = ? AND target_id = ? AND relation_type = ?""",
-            (agent_id, source["id"], target["id"], relation_type),
-        )
-        existing = cursor.fetchone()
-        if existing:
-            conn.execute(
-                """UPDATE kg_relations SET
-                       mention_count = mention_count + 1,
-                       last_seen = CURRENT_TIMESTAMP,
-                       confidence = MAX(confidence, ?)
-                   WHERE id = ?""",
-                (confidence, existing["id"]),
-            )
-            conn.commit()
-            cursor = conn.execute("SELECT * FROM kg_relations WHERE id = ?", (existing["id"],))
-            row = cursor.fetchone()
-            return _relation_row_to_dict(row) if row else None
-        else:
-            conn.execute(
-                """INSERT INTO kg_relations
-                       (id, agent_id, source_id, target_id, relation_type, properties, confidence)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    relation_id,
-                    agent_id,
-                    source["id"],
-                    target["id"],
-                    relation_type,
-                    props_json,
-                    confidence,
-                ),
+        _, relation_rows = _ingest_agent_graph(conn, agent_id, [], [relation])
+        conn.commit()
+    row = next(iter(relation_rows.values()), None)
+    return _relation_row_to_dict(row) if row else None
+
+
+def ingest_graph_batch(items: list[dict], processed_message_ids: list[str] | None = None) -> dict:
+    """Upsert a whole extracted entity/relation set in one transaction.
+
+    Args:
+        items: ``[{"agent_id": str, "entities": [...], "relations": [...]}]`` where
+            entities are ``{"name", "type", "properties"?}`` and relations are
+            ``{"source", "source_type", "target", "target_type", "relation_type",
+            "confidence"?, "properties"?}``. Items for the same agent are merged,
+            so repeated mentions across items accumulate into one row update.
+        processed_message_ids: Message IDs to record in ``kg_extraction_log`` as
+            part of the same transaction.
+
+    Returns:
+        ``{"entities": <entity rows written>, "relations": <relation rows written>}``.
+        Nothing is written if any statement fails.
+    """
+    by_agent: dict[str, tuple[list, list]] = {}
+    for item in items:
+        entities, relations = by_agent.setdefault(item["agent_id"], ([], []))
+        entities.extend(item.get("entities", []))
+        relations.extend(item.get("relations", []))
+
+    entity_total = relation_total = 0
+    with get_connection() as conn:
+        for agent_id, (entities, relations) in by_agent.items():
+            entity_rows, relation_rows = _ingest_agent_graph(conn, agent_id, entities, relations)
+            entity_total += len(entity_rows)
+            relation_total += len(relation_rows)
+        if processed_message_ids:
+            conn.executemany(
+                "INSERT OR IGNORE INTO kg_extraction_log (message_id) VALUES (?)",
+                [(message_id,) for message_id in processed_message_ids],
             )
-            conn.commit()
-            cursor = conn.execute("SELECT * FROM kg_relations WHERE id = ?", (relation_id,))
-            row = cursor.fetchone()
-            return _relation_row_to_dict(row) if row else None
+        conn.commit()
+    return {"entities": entity_total, "relations": relation_total}
 
 
 def get_entity(agent_id: str, name: str, entity_type: str | None = None) -> dict | None:
@@ -184,55 +301,150 @@ def get_entity_relations(entity_id: str) -> list[dict]:
         return results
 
 
+_SUBGRAPH_RELATIONS_SQL = """SELECT r.*,
+       se.name AS source_name, se.entity_type AS source_entity_type,
+       te.name AS target_name, te.entity_type AS target_entity_type
+   FROM kg_relations r
+   JOIN kg_entities se ON se.id = r.source_id
+   JOIN kg_entities te ON te.id = r.target_id
+   WHERE r.agent_id = ? AND (r.source_id IN ({ids}) OR r.target_id IN ({ids}))
+   ORDER BY r.mention_count DESC, r.confidence DESC"""
+
+
+def _chunked(ids: list[str]):
+    for start in range(0, len(ids), _BULK_ROWS):
+        yield ids[start : start + _BULK_ROWS]
+
+
+def _expand_subgraph(
+    conn,
+    agent_id: str,
+    seeds: dict[str, dict],
+    hops: int,
+    max_nodes: int | None = None,
+    max_edges: int | None = None,
+    min_importance: float = 0.0,
+) -> tuple[dict[str, dict], dict[str, dict]]:
+    """Frontier-at-a-time BFS from ``seeds`` (``{entity_id: entity}``).
+
+    Each hop costs one relation query and one entity query over the whole
+    frontier. Stronger relations (mention_count, then confidence) are kept
+    first when ``max_nodes``/``max_edges`` cut the expansion short; neighbours
+    below ``min_importance`` are not visited. Seeds are always included.
+    """
+    entities: dict[str, dict] = dict(seeds)
+    relations: dict[str, dict] = {}
+    frontier = list(seeds)
+
+    for _ in range(hops):
+        if not frontier or (max_edges is not None and len(relations) >= max_edges):
+            break
+        hop_relations: dict[str, dict] = {}
+        for chunk in _chunked(frontier):
+            placeholders = ",".join("?" * len(chunk))
+            cursor = conn.execute(
+                _SUBGRAPH_RELATIONS_SQL.format(ids=placeholders),
+                (agent_id, *chunk, *chunk),
+            )
+            for row in cursor.fetchall():
+                if row["id"] not in relations:
+                    hop_relations[row["id"]] = _relation_row_to_dict(row)
+        ordered = sorted(
+            hop_relations.values(),
+            key=lambda r: (r["mention_count"], r["confidence"]),
+            reverse=True,
+        )
+
+        unseen = list(
+            {
+                endpoint
+                for rel in ordered
+                for endpoint in (rel["source_id"], rel["target_id"])
+                if endpoint not in entities
+            }
+        )
+        candidates: dict[str, dict] = {}
+        for chunk in _chunked(unseen):
+            placeholders = ",".join("?" * len(chunk))
+            cursor = conn.execute(
+                f"SELECT * FROM kg_entities WHERE id IN ({placeholders}) AND importance_score >= ?",
+                (*chunk, min_importance),
+            )
+            for row in cursor.fetchall():
+                candidates[row["id"]] = _entity_row_to_dict(row)
+
+        next_frontier: list[str] = []
+        for rel in ordered:
+            if max_edges is not None and len(relations) >= max_edges:
+                break
+            new_ids = {
+                endpoint
+                for endpoint in (rel["source_id"], rel["target_id"])
+                if endpoint not in entities
+            }
+            if any(endpoint not in candidates for endpoint in new_ids):
+                continue
+            if max_nodes is not None and len(entities) + len(new_ids) > max_nodes:
+                continue
+            relations[rel["id"]] = rel
+            for endpoint in new_ids:
+                entities[endpoint] = candidates[endpoint]
+                next_frontier.append(endpoint)
+        frontier = next_frontier
+
+    return entities, relations
+
+
+def _resolve_entities(conn, agent_id: str, names: list[str]) -> dict[str, dict]:
+    """Look up entities by name in one query; returns ``{name: entity}``.
+
+    When a name exists under several types, the most-mentioned one wins
+    (matching ``get_entity`` without a type).
+    """
+    keys = list(dict.fromkeys(name.lower().strip() for name in names))
+    resolved: dict[str, dict] = {}
+    for chunk in _chunked(keys):
+        placeholders = ",".join("?" * len(chunk))
+        cursor = conn.execute(
+            f"SELECT * FROM kg_entities WHERE agent_id = ? AND name IN ({placeholders}) "
+            "ORDER BY mention_count DESC",
+            (agent_id, *chunk),
+        )
+        for row in cursor.fetchall():
+            resolved.setdefault(row["name"], _entity_row_to_dict(row))
+    return resolved
+
+
 def traverse_graph(
     agent_id: str,
     entity_name: str,
     hops: int = 1,
+    max_nodes: int | None = None,
+    max_edges: int | None = None,
+    min_importance: float = 0.0,
 ) -> dict:
-    """BFS traversal from a seed entity. Returns subgraph as {entities, relations}."""
-    seed = get_entity(agent_id, entity_name)
-    if not seed:
-        return {"entities": [], "relations": []}
-
-    visited_entities: dict[str, dict] = {seed["id"]: seed}
-    visited_relations: dict[str, dict] = {}
-    frontier: set[str] = {seed["id"]}
+    """BFS traversal from a seed entity. Returns subgraph as {entities, relations}.
 
+    ``max_nodes``, ``max_edges`` and ``min_importance`` optionally bound the
+    result; the strongest relations are kept when a cap is hit.
+    """
     with get_connection() as conn:
-        for _ in range(hops):
-            if not frontier:
-                break
-            next_frontier: set[str] = set()
-            for eid in frontier:
-                cursor = conn.execute(
-                    """SELECT r.*, se.name as source_name, te.name as target_name
-                       FROM kg_relations r
-                       JOIN kg_entities se ON se.id = r.source_id
-                       JOIN kg_entities te ON te.id = r.target_id
-                       WHERE (r.source_id = ? OR r.target_id = ?)
-                             AND r.agent_id = ?""",
-                    (eid, eid, agent_id),
-                )
-                for row in cursor.fetchall():
-                    rel = _relation_row_to_dict(row)
-                    visited_relations[rel["id"]] = rel
-
-                    # Add neighbor entities
-                    for neighbor_id in [rel["source_id"], rel["target_id"]]:
-                        if neighbor_id not in visited_entities:
-                            ecursor = conn.execute(
-                                "SELECT * FROM kg_entities WHERE id = ?",
-                                (neighbor_id,),
-                            )
-                            erow = ecursor.fetchone()
-                            if erow:
-                                visited_entities[neighbor_id] = _entity_row_to_dict(erow)
-                                next_frontier.add(neighbor_id)
-            frontier = next_frontier
+        seed = _resolve_entities(conn, agent_id, [entity_name]).get(entity_name.lower().strip())
+        if not seed:
+            return {"entities": [], "relations": []}
+        entities, relations = _expand_subgraph(
+            conn,
+            agent_id,
+            {seed["id"]: seed},
+            hops,
+            max_nodes=max_nodes,
+            max_edges=max_edges,
+            min_importance=min_importance,
+        )
 
     return {
-        "entities": list(visited_entities.values()),
-        "relations": list(visited_relations.values()),
+        "entities": list(entities.values()),
+        "relations": list(relations.values()),
     }
 
 
@@ -253,16 +465,30 @@ def get_entity_context(agent_id: str, entity_names: list[str]) -> str:
     """Generate natural language summary of entity relationships."""
     if not entity_names:
         return ""
+    with get_connection() as conn:
+        seeds = _resolve_entities(conn, agent_id, entity_names)
+        if not seeds:
+            return ""
+        _, relations = _expand_subgraph(
+            conn, agent_id, {entity["id"]: entity for entity in seeds.values()}, hops=1
+        )
+
+    by_entity: dict[str, list[dict]] = {}
+    for rel in relations.values():  # already ordered strongest first
+        by_entity.setdefault(rel["source_id"], []).append(rel)
+        if rel["target_id"] != rel["source_id"]:
+            by_entity.setdefault(rel["target_id"], []).append(rel)
+
     lines: list[str] = []
     for name in entity_names:
-        entity = get_entity(agent_id, name)
+        entity = seeds.get(name.lower().strip())
         if not entity:
             continue
-        relations = get_entity_relations(entity["id"])
-        if not relations:
+        entity_relations = by_entity.get(entity["id"])
+        if not entity_relations:
             lines.append(f"- {entity['name']} ({entity['entity_type']})")
             continue
-        for rel in relations[:5]:  # Limit to 5 relations per entity
+        for rel in entity_relations[:5]:  # Limit to 5 relations per entity
             src = rel.get("source_name", "?")
             tgt = rel.get("target_name", "?")
             lines.append(f"- {src} --[{rel['relation_type']}]--> {tgt}")
@@ -2956,7 +2956,10 @@ def _migrate_v57_add_rbac_and_audit_tables(conn):
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """)
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_user_roles_api_key ON user_roles(api_key)")
+    # Fresh databases already have the hashed-key shape (see migration 108)
+    user_role_cols = {row[1] for row in conn.execute("PRAGMA table_info(user_roles)")}
+    if "api_key" in user_role_cols:
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_user_roles_api_key ON user_roles(api_key)")
 
     conn.execute("""
         CREATE TABLE IF NOT EXISTS audit_events (
@@ -4350,6 +4353,415 @@ def _migrate_100_session_per_worktree(conn):
     )
 
 
+def _migrate_101_rate_limit_series(conn):
+    """Add rate_limit_series (epoch-indexed, downsampled snapshots) and backfill it."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS rate_limit_series (
+            account_id INTEGER NOT NULL,
+            window_type TEXT NOT NULL,
+            resolution INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            sample_ts INTEGER NOT NULL,
+            tokens_used INTEGER DEFAULT 0,
+            tokens_limit INTEGER DEFAULT 0,
+            percentage REAL DEFAULT 0.0,
+            samples INTEGER NOT NULL DEFAULT 1,
+            PRIMARY KEY (account_id, window_type, resolution, bucket)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_rate_limit_series_bucket "
+        "ON rate_limit_series(resolution, bucket)"
+    )
+
+    # Backfill from existing snapshots: raw samples for 48h, buckets for 7/31 days.
+    # Bare columns alongside MAX(ts) take their values from the latest sample.
+    source = """
+        SELECT account_id, window_type, CAST(strftime('%s', recorded_at) AS INTEGER) AS ts,
+               tokens_used, tokens_limit, percentage
+        FROM rate_limit_snapshots
+        WHERE recorded_at >= datetime('now', ?)
+    """
+    conn.execute(
+        f"""
+        INSERT OR IGNORE INTO rate_limit_series
+            (account_id, window_type, resolution, bucket, sample_ts,
+             tokens_used, tokens_limit, percentage)
+        SELECT account_id, window_type, 0, ts, ts, tokens_used, tokens_limit, percentage
+        FROM ({source})
+        WHERE ts IS NOT NULL
+        """,
+        ("-48 hours",),
+    )
+    for resolution, age in ((300, "-7 days"), (3600, "-31 days")):
+        conn.execute(
+            f"""
+            INSERT OR IGNORE INTO rate_limit_series
+                (account_id, window_type, resolution, bucket, sample_ts,
+                 tokens_used, tokens_limit, percentage, samples)
+            SELECT account_id, window_type, ?, (ts / ?) * ?, MAX(ts),
+                   tokens_used, tokens_limit, percentage, COUNT(*)
+            FROM ({source})
+            WHERE ts IS NOT NULL
+            GROUP BY account_id, window_type, ts / ?
+            """,
+            (resolution, resolution, resolution, age, resolution),
+        )
+
+
+def _migrate_102_execution_queue_delayed_retries(conn):
+    """Add delayed delivery to execution_queue and move pending_retries into it."""
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(execution_queue)")}
+    if "not_before" not in cols:
+        conn.execute("ALTER TABLE execution_queue ADD COLUMN not_before TEXT")
+    if "attempt" not in cols:
+        conn.execute("ALTER TABLE execution_queue ADD COLUMN attempt INTEGER DEFAULT 0")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_eq_status_not_before ON execution_queue(status, not_before)"
+    )
+
+    # Legacy timer-backed retries become delayed queue entries; the table is left
+    # in place (empty) so older builds can still open the database. retry_at was
+    # written as a naive local-time isoformat, so convert it to UTC like not_before.
+    cursor = conn.execute(
+        """
+        INSERT INTO execution_queue
+            (id, trigger_id, trigger_type, message_text, event_data, status, priority,
+             created_at, not_before, attempt)
+        SELECT 'qe-' || lower(hex(randomblob(3))), trigger_id, trigger_type, message_text,
+               event_json, 'pending', 0, datetime('now'), datetime(retry_at, 'utc'), 1
+        FROM pending_retries
+        WHERE EXISTS (SELECT 1 FROM triggers t WHERE t.id = pending_retries.trigger_id)
+        """
+    )
+    if cursor.rowcount:
+        logger.info("Moved %d pending retries into execution_queue", cursor.rowcount)
+    conn.execute("DELETE FROM pending_retries")
+
+
+def _migrate_103_chunk_result_cache(conn):
+    """Add chunk_result_cache (content-hash keyed bot output reuse) and chunk_results.cached."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS chunk_result_cache (
+            bot_id TEXT NOT NULL,
+            prompt_hash TEXT NOT NULL,
+            chunk_hash TEXT NOT NULL,
+            bot_output TEXT NOT NULL,
+            token_count INTEGER DEFAULT 0,
+            created_at TEXT NOT NULL DEFAULT (datetime('now')),
+            expires_at TEXT NOT NULL,
+            PRIMARY KEY (bot_id, prompt_hash, chunk_hash)
+        )
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_chunk_result_cache_expires "
+        "ON chunk_result_cache(expires_at)"
+    )
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(chunk_results)")}
+    if "cached" not in cols:
+        conn.execute("ALTER TABLE chunk_results ADD COLUMN cached INTEGER DEFAULT 0")
+
+
+def _migrate_104_kg_relations_unique(conn):
+    """Merge duplicate KG relations and enforce one row per (agent, source, target, type)."""
+    key = "agent_id, source_id, target_id, relation_type"
+    # Fold duplicates into the oldest row before deleting the rest
+    conn.execute(f"""
+        UPDATE kg_relations SET
+            mention_count = (
+                SELECT SUM(d.mention_count) FROM kg_relations d
+                WHERE d.agent_id = kg_relations.agent_id
+                  AND d.source_id = kg_relations.source_id
+                  AND d.target_id = kg_relations.target_id
+                  AND d.relation_type = kg_relations.relation_type
+            ),
+            confidence = (
+                SELECT MAX(d.confidence) FROM kg_relations d
+                WHERE d.agent_id = kg_relations.agent_id
+                  AND d.source_id = kg_relations.source_id
+                  AND d.target_id = kg_relations.target_id
+                  AND d.relation_type = kg_relations.relation_type
+            )
+        WHERE rowid IN (
+            SELECT MIN(rowid) FROM kg_relations GROUP BY {key} HAVING COUNT(*) > 1
+        )
+    """)
+    conn.execute(f"""
+        DELETE FROM kg_relations
+        WHERE rowid NOT IN (SELECT MIN(rowid) FROM kg_relations GROUP BY {key})
+    """)
+    conn.execute(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS idx_kg_relations_unique ON kg_relations({key})"
+    )
+
+
+def _migrate_105_kg_entities_decay_watermark(conn):
+    """Track when each KG entity was last decayed so decay can run incrementally."""
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(kg_entities)")}
+    if "last_decayed_at" not in cols:
+        conn.execute("ALTER TABLE kg_entities ADD COLUMN last_decayed_at TIMESTAMP")
+
+
+def _migrate_106_trigger_health_stats(conn):
+    """Add trigger_health_stats and seed it from each trigger's recent executions."""
+    from .trigger_health import DURATION_EWMA_ALPHA
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS trigger_health_stats (
+            trigger_id TEXT PRIMARY KEY,
+            total_runs INTEGER NOT NULL DEFAULT 0,
+            consecutive_failures INTEGER NOT NULL DEFAULT 0,
+            last_status TEXT,
+            last_duration_ms INTEGER,
+            baseline_duration_ms REAL,
+            ewma_duration_ms REAL,
+            duration_samples INTEGER NOT NULL DEFAULT 0,
+            last_finished_at TEXT,
+            updated_at TEXT DEFAULT (datetime('now')),
+            FOREIGN KEY (trigger_id) REFERENCES triggers(id) ON DELETE CASCADE
+        )
+    """)
+
+    cursor = conn.execute("""
+        SELECT trigger_id, status, duration_ms, finished_at FROM (
+            SELECT e.trigger_id, e.status, e.duration_ms, e.finished_at,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY e.trigger_id ORDER BY e.started_at DESC
+                   ) AS rn
+            FROM execution_logs e
+            JOIN triggers t ON t.id = e.trigger_id
+            WHERE e.status NOT IN ('running', 'pending')
+        )
+        WHERE rn <= 20
+        ORDER BY trigger_id, rn DESC
+    """)
+    stats: dict[str, dict] = {}
+    for row in cursor.fetchall():
+        s = stats.setdefault(
+            row[0],
+            {"runs": 0, "streak": 0, "ewma": None, "baseline": None, "samples": 0},
+        )
+        status, duration_ms = row[1], row[2]
+        s["runs"] += 1
+        s["streak"] = s["streak"] + 1 if status == "failed" else 0
+        s["baseline"] = s["ewma"]
+        if duration_ms and duration_ms > 0:
+            s["samples"] += 1
+            s["ewma"] = (
+                duration_ms
+                if s["ewma"] is None
+                else DURATION_EWMA_ALPHA * duration_ms + (1 - DURATION_EWMA_ALPHA) * s["ewma"]
+            )
+        s.update(status=status, duration_ms=duration_ms, finished_at=row[3])
+    conn.executemany(
+        """
+        INSERT OR IGNORE INTO trigger_health_stats
+            (trigger_id, total_runs, consecutive_failures, last_status, last_duration_ms,
+             baseline_duration_ms, ewma_duration_ms, duration_samples, last_finished_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (
+                trigger_id,
+                s["runs"],
+                s["streak"],
+                s["status"],
+                s["duration_ms"],
+                s["baseline"],
+                s["ewma"],
+                s["samples"],
+                s["finished_at"],
+            )
+            for trigger_id, s in stats.items()
+        ],
+    )
+
+
+def _migrate_107_bot_sla_buckets(conn):
+    """Add hourly bot SLA buckets and seed them from the last 30 days of executions."""
+    from ..utils.quantile_sketch import QuantileSketch
+    from .bot_sla import FAILED_STATUSES
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS bot_sla_buckets (
+            trigger_id TEXT NOT NULL,
+            bucket_start TEXT NOT NULL,
+            total_runs INTEGER NOT NULL DEFAULT 0,
+            success_runs INTEGER NOT NULL DEFAULT 0,
+            failed_runs INTEGER NOT NULL DEFAULT 0,
+            duration_sketch TEXT,
+            queue_wait_sketch TEXT,
+            PRIMARY KEY (trigger_id, bucket_start),
+            FOREIGN KEY (trigger_id) REFERENCES triggers(id) ON DELETE CASCADE
+        )
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_bot_sla_buckets_start ON bot_sla_buckets(bucket_start)"
+    )
+
+    # Queue wait was never recorded per execution, so only durations are backfilled
+    cursor = conn.execute("""
+        SELECT e.trigger_id,
+               strftime('%Y-%m-%d %H:00:00', e.finished_at, 'utc') AS bucket,
+               e.status, e.duration_ms
+        FROM execution_logs e
+        JOIN triggers t ON t.id = e.trigger_id
+        WHERE e.status NOT IN ('running', 'pending')
+          AND datetime(e.finished_at, 'utc') >= datetime('now', '-30 days')
+    """)
+    buckets: dict[tuple, dict] = {}
+    for trigger_id, bucket, status, duration_ms in cursor.fetchall():
+        if not bucket:
+            continue
+        b = buckets.setdefault(
+            (trigger_id, bucket),
+            {"total": 0, "success": 0, "failed": 0, "durations": QuantileSketch()},
+        )
+        b["total"] += 1
+        b["success"] += status == "success"
+        b["failed"] += status in FAILED_STATUSES
+        if duration_ms is not None:
+            b["durations"].add(duration_ms)
+    conn.executemany(
+        """
+        INSERT OR IGNORE INTO bot_sla_buckets
+            (trigger_id, bucket_start, total_runs, success_runs, failed_runs,
+             duration_sketch, queue_wait_sketch)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (
+                trigger_id,
+                bucket,
+                b["total"],
+                b["success"],
+                b["failed"],
+                b["durations"].to_json(),
+                QuantileSketch().to_json(),
+            )
+            for (trigger_id, bucket), b in buckets.items()
+        ],
+    )
+
+
+def _migrate_108_hash_user_role_keys(conn):
+    """Replace plaintext user_roles.api_key with a keyed hash and a display prefix."""
+    from .rbac import api_key_prefix, hash_api_key
+
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(user_roles)")}
+    if "key_hash" in cols:
+        return
+    conn.execute("DROP INDEX IF EXISTS idx_user_roles_api_key")
+    conn.execute("ALTER TABLE user_roles RENAME COLUMN api_key TO key_hash")
+    conn.execute("ALTER TABLE user_roles ADD COLUMN key_prefix TEXT NOT NULL DEFAULT ''")
+    rows = conn.execute("SELECT id, key_hash FROM user_roles").fetchall()
+    conn.executemany(
+        "UPDATE user_roles SET key_hash = ?, key_prefix = ? WHERE id = ?",
+        [(hash_api_key(key), api_key_prefix(key), role_id) for role_id, key in rows],
+    )
+
+
+def _migrate_109_conversation_branch_cow(conn):
+    """Let branches inherit their parent's messages up to a fork index, with a stored count."""
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(conversation_branches)")}
+    if "fork_index" not in cols:
+        conn.execute("ALTER TABLE conversation_branches ADD COLUMN fork_index INTEGER")
+    if "message_count" not in cols:
+        conn.execute(
+            "ALTER TABLE conversation_branches ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0"
+        )
+        # Existing branches hold full copies of their messages
+        conn.execute("""
+            UPDATE conversation_branches SET message_count = (
+                SELECT COUNT(*) FROM conversation_messages m
+                WHERE m.branch_id = conversation_branches.id
+            )
+        """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_conv_msg_branch_index "
+        "ON conversation_messages(branch_id, message_index)"
+    )
+
+
+def _migrate_110_execution_daily_stats(conn):
+    """Add per-trigger daily execution counts maintained by triggers, rebuilt from history."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS execution_daily_stats (
+            trigger_id TEXT NOT NULL,
+            day TEXT NOT NULL,
+            trigger_type TEXT NOT NULL,
+            status TEXT NOT NULL,
+            runs INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (trigger_id, day, trigger_type, status)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_execution_daily_stats_day ON execution_daily_stats(day)"
+    )
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS execution_logs_daily_stats_insert
+        AFTER INSERT ON execution_logs
+        BEGIN
+            INSERT INTO execution_daily_stats (trigger_id, day, trigger_type, status, runs)
+            VALUES (COALESCE(new.trigger_id, ''), substr(new.started_at, 1, 10),
+                    new.trigger_type, new.status, 1)
+            ON CONFLICT (trigger_id, day, trigger_type, status) DO UPDATE SET runs = runs + 1;
+        END
+    """)
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS execution_logs_daily_stats_update
+        AFTER UPDATE OF trigger_id, trigger_type, started_at, status ON execution_logs
+        WHEN old.trigger_id IS NOT new.trigger_id OR old.trigger_type IS NOT new.trigger_type
+          OR old.started_at IS NOT new.started_at OR old.status IS NOT new.status
+        BEGIN
+            UPDATE execution_daily_stats SET runs = runs - 1
+            WHERE trigger_id = COALESCE(old.trigger_id, '') AND day = substr(old.started_at, 1, 10)
+              AND trigger_type = old.trigger_type AND status = old.status;
+            INSERT INTO execution_daily_stats (trigger_id, day, trigger_type, status, runs)
+            VALUES (COALESCE(new.trigger_id, ''), substr(new.started_at, 1, 10),
+                    new.trigger_type, new.status, 1)
+            ON CONFLICT (trigger_id, day, trigger_type, status) DO UPDATE SET runs = runs + 1;
+        END
+    """)
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS execution_logs_daily_stats_delete
+        AFTER DELETE ON execution_logs
+        BEGIN
+            UPDATE execution_daily_stats SET runs = runs - 1
+            WHERE trigger_id = COALESCE(old.trigger_id, '') AND day = substr(old.started_at, 1, 10)
+              AND trigger_type = old.trigger_type AND status = old.status;
+        END
+    """)
+
+    # Rebuilding (rather than topping up) keeps the migration safe to re-run
+    conn.execute("DELETE FROM execution_daily_stats")
+    conn.execute("""
+        INSERT INTO execution_daily_stats (trigger_id, day, trigger_type, status, runs)
+        SELECT COALESCE(trigger_id, ''), substr(started_at, 1, 10), trigger_type, status, COUNT(*)
+        FROM execution_logs
+        GROUP BY COALESCE(trigger_id, ''), substr(started_at, 1, 10), trigger_type, status
+    """)
+
+
+def _migrate_111_gitops_sync_retry(conn):
+    """Track GitOps config files to retry and when the last full-tree sync ran."""
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(gitops_repos)")}
+    if "pending_files" not in cols:
+        conn.execute("ALTER TABLE gitops_repos ADD COLUMN pending_files TEXT")
+    if "last_full_sync_at" not in cols:
+        conn.execute("ALTER TABLE gitops_repos ADD COLUMN last_full_sync_at TIMESTAMP")
+
+
+
+def _migrate_112_conversation_branch_divergence(conn):
+    """Record where a branch first got a message outside the transcript sync."""
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(conversation_branches)")}
+    if "diverged_index" not in cols:
+        conn.execute("ALTER TABLE conversation_branches ADD COLUMN diverged_index INTEGER")
+
 VERSIONED_MIGRATIONS = [
     (1, "add_github_columns", _migrate_add_github_columns),
     (2, "add_pr_reviews_table", _migrate_add_pr_reviews_table),
@@ -4476,4 +4888,28 @@ VERSIONED_MIGRATIONS = [
     (99, "kg_extraction_log", _migrate_99_kg_extraction_log),
     # v0.5.0 session-per-worktree
     (100, "session_per_worktree", _migrate_100_session_per_worktree),
+    # Downsampled rate-limit time series
+    (101, "rate_limit_series", _migrate_101_rate_limit_series),
+    # Durable delayed retries in the execution queue
+    (102, "execution_queue_delayed_retries", _migrate_102_execution_queue_delayed_retries),
+    # Content-hash cache for chunked bot execution
+    (103, "chunk_result_cache", _migrate_103_chunk_result_cache),
+    # Bulk knowledge-graph ingestion (relation UPSERT target)
+    (104, "kg_relations_unique", _migrate_104_kg_relations_unique),
+    # Incremental SQL-side knowledge-graph decay
+    (105, "kg_entities_decay_watermark", _migrate_105_kg_entities_decay_watermark),
+    # Event-driven health monitoring (per-trigger rolling stats)
+    (106, "trigger_health_stats", _migrate_106_trigger_health_stats),
+    # Bot SLA and latency percentiles from hourly quantile sketches
+    (107, "bot_sla_buckets", _migrate_107_bot_sla_buckets),
+    # API keys stored as keyed hashes plus a display prefix
+    (108, "hash_user_role_keys", _migrate_108_hash_user_role_keys),
+    # Copy-on-write conversation branches
+    (109, "conversation_branch_cow", _migrate_109_conversation_branch_cow),
+    # Daily execution counts for cross-team insights and weekly reports
+    (110, "execution_daily_stats", _migrate_110_execution_daily_stats),
+    # GitOps retry of files that failed to apply, plus periodic full resyncs
+    (111, "gitops_sync_retry", _migrate_111_gitops_sync_retry),
+    # Main conversation branches remember where add_message diverged them
+    (112, "conversation_branch_divergence", _migrate_112_conversation_branch_divergence),
 ]
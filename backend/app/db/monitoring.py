@@ -2,6 +2,7 @@
 
 import logging
 import sqlite3
+import time
 from typing import List, Optional
 
 from .connection import get_connection
@@ -53,6 +54,19 @@ def insert_rate_limit_snapshot(
                     resets_at,
                 ),
             )
+            _append_series_samples(
+                conn,
+                [
+                    {
+                        "account_id": account_id,
+                        "window_type": window_type,
+                        "tokens_used": tokens_used,
+                        "tokens_limit": tokens_limit,
+                        "percentage": percentage,
+                    }
+                ],
+                int(time.time()),
+            )
             conn.commit()
             return cursor.lastrowid
         except sqlite3.Error as e:
@@ -60,6 +74,81 @@ def insert_rate_limit_snapshot(
             return None
 
 
+def insert_rate_limit_snapshots(snapshots: List[dict]) -> int:
+    """Insert many rate limit snapshot rows in a single transaction.
+
+    Each dict carries the same keys as ``insert_rate_limit_snapshot`` arguments.
+    Returns the number of rows inserted (0 on failure; the batch is rolled back).
+    """
+    if not snapshots:
+        return 0
+    rows = [
+        (
+            s["account_id"],
+            s["backend_type"],
+            s["window_type"],
+            s.get("tokens_used", 0),
+            s.get("tokens_limit", 0),
+            s.get("percentage", 0.0),
+            s.get("threshold_level", "normal"),
+            s.get("resets_at"),
+        )
+        for s in snapshots
+    ]
+    with get_connection() as conn:
+        try:
+            conn.executemany(
+                """
+                INSERT INTO rate_limit_snapshots
+                    (account_id, backend_type, window_type, tokens_used, tokens_limit,
+                     percentage, threshold_level, resets_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            _append_series_samples(conn, snapshots, int(time.time()))
+            conn.commit()
+            return len(rows)
+        except sqlite3.Error as e:
+            conn.rollback()
+            logger.error(f"Database error in insert_rate_limit_snapshots: {e}")
+            return 0
+
+
+# Windows never reported in monitoring status: Gemini Vertex AI duplicates, deprecated
+# 2.0/2.5 models and unlabelled primary/secondary windows. Both the SQL filter of
+# get_latest_snapshots and is_reported_window_type are built from these lists.
+_UNREPORTED_WINDOW_SUFFIXES = ("_vertex",)
+_UNREPORTED_WINDOW_PREFIXES = ("gemini-2.0", "gemini-2.5")
+_UNREPORTED_WINDOWS = ("primary_window", "secondary_window")
+
+
+def _like_literal(text: str) -> str:
+    """Escape ``text`` for a LIKE pattern using '!' as the escape character."""
+    return text.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+_REPORTED_WINDOW_SQL = " AND ".join(
+    ["window_type NOT LIKE ? ESCAPE '!'"]
+    * (len(_UNREPORTED_WINDOW_SUFFIXES) + len(_UNREPORTED_WINDOW_PREFIXES))
+    + ["window_type != ?"] * len(_UNREPORTED_WINDOWS)
+)
+_REPORTED_WINDOW_PARAMS = (
+    *(f"%{_like_literal(suffix)}" for suffix in _UNREPORTED_WINDOW_SUFFIXES),
+    *(f"{_like_literal(prefix)}%" for prefix in _UNREPORTED_WINDOW_PREFIXES),
+    *_UNREPORTED_WINDOWS,
+)
+
+
+def is_reported_window_type(window_type: str) -> bool:
+    """Return True if ``get_latest_snapshots`` would report windows of this type."""
+    return not (
+        window_type.endswith(_UNREPORTED_WINDOW_SUFFIXES)
+        or window_type.startswith(_UNREPORTED_WINDOW_PREFIXES)
+        or window_type in _UNREPORTED_WINDOWS
+    )
+
+
 def get_latest_snapshots(max_age_minutes: int = 60) -> List[dict]:
     """Return the most recent snapshot per (account_id, window_type).
 
@@ -69,24 +158,20 @@ def get_latest_snapshots(max_age_minutes: int = 60) -> List[dict]:
     """
     with get_connection() as conn:
         cursor = conn.execute(
-            """
+            f"""
             SELECT s.*
             FROM rate_limit_snapshots s
             INNER JOIN (
                 SELECT account_id, window_type, MAX(id) as max_id
                 FROM rate_limit_snapshots
-                WHERE window_type NOT LIKE '%!_vertex' ESCAPE '!'
-                  AND window_type NOT LIKE 'gemini-2.0%'
-                  AND window_type NOT LIKE 'gemini-2.5%'
-                  AND window_type != 'primary_window'
-                  AND window_type != 'secondary_window'
+                WHERE {_REPORTED_WINDOW_SQL}
                   AND recorded_at >= datetime('now', ?)
                 GROUP BY account_id, window_type
             ) latest
             ON s.id = latest.max_id
             ORDER BY s.account_id, s.window_type
             """,
-            (f"-{max_age_minutes} minutes",),
+            (*_REPORTED_WINDOW_PARAMS, f"-{max_age_minutes} minutes"),
         )
         return [_utc_suffix(dict(row)) for row in cursor.fetchall()]
 
@@ -151,6 +236,112 @@ def get_rate_limit_stats_by_period(
         return [dict(row) for row in cursor.fetchall()]
 
 
+# =============================================================================
+# Rate limit time series (downsampled, epoch-indexed)
+# =============================================================================
+#
+# rate_limit_series mirrors every snapshot at three resolutions keyed by integer
+# epoch buckets: raw samples (resolution 0), 5-minute and hourly buckets. Each
+# bucket keeps the last sample that fell into it, so deltas between buckets equal
+# deltas between the underlying samples. Rollups are maintained on write; the
+# compaction job only prunes each resolution past its retention.
+
+SERIES_RAW = 0
+SERIES_5MIN = 300
+SERIES_HOURLY = 3600
+
+# Retention per resolution, in seconds
+SERIES_RETENTION = {
+    SERIES_RAW: 48 * 3600,
+    SERIES_5MIN: 7 * 86400,
+    SERIES_HOURLY: 31 * 86400,
+}
+
+
+def _append_series_samples(conn, samples: List[dict], ts: int) -> None:
+    """Write samples at epoch ``ts`` into every series resolution (caller commits)."""
+    rows = []
+    for s in samples:
+        values = (
+            s.get("tokens_used", 0),
+            s.get("tokens_limit", 0),
+            s.get("percentage", 0.0),
+        )
+        for resolution in SERIES_RETENTION:
+            bucket = ts - ts % resolution if resolution else ts
+            rows.append((s["account_id"], s["window_type"], resolution, bucket, ts, *values))
+    conn.executemany(
+        """
+        INSERT INTO rate_limit_series
+            (account_id, window_type, resolution, bucket, sample_ts,
+             tokens_used, tokens_limit, percentage)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(account_id, window_type, resolution, bucket) DO UPDATE SET
+            sample_ts = excluded.sample_ts,
+            tokens_used = excluded.tokens_used,
+            tokens_limit = excluded.tokens_limit,
+            percentage = excluded.percentage,
+            samples = samples + 1
+        WHERE excluded.sample_ts >= rate_limit_series.sample_ts
+        """,
+        rows,
+    )
+
+
+def _choose_series_resolution(since_ts: int, now_ts: int) -> int:
+    """Pick the finest resolution whose retention still covers ``since_ts``."""
+    age = now_ts - since_ts
+    for resolution in (SERIES_RAW, SERIES_5MIN, SERIES_HOURLY):
+        if age <= SERIES_RETENTION[resolution]:
+            return resolution
+    return SERIES_HOURLY
+
+
+def get_rate_limit_series(
+    since_ts: int,
+    account_id: Optional[int] = None,
+    window_type: Optional[str] = None,
+    resolution: Optional[int] = None,
+) -> List[tuple]:
+    """Return series points as ``(account_id, window_type, ts, tokens_used, tokens_limit,
+    percentage)`` tuples ordered by account, window and time.
+
+    When ``resolution`` is None the finest resolution covering ``since_ts`` is used.
+    """
+    if resolution is None:
+        resolution = _choose_series_resolution(since_ts, int(time.time()))
+    query = """
+        SELECT account_id, window_type, sample_ts, tokens_used, tokens_limit, percentage
+        FROM rate_limit_series
+        WHERE resolution = ? AND bucket >= ?
+    """
+    params: list = [resolution, since_ts - since_ts % resolution if resolution else since_ts]
+    if account_id is not None:
+        query += " AND account_id = ?"
+        params.append(account_id)
+    if window_type is not None:
+        query += " AND window_type = ?"
+        params.append(window_type)
+    query += " ORDER BY account_id, window_type, bucket"
+    with get_connection() as conn:
+        return [tuple(row) for row in conn.execute(query, params).fetchall()]
+
+
+def compact_rate_limit_series(now_ts: Optional[int] = None) -> int:
+    """Prune each series resolution past its retention. Returns rows deleted."""
+    now_ts = int(time.time()) if now_ts is None else now_ts
+    deleted = 0
+    with get_connection() as conn:
+        for resolution, retention in SERIES_RETENTION.items():
+            cursor = conn.execute(
+                "DELETE FROM rate_limit_series WHERE resolution = ? AND bucket < ?",
+                (resolution, now_ts - retention),
+            )
+            deleted += cursor.rowcount
+        conn.commit()
+    return deleted
+
+
 # =============================================================================
 # Monitoring Config CRUD operations
 # =============================================================================
@@ -249,83 +440,3 @@ def get_setup_executions_for_project(project_id: str, limit: int = 20) -> List[d
             (project_id, limit),
         )
         return [dict(row) for row in cursor.fetchall()]
-
-
-# =============================================================================
-# Pending rate-limit retry persistence
-# =============================================================================
-
-
-def upsert_pending_retry(
-    trigger_id: str,
-    trigger_json: str,
-    message_text: str,
-    event_json: str,
-    trigger_type: str,
-    cooldown_seconds: int,
-    retry_at: str,
-) -> bool:
-    """Insert or replace a pending rate-limit retry record. Returns True on success."""
-    with get_connection() as conn:
-        try:
-            conn.execute(
-                """
-                INSERT INTO pending_retries
-                    (trigger_id, trigger_json, message_text, event_json, trigger_type,
-                     cooldown_seconds, retry_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(trigger_id) DO UPDATE SET
-                    trigger_json = excluded.trigger_json,
-                    message_text = excluded.message_text,
-                    event_json = excluded.event_json,
-                    trigger_type = excluded.trigger_type,
-                    cooldown_seconds = excluded.cooldown_seconds,
-                    retry_at = excluded.retry_at
-                """,
-                (
-                    trigger_id,
-                    trigger_json,
-                    message_text,
-                    event_json,
-                    trigger_type,
-                    cooldown_seconds,
-                    retry_at,
-                ),
-            )
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            logger.error("Database error in upsert_pending_retry: %s", e)
-            return False
-
-
-def delete_pending_retry(trigger_id: str) -> bool:
-    """Remove a pending retry record once executed. Returns True on success."""
-    with get_connection() as conn:
-        try:
-            conn.execute("DELETE FROM pending_retries WHERE trigger_id = ?", (trigger_id,))
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            logger.error("Database error in delete_pending_retry: %s", e)
-            return False
-
-
-def get_pending_retries_due(now_iso: str) -> List[dict]:
-    """Return all pending retries whose retry_at is in the past (i.e. due for execution).
-
-    Used on server startup to restore in-flight retries that survived a restart.
-    """
-    with get_connection() as conn:
-        cursor = conn.execute(
-            "SELECT * FROM pending_retries WHERE retry_at <= ?",
-            (now_iso,),
-        )
-        return [dict(row) for row in cursor.fetchall()]
-
-
-def get_all_pending_retries() -> List[dict]:
-    """Return all pending retries (for status reporting)."""
-    with get_connection() as conn:
-        cursor = conn.execute("SELECT * FROM pending_retries ORDER BY retry_at")
-        return [dict(row) for row in cursor.fetchall()]
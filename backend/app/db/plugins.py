@@ -2,7 +2,7 @@
 
 import logging
 import sqlite3
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from .connection import get_connection
 from .ids import _generate_short_id, _get_unique_plugin_id
@@ -15,6 +15,23 @@ logger = logging.getLogger(__name__)
 # =============================================================================
 
 
+def plugin_row(
+    name: str,
+    description: str = None,
+    version: str = "1.0.0",
+    status: str = "draft",
+    author: str = None,
+) -> dict:
+    """Build the column values for a new plugin, applying the create defaults."""
+    return {
+        "name": name,
+        "description": description,
+        "version": version,
+        "status": status,
+        "author": author,
+    }
+
+
 def create_plugin(
     name: str,
     description: str = None,
@@ -23,15 +40,16 @@ def create_plugin(
     author: str = None,
 ) -> Optional[str]:
     """Add a new plugin. Returns plugin_id on success, None on failure."""
+    row = plugin_row(
+        name=name, description=description, version=version, status=status, author=author
+    )
     with get_connection() as conn:
         try:
             plugin_id = _get_unique_plugin_id(conn)
             conn.execute(
-                """
-                INSERT INTO plugins (id, name, description, version, status, author)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """,
-                (plugin_id, name, description, version, status, author),
+                f"INSERT INTO plugins (id, {', '.join(row)}) "
+                f"VALUES ({', '.join('?' * (len(row) + 1))})",
+                (plugin_id, *row.values()),
             )
             conn.commit()
             return plugin_id
@@ -39,15 +57,14 @@ def create_plugin(
             return None
 
 
-def update_plugin(
-    plugin_id: str,
+def plugin_update_clauses(
     name: str = None,
     description: str = None,
     version: str = None,
     status: str = None,
     author: str = None,
-) -> bool:
-    """Update plugin fields. Returns True on success."""
+) -> Tuple[List[str], list]:
+    """Build the SET expressions and values for a plugin update."""
     updates = []
     values = []
 
@@ -67,10 +84,26 @@ def update_plugin(
         updates.append("author = ?")
         values.append(author)
 
+    if updates:
+        updates.append("updated_at = CURRENT_TIMESTAMP")
+    return updates, values
+
+
+def update_plugin(
+    plugin_id: str,
+    name: str = None,
+    description: str = None,
+    version: str = None,
+    status: str = None,
+    author: str = None,
+) -> bool:
+    """Update plugin fields. Returns True on success."""
+    updates, values = plugin_update_clauses(
+        name=name, description=description, version=version, status=status, author=author
+    )
     if not updates:
         return False
 
-    updates.append("updated_at = CURRENT_TIMESTAMP")
     values.append(plugin_id)
 
     with get_connection() as conn:
@@ -53,6 +53,19 @@ def get_snippet_by_name(name: str) -> Optional[dict]:
         return dict(row) if row else None
 
 
+def get_snippets_by_names(names) -> dict:
+    """Get snippets for several names in one query, keyed by name (missing names omitted)."""
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+    placeholders = ",".join("?" * len(names))
+    with get_connection() as conn:
+        cursor = conn.execute(
+            f"SELECT * FROM prompt_snippets WHERE name IN ({placeholders})", names
+        )
+        return {row["name"]: dict(row) for row in cursor.fetchall()}
+
+
 def get_all_snippets(limit: Optional[int] = None, offset: int = 0) -> List[dict]:
     """Get all prompt snippets."""
     with get_connection() as conn:
@@ -1,14 +1,18 @@
 """RBAC (Role-Based Access Control) database operations.
 
 Manages user_roles table: maps API keys to roles (viewer, operator, editor, admin).
+Keys are stored only as keyed hashes (``key_hash``) plus a short display prefix.
 """
 
+import hashlib
 import hmac
 import logging
 import secrets
 import threading
 import time
-from typing import Optional
+from typing import Dict, Optional
+
+from app import config as app_config
 
 from .connection import get_connection
 from .ids import _get_unique_role_id
@@ -17,38 +21,101 @@ logger = logging.getLogger(__name__)
 
 VALID_ROLES = ("viewer", "operator", "editor", "admin")
 
+# Columns returned to callers; the key hash never leaves this module
+_PUBLIC_COLUMNS = "id, key_prefix, label, role, created_at, updated_at"
+
 
 def generate_api_key() -> str:
     """Generate a cryptographically secure 64-character hex API key."""
     return secrets.token_hex(32)
 
 
-# Cache for has_any_keys() — avoids a DB query on every request.
-# TTL of 5 seconds: after a key is created, it takes at most 5s for auth to kick in.
-_has_any_keys_cache: dict = {}  # {"result": bool, "ts": float}
-_has_any_keys_lock = threading.Lock()
-_HAS_ANY_KEYS_TTL = 5.0
+# HMAC key derived from SECRET_KEY, computed on first use
+_derived_hash_secret: Optional[bytes] = None
 
 
-def has_any_keys() -> bool:
-    """Check if any API keys exist in the database. Cached with 5s TTL."""
+def _hash_secret() -> bytes:
+    """HMAC key for API-key hashes: ``API_KEY_HASH_SECRET``, else derived from SECRET_KEY.
+
+    Deriving it from the per-install secret keeps installs that never set
+    ``AGENTED_API_KEY_HASH_SECRET`` from sharing a public hashing key.
+    """
+    global _derived_hash_secret
+    if app_config.API_KEY_HASH_SECRET:
+        return app_config.API_KEY_HASH_SECRET.encode()
+    if _derived_hash_secret is None:
+        from app import _get_secret_key
+
+        _derived_hash_secret = hmac.new(
+            _get_secret_key().encode(), b"agented-api-key-hash", hashlib.sha256
+        ).digest()
+    return _derived_hash_secret
+
+
+def hash_api_key(api_key: str) -> str:
+    """Return the keyed hash stored for ``api_key`` (HMAC-SHA256, hex)."""
+    return hmac.new(_hash_secret(), api_key.encode(), hashlib.sha256).hexdigest()
+
+
+def api_key_prefix(api_key: str) -> str:
+    """Short, non-secret prefix kept for display (never more than a third of the key)."""
+    return api_key[: min(8, len(api_key) // 3)]
+
+
+# key_hash -> role for every stored key, so request auth is a dict lookup.
+# Cleared by every mutation in this module; the TTL bounds how long changes made
+# by another process (or direct SQL) take to apply.
+_key_roles_cache: dict = {}  # {"roles": {key_hash: role}, "ts": float}
+_key_roles_lock = threading.Lock()
+_key_roles_generation = 0
+_KEY_ROLES_TTL = 5.0
+
+
+def _get_key_roles() -> Dict[str, str]:
+    """Return the cached key_hash -> role map, loading it if stale."""
+    global _key_roles_generation
     now = time.monotonic()
-    with _has_any_keys_lock:
-        cached = _has_any_keys_cache.get("result")
-        ts = _has_any_keys_cache.get("ts", 0.0)
-        if cached is not None and (now - ts) < _HAS_ANY_KEYS_TTL:
-            return cached
-    result = count_user_roles() > 0
-    with _has_any_keys_lock:
-        _has_any_keys_cache["result"] = result
-        _has_any_keys_cache["ts"] = now
-    return result
+    with _key_roles_lock:
+        roles = _key_roles_cache.get("roles")
+        if roles is not None and (now - _key_roles_cache["ts"]) < _KEY_ROLES_TTL:
+            return roles
+        generation = _key_roles_generation
+    with get_connection() as conn:
+        rows = conn.execute("SELECT key_hash, role FROM user_roles").fetchall()
+    roles = {key_hash: role for key_hash, role in rows}
+    with _key_roles_lock:
+        # Don't cache a snapshot that a concurrent mutation already made stale
+        if generation == _key_roles_generation:
+            _key_roles_cache["roles"] = roles
+            _key_roles_cache["ts"] = now
+    return roles
+
+
+def has_any_keys() -> bool:
+    """Check if any API keys exist in the database (served from the key cache)."""
+    return bool(_get_key_roles())
 
 
 def invalidate_key_cache():
-    """Clear the has_any_keys cache (call after creating/deleting keys)."""
-    with _has_any_keys_lock:
-        _has_any_keys_cache.clear()
+    """Clear the key -> role cache (call after creating, updating or deleting keys)."""
+    global _key_roles_generation
+    with _key_roles_lock:
+        _key_roles_cache.clear()
+        _key_roles_generation += 1
+
+
+def insert_user_role(conn, api_key: str, label: str, role: str) -> str:
+    """Insert a role row for ``api_key`` on an open connection (caller commits).
+
+    Only the key's hash and display prefix are stored. Returns the new role ID.
+    """
+    role_id = _get_unique_role_id(conn)
+    conn.execute(
+        """INSERT INTO user_roles (id, key_hash, key_prefix, label, role)
+           VALUES (?, ?, ?, ?, ?)""",
+        (role_id, hash_api_key(api_key), api_key_prefix(api_key), label, role),
+    )
+    return role_id
 
 
 def create_user_role(api_key: str, label: str, role: str = "viewer") -> Optional[str]:
@@ -68,12 +135,7 @@ def create_user_role(api_key: str, label: str, role: str = "viewer") -> Optional
 
     try:
         with get_connection() as conn:
-            role_id = _get_unique_role_id(conn)
-            conn.execute(
-                """INSERT INTO user_roles (id, api_key, label, role)
-                   VALUES (?, ?, ?, ?)""",
-                (role_id, api_key, label, role),
-            )
+            role_id = insert_user_role(conn, api_key, label, role)
             conn.commit()
             invalidate_key_cache()
             return role_id
@@ -83,17 +145,18 @@ def create_user_role(api_key: str, label: str, role: str = "viewer") -> Optional
 
 
 def get_role_for_api_key(api_key: str) -> Optional[str]:
-    """Look up the role string for a given API key using constant-time comparison.
+    """Look up the role string for a given API key.
+
+    The key is hashed and looked up in the cached hash -> role map. Comparing
+    keyed digests leaks nothing useful about the stored keys, so no
+    constant-time scan is needed.
 
     Returns:
         The role string (e.g. 'admin'), or None if not found.
     """
-    with get_connection() as conn:
-        rows = conn.execute("SELECT api_key, role FROM user_roles").fetchall()
-        for row_key, role in rows:
-            if hmac.compare_digest(api_key, row_key):
-                return role
+    if not api_key:
         return None
+    return _get_key_roles().get(hash_api_key(api_key))
 
 
 def get_user_role(role_id: str) -> Optional[dict]:
@@ -104,7 +167,9 @@ def get_user_role(role_id: str) -> Optional[dict]:
     """
     with get_connection() as conn:
         conn.row_factory = _dict_factory
-        row = conn.execute("SELECT * FROM user_roles WHERE id = ?", (role_id,)).fetchone()
+        row = conn.execute(
+            f"SELECT {_PUBLIC_COLUMNS} FROM user_roles WHERE id = ?", (role_id,)
+        ).fetchone()
         conn.row_factory = None
         return row
 
@@ -117,7 +182,9 @@ def list_user_roles() -> list:
     """
     with get_connection() as conn:
         conn.row_factory = _dict_factory
-        rows = conn.execute("SELECT * FROM user_roles ORDER BY created_at DESC").fetchall()
+        rows = conn.execute(
+            f"SELECT {_PUBLIC_COLUMNS} FROM user_roles ORDER BY created_at DESC"
+        ).fetchall()
         conn.row_factory = None
         return rows
 
@@ -158,6 +225,7 @@ def update_user_role(role_id: str, label: Optional[str] = None, role: Optional[s
             params,
         )
         conn.commit()
+        invalidate_key_cache()
         return cursor.rowcount > 0
 
 
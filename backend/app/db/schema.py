@@ -149,6 +149,59 @@ def create_fresh_schema(conn):
         END
     """)
 
+    # --- Daily execution counts per trigger, kept in sync by triggers on execution_logs ---
+    # day is the date part of started_at; executions without a trigger count under ''
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS execution_daily_stats (
+            trigger_id TEXT NOT NULL,
+            day TEXT NOT NULL,
+            trigger_type TEXT NOT NULL,
+            status TEXT NOT NULL,
+            runs INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (trigger_id, day, trigger_type, status)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_execution_daily_stats_day ON execution_daily_stats(day)"
+    )
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS execution_logs_daily_stats_insert
+        AFTER INSERT ON execution_logs
+        BEGIN
+            INSERT INTO execution_daily_stats (trigger_id, day, trigger_type, status, runs)
+            VALUES (COALESCE(new.trigger_id, ''), substr(new.started_at, 1, 10),
+                    new.trigger_type, new.status, 1)
+            ON CONFLICT (trigger_id, day, trigger_type, status) DO UPDATE SET runs = runs + 1;
+        END
+    """)
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS execution_logs_daily_stats_update
+        AFTER UPDATE OF trigger_id, trigger_type, started_at, status ON execution_logs
+        WHEN old.trigger_id IS NOT new.trigger_id OR old.trigger_type IS NOT new.trigger_type
+          OR old.started_at IS NOT new.started_at OR old.status IS NOT new.status
+        BEGIN
+            UPDATE execution_daily_stats SET runs = runs - 1
+            WHERE trigger_id = COALESCE(old.trigger_id, '') AND day = substr(old.started_at, 1, 10)
+              AND trigger_type = old.trigger_type AND status = old.status;
+            INSERT INTO execution_daily_stats (trigger_id, day, trigger_type, status, runs)
+            VALUES (COALESCE(new.trigger_id, ''), substr(new.started_at, 1, 10),
+                    new.trigger_type, new.status, 1)
+            ON CONFLICT (trigger_id, day, trigger_type, status) DO UPDATE SET runs = runs + 1;
+        END
+    """)
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS execution_logs_daily_stats_delete
+        AFTER DELETE ON execution_logs
+        BEGIN
+            UPDATE execution_daily_stats SET runs = runs - 1
+            WHERE trigger_id = COALESCE(old.trigger_id, '') AND day = substr(old.started_at, 1, 10)
+              AND trigger_type = old.trigger_type AND status = old.status;
+        END
+    """)
+
     # Prompt snippets (reusable prompt fragments for {{snippet}} resolution)
     conn.execute("""
         CREATE TABLE IF NOT EXISTS prompt_snippets (
@@ -1418,6 +1471,41 @@ def create_fresh_schema(conn):
         "CREATE INDEX IF NOT EXISTS idx_health_alerts_created ON health_alerts(created_at)"
     )
 
+    # --- Per-trigger rolling health stats (updated as executions finish) ---
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS trigger_health_stats (
+            trigger_id TEXT PRIMARY KEY,
+            total_runs INTEGER NOT NULL DEFAULT 0,
+            consecutive_failures INTEGER NOT NULL DEFAULT 0,
+            last_status TEXT,
+            last_duration_ms INTEGER,
+            baseline_duration_ms REAL,
+            ewma_duration_ms REAL,
+            duration_samples INTEGER NOT NULL DEFAULT 0,
+            last_finished_at TEXT,
+            updated_at TEXT DEFAULT (datetime('now')),
+            FOREIGN KEY (trigger_id) REFERENCES triggers(id) ON DELETE CASCADE
+        )
+    """)
+
+    # --- Per-bot SLA: hourly run counts and latency quantile sketches ---
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS bot_sla_buckets (
+            trigger_id TEXT NOT NULL,
+            bucket_start TEXT NOT NULL,
+            total_runs INTEGER NOT NULL DEFAULT 0,
+            success_runs INTEGER NOT NULL DEFAULT 0,
+            failed_runs INTEGER NOT NULL DEFAULT 0,
+            duration_sketch TEXT,
+            queue_wait_sketch TEXT,
+            PRIMARY KEY (trigger_id, bucket_start),
+            FOREIGN KEY (trigger_id) REFERENCES triggers(id) ON DELETE CASCADE
+        )
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_bot_sla_buckets_start ON bot_sla_buckets(bucket_start)"
+    )
+
     # --- Webhook deduplication keys ---
     conn.execute("""
         CREATE TABLE IF NOT EXISTS webhook_dedup_keys (
@@ -1431,11 +1519,13 @@ def create_fresh_schema(conn):
         "CREATE INDEX IF NOT EXISTS idx_webhook_dedup_created ON webhook_dedup_keys(created_at)"
     )
 
-    # user_roles -- RBAC role assignments mapped to API keys
+    # user_roles -- RBAC role assignments mapped to API keys (stored as keyed hashes;
+    # the UNIQUE constraint indexes key_hash)
     conn.execute("""
         CREATE TABLE IF NOT EXISTS user_roles (
             id TEXT PRIMARY KEY,
-            api_key TEXT NOT NULL UNIQUE,
+            key_hash TEXT NOT NULL UNIQUE,
+            key_prefix TEXT NOT NULL DEFAULT '',
             label TEXT NOT NULL DEFAULT '',
             role TEXT NOT NULL DEFAULT 'viewer'
                 CHECK(role IN ('viewer', 'operator', 'editor', 'admin')),
@@ -1443,7 +1533,6 @@ def create_fresh_schema(conn):
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """)
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_user_roles_api_key ON user_roles(api_key)")
 
     # audit_events -- persistent audit trail for all configuration changes
     conn.execute("""
@@ -1530,6 +1619,8 @@ def create_fresh_schema(conn):
             poll_interval_seconds INTEGER DEFAULT 60,
             last_sync_at TIMESTAMP,
             last_commit_sha TEXT,
+            pending_files TEXT,
+            last_full_sync_at TIMESTAMP,
             enabled INTEGER DEFAULT 1,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
@@ -1624,6 +1715,10 @@ def create_fresh_schema(conn):
         "CREATE INDEX IF NOT EXISTS idx_conv_msg_conv_branch "
         "ON conversation_messages(conversation_id, branch_id)"
     )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_conv_msg_branch_index "
+        "ON conversation_messages(branch_id, message_index)"
+    )
 
     # Conversation branches (EXE-04: ContextBranch paper arXiv:2512.13914)
     conn.execute("""
@@ -1632,8 +1727,11 @@ def create_fresh_schema(conn):
             conversation_id TEXT NOT NULL,
             parent_branch_id TEXT,
             fork_message_id TEXT,
+            fork_index INTEGER,
             name TEXT,
             status TEXT DEFAULT 'active',
+            message_count INTEGER NOT NULL DEFAULT 0,
+            diverged_index INTEGER,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (conversation_id) REFERENCES agent_conversations(id) ON DELETE CASCADE
         )
@@ -1669,6 +1767,7 @@ def create_fresh_schema(conn):
             bot_output TEXT,
             token_count INTEGER DEFAULT 0,
             status TEXT DEFAULT 'pending',
+            cached INTEGER DEFAULT 0,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             completed_at TIMESTAMP,
             FOREIGN KEY (chunked_execution_id) REFERENCES chunked_executions(id) ON DELETE CASCADE
@@ -1678,6 +1777,24 @@ def create_fresh_schema(conn):
         "CREATE INDEX IF NOT EXISTS idx_chunk_results_exec ON chunk_results(chunked_execution_id)"
     )
 
+    # Chunk result cache (bot output reuse keyed by bot, prompt hash, chunk hash)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS chunk_result_cache (
+            bot_id TEXT NOT NULL,
+            prompt_hash TEXT NOT NULL,
+            chunk_hash TEXT NOT NULL,
+            bot_output TEXT NOT NULL,
+            token_count INTEGER DEFAULT 0,
+            created_at TEXT NOT NULL DEFAULT (datetime('now')),
+            expires_at TEXT NOT NULL,
+            PRIMARY KEY (bot_id, prompt_hash, chunk_hash)
+        )
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_chunk_result_cache_expires "
+        "ON chunk_result_cache(expires_at)"
+    )
+
     # Viewer comments (EXE-05: inline comments on execution log lines)
     conn.execute("""
         CREATE TABLE IF NOT EXISTS viewer_comments (
@@ -1729,7 +1846,9 @@ def create_fresh_schema(conn):
             priority INTEGER DEFAULT 0,
             created_at TEXT NOT NULL,
             dispatched_at TEXT,
-            completed_at TEXT
+            completed_at TEXT,
+            not_before TEXT,
+            attempt INTEGER DEFAULT 0
         )
     """)
     conn.execute("CREATE INDEX IF NOT EXISTS idx_eq_status ON execution_queue(status)")
@@ -1739,6 +1858,9 @@ def create_fresh_schema(conn):
     conn.execute(
         "CREATE INDEX IF NOT EXISTS idx_eq_priority_created ON execution_queue(priority DESC, created_at ASC)"
     )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_eq_status_not_before ON execution_queue(status, not_before)"
+    )
 
     # --- v0.2.0: Circuit breakers (per-backend resilience) ---
     conn.execute("""
@@ -2174,6 +2296,7 @@ def create_fresh_schema(conn):
             importance_score REAL DEFAULT 0.5,
             first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_decayed_at TIMESTAMP,
             UNIQUE(agent_id, name, entity_type)
         )
     """)
@@ -2199,6 +2322,10 @@ def create_fresh_schema(conn):
     conn.execute("CREATE INDEX IF NOT EXISTS idx_kg_relations_source ON kg_relations(source_id)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_kg_relations_target ON kg_relations(target_id)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_kg_relations_agent ON kg_relations(agent_id)")
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_kg_relations_unique "
+        "ON kg_relations(agent_id, source_id, target_id, relation_type)"
+    )
 
     # --- Memory consolidation log ---
     conn.execute("""
@@ -70,6 +70,16 @@ def list_secrets(scope: Optional[str] = None) -> list:
         return rows
 
 
+def get_secret_values(scope: str) -> list:
+    """Return id, name and encrypted_value of every secret in a scope, in one query."""
+    with get_connection() as conn:
+        conn.row_factory = _dict_factory
+        return conn.execute(
+            "SELECT id, name, encrypted_value FROM secrets WHERE scope = ? ORDER BY name",
+            (scope,),
+        ).fetchall()
+
+
 def update_secret(
     secret_id: str,
     encrypted_value: Optional[str] = None,
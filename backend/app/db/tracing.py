@@ -282,6 +282,38 @@ def update_span(
     return get_span(span_id)
 
 
+def insert_trace_batch(traces: list[dict], spans: list[dict]) -> None:
+    """Write finished traces and their spans in one transaction.
+
+    Rows are complete (timestamps, durations, final status), so each is a
+    single INSERT. ``spans`` must list parents before their children.
+    """
+    if not traces and not spans:
+        return
+    with get_connection() as conn:
+        conn.executemany(
+            """INSERT INTO traces (id, name, entity_type, entity_id, execution_id, status,
+                   metadata, error_message, duration_ms, started_at, finished_at)
+               VALUES (:id, :name, :entity_type, :entity_id, :execution_id, :status,
+                   :metadata, :error_message, :duration_ms, :started_at, :finished_at)""",
+            [
+                {**t, "metadata": json.dumps(t["metadata"]) if t.get("metadata") else None}
+                for t in traces
+            ],
+        )
+        conn.executemany(
+            """INSERT INTO trace_spans (id, trace_id, parent_span_id, name, span_type, status,
+                   attributes, error_message, duration_ms, started_at, finished_at)
+               VALUES (:id, :trace_id, :parent_span_id, :name, :span_type, :status,
+                   :attributes, :error_message, :duration_ms, :started_at, :finished_at)""",
+            [
+                {**s, "attributes": json.dumps(s["attributes"]) if s.get("attributes") else None}
+                for s in spans
+            ],
+        )
+        conn.commit()
+
+
 # --- Statistics ---
 
 
@@ -0,0 +1,96 @@
+"""Per-trigger rolling health statistics.
+
+One row per trigger, updated incrementally as each execution finishes, so the
+HealthMonitorService can evaluate every trigger from a single small table
+instead of re-reading recent execution logs (and their output blobs).
+"""
+
+import logging
+from typing import List, Optional
+
+from .connection import get_connection
+
+logger = logging.getLogger(__name__)
+
+# Smoothing factor for the duration EWMA (~ a 20-run window)
+DURATION_EWMA_ALPHA = 0.1
+
+# The new run's values arrive as excluded.*; baseline_duration_ms keeps the
+# EWMA from *before* this run so "latest vs. typical" compares like with like.
+_RECORD_SQL = """
+    INSERT INTO trigger_health_stats
+        (trigger_id, total_runs, consecutive_failures, last_status, last_duration_ms,
+         baseline_duration_ms, ewma_duration_ms, duration_samples, last_finished_at,
+         updated_at)
+    VALUES (
+        :trigger_id, 1, CASE WHEN :status = 'failed' THEN 1 ELSE 0 END, :status, :duration_ms,
+        NULL, CASE WHEN :duration_ms > 0 THEN :duration_ms END,
+        CASE WHEN :duration_ms > 0 THEN 1 ELSE 0 END, :finished_at,
+        datetime('now')
+    )
+    ON CONFLICT(trigger_id) DO UPDATE SET
+        total_runs = trigger_health_stats.total_runs + 1,
+        consecutive_failures = CASE
+            WHEN excluded.last_status = 'failed' THEN trigger_health_stats.consecutive_failures + 1
+            ELSE 0
+        END,
+        last_status = excluded.last_status,
+        last_duration_ms = excluded.last_duration_ms,
+        baseline_duration_ms = trigger_health_stats.ewma_duration_ms,
+        ewma_duration_ms = CASE
+            WHEN COALESCE(excluded.last_duration_ms, 0) <= 0
+                THEN trigger_health_stats.ewma_duration_ms
+            WHEN trigger_health_stats.ewma_duration_ms IS NULL THEN excluded.last_duration_ms
+            ELSE :alpha * excluded.last_duration_ms
+                 + (1 - :alpha) * trigger_health_stats.ewma_duration_ms
+        END,
+        duration_samples = trigger_health_stats.duration_samples
+            + CASE WHEN excluded.last_duration_ms > 0 THEN 1 ELSE 0 END,
+        last_finished_at = COALESCE(
+            excluded.last_finished_at, trigger_health_stats.last_finished_at
+        ),
+        updated_at = datetime('now')
+    RETURNING *
+"""
+
+
+def record_execution_outcome(
+    trigger_id: str,
+    status: str,
+    duration_ms: Optional[int] = None,
+    finished_at: Optional[str] = None,
+) -> Optional[dict]:
+    """Fold one finished execution into the trigger's rolling stats.
+
+    Returns the updated stats row, or None if the trigger no longer exists.
+    """
+    params = {
+        "trigger_id": trigger_id,
+        "status": status,
+        "duration_ms": duration_ms,
+        "finished_at": finished_at,
+        "alpha": DURATION_EWMA_ALPHA,
+    }
+    with get_connection() as conn:
+        exists = conn.execute("SELECT 1 FROM triggers WHERE id = ?", (trigger_id,)).fetchone()
+        if not exists:
+            return None
+        row = conn.execute(_RECORD_SQL, params).fetchone()
+        conn.commit()
+        return dict(row) if row else None
+
+
+def get_trigger_health_stats(trigger_id: str) -> Optional[dict]:
+    """Get rolling health stats for one trigger."""
+    with get_connection() as conn:
+        row = conn.execute(
+            "SELECT * FROM trigger_health_stats WHERE trigger_id = ?", (trigger_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+
+def get_all_trigger_health_stats() -> List[dict]:
+    """Get rolling health stats for every trigger that has finished a run."""
+    with get_connection() as conn:
+        cursor = conn.execute("SELECT * FROM trigger_health_stats ORDER BY trigger_id")
+        return [dict(row) for row in cursor.fetchall()]
@@ -11,7 +11,7 @@ import logging
 import os
 import re
 import sqlite3
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import app.config as config
 
@@ -171,7 +171,7 @@ PREDEFINED_TRIGGER = PREDEFINED_TRIGGERS[0]
 # =============================================================================
 
 
-def create_trigger(
+def trigger_row(
     name: str,
     prompt_template: str,
     backend_type: str = "claude",
@@ -195,8 +195,8 @@ def create_trigger(
     sigterm_grace_seconds: int = None,
     dispatch_type: str = "bot",
     super_agent_id: str = None,
-) -> Optional[str]:
-    """Add a new trigger. Returns trigger_id (string) on success, None on failure."""
+) -> dict:
+    """Build the column values for a new trigger, applying the create defaults."""
     if backend_type not in VALID_BACKENDS:
         logger.warning(
             "Invalid backend_type %r for trigger %r; falling back to 'claude'. Valid values: %s",
@@ -229,44 +229,92 @@ def create_trigger(
         )
         execution_mode = "direct"
 
+    return {
+        "name": name,
+        "prompt_template": prompt_template,
+        "backend_type": backend_type,
+        "trigger_source": trigger_source,
+        "match_field_path": match_field_path,
+        "match_field_value": match_field_value,
+        "text_field_path": text_field_path,
+        "detection_keyword": detection_keyword,
+        "group_id": group_id,
+        "schedule_type": schedule_type,
+        "schedule_time": schedule_time,
+        "schedule_day": schedule_day,
+        "schedule_timezone": schedule_timezone,
+        "skill_command": skill_command,
+        "model": model,
+        "execution_mode": execution_mode,
+        "team_id": team_id,
+        "timeout_seconds": timeout_seconds,
+        "webhook_secret": webhook_secret,
+        "allowed_tools": allowed_tools,
+        "sigterm_grace_seconds": sigterm_grace_seconds,
+        "dispatch_type": dispatch_type,
+        "super_agent_id": super_agent_id,
+    }
+
+
+def create_trigger(
+    name: str,
+    prompt_template: str,
+    backend_type: str = "claude",
+    trigger_source: str = "webhook",
+    match_field_path: str = None,
+    match_field_value: str = None,
+    text_field_path: str = "text",
+    detection_keyword: str = "",
+    group_id: int = 0,  # Deprecated, kept for backward compatibility
+    schedule_type: str = None,
+    schedule_time: str = None,
+    schedule_day: int = None,
+    schedule_timezone: str = "Asia/Seoul",
+    skill_command: str = None,
+    model: str = None,
+    execution_mode: str = "direct",
+    team_id: str = None,
+    timeout_seconds: int = None,
+    webhook_secret: str = None,
+    allowed_tools: str = None,
+    sigterm_grace_seconds: int = None,
+    dispatch_type: str = "bot",
+    super_agent_id: str = None,
+) -> Optional[str]:
+    """Add a new trigger. Returns trigger_id (string) on success, None on failure."""
+    row = trigger_row(
+        name=name,
+        prompt_template=prompt_template,
+        backend_type=backend_type,
+        trigger_source=trigger_source,
+        match_field_path=match_field_path,
+        match_field_value=match_field_value,
+        text_field_path=text_field_path,
+        detection_keyword=detection_keyword,
+        group_id=group_id,
+        schedule_type=schedule_type,
+        schedule_time=schedule_time,
+        schedule_day=schedule_day,
+        schedule_timezone=schedule_timezone,
+        skill_command=skill_command,
+        model=model,
+        execution_mode=execution_mode,
+        team_id=team_id,
+        timeout_seconds=timeout_seconds,
+        webhook_secret=webhook_secret,
+        allowed_tools=allowed_tools,
+        sigterm_grace_seconds=sigterm_grace_seconds,
+        dispatch_type=dispatch_type,
+        super_agent_id=super_agent_id,
+    )
+
     with get_connection() as conn:
         try:
             trigger_id = _get_unique_trigger_id(conn)
             conn.execute(
-                """
-                INSERT INTO triggers (id, name, group_id, detection_keyword, prompt_template, backend_type, trigger_source,
-                                      match_field_path, match_field_value, text_field_path,
-                                      schedule_type, schedule_time, schedule_day, schedule_timezone, skill_command, model,
-                                      execution_mode, team_id, timeout_seconds, webhook_secret, allowed_tools,
-                                      sigterm_grace_seconds, dispatch_type, super_agent_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    trigger_id,
-                    name,
-                    group_id,
-                    detection_keyword,
-                    prompt_template,
-                    backend_type,
-                    trigger_source,
-                    match_field_path,
-                    match_field_value,
-                    text_field_path,
-                    schedule_type,
-                    schedule_time,
-                    schedule_day,
-                    schedule_timezone,
-                    skill_command,
-                    model,
-                    execution_mode,
-                    team_id,
-                    timeout_seconds,
-                    webhook_secret,
-                    allowed_tools,
-                    sigterm_grace_seconds,
-                    dispatch_type,
-                    super_agent_id,
-                ),
+                f"INSERT INTO triggers (id, {', '.join(row)}) "
+                f"VALUES ({', '.join('?' * (len(row) + 1))})",
+                (trigger_id, *row.values()),
             )
             conn.commit()
             return trigger_id
@@ -274,8 +322,7 @@ def create_trigger(
             return None
 
 
-def update_trigger(
-    trigger_id: str,
+def trigger_update_clauses(
     name: str = None,
     group_id: int = None,  # Deprecated
     detection_keyword: str = None,
@@ -300,8 +347,8 @@ def update_trigger(
     sigterm_grace_seconds: int = None,
     dispatch_type: str = None,
     super_agent_id: str = None,
-) -> bool:
-    """Update trigger fields. Returns True on success."""
+) -> Tuple[List[str], list]:
+    """Build the SET expressions and values for a trigger update."""
     updates = []
     values = []
 
@@ -420,6 +467,63 @@ def update_trigger(
             updates.append("super_agent_id = ?")
             values.append(super_agent_id)
 
+    return updates, values
+
+
+def update_trigger(
+    trigger_id: str,
+    name: str = None,
+    group_id: int = None,  # Deprecated
+    detection_keyword: str = None,
+    prompt_template: str = None,
+    backend_type: str = None,
+    trigger_source: str = None,
+    match_field_path: str = None,
+    match_field_value: str = None,
+    text_field_path: str = None,
+    enabled: int = None,
+    schedule_type: str = None,
+    schedule_time: str = None,
+    schedule_day: int = None,
+    schedule_timezone: str = None,
+    skill_command: str = None,
+    model: str = None,
+    execution_mode: str = None,
+    team_id: str = None,
+    timeout_seconds: int = None,
+    webhook_secret: str = None,
+    allowed_tools: str = None,
+    sigterm_grace_seconds: int = None,
+    dispatch_type: str = None,
+    super_agent_id: str = None,
+) -> bool:
+    """Update trigger fields. Returns True on success."""
+    updates, values = trigger_update_clauses(
+        name=name,
+        group_id=group_id,
+        detection_keyword=detection_keyword,
+        prompt_template=prompt_template,
+        backend_type=backend_type,
+        trigger_source=trigger_source,
+        match_field_path=match_field_path,
+        match_field_value=match_field_value,
+        text_field_path=text_field_path,
+        enabled=enabled,
+        schedule_type=schedule_type,
+        schedule_time=schedule_time,
+        schedule_day=schedule_day,
+        schedule_timezone=schedule_timezone,
+        skill_command=skill_command,
+        model=model,
+        execution_mode=execution_mode,
+        team_id=team_id,
+        timeout_seconds=timeout_seconds,
+        webhook_secret=webhook_secret,
+        allowed_tools=allowed_tools,
+        sigterm_grace_seconds=sigterm_grace_seconds,
+        dispatch_type=dispatch_type,
+        super_agent_id=super_agent_id,
+    )
     if not updates:
         return False
 
@@ -56,6 +56,11 @@ class KGEntityPath(BaseModel):
 class KGGraphQuery(BaseModel):
     seed: str = Field(..., description="Seed entity name for graph traversal")
     hops: int = Field(1, ge=1, le=3, description="Traversal depth")
+    max_nodes: Optional[int] = Field(None, ge=1, description="Cap on returned entities")
+    max_edges: Optional[int] = Field(None, ge=1, description="Cap on returned relations")
+    min_importance: float = Field(
+        0.0, ge=0.0, le=1.0, description="Skip neighbours below this importance score"
+    )
 
 
 class KGStatsResponse(BaseModel):
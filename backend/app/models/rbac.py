@@ -40,7 +40,7 @@ class UserRoleResponse(BaseModel):
     """Response model for a user role record."""
 
     id: str
-    api_key: str
+    key_prefix: str = Field("", description="Leading characters of the key (it is stored hashed)")
     label: str
     role: str
     created_at: Optional[str] = None
@@ -1,14 +1,16 @@
-"""Stub endpoints for bot SLA & uptime tracking."""
+"""Bot SLA & uptime API endpoints."""
 
 from http import HTTPStatus
 
 from flask_openapi3 import APIBlueprint, Tag
 
+from ..services.bot_sla_service import BotSlaService
+
 tag = Tag(name="bot-sla", description="Bot SLA & uptime tracking")
 bot_sla_bp = APIBlueprint("bot_sla", __name__, url_prefix="/admin", abp_tags=[tag])
 
 
 @bot_sla_bp.get("/bots/sla")
 def get_bot_sla():
-    """Stub: bot SLA and uptime entries."""
-    return {"entries": []}, HTTPStatus.OK
+    """Per-bot uptime, success rate and duration/queue-wait percentiles (7d and 30d)."""
+    return {"entries": BotSlaService.get_sla_entries()}, HTTPStatus.OK
@@ -74,9 +74,11 @@ def _handle_bulk(entity_type: str):
     succeeded = sum(1 for r in results if r["success"])
     failed = sum(1 for r in results if not r["success"])
 
+    # Batches are all-or-nothing: any failure means nothing was written
     return {
         "results": results,
         "total": len(results),
         "succeeded": succeeded,
         "failed": failed,
+        "committed": failed == 0,
     }, HTTPStatus.OK
@@ -1,15 +1,21 @@
 """Chunked bot execution API endpoints with merge/dedup.
 
 Splits large content into chunks, dispatches per-chunk bot invocations
-in background threads, and serves merged/deduplicated results.
+to a small background worker pool, and serves merged/deduplicated results.
 
 Per 08-RESEARCH.md Anti-Pattern: Never process chunks sequentially in
-the request thread -- background threads with Semaphore(3) concurrency.
+the request thread -- chunks run on a fixed pool of 3 workers fed by a
+bounded backlog. Chunk outputs are cached by (bot, prompt hash, normalized
+chunk hash), so re-running an audit after a small edit only sends the
+changed chunks to the AI backend.
 """
 
 import logging
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
+from typing import Optional
 
 from flask import request
 from flask_openapi3 import APIBlueprint, Tag
@@ -20,13 +26,16 @@ from app.models.common import error_response
 from ..db.chunk_results import (
     create_chunk_result,
     create_chunked_execution,
+    delete_expired_chunk_cache,
+    get_cached_chunk_outputs,
     get_chunk_results,
     get_chunked_execution,
     increment_completed_chunks,
+    put_cached_chunk_output,
     update_chunk_result,
     update_chunked_execution_status,
 )
-from ..db.triggers import get_trigger
+from ..db.triggers import get_execution_log, get_trigger
 from ..services.chunk_service import ChunkService
 
 logger = logging.getLogger(__name__)
@@ -34,8 +43,16 @@ logger = logging.getLogger(__name__)
 tag = Tag(name="chunks", description="Chunked bot execution with merge/dedup")
 chunks_bp = APIBlueprint("chunks", __name__, url_prefix="/admin", abp_tags=[tag])
 
-# Semaphore to limit concurrent chunk invocations (avoid overwhelming AI backend)
-_chunk_semaphore = threading.Semaphore(3)
+# Concurrent chunk invocations (avoid overwhelming AI backend)
+_CHUNK_WORKERS = 3
+# Cap on chunk jobs queued or running across all chunked executions
+_MAX_QUEUED_CHUNKS = 200
+# Max seconds to wait for a single chunk's bot execution
+_CHUNK_EXECUTION_TIMEOUT = 120
+
+_chunk_executor: Optional[ThreadPoolExecutor] = None
+_chunk_queue_lock = threading.Lock()
+_queued_chunks = 0
 
 
 class BotPath(BaseModel):
@@ -46,72 +63,114 @@ class ChunkedExecutionPath(BaseModel):
     chunked_execution_id: str = Field(..., description="Chunked execution ID")
 
 
+def _reserve_chunk_slots(count: int) -> bool:
+    """Reserve backlog capacity for ``count`` chunk jobs. Returns False if full."""
+    global _queued_chunks
+    with _chunk_queue_lock:
+        if _queued_chunks + count > _MAX_QUEUED_CHUNKS:
+            return False
+        _queued_chunks += count
+        return True
+
+
+def _release_chunk_slot() -> None:
+    global _queued_chunks
+    with _chunk_queue_lock:
+        _queued_chunks = max(0, _queued_chunks - 1)
+
+
+def _get_chunk_executor() -> ThreadPoolExecutor:
+    global _chunk_executor
+    with _chunk_queue_lock:
+        if _chunk_executor is None:
+            _chunk_executor = ThreadPoolExecutor(
+                max_workers=_CHUNK_WORKERS, thread_name_prefix="chunk-worker"
+            )
+        return _chunk_executor
+
+
+def _run_bot_on_chunk(bot: dict, chunk_content: str) -> tuple[str, int, bool]:
+    """Run the bot against one chunk and wait for it to finish.
+
+    Returns ``(bot_output, token_count, succeeded)``. Only successful runs with
+    output are eligible for the result cache.
+    """
+    from ..services.execution_log_service import ExecutionLogService
+    from ..services.execution_service import ExecutionService, ExecutionState
+
+    token_count = len(chunk_content) // 4  # Rough estimate until the log reports usage
+    execution_id = ExecutionService.run_trigger(
+        trigger=bot,
+        message_text=chunk_content,
+        trigger_type="manual",
+    )
+    if not execution_id:
+        return "", token_count, False
+
+    deadline = time.monotonic() + _CHUNK_EXECUTION_TIMEOUT
+    while ExecutionLogService.is_running(execution_id):
+        if time.monotonic() >= deadline:
+            return "", token_count, False
+        time.sleep(1)
+
+    log = get_execution_log(execution_id)
+    if not log:
+        return "", token_count, False
+    tokens = (log.get("input_tokens") or 0) + (log.get("output_tokens") or 0)
+    output = log.get("stdout_log") or ""
+    succeeded = log.get("status") == ExecutionState.SUCCESS and bool(output.strip())
+    return output, tokens or token_count, succeeded
+
+
 def _process_chunk(
     chunked_execution_id: str,
-    chunk_result_id: str,
+    chunk_result_ids: list[str],
     chunk_content: str,
     total_chunks: int,
     bot_id: str,
+    prompt_hash: str,
+    chunk_hash: str,
 ):
-    """Process a single chunk in a background thread.
+    """Process one unique chunk on a pool worker.
 
-    Acquires the semaphore to limit concurrency. On completion, updates
-    the chunk result and checks if all chunks are done to trigger merge.
+    Identical chunks within an execution share a single bot run; every
+    chunk result in ``chunk_result_ids`` receives its output. Successful
+    outputs are written to the chunk result cache. On completion, checks
+    whether all chunks are done to trigger merge.
     """
     try:
-        with _chunk_semaphore:
-            # In a full implementation, this would invoke the bot via
-            # ExecutionService.run_trigger() with chunk_content as the
-            # prompt context. For now, we store the chunk as processed
-            # since the actual bot invocation depends on the specific
-            # bot configuration and CLI tool availability.
-            #
-            # The bot_output will be populated by the actual execution
-            # pipeline when integrated with ExecutionService.
-            bot_output = ""
-            token_count = len(chunk_content) // 4  # Rough estimate
-
-            try:
-                from ..services.execution_service import ExecutionService
-
-                bot = get_trigger(bot_id)
-                if bot:
-                    # Build a minimal prompt from chunk content
-                    execution_id = ExecutionService.run_trigger(
-                        trigger=bot,
-                        message_text=chunk_content,
-                        trigger_type="manual",
-                    )
-                    if execution_id:
-                        # Wait for execution to complete and get output
-                        import time
-
-                        for _ in range(120):  # 2 min max wait
-                            from ..services.execution_log_service import (
-                                ExecutionLogService,
-                            )
-
-                            if not ExecutionLogService.is_running(execution_id):
-                                log = ExecutionLogService.get_log(execution_id)
-                                if log:
-                                    bot_output = log.get("output", "")
-                                    token_count = log.get("token_count", token_count)
-                                break
-                            time.sleep(1)
-            except Exception as e:
-                logger.warning("Bot execution for chunk %s failed: %s", chunk_result_id, e)
-                bot_output = f"Error processing chunk: {e}"
-
-            # Update chunk result
+        try:
+            bot = get_trigger(bot_id)
+            if bot:
+                bot_output, token_count, succeeded = _run_bot_on_chunk(bot, chunk_content)
+            else:
+                bot_output, token_count, succeeded = "", 0, False
+        except Exception as e:
+            logger.warning("Bot execution for chunk %s failed: %s", chunk_hash[:12], e)
+            bot_output, token_count, succeeded = f"Error processing chunk: {e}", 0, False
+
+        if succeeded:
+            put_cached_chunk_output(
+                bot_id,
+                prompt_hash,
+                chunk_hash,
+                bot_output,
+                token_count,
+                ChunkService.CACHE_TTL_SECONDS,
+            )
+        for chunk_result_id in chunk_result_ids:
             update_chunk_result(chunk_result_id, bot_output, token_count)
 
     except Exception as e:
-        logger.error("Chunk processing error for %s: %s", chunk_result_id, e)
-        update_chunk_result(chunk_result_id, f"Error: {e}", 0, status="failed")
+        logger.error("Chunk processing error for %s: %s", chunk_result_ids, e)
+        for chunk_result_id in chunk_result_ids:
+            update_chunk_result(chunk_result_id, f"Error: {e}", 0, status="failed")
+    finally:
+        _release_chunk_slot()
 
     # Check if all chunks complete
     try:
-        completed = increment_completed_chunks(chunked_execution_id)
+        completed = increment_completed_chunks(chunked_execution_id, len(chunk_result_ids))
         if completed >= total_chunks:
             _finalize_chunked_execution(chunked_execution_id)
     except Exception as e:
@@ -161,8 +220,9 @@ def run_chunked(path: BotPath):
     """Run a bot against chunked content with merge/dedup.
 
     Splits content via ChunkService, creates DB records for tracking,
-    and dispatches per-chunk bot invocations in background threads.
-    Returns immediately with the chunked execution ID.
+    serves unchanged chunks from the result cache, and queues the rest
+    on the chunk worker pool. Returns immediately with the chunked
+    execution ID (429 if the chunk backlog is full).
     """
     bot = get_trigger(path.bot_id)
     if not bot:
@@ -177,40 +237,83 @@ def run_chunked(path: BotPath):
 
     max_chunk_chars = body.get("max_chunk_chars")
 
-    # Split content into chunks
+    # Split content into chunks and look up previously analysed chunk text
     chunks = ChunkService.chunk_code(content, max_chars=max_chunk_chars)
+    prompt_hash = ChunkService.prompt_hash(bot.get("prompt_template"))
+    chunk_hashes = [ChunkService.chunk_hash(chunk) for chunk in chunks]
+    try:
+        delete_expired_chunk_cache()
+        cached = get_cached_chunk_outputs(path.bot_id, prompt_hash, chunk_hashes)
+    except Exception as e:
+        logger.warning("Chunk cache lookup failed, running all chunks: %s", e)
+        cached = {}
+
+    misses = {h for h in chunk_hashes if h not in cached}
+    if misses and not _reserve_chunk_slots(len(misses)):
+        return error_response(
+            "TOO_MANY_REQUESTS",
+            "Chunk work queue is full, try again later",
+            HTTPStatus.TOO_MANY_REQUESTS,
+        )
 
     # Create chunked execution record
     chunked_execution_id = create_chunked_execution(path.bot_id, len(chunks))
     if not chunked_execution_id:
+        for _ in misses:
+            _release_chunk_slot()
         return error_response(
             "INTERNAL_SERVER_ERROR",
             "Failed to create chunked execution",
             HTTPStatus.INTERNAL_SERVER_ERROR,
         )
 
-    # Create chunk result records and spawn background threads
-    for idx, chunk_content in enumerate(chunks):
+    # Create chunk result records; cache hits complete immediately, and
+    # misses are grouped by hash so duplicate chunks run once
+    pending: dict[str, list[str]] = {}
+    first_content: dict[str, str] = {}
+    cache_hits = 0
+    for idx, (chunk_content, chunk_hash) in enumerate(zip(chunks, chunk_hashes)):
         chunk_result_id = create_chunk_result(chunked_execution_id, idx, chunk_content)
-        if chunk_result_id:
-            thread = threading.Thread(
-                target=_process_chunk,
-                args=(
-                    chunked_execution_id,
-                    chunk_result_id,
-                    chunk_content,
-                    len(chunks),
-                    path.bot_id,
-                ),
-                daemon=True,
-            )
-            thread.start()
+        if not chunk_result_id:
+            continue
+        hit = cached.get(chunk_hash)
+        if hit is not None:
+            update_chunk_result(chunk_result_id, hit["bot_output"], 0, cached=True)
+            cache_hits += 1
+        else:
+            pending.setdefault(chunk_hash, []).append(chunk_result_id)
+            first_content.setdefault(chunk_hash, chunk_content)
+
+    # Return slots reserved for chunks whose result records could not be created
+    for _ in misses - pending.keys():
+        _release_chunk_slot()
+
+    finalized = False
+    if cache_hits:
+        completed = increment_completed_chunks(chunked_execution_id, cache_hits)
+        if not pending and completed >= len(chunks):
+            _finalize_chunked_execution(chunked_execution_id)
+            finalized = True
+
+    executor = _get_chunk_executor()
+    for chunk_hash, chunk_result_ids in pending.items():
+        executor.submit(
+            _process_chunk,
+            chunked_execution_id,
+            chunk_result_ids,
+            first_content[chunk_hash],
+            len(chunks),
+            path.bot_id,
+            prompt_hash,
+            chunk_hash,
+        )
 
     return {
         "chunked_execution_id": chunked_execution_id,
         "bot_id": path.bot_id,
         "total_chunks": len(chunks),
-        "status": "processing",
+        "cached_chunks": cache_hits,
+        "status": "completed" if finalized else "processing",
     }, HTTPStatus.CREATED
 
 
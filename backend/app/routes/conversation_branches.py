@@ -31,7 +31,8 @@ class BranchPath(BaseModel):
 def create_branch(path: ConversationPath):
     """Create a new branch from a conversation at a specific message index.
 
-    Deep-copies messages up to the fork point into the new branch.
+    The branch inherits messages up to the fork point from its parent (the
+    main branch, or ``parent_branch_id`` if given) without copying them.
     The original conversation messages are never modified.
     """
     body = request.get_json(silent=True) or {}
@@ -50,10 +51,14 @@ def create_branch(path: ConversationPath):
         )
 
     name = body.get("name")
+    parent_branch_id = body.get("parent_branch_id")
 
     try:
         branch = ConversationBranchService.create_branch(
-            path.conversation_id, fork_message_index, name=name
+            path.conversation_id,
+            fork_message_index,
+            name=name,
+            parent_branch_id=parent_branch_id,
         )
         return branch, HTTPStatus.CREATED
     except ValueError as e:
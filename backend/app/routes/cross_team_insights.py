@@ -4,7 +4,7 @@ from http import HTTPStatus
 
 from flask_openapi3 import APIBlueprint, Tag
 
-from app.db.cross_team_insights import get_cross_team_insights
+from app.services.report_service import ReportService
 
 tag = Tag(name="analytics", description="Analytics and metrics")
 cross_team_insights_bp = APIBlueprint(
@@ -15,5 +15,5 @@ cross_team_insights_bp = APIBlueprint(
 @cross_team_insights_bp.get("/analytics/cross-team-insights")
 def get_cross_team_insights_endpoint():
     """Get cross-team automation insights including per-team execution stats and org-level findings."""
-    result = get_cross_team_insights()
+    result = ReportService.get_cross_team_insights()
     return result, HTTPStatus.OK
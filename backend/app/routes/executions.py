@@ -14,6 +14,7 @@ from ..db.executions import count_filtered_executions, get_filtered_executions
 from ..models.common import ExecutionFilterQuery
 from ..services.execution_log_service import ExecutionLogService
 from ..services.execution_queue_service import ExecutionQueueService
+from ..services.usage_stream import LiveUsageTracker
 
 tag = Tag(name="executions", description="Execution log operations")
 executions_bp = APIBlueprint("executions", __name__, url_prefix="/admin", abp_tags=[tag])
@@ -103,11 +104,20 @@ def get_execution(path: ExecutionPath):
     - ``q``: optional search string. When provided, only log lines containing
       ``q`` (case-insensitive) are returned. Adds ``log_search_query`` and
       ``log_match_count`` fields to the response.
+
+    Running executions also carry ``live_usage``: token usage reported by the
+    CLI so far, when its output format includes it.
     """
     execution = ExecutionLogService.get_execution(path.execution_id)
     if not execution:
         return error_response("NOT_FOUND", "Execution not found", HTTPStatus.NOT_FOUND)
 
+    if execution.get("status") == "running":
+        live_usage = LiveUsageTracker.usage(path.execution_id)
+        if live_usage:
+            execution = dict(execution)  # shallow copy — avoid mutating the cached dict
+            execution["live_usage"] = live_usage
+
     q = request.args.get("q", "").strip()
     if q:
         execution = dict(execution)  # shallow copy — avoid mutating the cached dict
@@ -559,19 +569,20 @@ def cancel_queue_for_trigger(path: QueueTriggerPath):
 
 @executions_bp.get("/executions/retries")
 def get_pending_retries():
-    """Get pending rate-limit retries from the pending_retries table."""
-    from ..db.monitoring import get_all_pending_retries
+    """Get pending rate-limit retries (delayed entries in the execution queue)."""
+    from ..db.execution_queue import get_pending_retry_entries
 
-    retries = get_all_pending_retries()
+    retries = get_pending_retry_entries()
     result = []
     for row in retries:
         result.append(
             {
                 "trigger_id": row["trigger_id"],
-                "cooldown_seconds": row.get("cooldown_seconds", 0),
-                "retry_at": row.get("retry_at", ""),
+                "cooldown_seconds": row.get("delay_seconds") or 0,
+                "retry_at": row.get("not_before") or "",
                 "trigger_type": row.get("trigger_type", "webhook"),
                 "created_at": row.get("created_at", ""),
+                "attempt": row.get("attempt", 0),
             }
         )
 
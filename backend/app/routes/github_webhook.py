@@ -165,6 +165,7 @@ def github_webhook():
             "pr_title": pr_title,
             "pr_url": pr_url,
             "pr_author": pr_author,
+            "head_sha": pr.get("head", {}).get("sha", ""),
             "repo_full_name": repo_full_name,
             "repo_url": repo_url,
             "action": action,
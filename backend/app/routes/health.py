@@ -14,14 +14,14 @@ health_bp = APIBlueprint("health", __name__, url_prefix="/health", abp_tags=[tag
 
 def _is_authenticated_request() -> bool:
     """Check if request carries a valid API key (DB or env var)."""
-    from ..db.rbac import has_any_keys, get_role_for_api_key
+    from ..services.rbac_service import get_role_for_request
 
     api_key = request.headers.get("X-API-Key")
     if not api_key:
         return False
 
     # Check DB keys first
-    if has_any_keys() and get_role_for_api_key(api_key):
+    if get_role_for_request():
         return True
 
     # Fallback: check env var
@@ -202,9 +202,8 @@ def setup():
     if len(hits) >= _SETUP_RATE_MAX:
         return {"error": "Too many requests"}, 429
     hits.append(now)
-    from ..db.rbac import generate_api_key, invalidate_key_cache
     from ..db.connection import get_connection
-    from ..db.ids import _get_unique_role_id
+    from ..db.rbac import generate_api_key, insert_user_role, invalidate_key_cache
 
     data = request.get_json(silent=True) or {}
     label = data.get("label", "Admin")
@@ -217,11 +216,7 @@ def setup():
         if existing > 0:
             return {"error": "Already configured. Use the admin API to manage keys."}, 403
 
-        role_id = _get_unique_role_id(conn)
-        conn.execute(
-            "INSERT INTO user_roles (id, api_key, label, role) VALUES (?, ?, ?, ?)",
-            (role_id, api_key, label, "admin"),
-        )
+        role_id = insert_user_role(conn, api_key, label, "admin")
         conn.commit()
 
     invalidate_key_cache()
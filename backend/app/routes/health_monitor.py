@@ -8,6 +8,7 @@ from flask_openapi3 import APIBlueprint, Tag
 from app.models.common import error_response
 
 from ..db.health_alerts import acknowledge_alert, get_recent_alerts
+from ..services.execution_report_cache import ExecutionReportCache
 from ..services.health_monitor_service import HealthMonitorService
 from ..services.report_service import ReportService
 
@@ -44,6 +45,8 @@ def acknowledge(alert_id: int):
     """Acknowledge a health alert."""
     success = acknowledge_alert(alert_id)
     if success:
+        # Weekly reports list bots with unacknowledged alerts
+        ExecutionReportCache.invalidate()
         return {"message": "Alert acknowledged"}, HTTPStatus.OK
     return error_response("NOT_FOUND", "Alert not found", HTTPStatus.NOT_FOUND)
 
@@ -68,7 +68,14 @@ def query_agent_graph(path: KGAgentPath, query: KGGraphQuery):
     agent, err = _validate_agent(path.agent_id)
     if err:
         return err
-    subgraph = traverse_graph(path.agent_id, query.seed, query.hops)
+    subgraph = traverse_graph(
+        path.agent_id,
+        query.seed,
+        query.hops,
+        max_nodes=query.max_nodes,
+        max_edges=query.max_edges,
+        min_importance=query.min_importance,
+    )
     return subgraph, HTTPStatus.OK
 
 
@@ -18,6 +18,7 @@ from ..db.prompt_snippets import (
     get_snippet_by_name,
     update_snippet,
 )
+from ..services.prompt_renderer import PromptRenderer
 from ..services.prompt_snippet_service import SnippetService
 from ..services.rbac_service import require_role
 
@@ -75,6 +76,8 @@ def create_snippet():
 
     snippet_id = db_create_snippet(name=name, content=content, description=description)
     if snippet_id:
+        # Templates that referenced the (previously missing) name must recompile
+        PromptRenderer.invalidate_snippets([name])
         snippet = get_snippet(snippet_id)
         return {"message": "Snippet created", "snippet": snippet}, HTTPStatus.CREATED
     else:
@@ -131,6 +134,7 @@ def update_snippet_endpoint(path: SnippetPath):
         description=data.get("description"),
     )
     if success:
+        PromptRenderer.invalidate_snippets({snippet["name"], name or snippet["name"]})
         updated = get_snippet(path.snippet_id)
         return {"message": "Snippet updated", "snippet": updated}, HTTPStatus.OK
     else:
@@ -147,6 +151,7 @@ def delete_snippet_endpoint(path: SnippetPath):
 
     success = delete_snippet(path.snippet_id)
     if success:
+        PromptRenderer.invalidate_snippets([snippet["name"]])
         return {"message": "Snippet deleted"}, HTTPStatus.OK
     else:
         return error_response(
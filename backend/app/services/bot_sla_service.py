@@ -0,0 +1,180 @@
+"""Bot SLA, uptime and latency percentiles from hourly SLA buckets.
+
+Executions fold into ``bot_sla_buckets`` as they finish (see
+``record_sla_sample``); a report merges the buckets of each rolling window
+instead of scanning execution history.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from ..db.bot_sla import get_sla_buckets, record_sla_sample
+from ..db.trigger_health import get_all_trigger_health_stats
+from ..db.triggers import get_all_triggers
+from ..utils.quantile_sketch import QuantileSketch
+from .health_monitor_service import HealthMonitorService
+from .pipeline_tracer import PipelineTracer
+
+logger = logging.getLogger(__name__)
+
+
+class BotSlaService:
+    """Incremental per-bot SLA statistics."""
+
+    WINDOWS_DAYS = (7, 30)
+    QUANTILES = (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+    # Expected interval per legacy schedule type (same table as missing-fire checks)
+    SCHEDULE_INTERVAL_HOURS = {"daily": 24, "weekly": 168, "monthly": 720}
+
+    @classmethod
+    def on_execution_finished(
+        cls, execution_id: str, trigger_id: str, status: str, duration_ms: Optional[int]
+    ) -> None:
+        """Record a finished execution, including its queue wait when it was queued."""
+        trace = PipelineTracer.for_execution(execution_id)
+        queue_wait_ms = trace.context.get("queue_wait_ms") if trace else None
+        record_sla_sample(trigger_id, status, duration_ms, queue_wait_ms)
+
+    @classmethod
+    def _percentiles(cls, sketch: QuantileSketch) -> Dict[str, Optional[float]]:
+        return {
+            name: (round(value, 1) if (value := sketch.quantile(q)) is not None else None)
+            for name, q in cls.QUANTILES
+        }
+
+    @staticmethod
+    def _parse_time(
+        value: Optional[str], naive_tz: Optional[timezone] = None
+    ) -> Optional[datetime]:
+        """Parse a stored timestamp as UTC.
+
+        Naive values are read in ``naive_tz``, or local time when omitted (as
+        execution logs write them).
+        """
+        if not value:
+            return None
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except (ValueError, TypeError):
+            return None
+        if parsed.tzinfo is None and naive_tz is not None:
+            parsed = parsed.replace(tzinfo=naive_tz)
+        return parsed.astimezone(timezone.utc)
+
+    @staticmethod
+    def _bucket_time(bucket: str) -> datetime:
+        return datetime.strptime(bucket, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+
+    @classmethod
+    def _window(
+        cls,
+        buckets: List[dict],
+        since: datetime,
+        now: datetime,
+        interval_h: Optional[int],
+        created_at: Optional[datetime],
+    ) -> dict:
+        """Merge the buckets at or after ``since`` into one window summary."""
+        total = success = failed = 0
+        durations, waits = QuantileSketch(), QuantileSketch()
+        success_hours = []
+        for bucket in buckets:
+            start = cls._bucket_time(bucket["bucket_start"])
+            if start < since.replace(minute=0, second=0, microsecond=0):
+                continue
+            total += bucket["total_runs"]
+            success += bucket["success_runs"]
+            failed += bucket["failed_runs"]
+            durations.merge(QuantileSketch.from_json(bucket["duration_sketch"]))
+            waits.merge(QuantileSketch.from_json(bucket["queue_wait_sketch"]))
+            if bucket["success_runs"]:
+                success_hours.append(start)
+
+        success_rate = round(100.0 * success / (success + failed), 1) if success + failed else 100.0
+
+        if interval_h:
+            # Share of expected schedule slots (newest first, each one interval
+            # long) that saw at least one successful run
+            slot = timedelta(hours=interval_h)
+            expected = met = 0
+            slot_end = now
+            while slot_end - slot >= since:
+                slot_start = slot_end - slot
+                if created_at and slot_end <= created_at:
+                    break
+                expected += 1
+                # Hour buckets are truncated, so include the hour the slot starts in
+                lower = slot_start.replace(minute=0, second=0, microsecond=0)
+                if any(lower <= h < slot_end for h in success_hours):
+                    met += 1
+                slot_end = slot_start
+            uptime = round(100.0 * met / expected, 1) if expected else 100.0
+        else:
+            uptime = success_rate
+
+        return {
+            "runs": total,
+            "success_rate": success_rate,
+            "uptime": uptime,
+            "duration_ms": cls._percentiles(durations),
+            "queue_wait_ms": cls._percentiles(waits),
+        }
+
+    @classmethod
+    def get_sla_entries(cls, now: Optional[datetime] = None) -> List[dict]:
+        """Build the SLA report for every trigger."""
+        now = now or datetime.now(timezone.utc)
+        longest = max(cls.WINDOWS_DAYS)
+        buckets_by_trigger = get_sla_buckets(now - timedelta(days=longest))
+        health = {s["trigger_id"]: s for s in get_all_trigger_health_stats()}
+
+        entries = []
+        for trigger in get_all_triggers():
+            trigger_id = trigger["id"]
+            stats = health.get(trigger_id) or {}
+            interval_h = None
+            if trigger.get("trigger_source") == "scheduled":
+                interval_h = cls.SCHEDULE_INTERVAL_HOURS.get(trigger.get("schedule_type"))
+            # CURRENT_TIMESTAMP defaults are UTC, not local time
+            created_at = cls._parse_time(trigger.get("created_at"), naive_tz=timezone.utc)
+            buckets = buckets_by_trigger.get(trigger_id, [])
+
+            windows = {
+                f"{days}d": cls._window(
+                    buckets, now - timedelta(days=days), now, interval_h, created_at
+                )
+                for days in cls.WINDOWS_DAYS
+            }
+
+            last_run = cls._parse_time(stats.get("last_finished_at"))
+            next_expected = overdue_by_h = None
+            overdue = False
+            if interval_h and last_run:
+                next_expected = last_run + timedelta(hours=interval_h)
+                late_h = (now - next_expected).total_seconds() / 3600.0
+                grace_h = interval_h * (HealthMonitorService.MISSING_FIRE_MULTIPLIER - 1)
+                overdue = late_h > grace_h
+                overdue_by_h = round(late_h, 1) if overdue else None
+
+            ewma = stats.get("ewma_duration_ms")
+            entries.append(
+                {
+                    "bot_id": trigger_id,
+                    "bot_name": trigger.get("name", trigger_id),
+                    "trigger_type": trigger.get("trigger_source", "webhook"),
+                    "expected_frequency_h": interval_h,
+                    "last_run_at": last_run.isoformat() if last_run else None,
+                    "next_expected_at": next_expected.isoformat() if next_expected else None,
+                    "overdue": overdue,
+                    "overdue_by_h": overdue_by_h,
+                    "uptime_7d": windows["7d"]["uptime"],
+                    "uptime_30d": windows["30d"]["uptime"],
+                    "success_rate_7d": windows["7d"]["success_rate"],
+                    "success_rate_30d": windows["30d"]["success_rate"],
+                    "avg_duration_s": round(ewma / 1000, 1) if ewma else 0,
+                    "alert_enabled": bool(trigger.get("enabled")),
+                    "windows": windows,
+                }
+            )
+        return entries
@@ -1,6 +1,5 @@
 """Budget enforcement service with pre-check, post-record, and cost estimation."""
 
-import json
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional
@@ -64,202 +63,26 @@ class BudgetService:
     }
 
     @classmethod
-    def extract_token_usage(cls, stdout_log: str, backend_type: str) -> Optional[dict]:
-        """Extract token usage from CLI output.
-
-        Dispatches to backend-specific parsers:
-        - claude: parses JSON result from --output-format json
-        - gemini: parses JSON with stats.models.*.tokens structure
-        - codex: parses JSONL with turn.completed events
-        - opencode: best-effort JSON parsing (MEDIUM confidence)
-        """
-        if not stdout_log or not stdout_log.strip():
-            return None
-
-        if backend_type == "claude":
-            return cls._extract_claude_usage(stdout_log)
-        elif backend_type == "gemini":
-            return cls._extract_gemini_usage(stdout_log)
-        elif backend_type == "codex":
-            return cls._extract_codex_usage(stdout_log)
-        elif backend_type == "opencode":
-            return cls._extract_opencode_usage(stdout_log)
-        else:
-            return None
-
-    @classmethod
-    def _extract_claude_usage(cls, stdout_log: str) -> Optional[dict]:
-        """Parse Claude CLI JSON output for token usage."""
-        parsed = cls._try_parse_json(stdout_log.strip())
-
-        if parsed is None:
-            parsed = cls._find_last_json_object(stdout_log)
-
-        if parsed is None:
-            return None
-
-        usage = parsed.get("usage", {})
-
-        return {
-            "input_tokens": usage.get("input_tokens", 0),
-            "output_tokens": usage.get("output_tokens", 0),
-            "cache_read_tokens": usage.get("cache_read_input_tokens", 0),
-            "cache_creation_tokens": usage.get("cache_creation_input_tokens", 0),
-            "total_cost_usd": parsed.get("total_cost_usd", 0.0),
-            "num_turns": parsed.get("num_turns", 0),
-            "duration_api_ms": parsed.get("duration_api_ms", 0),
-            "session_id": parsed.get("session_id"),
-            "source": "cli_output",
-        }
-
-    @classmethod
-    def _extract_gemini_usage(cls, stdout_log: str) -> Optional[dict]:
-        """Parse Gemini CLI JSON output for token usage.
+    def usage_cost(cls, usage_data: Optional[dict], model: Optional[str] = None) -> float:
+        """Cost of a usage dict: the CLI-reported cost, else priced from ``MODEL_PRICING``.
 
-        Gemini --output-format json returns stats.models.<model>.tokens with
-        prompt, candidates, total, cached, thoughts, tool fields.
-        Sums across all models.
+        Returns 0.0 when the CLI reported no cost and the model has no known pricing.
         """
-        parsed = cls._try_parse_json(stdout_log.strip())
-        if parsed is None:
-            parsed = cls._find_last_json_object(stdout_log)
-        if parsed is None:
-            return None
-
-        stats = parsed.get("stats", {})
-        models = stats.get("models", {})
-
-        total_input = 0
-        total_output = 0
-        total_cached = 0
-
-        for model_data in models.values():
-            tokens = model_data.get("tokens", {})
-            total_input += tokens.get("prompt", 0)
-            total_output += tokens.get("candidates", 0)
-            total_cached += tokens.get("cached", 0)
-
-        if total_input == 0 and total_output == 0:
-            return None
-
-        return {
-            "input_tokens": total_input,
-            "output_tokens": total_output,
-            "cache_read_tokens": total_cached,
-            "cache_creation_tokens": 0,
-            "total_cost_usd": 0.0,
-            "source": "cli_output",
-        }
-
-    @classmethod
-    def _extract_codex_usage(cls, stdout_log: str) -> Optional[dict]:
-        """Parse Codex CLI JSONL output for token usage.
-
-        Codex --json outputs JSONL events. The last turn.completed event contains:
-        {"type":"turn.completed","usage":{"input_tokens":N,"cached_input_tokens":N,"output_tokens":N}}
-        """
-        last_usage = None
-
-        for line in stdout_log.strip().splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                event = json.loads(line)
-                if event.get("type") == "turn.completed" and "usage" in event:
-                    last_usage = event["usage"]
-            except (json.JSONDecodeError, ValueError):
-                continue
-
-        if not last_usage:
-            return None
-
-        return {
-            "input_tokens": last_usage.get("input_tokens", 0),
-            "output_tokens": last_usage.get("output_tokens", 0),
-            "cache_read_tokens": last_usage.get("cached_input_tokens", 0),
-            "cache_creation_tokens": 0,
-            "total_cost_usd": 0.0,
-            "source": "cli_output",
-        }
-
-    @classmethod
-    def _extract_opencode_usage(cls, stdout_log: str) -> Optional[dict]:
-        """Parse OpenCode CLI JSON output for token usage.
-
-        MEDIUM confidence parser -- OpenCode's JSON event format is less documented.
-        Tries to find usage or stats keys with token counts.
-        Returns None if structure doesn't match expected format.
-        """
-        parsed = cls._try_parse_json(stdout_log.strip())
-        if parsed is None:
-            parsed = cls._find_last_json_object(stdout_log)
-        if parsed is None:
-            return None
-
-        # Try direct usage key
-        usage = parsed.get("usage", {})
-        if usage and (usage.get("input_tokens") or usage.get("output_tokens")):
-            return {
-                "input_tokens": usage.get("input_tokens", 0),
-                "output_tokens": usage.get("output_tokens", 0),
-                "cache_read_tokens": usage.get("cache_read_tokens", 0),
-                "cache_creation_tokens": 0,
-                "total_cost_usd": 0.0,
-                "source": "cli_output",
-            }
-
-        # Try stats key
-        stats = parsed.get("stats", {})
-        if stats and (stats.get("input_tokens") or stats.get("output_tokens")):
-            return {
-                "input_tokens": stats.get("input_tokens", 0),
-                "output_tokens": stats.get("output_tokens", 0),
-                "cache_read_tokens": stats.get("cache_read_tokens", 0),
-                "cache_creation_tokens": 0,
-                "total_cost_usd": 0.0,
-                "source": "cli_output",
-            }
-
-        return None
-
-    @classmethod
-    def _try_parse_json(cls, text: str) -> Optional[dict]:
-        """Try to parse text as JSON. Returns dict or None."""
-        try:
-            obj = json.loads(text)
-            if isinstance(obj, dict):
-                return obj
-        except (json.JSONDecodeError, ValueError):
-            pass  # Intentionally silenced: malformed data handled gracefully
-        return None
-
-    @classmethod
-    def _find_last_json_object(cls, text: str) -> Optional[dict]:
-        """Find the last JSON object in mixed text content.
-
-        Scans from the end of the text looking for a matching { }.
-        """
-        # Find the last closing brace
-        last_close = text.rfind("}")
-        if last_close == -1:
-            return None
-
-        # Find the matching opening brace by counting
-        depth = 0
-        for i in range(last_close, -1, -1):
-            if text[i] == "}":
-                depth += 1
-            elif text[i] == "{":
-                depth -= 1
-                if depth == 0:
-                    # Try to parse this substring
-                    candidate = text[i : last_close + 1]
-                    parsed = cls._try_parse_json(candidate)
-                    if parsed is not None:
-                        return parsed
-                    break
-        return None
+        if not usage_data:
+            return 0.0
+        reported = usage_data.get("total_cost_usd") or 0.0
+        if reported or not model:
+            return float(reported)
+        # Dated model ids ("claude-sonnet-4-5-20250929") price as their longest known prefix
+        matches = [name for name in cls.MODEL_PRICING if model.startswith(name)]
+        if not matches:
+            return 0.0
+        pricing = cls.MODEL_PRICING[max(matches, key=len)]
+        return (
+            usage_data.get("input_tokens", 0) * pricing["input"]
+            + usage_data.get("output_tokens", 0) * pricing["output"]
+            + usage_data.get("cache_read_tokens", 0) * pricing["cache_read"]
+        ) / 1_000_000
 
     @classmethod
     def estimate_cost(
@@ -304,9 +127,12 @@ class BudgetService:
         }
 
     @classmethod
-    def check_budget(cls, entity_type: str, entity_id: str) -> dict:
+    def check_budget(cls, entity_type: str, entity_id: str, pending_usd: float = 0.0) -> dict:
         """Pre-execution budget check.
 
+        ``pending_usd`` is spend not yet recorded (e.g. the live cost of the
+        execution being monitored) and counts toward the limits.
+
         Returns dict with allowed, reason, remaining_usd, current_spend, limit.
         """
         limits = get_budget_limit(entity_type, entity_id)
@@ -335,7 +161,7 @@ class BudgetService:
                 }
 
         period = limits.get("period", "monthly")
-        current_spend = get_current_period_spend(entity_type, entity_id, period)
+        current_spend = get_current_period_spend(entity_type, entity_id, period) + pending_usd
 
         hard_limit = limits.get("hard_limit_usd")
         soft_limit = limits.get("soft_limit_usd")
@@ -1,33 +1,31 @@
 """Bulk operation service for batch entity management (API-05).
 
 Processes bulk create/update/delete operations for agents, triggers, plugins, and hooks.
-Each item is processed independently so one failure does not roll back successful items.
+The whole batch is validated before anything is written and then applied with
+set-based statements in a single transaction (see ``app.db.bulk``). Batches are
+all-or-nothing: if any item is rejected nothing is written, and every item's
+result says why.
 """
 
+import inspect
 import logging
-from typing import Any
-
-from ..database import (
-    create_agent,
-    create_hook,
-    create_plugin,
-    create_trigger,
-    delete_agent,
-    delete_hook,
-    delete_plugin,
-    delete_trigger,
-    update_agent,
-    update_hook,
-    update_plugin,
-    update_trigger,
-)
-from ..db.triggers import PREDEFINED_TRIGGER_IDS
+import sqlite3
+from typing import Any, Callable
+
+from ..database import bulk_delete, bulk_insert, bulk_update
+from ..db.agents import agent_row, agent_update_clauses
+from ..db.hooks import hook_row, hook_update_clauses
+from ..db.plugins import plugin_row, plugin_update_clauses
+from ..db.triggers import PREDEFINED_TRIGGER_IDS, trigger_row, trigger_update_clauses
 
 logger = logging.getLogger(__name__)
 
 VALID_ENTITY_TYPES = {"agent", "trigger", "plugin", "hook"}
 VALID_ACTIONS = {"create", "update", "delete"}
 
+# Error reported for valid items of a batch that was rejected because of other items
+NOT_APPLIED_ERROR = "Not applied: another item in the batch was rejected"
+
 
 class BulkService:
     """Processes bulk create/update/delete operations for entities (API-05)."""
@@ -36,7 +34,7 @@ class BulkService:
 
     @staticmethod
     def process(entity_type: str, action: str, items: list) -> list[dict[str, Any]]:
-        """Process bulk operations. Returns per-item results.
+        """Process a bulk operation as one all-or-nothing transaction.
 
         Args:
             entity_type: One of "agent", "trigger", "plugin", "hook".
@@ -44,7 +42,8 @@ class BulkService:
             items: List of item dicts to process.
 
         Returns:
-            List of result dicts: {"index": int, "success": bool, "id": str|None, "error": str|None}
+            List of result dicts: {"index": int, "success": bool, "id": str|None, "error": str|None}.
+            Either every item succeeded or none was applied.
 
         Raises:
             ValueError: If entity_type, action, or items length is invalid.
@@ -66,216 +65,183 @@ class BulkService:
         if not handler:
             raise ValueError(f"Unsupported combination: {entity_type}/{action}")
 
-        results = []
+        # Validate the whole batch before writing anything
+        operations = []
+        errors = {}
+        seen_ids = {}
         for i, item in enumerate(items):
             try:
-                result = handler(item)
-                results.append(result)
-            except Exception as e:
-                logger.warning("Bulk %s %s item %d failed: %s", action, entity_type, i, e)
-                results.append({"index": i, "success": False, "id": None, "error": str(e)})
-
-        # Ensure all results have correct indices
-        for i, r in enumerate(results):
-            r["index"] = i
-
-        return results
+                if not isinstance(item, dict):
+                    raise ValueError("Each item must be an object")
+                operation = handler(item)
+            except ValueError as e:
+                errors[i] = str(e)
+                continue
+            if action != "create":
+                item_id = operation[0] if action == "update" else operation
+                if item_id in seen_ids:
+                    errors[i] = f"Duplicate id (also at index {seen_ids[item_id]})"
+                seen_ids.setdefault(item_id, i)
+            operations.append(operation)
+        if errors:
+            logger.warning(
+                "Bulk %s %s rejected: %d of %d items invalid",
+                action,
+                entity_type,
+                len(errors),
+                len(items),
+            )
+            return _rejected(items, errors)
+
+        try:
+            if action == "create":
+                ids = bulk_insert(entity_type, operations)
+            elif action == "update":
+                errors = bulk_update(entity_type, operations)
+                ids = [item_id for item_id, _, _ in operations]
+            else:
+                errors = bulk_delete(entity_type, operations)
+                ids = operations
+        except sqlite3.Error as e:
+            logger.warning("Bulk %s %s rolled back: %s", action, entity_type, e)
+            return _rejected(items, {}, f"Batch rolled back: {e}")
+        if errors:
+            return _rejected(items, errors)
+
+        return [
+            {"index": i, "success": True, "id": item_id, "error": None}
+            for i, item_id in enumerate(ids)
+        ]
+
+
+def _rejected(items: list, errors: dict, reason: str = NOT_APPLIED_ERROR) -> list[dict]:
+    """Per-item results for a batch that was not applied."""
+    return [
+        {
+            "index": i,
+            "success": False,
+            "id": item.get("id") if isinstance(item, dict) else None,
+            "error": errors.get(i, reason),
+        }
+        for i, item in enumerate(items)
+    ]
 
 
 # =============================================================================
-# Per-entity-type handlers
+# Per-item validation: each handler returns the operation for app.db.bulk
+# (a row for create, (id, set_expressions, values) for update, an id for
+# delete) or raises ValueError with the item's error.
 # =============================================================================
 
 
-def _create_agent(item: dict) -> dict:
-    name = item.get("name")
-    if not name:
-        return {"index": 0, "success": False, "id": None, "error": "name is required"}
-    agent_id = create_agent(
-        name=name,
-        description=item.get("description"),
-        role=item.get("role"),
-        goals=item.get("goals"),
-        context=item.get("context"),
-        backend_type=item.get("backend_type", "claude"),
-        skills=item.get("skills"),
-        system_prompt=item.get("system_prompt"),
-    )
-    if not agent_id:
-        return {"index": 0, "success": False, "id": None, "error": "Failed to create agent"}
-    return {"index": 0, "success": True, "id": agent_id, "error": None}
-
-
-def _update_agent(item: dict) -> dict:
-    agent_id = item.get("id")
-    if not agent_id:
-        return {"index": 0, "success": False, "id": None, "error": "id is required for update"}
+def _required(item: dict, field: str) -> Any:
+    value = item.get(field)
+    if not value:
+        raise ValueError(f"{field} is required")
+    return value
+
+
+def _item_id(item: dict, action: str) -> str:
+    item_id = item.get("id")
+    if not item_id:
+        raise ValueError(f"id is required for {action}")
+    if not isinstance(item_id, str):
+        raise ValueError("id must be a string")
+    return item_id
+
+
+def _hook_id(item: dict, action: str) -> int:
+    hook_id = item.get("id")
+    if hook_id is None:
+        raise ValueError(f"id is required for {action}")
+    try:
+        return int(hook_id)
+    except (TypeError, ValueError):
+        raise ValueError("id must be an integer") from None
+
+
+def _fields(item: dict, build: Callable) -> dict:
+    """The item's non-null fields other than id, rejecting any ``build`` does not accept."""
     fields = {k: v for k, v in item.items() if k != "id" and v is not None}
+    unknown = sorted(set(fields) - set(inspect.signature(build).parameters))
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return fields
+
+
+def _create(item: dict, build_row: Callable, required: tuple) -> dict:
+    """Build a new row with the single-entity create's row builder and defaults."""
+    for field in required:
+        _required(item, field)
+    try:
+        return build_row(**_fields(item, build_row))
+    except TypeError as e:
+        raise ValueError(f"Invalid field value: {e}") from None
+
+
+def _update(item_id: Any, item: dict, build_clauses: Callable) -> tuple:
+    """Validate an update's fields with the single-entity update's SET builder."""
+    fields = _fields(item, build_clauses)
     if not fields:
-        return {"index": 0, "success": False, "id": agent_id, "error": "No fields to update"}
-    success = update_agent(agent_id, **fields)
-    if not success:
-        return {
-            "index": 0,
-            "success": False,
-            "id": agent_id,
-            "error": "Agent not found or no changes",
-        }
-    return {"index": 0, "success": True, "id": agent_id, "error": None}
+        raise ValueError("No fields to update")
+    try:
+        updates, values = build_clauses(**fields)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid field value: {e}") from None
+    if not updates:
+        raise ValueError("No valid fields to update")
+    return item_id, updates, values
+
+
+def _create_agent(item: dict) -> dict:
+    return _create(item, agent_row, ("name",))
 
 
-def _delete_agent(item: dict) -> dict:
-    agent_id = item.get("id")
-    if not agent_id:
-        return {"index": 0, "success": False, "id": None, "error": "id is required for delete"}
-    success = delete_agent(agent_id)
-    if not success:
-        return {"index": 0, "success": False, "id": agent_id, "error": "Agent not found"}
-    return {"index": 0, "success": True, "id": agent_id, "error": None}
+def _update_agent(item: dict) -> tuple:
+    return _update(_item_id(item, "update"), item, agent_update_clauses)
+
+
+def _delete_agent(item: dict) -> str:
+    return _item_id(item, "delete")
 
 
 def _create_trigger(item: dict) -> dict:
-    name = item.get("name")
-    if not name:
-        return {"index": 0, "success": False, "id": None, "error": "name is required"}
-    prompt_template = item.get("prompt_template")
-    if not prompt_template:
-        return {"index": 0, "success": False, "id": None, "error": "prompt_template is required"}
-    trigger_id = create_trigger(
-        name=name,
-        prompt_template=prompt_template,
-        backend_type=item.get("backend_type", "claude"),
-        trigger_source=item.get("trigger_source", "webhook"),
-    )
-    if not trigger_id:
-        return {"index": 0, "success": False, "id": None, "error": "Failed to create trigger"}
-    return {"index": 0, "success": True, "id": trigger_id, "error": None}
-
-
-def _update_trigger(item: dict) -> dict:
-    trigger_id = item.get("id")
-    if not trigger_id:
-        return {"index": 0, "success": False, "id": None, "error": "id is required for update"}
-    fields = {k: v for k, v in item.items() if k != "id" and v is not None}
-    if not fields:
-        return {"index": 0, "success": False, "id": trigger_id, "error": "No fields to update"}
-    success = update_trigger(trigger_id, **fields)
-    if not success:
-        return {
-            "index": 0,
-            "success": False,
-            "id": trigger_id,
-            "error": "Trigger not found or no changes",
-        }
-    return {"index": 0, "success": True, "id": trigger_id, "error": None}
+    return _create(item, trigger_row, ("name", "prompt_template"))
+
 
+def _update_trigger(item: dict) -> tuple:
+    return _update(_item_id(item, "update"), item, trigger_update_clauses)
 
-def _delete_trigger(item: dict) -> dict:
-    trigger_id = item.get("id")
-    if not trigger_id:
-        return {"index": 0, "success": False, "id": None, "error": "id is required for delete"}
+
+def _delete_trigger(item: dict) -> str:
+    trigger_id = _item_id(item, "delete")
     if trigger_id in PREDEFINED_TRIGGER_IDS:
-        return {
-            "index": 0,
-            "success": False,
-            "id": trigger_id,
-            "error": "Cannot delete predefined trigger",
-        }
-    success = delete_trigger(trigger_id)
-    if not success:
-        return {"index": 0, "success": False, "id": trigger_id, "error": "Trigger not found"}
-    return {"index": 0, "success": True, "id": trigger_id, "error": None}
+        raise ValueError("Cannot delete predefined trigger")
+    return trigger_id
 
 
 def _create_plugin(item: dict) -> dict:
-    name = item.get("name")
-    if not name:
-        return {"index": 0, "success": False, "id": None, "error": "name is required"}
-    plugin_id = create_plugin(
-        name=name,
-        description=item.get("description"),
-        version=item.get("version", "1.0.0"),
-        status=item.get("status", "draft"),
-        author=item.get("author"),
-    )
-    if not plugin_id:
-        return {"index": 0, "success": False, "id": None, "error": "Failed to create plugin"}
-    return {"index": 0, "success": True, "id": plugin_id, "error": None}
-
-
-def _update_plugin(item: dict) -> dict:
-    plugin_id = item.get("id")
-    if not plugin_id:
-        return {"index": 0, "success": False, "id": None, "error": "id is required for update"}
-    fields = {k: v for k, v in item.items() if k != "id" and v is not None}
-    if not fields:
-        return {"index": 0, "success": False, "id": plugin_id, "error": "No fields to update"}
-    success = update_plugin(plugin_id, **fields)
-    if not success:
-        return {
-            "index": 0,
-            "success": False,
-            "id": plugin_id,
-            "error": "Plugin not found or no changes",
-        }
-    return {"index": 0, "success": True, "id": plugin_id, "error": None}
+    return _create(item, plugin_row, ("name",))
+
+
+def _update_plugin(item: dict) -> tuple:
+    return _update(_item_id(item, "update"), item, plugin_update_clauses)
 
 
-def _delete_plugin(item: dict) -> dict:
-    plugin_id = item.get("id")
-    if not plugin_id:
-        return {"index": 0, "success": False, "id": None, "error": "id is required for delete"}
-    success = delete_plugin(plugin_id)
-    if not success:
-        return {"index": 0, "success": False, "id": plugin_id, "error": "Plugin not found"}
-    return {"index": 0, "success": True, "id": plugin_id, "error": None}
+def _delete_plugin(item: dict) -> str:
+    return _item_id(item, "delete")
 
 
 def _create_hook(item: dict) -> dict:
-    name = item.get("name")
-    if not name:
-        return {"index": 0, "success": False, "id": None, "error": "name is required"}
-    event = item.get("event")
-    if not event:
-        return {"index": 0, "success": False, "id": None, "error": "event is required"}
-    hook_id = create_hook(
-        name=name,
-        event=event,
-        description=item.get("description"),
-        content=item.get("content"),
-        enabled=item.get("enabled", True),
-    )
-    if hook_id is None:
-        return {"index": 0, "success": False, "id": None, "error": "Failed to create hook"}
-    return {"index": 0, "success": True, "id": hook_id, "error": None}
+    return _create(item, hook_row, ("name", "event"))
 
 
-def _update_hook(item: dict) -> dict:
-    hook_id = item.get("id")
-    if hook_id is None:
-        return {"index": 0, "success": False, "id": None, "error": "id is required for update"}
-    fields = {k: v for k, v in item.items() if k != "id" and v is not None}
-    if not fields:
-        return {"index": 0, "success": False, "id": hook_id, "error": "No fields to update"}
-    success = update_hook(hook_id, **fields)
-    if not success:
-        return {
-            "index": 0,
-            "success": False,
-            "id": hook_id,
-            "error": "Hook not found or no changes",
-        }
-    return {"index": 0, "success": True, "id": hook_id, "error": None}
+def _update_hook(item: dict) -> tuple:
+    return _update(_hook_id(item, "update"), item, hook_update_clauses)
 
 
-def _delete_hook(item: dict) -> dict:
-    hook_id = item.get("id")
-    if hook_id is None:
-        return {"index": 0, "success": False, "id": None, "error": "id is required for delete"}
-    success = delete_hook(hook_id)
-    if not success:
-        return {"index": 0, "success": False, "id": hook_id, "error": "Hook not found"}
-    return {"index": 0, "success": True, "id": hook_id, "error": None}
+def _delete_hook(item: dict) -> int:
+    return _hook_id(item, "delete")
 
 
 # Handler lookup table: (entity_type, action) -> handler function
@@ -9,6 +9,7 @@ splitting at 400-512 tokens per Pinecone/LangCopilot recommendations.
 Deduplication uses normalized string matching per NAACL 2025 Findings.
 """
 
+import hashlib
 import logging
 import re
 
@@ -32,6 +33,27 @@ class ChunkService:
     MAX_CHUNK_CHARS = 2000  # ~500 tokens at 4 chars/token
     OVERLAP_CHARS = 200  # ~10% overlap for context continuity
     SIZE_THRESHOLD = 102400  # 100KB threshold for triggering chunking
+    CACHE_TTL_SECONDS = 7 * 24 * 3600  # Reuse per-chunk bot output for a week
+
+    @classmethod
+    def normalize_chunk(cls, chunk: str) -> str:
+        """Normalize chunk text for cache keying.
+
+        Unifies line endings and drops trailing whitespace and surrounding blank
+        lines, so whitespace-only edits still hit the result cache.
+        """
+        lines = chunk.replace("\r\n", "\n").split("\n")
+        return "\n".join(line.rstrip() for line in lines).strip("\n")
+
+    @classmethod
+    def prompt_hash(cls, prompt_template: str | None) -> str:
+        """Hash a bot's prompt template; changing the prompt invalidates cached chunks."""
+        return hashlib.sha256((prompt_template or "").encode("utf-8")).hexdigest()
+
+    @classmethod
+    def chunk_hash(cls, chunk: str) -> str:
+        """Hash the normalized chunk text."""
+        return hashlib.sha256(cls.normalize_chunk(chunk).encode("utf-8")).hexdigest()
 
     @classmethod
     def chunk_code(cls, content: str, max_chars: int | None = None) -> list[str]:
@@ -15,6 +15,13 @@ logger = logging.getLogger(__name__)
 class CommandBuilder:
     """Stateless builder for backend CLI commands."""
 
+    # Backends whose CLI can record a session under a caller-chosen id and resume it
+    SESSION_BACKENDS = ("claude",)
+
+    @classmethod
+    def supports_session_resume(cls, backend: str) -> bool:
+        return backend in cls.SESSION_BACKENDS
+
     @staticmethod
     def build(
         backend: str,
@@ -23,6 +30,8 @@ class CommandBuilder:
         model: str = None,
         codex_settings: dict = None,
         allowed_tools: str = None,
+        session_id: str = None,
+        resume: bool = False,
     ) -> list:
         """Build the CLI command for the specified backend.
 
@@ -34,6 +43,10 @@ class CommandBuilder:
             codex_settings: Optional dict with codex-specific settings
                 (e.g. {"reasoning_level": "high"}).
             allowed_tools: Optional comma-separated tool allowlist for claude backend.
+            session_id: Optional session id for backends in ``SESSION_BACKENDS``;
+                ignored by the others.
+            resume: Resume the existing session ``session_id`` instead of
+                starting a new one under that id.
 
         Returns:
             A list of command-line arguments suitable for subprocess.
@@ -75,6 +88,8 @@ class CommandBuilder:
             ]
             if model:
                 cmd.extend(["--model", model])
+            if session_id:
+                cmd.extend(["--resume" if resume else "--session-id", session_id])
             if allowed_paths:
                 for path in allowed_paths:
                     cmd.extend(["--add-dir", path])
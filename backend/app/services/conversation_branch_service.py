@@ -5,7 +5,8 @@ thread intact (immutable). Based on ContextBranch paper (arXiv:2512.13914)
 achieving 58% context reduction and improved focus.
 
 Messages are stored as normalized rows with parent_message_id references
-forming a tree structure -- NOT as JSON blobs.
+forming a tree structure -- NOT as JSON blobs. Forks are copy-on-write: they
+reference their parent branch and fork index instead of copying the prefix.
 """
 
 import json
@@ -13,12 +14,15 @@ import logging
 
 from ..db.agents import get_agent_conversation
 from ..db.conversation_branches import (
-    count_messages_for_branch,
+    append_message,
     create_branch,
-    create_message,
+    create_root_branch,
     get_branch,
     get_branches_for_conversation,
+    get_message,
+    get_message_at,
     get_messages_for_branch,
+    sync_root_branch,
 )
 
 logger = logging.getLogger(__name__)
@@ -29,84 +33,72 @@ class ConversationBranchService:
 
     @classmethod
     def create_branch(
-        cls, conversation_id: str, fork_message_index: int, name: str | None = None
+        cls,
+        conversation_id: str,
+        fork_message_index: int,
+        name: str | None = None,
+        parent_branch_id: str | None = None,
     ) -> dict:
         """Create a new branch forking from a specific message index.
 
-        Deep-copies messages from index 0 to fork_message_index (inclusive)
-        into the new branch. The original conversation's messages JSON field
+        The branch references its parent (the conversation's main branch unless
+        ``parent_branch_id`` is given) and inherits its messages from index 0 to
+        fork_message_index (inclusive) without copying them, so forking costs
+        the same at any depth. The original conversation's messages JSON field
         is NEVER modified (immutable per ContextBranch paper).
 
         Args:
             conversation_id: The conversation to branch from.
             fork_message_index: Index of the last message to include (inclusive).
             name: Optional branch name.
+            parent_branch_id: Optional branch to fork instead of the main branch.
 
         Returns:
             Branch details dict.
 
         Raises:
-            ValueError: If conversation not found or index out of bounds.
+            ValueError: If conversation or parent branch not found, or index out of bounds.
         """
         conversation = get_agent_conversation(conversation_id)
         if not conversation:
             raise ValueError(f"Conversation not found: {conversation_id}")
 
-        # Parse messages from the conversation's JSON field
-        try:
-            messages = json.loads(conversation.get("messages", "[]"))
-        except (json.JSONDecodeError, TypeError):
-            messages = []
-
-        if not messages:
-            raise ValueError("Conversation has no messages to branch from")
-
-        if fork_message_index < 0 or fork_message_index >= len(messages):
+        if parent_branch_id:
+            parent = get_branch(parent_branch_id)
+            if not parent or parent["conversation_id"] != conversation_id:
+                raise ValueError(f"Branch not found: {parent_branch_id}")
+            available = parent["message_count"]
+        else:
+            # Parse messages from the conversation's JSON field
+            try:
+                messages = json.loads(conversation.get("messages", "[]"))
+            except (json.JSONDecodeError, TypeError):
+                messages = []
+
+            if not messages:
+                raise ValueError("Conversation has no messages to branch from")
+            parent = None
+            available = len(messages)
+
+        if fork_message_index < 0 or fork_message_index >= available:
             raise ValueError(
-                f"fork_message_index {fork_message_index} out of bounds (0 to {len(messages) - 1})"
+                f"fork_message_index {fork_message_index} out of bounds (0 to {available - 1})"
             )
 
-        # Create the branch record
+        if parent is None:
+            parent = sync_root_branch(conversation_id, messages)
+
+        fork_msg = get_message_at(parent["id"], fork_message_index)
         branch_id = create_branch(
             conversation_id=conversation_id,
+            parent_branch_id=parent["id"],
+            fork_message_id=fork_msg["id"] if fork_msg else None,
             name=name,
+            fork_index=fork_message_index,
         )
         if not branch_id:
             raise ValueError("Failed to create branch record")
 
-        # Deep-copy messages up to the fork point into individual rows
-        prev_message_id = None
-        fork_msg_id = None
-
-        for idx in range(fork_message_index + 1):
-            msg = messages[idx]
-            role = msg.get("role", "user")
-            content = msg.get("content", "")
-
-            message_id = create_message(
-                conversation_id=conversation_id,
-                branch_id=branch_id,
-                role=role,
-                content=content,
-                parent_message_id=prev_message_id,
-                message_index=idx,
-            )
-            prev_message_id = message_id
-
-            if idx == fork_message_index:
-                fork_msg_id = message_id
-
-        # Update branch with fork_message_id
-        if fork_msg_id:
-            from ..db.connection import get_connection
-
-            with get_connection() as conn:
-                conn.execute(
-                    "UPDATE conversation_branches SET fork_message_id = ? WHERE id = ?",
-                    (fork_msg_id, branch_id),
-                )
-                conn.commit()
-
         branch = get_branch(branch_id)
         return branch if branch else {"branch_id": branch_id}
 
@@ -135,26 +127,11 @@ class ConversationBranchService:
         except (json.JSONDecodeError, TypeError):
             messages = []
 
-        branch_id = create_branch(
-            conversation_id=conversation_id,
-            name="main",
-        )
-        if not branch_id:
-            raise ValueError("Failed to create main branch record")
-
-        prev_message_id = None
-        for idx, msg in enumerate(messages):
-            role = msg.get("role", "user")
-            content = msg.get("content", "")
-            message_id = create_message(
-                conversation_id=conversation_id,
-                branch_id=branch_id,
-                role=role,
-                content=content,
-                parent_message_id=prev_message_id,
-                message_index=idx,
-            )
-            prev_message_id = message_id
+        try:
+            branch_id = create_root_branch(conversation_id, messages, name="main")
+        except Exception as e:
+            logger.error("Failed to create main branch: %s", e)
+            raise ValueError("Failed to create main branch record") from e
 
         branch = get_branch(branch_id)
         return branch if branch else {"branch_id": branch_id}
@@ -174,30 +151,9 @@ class ConversationBranchService:
         Raises:
             ValueError: If branch not found.
         """
-        branch = get_branch(branch_id)
-        if not branch:
-            raise ValueError(f"Branch not found: {branch_id}")
-
-        conversation_id = branch["conversation_id"]
-        message_count = count_messages_for_branch(branch_id)
-
-        # Get the last message to set as parent
-        branch_messages = get_messages_for_branch(branch_id, conversation_id)
-        parent_message_id = branch_messages[-1]["id"] if branch_messages else None
-
-        message_id = create_message(
-            conversation_id=conversation_id,
-            branch_id=branch_id,
-            role=role,
-            content=content,
-            parent_message_id=parent_message_id,
-            message_index=message_count,
-        )
-
+        message_id = append_message(branch_id, role, content)
         if not message_id:
-            raise ValueError("Failed to create message")
-
-        from ..db.conversation_branches import get_message
+            raise ValueError(f"Branch not found: {branch_id}")
 
         msg = get_message(message_id)
         return msg if msg else {"id": message_id}
@@ -229,12 +185,9 @@ class ConversationBranchService:
             conversation_id: The conversation to get branches for.
 
         Returns:
-            List of branch dicts with message_count field added.
+            List of branch dicts, each with its stored message_count.
         """
-        branches = get_branches_for_conversation(conversation_id)
-        for branch in branches:
-            branch["message_count"] = count_messages_for_branch(branch["id"])
-        return branches
+        return get_branches_for_conversation(conversation_id)
 
     @classmethod
     def get_branch_tree(cls, conversation_id: str) -> dict:
@@ -258,7 +211,7 @@ class ConversationBranchService:
                 "name": b.get("name"),
                 "status": b.get("status", "active"),
                 "fork_message_id": b.get("fork_message_id"),
-                "message_count": count_messages_for_branch(b["id"]),
+                "message_count": b["message_count"],
                 "children": [],
             }
             branch_map[b["id"]] = node
@@ -21,14 +21,38 @@ class DiffContextService:
     """Service for extracting diff-aware context from PR diffs."""
 
     CONTEXT_LINES = 10
+    CHARS_PER_TOKEN = 4
+
+    # Hunks in these files are the first to go when trimming to a token budget
+    LOW_VALUE_FILENAMES = frozenset(
+        {
+            "package-lock.json",
+            "yarn.lock",
+            "pnpm-lock.yaml",
+            "poetry.lock",
+            "uv.lock",
+            "Cargo.lock",
+            "Gemfile.lock",
+            "composer.lock",
+            "go.sum",
+        }
+    )
+    LOW_VALUE_SUFFIXES = (".min.js", ".min.css", ".map", ".snap", ".svg")
+    LOW_VALUE_DIRS = frozenset({"dist", "vendor", "node_modules", "__snapshots__"})
 
     @classmethod
-    def extract_pr_diff_context(cls, diff_text: str, context_lines: Optional[int] = None) -> str:
+    def extract_pr_diff_context(
+        cls,
+        diff_text: str,
+        context_lines: Optional[int] = None,
+        token_budget: Optional[int] = None,
+    ) -> str:
         """Extract focused context from a unified diff.
 
         Args:
             diff_text: Raw unified diff text (e.g., from `git diff`).
             context_lines: Number of context lines around changes (default 10).
+            token_budget: Optional cap on the rendered size; see ``render_patch_set``.
 
         Returns:
             Formatted context string with only changed files and hunks.
@@ -43,49 +67,121 @@ class DiffContextService:
             logger.warning("Failed to parse diff: %s", e)
             return f"[Failed to parse diff: {e}]"
 
+        return cls.render_patch_set(patch_set, token_budget=token_budget)
+
+    @classmethod
+    def render_patch_set(cls, patch_set: PatchSet, token_budget: Optional[int] = None) -> str:
+        """Render a parsed diff as focused context.
+
+        When ``token_budget`` is set and the full rendering exceeds it, the
+        lowest-value hunks are dropped first (lockfiles, minified/generated
+        files, then hunks with the fewest changed lines) until it fits. File
+        headers are always kept, with a note of how many hunks were omitted.
+        """
         if not patch_set:
             return ""
 
-        parts = []
-
+        # (header lines, [(hunk text, value)]) per file, in diff order
+        files = []
         for patched_file in patch_set:
             # Skip binary files
             if patched_file.is_binary_file:
-                parts.append(f"[Binary file: {patched_file.path} -- skipped]")
+                files.append(([f"[Binary file: {patched_file.path} -- skipped]"], []))
                 continue
 
+            header = []
             # Handle renamed files
             if patched_file.source_file and patched_file.target_file:
                 source = patched_file.source_file.lstrip("a/")
                 target = patched_file.target_file.lstrip("b/")
                 if source != target:
-                    parts.append(f"## {target} (renamed from {source})")
+                    header.append(f"## {target} (renamed from {source})")
                 else:
-                    parts.append(f"## {target}")
+                    header.append(f"## {target}")
             else:
-                parts.append(f"## {patched_file.path}")
+                header.append(f"## {patched_file.path}")
 
             # Add summary line
-            parts.append(f"+{patched_file.added} -{patched_file.removed} lines changed")
-            parts.append("")
+            header.append(f"+{patched_file.added} -{patched_file.removed} lines changed")
+            header.append("")
 
-            # Include all hunks with context
+            low_value = cls._is_low_value_path(patched_file.path)
+            hunks = []
             for hunk in patched_file:
-                parts.append(
+                lines = [
                     f"@@ -{hunk.source_start},{hunk.source_length} "
                     f"+{hunk.target_start},{hunk.target_length} @@"
-                )
+                ]
                 for line in hunk:
                     if line.is_added:
-                        parts.append(f"+{line.value.rstrip()}")
+                        lines.append(f"+{line.value.rstrip()}")
                     elif line.is_removed:
-                        parts.append(f"-{line.value.rstrip()}")
+                        lines.append(f"-{line.value.rstrip()}")
                     else:
-                        parts.append(f" {line.value.rstrip()}")
+                        lines.append(f" {line.value.rstrip()}")
+                lines.append("")
+                value = 0 if low_value else hunk.added + hunk.removed
+                hunks.append(("\n".join(lines), value))
+            files.append((header, hunks))
+
+        dropped = cls._select_dropped_hunks(files, token_budget)
+
+        parts = []
+        for file_idx, (header, hunks) in enumerate(files):
+            parts.extend(header)
+            omitted = 0
+            for hunk_idx, (text, _value) in enumerate(hunks):
+                if (file_idx, hunk_idx) in dropped:
+                    omitted += 1
+                else:
+                    parts.append(text)
+            if omitted:
+                parts.append(f"[{omitted} hunk(s) omitted to fit token budget]")
                 parts.append("")
 
         return "\n".join(parts).strip()
 
+    @classmethod
+    def _is_low_value_path(cls, path: str) -> bool:
+        name = path.rsplit("/", 1)[-1]
+        return (
+            name in cls.LOW_VALUE_FILENAMES
+            or name.endswith(cls.LOW_VALUE_SUFFIXES)
+            or any(part in cls.LOW_VALUE_DIRS for part in path.split("/")[:-1])
+        )
+
+    @classmethod
+    def _select_dropped_hunks(cls, files: list, token_budget: Optional[int]) -> set:
+        """Pick (file, hunk) indices to drop so the rendering fits ``token_budget``."""
+        if not token_budget or token_budget <= 0:
+            return set()
+
+        def tokens(text: str) -> int:
+            return (len(text) + cls.CHARS_PER_TOKEN - 1) // cls.CHARS_PER_TOKEN
+
+        total = sum(
+            tokens("\n".join(header)) + sum(tokens(text) for text, _ in hunks)
+            for header, hunks in files
+        )
+        if total <= token_budget:
+            return set()
+
+        # Cheapest value first; among equals, shed the biggest hunk first
+        candidates = sorted(
+            (
+                (value, -tokens(text), file_idx, hunk_idx)
+                for file_idx, (_, hunks) in enumerate(files)
+                for hunk_idx, (text, value) in enumerate(hunks)
+            )
+        )
+        dropped = set()
+        for _value, neg_tokens, file_idx, hunk_idx in candidates:
+            if total <= token_budget:
+                break
+            dropped.add((file_idx, hunk_idx))
+            total += neg_tokens
+        return dropped
+
     @classmethod
     def extract_from_repo(
         cls,
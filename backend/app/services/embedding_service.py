@@ -2,6 +2,8 @@
 
 import logging
 import struct
+import threading
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
@@ -10,6 +12,11 @@ _model = None
 _MODEL_NAME = "all-MiniLM-L6-v2"
 _DIMENSION = 384
 
+# Recently embedded query texts — recall paths embed the same query repeatedly
+_QUERY_CACHE_SIZE = 256
+_query_cache: "OrderedDict[str, list[float]]" = OrderedDict()
+_query_cache_lock = threading.Lock()
+
 
 def get_model():
     """Lazy-load the sentence-transformers model."""
@@ -49,6 +56,30 @@ def embed_text(text: str) -> list[float] | None:
     return results[0] if results else None
 
 
+def embed_query(text: str) -> list[float] | None:
+    """Embed a search query, reusing the vector of a recently seen identical query."""
+    with _query_cache_lock:
+        cached = _query_cache.get(text)
+        if cached is not None:
+            _query_cache.move_to_end(text)
+            return cached
+    embedding = embed_text(text)
+    if embedding is None:
+        return None
+    with _query_cache_lock:
+        _query_cache[text] = embedding
+        _query_cache.move_to_end(text)
+        while len(_query_cache) > _QUERY_CACHE_SIZE:
+            _query_cache.popitem(last=False)
+    return embedding
+
+
+def clear_query_cache() -> None:
+    """Drop cached query embeddings (e.g. after the model changes, or in tests)."""
+    with _query_cache_lock:
+        _query_cache.clear()
+
+
 def serialize_embedding(embedding: list[float]) -> bytes:
     """Serialize embedding to bytes for SQLite BLOB storage."""
     return struct.pack(f"{len(embedding)}f", *embedding)
@@ -156,6 +156,29 @@ class ExecutionLogService:
             },
         )
 
+        # Execution-history reports now include this run
+        from .execution_report_cache import ExecutionReportCache
+
+        ExecutionReportCache.invalidate()
+
+        # Incremental per-trigger health stats + immediate alerting
+        trigger_id = execution.get("trigger_id") if execution else None
+        if trigger_id:
+            try:
+                from .health_monitor_service import HealthMonitorService
+
+                HealthMonitorService.on_execution_finished(
+                    trigger_id, status, duration_ms, finished_at.isoformat()
+                )
+            except Exception as e:
+                logger.warning("Health stats update failed for %s: %s", execution_id, e)
+            try:
+                from .bot_sla_service import BotSlaService
+
+                BotSlaService.on_execution_finished(execution_id, trigger_id, status, duration_ms)
+            except Exception as e:
+                logger.warning("SLA stats update failed for %s: %s", execution_id, e)
+
         # Post-execution notification hook (INT-01, INT-02)
         # Deferred import to avoid circular imports. NotificationService may not
         # exist yet (plans execute in parallel), so ImportError is expected and
@@ -163,7 +186,6 @@ class ExecutionLogService:
         try:
             from .notification_service import NotificationService
 
-            trigger_id = execution.get("trigger_id") if execution else None
             NotificationService.on_execution_complete(
                 execution_id=execution_id,
                 trigger_id=trigger_id,
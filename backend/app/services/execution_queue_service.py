@@ -5,6 +5,7 @@ Replaces fire-and-forget thread dispatch with a durable queue that:
 - Enforces per-trigger concurrency caps (default 1)
 - Checks circuit breaker state before dispatching
 - Dispatches in FIFO order within priority levels
+- Holds delayed entries (e.g. rate-limit retries) until their not_before time
 
 Architecture follows persist-queue (2025) SQLite-backed queue patterns.
 """
@@ -12,6 +13,8 @@ Architecture follows persist-queue (2025) SQLite-backed queue patterns.
 import json
 import logging
 import threading
+import time
+from datetime import datetime, timezone
 from typing import ClassVar, Dict, Optional
 
 from ..db.execution_queue import (
@@ -23,6 +26,7 @@ from ..db.execution_queue import (
     reset_stale_dispatching,
     update_entry_status,
 )
+from .pipeline_tracer import PipelineTracer
 
 logger = logging.getLogger(__name__)
 
@@ -92,6 +96,8 @@ class ExecutionQueueService:
         trigger_type: str,
         message_text: str = "",
         event_data: Optional[dict] = None,
+        delay_seconds: float = 0,
+        attempt: int = 0,
     ) -> str:
         """Enqueue an execution for later dispatch.
 
@@ -100,6 +106,8 @@ class ExecutionQueueService:
             trigger_type: One of webhook, github, schedule, manual.
             message_text: Rendered message/prompt text.
             event_data: Event payload dict (will be JSON-serialized).
+            delay_seconds: Hold the entry back from dispatch for this many seconds.
+            attempt: Retry attempt number (0 for a first delivery).
 
         Returns:
             Queue entry ID.
@@ -121,6 +129,8 @@ class ExecutionQueueService:
             trigger_type=trigger_type,
             message_text=message_text,
             event_data=event_json,
+            delay_seconds=delay_seconds,
+            attempt=attempt,
         )
         logger.info("Enqueued execution %s for trigger %s (%s)", entry_id, trigger_id, trigger_type)
         return entry_id
@@ -201,6 +211,14 @@ class ExecutionQueueService:
         entry_id = entry["id"]
         trigger_id = entry["trigger_id"]
         trigger_type = entry["trigger_type"]
+        trace = PipelineTracer.begin(
+            "queue.dispatch",
+            "queue_entry",
+            entry_id,
+            metadata={"trigger_id": trigger_id, "attempt": entry.get("attempt", 0)},
+        )
+        trace_status = "completed"
+        cls._record_queue_wait(trace, entry)
 
         try:
             from ..database import get_trigger
@@ -235,8 +253,27 @@ class ExecutionQueueService:
             logger.info("Queue entry %s completed successfully", entry_id)
 
         except Exception:
+            trace_status = "error"
             logger.exception("Queue entry %s failed", entry_id)
             update_entry_status(entry_id, "failed", expected_status="dispatching")
+        finally:
+            PipelineTracer.end(trace, trace_status)
+
+    @staticmethod
+    def _record_queue_wait(trace, entry: dict) -> None:
+        """Record time spent waiting in the queue (from when the entry became due)."""
+        due = entry.get("not_before") or entry.get("created_at")
+        if not due:
+            return
+        try:
+            due_at = datetime.strptime(due, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+        except (TypeError, ValueError):
+            return
+        start = due_at.timestamp()
+        trace.context["queue_wait_ms"] = max(0, int((time.time() - start) * 1000))
+        trace.record_span(
+            "queue.wait", min(start, time.time()), delayed=bool(entry.get("not_before"))
+        )
 
     @classmethod
     def get_concurrency_cap(cls, trigger_id: str) -> int:
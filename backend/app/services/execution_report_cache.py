@@ -0,0 +1,54 @@
+"""Cached execution-history reports, kept until the next execution finishes.
+
+Dashboards such as the cross-team insights and the weekly report only change
+when executions finish, so their results are cached under a generation that
+``ExecutionLogService.finish_execution`` bumps. A short TTL also bounds how
+long writes made elsewhere (retention purges, acknowledged alerts) stay hidden.
+"""
+
+import copy
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class ExecutionReportCache:
+    """Report results keyed by name, invalidated whenever an execution finishes."""
+
+    TTL_SECONDS = 60.0
+
+    _entries: Dict[Hashable, Tuple[int, float, Any]] = {}
+    _generation = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_or_compute(cls, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached result for ``key``, computing it on a miss.
+
+        Callers get their own copy, so mutating a result never alters the cache.
+        """
+        now = time.monotonic()
+        with cls._lock:
+            generation = cls._generation
+            entry = cls._entries.get(key)
+            if entry and entry[0] == generation and now - entry[1] < cls.TTL_SECONDS:
+                return copy.deepcopy(entry[2])
+
+        value = compute()
+        with cls._lock:
+            # An execution that finished while computing makes the result stale
+            if cls._generation == generation:
+                cls._entries[key] = (generation, now, copy.deepcopy(value))
+        return value
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop every cached report (an execution finished)."""
+        with cls._lock:
+            cls._generation += 1
+            cls._entries.clear()
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop every cached report. Used for testing."""
+        cls.invalidate()
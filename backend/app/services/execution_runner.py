@@ -19,8 +19,10 @@ from .audit_log_service import AuditLogService
 from .budget_service import BudgetService
 from .execution_log_service import ExecutionLogService
 from .github_service import GitHubService
+from .pipeline_tracer import PipelineTracer
 from .process_manager import ProcessManager
 from .rate_limit_service import RateLimitService
+from .usage_stream import LiveUsageTracker
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +39,8 @@ def stream_pipe(
     """Read from a pipe line by line and stream to log service.
 
     When stream_name is 'stderr' and backend_type is provided, checks each line
-    for rate limit patterns and flags the execution if detected.
+    for rate limit patterns and flags the execution if detected. stdout lines
+    also feed the execution's live usage parser, if one was started.
 
     Args:
         execution_id: The execution trace ID
@@ -48,12 +51,18 @@ def stream_pipe(
         transient_failure_detected: Shared dict to record transient failure detections
         lock: Threading lock guarding the shared dicts
     """
+    first_line = True
     try:
         for line in iter(pipe.readline, ""):
             if line:
+                if first_line:
+                    PipelineTracer.mark(execution_id, "first_output")
+                    first_line = False
                 content = line.rstrip("\n\r")
                 ExecutionLogService.append_log(execution_id, stream_name, content)
                 logger.debug("[%s] %s", stream_name, content)
+                if stream_name == "stdout":
+                    LiveUsageTracker.feed(execution_id, content)
 
                 # Check for rate limit patterns in stderr
                 if stream_name == "stderr" and backend_type:
@@ -126,8 +135,11 @@ def budget_monitor(
         if process.poll() is not None:
             break
         try:
-            # Check cost budget
-            budget_check = BudgetService.check_budget(entity_type, entity_id)
+            # Check cost budget, including what this run has spent so far
+            live_cost = BudgetService.usage_cost(
+                LiveUsageTracker.usage(execution_id), LiveUsageTracker.model(execution_id)
+            )
+            budget_check = BudgetService.check_budget(entity_type, entity_id, pending_usd=live_cost)
             if not budget_check["allowed"]:
                 reason = budget_check.get("reason", "hard limit reached")
                 logger.warning(
@@ -236,7 +248,7 @@ def clone_repos(path_entries: list, cloned_dirs: list, github_repo_map: dict) ->
     return effective_paths
 
 
-def build_subprocess_env(env_overrides: dict) -> Optional[dict]:
+def build_subprocess_env(env_overrides: dict, execution_id: Optional[str] = None) -> Optional[dict]:
     """Build subprocess environment, injecting vault secrets and account overrides.
 
     Returns a merged env dict (os.environ + overrides + vault secrets), or None if no
@@ -247,7 +259,9 @@ def build_subprocess_env(env_overrides: dict) -> Optional[dict]:
         from app.services.secret_vault_service import SecretVaultService
 
         if SecretVaultService.is_configured():
-            vault_secrets = SecretVaultService.get_secrets_for_execution(scope="global")
+            vault_secrets = SecretVaultService.get_secrets_for_execution(
+                scope="global", execution_id=execution_id
+            )
             if vault_secrets:
                 if env_overrides is None:
                     env_overrides = {}
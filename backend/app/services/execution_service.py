@@ -14,6 +14,8 @@ import shutil
 import signal
 import subprocess
 import threading
+import time
+import uuid
 from typing import Dict, List, Optional
 
 from app.config import (
@@ -33,7 +35,6 @@ from ..database import (
 from .audit_log_service import AuditLogService
 from .budget_service import BudgetService
 from .command_builder import CommandBuilder
-from .diff_context_service import DiffContextService
 from .execution_log_service import ExecutionLogService
 from .execution_retry import ExecutionRetryManager
 from .execution_runner import (
@@ -41,10 +42,12 @@ from .execution_runner import (
     build_subprocess_env,
     budget_monitor,
     clone_repos,
-    fetch_pr_diff,
     stream_pipe,
 )
+from .execution_workspace import ExecutionWorkspace, WorkspaceRegistry, claude_config_dir
 from .github_service import GitHubService
+from .pipeline_tracer import PipelineTracer
+from .pr_diff_cache import PRDiffCache
 from .process_manager import ProcessManager
 from .prompt_renderer import PromptRenderer
 from .trigger_dispatcher import (
@@ -53,6 +56,7 @@ from .trigger_dispatcher import (
     dispatch_webhook_event as _dispatch_webhook_event,
     match_payload as _match_payload,
 )
+from .usage_stream import LiveUsageTracker
 
 logger = logging.getLogger(__name__)
 
@@ -122,9 +126,6 @@ class ExecutionService:
     _rate_limit_detected = ExecutionRetryManager._rate_limit_detected
     _transient_failure_detected = ExecutionRetryManager._transient_failure_detected
     _rate_limit_lock = ExecutionRetryManager._rate_limit_lock
-    _pending_retries = ExecutionRetryManager._pending_retries
-    _retry_timers = ExecutionRetryManager._retry_timers
-    _retry_counts = ExecutionRetryManager._retry_counts
 
     @classmethod
     def was_rate_limited(cls, execution_id: str) -> Optional[int]:
@@ -144,7 +145,7 @@ class ExecutionService:
         event: Optional[dict],
         trigger_type: str,
         cooldown_seconds: int,
-    ) -> None:
+    ) -> Optional[str]:
         """Schedule a retry execution after rate-limit cooldown expires."""
         return ExecutionRetryManager.schedule_retry(
             trigger, message_text, event, trigger_type, cooldown_seconds
@@ -155,11 +156,6 @@ class ExecutionService:
         """Return a snapshot of all pending rate-limit retries keyed by trigger_id."""
         return ExecutionRetryManager.get_pending_retries()
 
-    @classmethod
-    def restore_pending_retries(cls) -> int:
-        """Re-schedule any pending retries persisted in the DB. Returns the count restored."""
-        return ExecutionRetryManager.restore_pending_retries()
-
     # ── Status / event persistence ────────────────────────────────────────────
 
     @classmethod
@@ -214,13 +210,6 @@ class ExecutionService:
         logger.info("Saved threat report: %s", filepath)
         return filepath
 
-    # ── Execution runner helpers (delegated to execution_runner) ──────────────
-
-    @staticmethod
-    def _fetch_pr_diff(event: dict) -> Optional[str]:
-        """Fetch PR diff text from GitHub."""
-        return fetch_pr_diff(event)
-
     # Execution timeout bounds imported from app.config
     TIMEOUT_MIN = EXECUTION_TIMEOUT_MIN
     TIMEOUT_MAX = EXECUTION_TIMEOUT_MAX
@@ -234,6 +223,8 @@ class ExecutionService:
         model: str = None,
         codex_settings: dict = None,
         allowed_tools: str = None,
+        session_id: str = None,
+        resume: bool = False,
     ) -> list:
         """Build the CLI command for the specified backend.
 
@@ -241,7 +232,7 @@ class ExecutionService:
         call sites (including test mocks) continue to resolve.
         """
         return CommandBuilder.build(
-            backend, prompt, allowed_paths, model, codex_settings, allowed_tools
+            backend, prompt, allowed_paths, model, codex_settings, allowed_tools, session_id, resume
         )
 
     @classmethod
@@ -280,9 +271,11 @@ class ExecutionService:
         return clone_repos(path_entries, cloned_dirs, github_repo_map)
 
     @staticmethod
-    def _build_subprocess_env(env_overrides: dict) -> Optional[dict]:
+    def _build_subprocess_env(
+        env_overrides: dict, execution_id: Optional[str] = None
+    ) -> Optional[dict]:
         """Build subprocess environment, injecting vault secrets and account overrides."""
-        return build_subprocess_env(env_overrides)
+        return build_subprocess_env(env_overrides, execution_id)
 
     @classmethod
     def run_trigger(
@@ -294,32 +287,59 @@ class ExecutionService:
         env_overrides: dict = None,
         account_id: int = None,
         working_directory: str = None,
+        workspace: ExecutionWorkspace = None,
+        resume_session_id: str = None,
     ) -> Optional[str]:
-        """Execute a trigger's prompt with real-time log streaming. Returns execution_id."""
+        """Execute a trigger's prompt with real-time log streaming. Returns execution_id.
+
+        ``workspace`` continues a rotated execution in its existing checkout:
+        ``message_text`` is used as the prompt verbatim and the clones are taken
+        over instead of made. ``resume_session_id`` resumes that CLI session
+        (backends in ``CommandBuilder.SESSION_BACKENDS`` only).
+        """
         trigger_id = trigger["id"]
         execution_id = None
         cloned_dirs = []  # temp dirs to clean up
         github_repo_map = {}  # clone_dir -> repo_url (for auto-resolve PR flow)
+        trace = PipelineTracer.begin(
+            "execution", "trigger", trigger_id, metadata={"trigger_type": trigger_type}
+        )
+        trace_status, trace_error = "completed", None
 
         try:
-            # Get detailed path info (includes path_type and github_repo_url)
-            path_entries = get_paths_for_trigger_detailed(trigger_id)
-
-            effective_paths = cls._clone_repos(path_entries, cloned_dirs, github_repo_map)
-
-            paths_str = ", ".join(effective_paths) if effective_paths else "no paths configured"
-
-            # Render prompt from template (delegated to PromptRenderer)
-            prompt = PromptRenderer.render(trigger, trigger_id, message_text, paths_str, event)
-            PromptRenderer.warn_unresolved(prompt, trigger.get("name", trigger_id), logger)
+            if workspace is not None:
+                # Continuation of a rotated execution: its checkout (including any
+                # uncommitted edits) and clones carry over to this run
+                effective_paths = list(workspace.paths)
+                cloned_dirs.extend(workspace.cloned_dirs)
+                github_repo_map.update(workspace.github_repo_map)
+                working_directory = working_directory or workspace.cwd
+                prompt = message_text
+            else:
+                # Get detailed path info (includes path_type and github_repo_url)
+                with trace.span("paths.resolve_and_clone") as span:
+                    path_entries = get_paths_for_trigger_detailed(trigger_id)
+                    effective_paths = cls._clone_repos(path_entries, cloned_dirs, github_repo_map)
+                    span.update(paths=len(path_entries), clones=len(cloned_dirs))
+
+                paths_str = ", ".join(effective_paths) if effective_paths else "no paths configured"
+
+                # Render prompt from template (delegated to PromptRenderer)
+                with trace.span("prompt.render"):
+                    prompt = PromptRenderer.render(
+                        trigger, trigger_id, message_text, paths_str, event
+                    )
+                    PromptRenderer.warn_unresolved(prompt, trigger.get("name", trigger_id), logger)
 
-            # EXE-02: Inject diff-aware context for github_pr trigger events
-            # Extracts focused diff context from PR to reduce token costs by 40-80%
-            if trigger_type in ("github_webhook", "github_pr") and event:
-                try:
-                    pr_diff_text = cls._fetch_pr_diff(event)
-                    if pr_diff_text:
-                        diff_context = DiffContextService.extract_pr_diff_context(pr_diff_text)
+                # EXE-02: Inject diff-aware context for github_pr trigger events
+                # Extracts focused diff context from PR to reduce token costs by 40-80%.
+                # The diff is fetched and parsed once per PR head and shared by every
+                # trigger the event fans out to.
+                if trigger_type in ("github_webhook", "github_pr") and event:
+                    try:
+                        with trace.span("diff.fetch") as span:
+                            diff_context = PRDiffCache.get_context(event)
+                            span["chars"] = len(diff_context)
                         if diff_context:
                             prompt = f"{prompt}\n\n--- PR Diff Context ---\n{diff_context}"
                             logger.info(
@@ -327,12 +347,12 @@ class ExecutionService:
                                 len(diff_context),
                                 trigger.get("name", trigger_id),
                             )
-                except Exception as e:
-                    logger.warning(
-                        "Failed to inject diff context for trigger '%s': %s",
-                        trigger.get("name", trigger_id),
-                        e,
-                    )
+                    except Exception as e:
+                        logger.warning(
+                            "Failed to inject diff context for trigger '%s': %s",
+                            trigger.get("name", trigger_id),
+                            e,
+                        )
 
             # For security audit skill, save message as threat report and prepend path
             if "/weekly-security-audit" in prompt:
@@ -344,8 +364,18 @@ class ExecutionService:
             backend = trigger["backend_type"]
             model = trigger.get("model")
             allowed_tools = trigger.get("allowed_tools")
+            # Record the CLI session under a known id so a rotation can resume it
+            session_id = None
+            if CommandBuilder.supports_session_resume(backend):
+                session_id = resume_session_id or str(uuid.uuid4())
             cmd = cls.build_command(
-                backend, prompt, effective_paths, model, allowed_tools=allowed_tools
+                backend,
+                prompt,
+                effective_paths,
+                model,
+                allowed_tools=allowed_tools,
+                session_id=session_id,
+                resume=bool(session_id and resume_session_id),
             )
 
             # Wrap with stdbuf to force line-buffered output for real-time streaming
@@ -375,6 +405,19 @@ class ExecutionService:
             # Trace logger — prefixes all subsequent log lines with the execution ID
             # so that trigger receipt -> subprocess output -> completion can be correlated.
             tlog = _trace_logger(execution_id)
+            PipelineTracer.bind_execution(execution_id, trace)
+            WorkspaceRegistry.register(
+                ExecutionWorkspace(
+                    execution_id=execution_id,
+                    cwd=effective_cwd,
+                    paths=effective_paths,
+                    cloned_dirs=cloned_dirs,
+                    github_repo_map=github_repo_map,
+                    backend_type=backend,
+                    session_id=session_id,
+                    config_dir=claude_config_dir(env_overrides) if session_id else None,
+                )
+            )
             tlog.info(
                 "Execution started: trigger='%s' backend=%s cwd=%s cmd=%s...",
                 trigger["name"],
@@ -400,7 +443,8 @@ class ExecutionService:
             try:
                 from ..db.health_alerts import create_health_alert
 
-                budget_check = BudgetService.check_budget("trigger", trigger_id)
+                with trace.span("budget.check"):
+                    budget_check = BudgetService.check_budget("trigger", trigger_id)
                 if not budget_check["allowed"]:
                     limit_info = budget_check.get("limit") or {}
                     reason = budget_check.get("reason", "hard limit reached")
@@ -467,24 +511,29 @@ class ExecutionService:
                     exc_info=True,
                 )
 
-            # Build process environment with optional overrides (includes vault secrets)
-            proc_env = cls._build_subprocess_env(env_overrides)
-
-            # Use Popen for streaming output (start_new_session for process group management)
-            process = subprocess.Popen(
-                cmd,
-                cwd=effective_cwd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,  # Line buffered
-                start_new_session=True,  # Process group for clean cleanup
-                env=proc_env,
-            )
+            with trace.span("process.spawn", backend=backend):
+                # Build process environment with optional overrides (includes vault secrets)
+                proc_env = cls._build_subprocess_env(env_overrides, execution_id)
+
+                # Use Popen for streaming output (start_new_session for process group management)
+                process = subprocess.Popen(
+                    cmd,
+                    cwd=effective_cwd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    bufsize=1,  # Line buffered
+                    start_new_session=True,  # Process group for clean cleanup
+                    env=proc_env,
+                )
+            spawned_at = time.time()
 
             # Register with ProcessManager for cancellation and shutdown tracking
             ProcessManager.register(execution_id, process, trigger_id)
 
+            # Usage is parsed from stdout as it streams (see usage_stream)
+            LiveUsageTracker.start(execution_id, backend)
+
             # Start threads to read stdout and stderr
             stdout_thread = threading.Thread(
                 target=cls._stream_pipe, args=(execution_id, "stdout", process.stdout), daemon=True
@@ -530,6 +579,10 @@ class ExecutionService:
                     tlog.warning("stdout reader thread still alive after kill")
                 if stderr_thread.is_alive():
                     tlog.warning("stderr reader thread still alive after kill")
+                if WorkspaceRegistry.is_handed_off(execution_id):
+                    tlog.info("Execution rotated to another account; continuation owns it")
+                    return execution_id
+                cls._record_stream_spans(trace, spawned_at, status="timeout")
                 tlog.warning("Trigger '%s' timed out after %s", trigger["name"], timeout_label)
                 ExecutionLogService.append_log(
                     execution_id,
@@ -572,13 +625,19 @@ class ExecutionService:
                     "[WARNING] stderr reader did not exit cleanly — output may be incomplete",
                 )
 
+            cls._record_stream_spans(trace, spawned_at, exit_code=exit_code)
+
             tlog.info("%s exit code: %d", backend, exit_code)
             ExecutionLogService.append_log(
                 execution_id, "stderr", f"[EXIT] {backend} exit code: {exit_code}"
             )
 
+            # Rotated to another account: RotationService already finished this
+            # execution and the continuation run owns the workspace
+            if WorkspaceRegistry.is_handed_off(execution_id):
+                tlog.info("Execution rotated to another account; continuation owns it")
             # Check if this execution was cancelled via the cancel endpoint
-            if ProcessManager.is_cancelled(execution_id):
+            elif ProcessManager.is_cancelled(execution_id):
                 ExecutionLogService.finish_execution(
                     execution_id=execution_id,
                     status=ExecutionState.CANCELLED,
@@ -602,9 +661,12 @@ class ExecutionService:
                     # Get scan output from execution logs
                     scan_output = ExecutionLogService.get_stdout_log(execution_id)
                     auto_resolve_and_pr(trigger, github_repo_map, scan_output)
-                ExecutionLogService.finish_execution(
-                    execution_id=execution_id, status=ExecutionState.SUCCESS, exit_code=exit_code
-                )
+                with trace.span("log.flush"):
+                    ExecutionLogService.finish_execution(
+                        execution_id=execution_id,
+                        status=ExecutionState.SUCCESS,
+                        exit_code=exit_code,
+                    )
                 AuditLogService.log(
                     action="execution.finish",
                     entity_type="trigger",
@@ -615,31 +677,32 @@ class ExecutionService:
 
                 # Extract and record token usage after successful execution
                 try:
-                    stdout_log = ExecutionLogService.get_stdout_log(execution_id)
-                    usage_data = BudgetService.extract_token_usage(stdout_log, backend)
-                    if usage_data:
-                        entity_type = trigger.get("_entity_type", "trigger")
-                        entity_id = trigger.get("_entity_id", trigger_id)
-                        BudgetService.record_usage(
-                            execution_id=execution_id,
-                            entity_type=entity_type,
-                            entity_id=entity_id,
-                            backend_type=backend,
-                            account_id=account_id,
-                            usage_data=usage_data,
-                        )
+                    with trace.span("usage.extract"):
+                        usage_data = LiveUsageTracker.finish(execution_id)
+                        if usage_data:
+                            entity_type = trigger.get("_entity_type", "trigger")
+                            entity_id = trigger.get("_entity_id", trigger_id)
+                            BudgetService.record_usage(
+                                execution_id=execution_id,
+                                entity_type=entity_type,
+                                entity_id=entity_id,
+                                backend_type=backend,
+                                account_id=account_id,
+                                usage_data=usage_data,
+                            )
                 except (TypeError, ValueError) as e:
                     tlog.error("Failed to record token usage: %s", e, exc_info=True)
                 except Exception:
                     tlog.exception("Unexpected error recording token usage")
             else:
                 error_msg = f"Exit code: {exit_code}"
-                ExecutionLogService.finish_execution(
-                    execution_id=execution_id,
-                    status=ExecutionState.FAILED,
-                    exit_code=exit_code,
-                    error_message=error_msg,
-                )
+                with trace.span("log.flush"):
+                    ExecutionLogService.finish_execution(
+                        execution_id=execution_id,
+                        status=ExecutionState.FAILED,
+                        exit_code=exit_code,
+                        error_message=error_msg,
+                    )
                 AuditLogService.log(
                     action="execution.finish",
                     entity_type="trigger",
@@ -655,6 +718,7 @@ class ExecutionService:
         except FileNotFoundError:
             backend = trigger.get("backend_type", "claude")
             error_msg = f"{backend} command not found"
+            trace_status, trace_error = "error", error_msg
             logger.error("%s. Is %s CLI installed?", error_msg, backend, exc_info=True)
             if execution_id:
                 ExecutionLogService.finish_execution(
@@ -662,26 +726,44 @@ class ExecutionService:
                 )
         except Exception as e:
             error_msg = str(e)
+            trace_status, trace_error = "error", error_msg
             logger.exception("Error running trigger '%s'", trigger["name"])
             if execution_id:
                 ExecutionLogService.finish_execution(
                     execution_id=execution_id, status=ExecutionState.FAILED, error_message=error_msg
                 )
         finally:
-            # Clean up all cloned directories (each wrapped independently to ensure all are attempted)
-            for d in cloned_dirs:
-                try:
-                    GitHubService.cleanup_clone(d)
-                except OSError as e:
-                    logger.error("Failed to clean up cloned directory %s: %s", d, e, exc_info=True)
-                except Exception:
-                    logger.exception("Unexpected error cleaning up cloned directory: %s", d)
+            # Clean up all cloned directories (each wrapped independently to ensure all are
+            # attempted) unless a rotation handed them to a continuation run
+            if WorkspaceRegistry.release(execution_id):
+                cls.cleanup_workspace(cloned_dirs)
             # Remove from ProcessManager tracking
             if execution_id:
                 ProcessManager.cleanup(execution_id)
+                LiveUsageTracker.finish(execution_id)
+            PipelineTracer.end(trace, trace_status, trace_error)
 
         return execution_id
 
+    @staticmethod
+    def cleanup_workspace(cloned_dirs: List[str]) -> None:
+        """Remove an execution's cloned directories, attempting every one."""
+        for d in cloned_dirs:
+            try:
+                GitHubService.cleanup_clone(d)
+            except OSError as e:
+                logger.error("Failed to clean up cloned directory %s: %s", d, e, exc_info=True)
+            except Exception:
+                logger.exception("Unexpected error cleaning up cloned directory: %s", d)
+
+    @staticmethod
+    def _record_stream_spans(trace, spawned_at: float, status: str = "completed", **attrs):
+        """Record time-to-first-output and total stream time for a finished process."""
+        first_output = trace.marks.get("first_output")
+        if first_output is not None:
+            trace.record_span("output.first", spawned_at, first_output)
+        trace.record_span("output.stream", spawned_at, status=status, **attrs)
+
     @classmethod
     def _auto_resolve_and_pr(
         cls, trigger: dict, github_repo_map: dict, scan_output: str
@@ -0,0 +1,138 @@
+"""Working directories of running executions, kept alive across account rotation.
+
+``run_trigger`` registers the workspace it prepared (cloned repos, resolved
+paths, cwd and the CLI session id). When ``RotationService`` switches an
+execution to another account it takes the workspace over with ``hand_off``
+before stopping the process; the original run then leaves the clones in
+place and the continuation run reuses (and eventually cleans up) them.
+"""
+
+import glob
+import logging
+import os
+import shutil
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExecutionWorkspace:
+    """Everything a continuation run needs to pick up where an execution stopped."""
+
+    execution_id: str
+    cwd: str
+    paths: List[str]
+    cloned_dirs: List[str] = field(default_factory=list)
+    github_repo_map: Dict[str, str] = field(default_factory=dict)
+    backend_type: Optional[str] = None
+    session_id: Optional[str] = None
+    # CLI config directory the session was recorded under (account-specific)
+    config_dir: Optional[str] = None
+    handed_off: bool = False
+
+
+class WorkspaceRegistry:
+    """Registry of live execution workspaces keyed by execution_id."""
+
+    _workspaces: Dict[str, ExecutionWorkspace] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def register(cls, workspace: ExecutionWorkspace) -> None:
+        with cls._lock:
+            cls._workspaces[workspace.execution_id] = workspace
+
+    @classmethod
+    def get(cls, execution_id: str) -> Optional[ExecutionWorkspace]:
+        with cls._lock:
+            return cls._workspaces.get(execution_id)
+
+    @classmethod
+    def hand_off(cls, execution_id: str) -> Optional[ExecutionWorkspace]:
+        """Take ownership of an execution's workspace for a continuation run.
+
+        Must be called before the execution's process is stopped, so its run
+        sees the hand-off when the process exits. Returns None if the execution
+        has no live workspace or it was already handed off.
+        """
+        with cls._lock:
+            workspace = cls._workspaces.get(execution_id)
+            if workspace is None or workspace.handed_off:
+                return None
+            workspace.handed_off = True
+            return workspace
+
+    @classmethod
+    def reclaim(cls, execution_id: str) -> bool:
+        """Undo ``hand_off`` when the execution's process could not be stopped.
+
+        Returns False if the run already ended while its workspace was handed
+        off, i.e. nobody will clean it up unless the caller does.
+        """
+        with cls._lock:
+            workspace = cls._workspaces.get(execution_id)
+            if workspace is None:
+                return False
+            workspace.handed_off = False
+            return True
+
+    @classmethod
+    def is_handed_off(cls, execution_id: str) -> bool:
+        with cls._lock:
+            workspace = cls._workspaces.get(execution_id)
+            return bool(workspace and workspace.handed_off)
+
+    @classmethod
+    def release(cls, execution_id: Optional[str]) -> bool:
+        """Forget an execution's workspace when its run ends.
+
+        Returns False if the workspace was handed off, i.e. the caller must not
+        clean it up because a continuation run owns it now.
+        """
+        if execution_id is None:
+            return True
+        with cls._lock:
+            workspace = cls._workspaces.pop(execution_id, None)
+        return not (workspace and workspace.handed_off)
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget all workspaces. Used for testing."""
+        with cls._lock:
+            cls._workspaces.clear()
+
+
+def claude_config_dir(env_overrides: Optional[dict] = None) -> str:
+    """Config directory the claude CLI records sessions under for these overrides."""
+    configured = (env_overrides or {}).get("CLAUDE_CONFIG_DIR") or os.environ.get(
+        "CLAUDE_CONFIG_DIR"
+    )
+    return configured or os.path.join(os.path.expanduser("~"), ".claude")
+
+
+def carry_claude_session(session_id: str, source_dir: str, target_dir: str) -> bool:
+    """Make a recorded claude session resumable from another config directory.
+
+    Sessions live at ``<config>/projects/<project>/<session_id>.jsonl``; the file
+    is copied to the same project folder under ``target_dir``. Returns False if
+    the session was never recorded (nothing to resume).
+    """
+    pattern = os.path.join(glob.escape(source_dir), "projects", "*", f"{session_id}.jsonl")
+    matches = glob.glob(pattern)
+    if not matches:
+        return False
+    if os.path.realpath(source_dir) == os.path.realpath(target_dir):
+        return True
+    source = matches[0]
+    project = os.path.basename(os.path.dirname(source))
+    target = os.path.join(target_dir, "projects", project)
+    try:
+        os.makedirs(target, exist_ok=True)
+        shutil.copy2(source, os.path.join(target, os.path.basename(source)))
+    except OSError as e:
+        logger.warning("Could not copy claude session %s to %s: %s", session_id, target_dir, e)
+        return False
+    return True
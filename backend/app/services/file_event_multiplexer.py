@@ -0,0 +1,246 @@
+"""FileEventMultiplexer -- one filesystem watcher shared by all session monitors.
+
+ALL STATE IN THIS SERVICE IS TRANSIENT (IN-MEMORY ONLY).
+
+A single watchdog observer (inotify on Linux, FSEvents on macOS) serves every
+subscribed directory; subscriptions on the same directory share one watch. A
+single dispatcher thread delivers each subscriber's changed paths as one
+debounced batch and runs delayed callbacks (``call_later``). While nothing
+changes the dispatcher sleeps on a condition variable, so monitors cost
+nothing per session while their files are quiet: no polling threads, no
+periodic ``listdir``/``stat`` or subprocess calls.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+logger = logging.getLogger(__name__)
+
+WatchKey = Tuple[str, bool]
+
+
+class _MultiplexHandler(FileSystemEventHandler):
+    """Forwards every event of one watched directory to the multiplexer."""
+
+    # Writes show up as modify/close; atomic saves and git ref updates as moves
+    EVENT_TYPES = frozenset({"created", "modified", "moved", "closed"})
+
+    def __init__(self, key: WatchKey) -> None:
+        super().__init__()
+        self.key = key
+
+    def dispatch(self, event) -> None:
+        if event.is_directory or event.event_type not in self.EVENT_TYPES:
+            return
+        path = getattr(event, "dest_path", "") or event.src_path
+        FileEventMultiplexer._on_event(self.key, path)
+
+
+class FileEventMultiplexer:
+    """Shared watchdog observer with debounced per-subscriber dispatch.
+
+    Follows the classmethod singleton pattern from ProjectSessionManager.
+    All state is class-level, protected by a condition variable's lock.
+    """
+
+    # Quiet time after the last event before a batch is delivered
+    DEBOUNCE_SECONDS = 0.5
+    # Upper bound on how long a continuously changing directory delays its batch
+    MAX_BATCH_DELAY_SECONDS = 2.0
+
+    _observer = None
+    _dispatcher: Optional[threading.Thread] = None
+    _watches: Dict[WatchKey, object] = {}
+    _watch_subscribers: Dict[WatchKey, Set[int]] = {}
+    # subscription_id -> (watch key, callback(paths), optional path filter)
+    _subscriptions: Dict[int, Tuple[WatchKey, Callable, Optional[Callable]]] = {}
+    # subscription_id -> changed paths (insertion-ordered) and (first event, deadline)
+    _pending: Dict[int, Dict[str, None]] = {}
+    _due: Dict[int, Tuple[float, float]] = {}
+    # timer_id -> (deadline, callback)
+    _timers: Dict[int, Tuple[float, Callable]] = {}
+    _ids = itertools.count(1)
+    _cond = threading.Condition()
+    # Serializes observer schedule/unschedule calls; _on_event never takes it
+    _observer_lock = threading.Lock()
+
+    @classmethod
+    def subscribe(
+        cls,
+        path: str,
+        callback: Callable[[List[str]], None],
+        recursive: bool = True,
+        path_filter: Optional[Callable[[str], bool]] = None,
+    ) -> int:
+        """Deliver batches of paths changed under ``path`` to ``callback``.
+
+        Args:
+            path: Existing directory to watch.
+            callback: Called on the dispatcher thread with the changed paths.
+            recursive: Also watch subdirectories.
+            path_filter: Optional predicate; paths it rejects are dropped early.
+
+        Returns:
+            Subscription id for ``unsubscribe``.
+        """
+        key = (str(path), recursive)
+        with cls._observer_lock:
+            with cls._cond:
+                cls._ensure_started()
+                observer = cls._observer
+                needs_watch = key not in cls._watch_subscribers
+                subscription_id = next(cls._ids)
+                cls._subscriptions[subscription_id] = (key, callback, path_filter)
+                cls._watch_subscribers.setdefault(key, set()).add(subscription_id)
+            if needs_watch:
+                # Never call into the observer while holding _cond: its thread holds
+                # the observer lock while dispatching into _on_event, which takes _cond.
+                try:
+                    watch = observer.schedule(_MultiplexHandler(key), key[0], recursive=recursive)
+                except Exception:
+                    with cls._cond:
+                        cls._subscriptions.pop(subscription_id, None)
+                        cls._watch_subscribers.pop(key, None)
+                    raise
+                with cls._cond:
+                    cls._watches[key] = watch
+        return subscription_id
+
+    @classmethod
+    def unsubscribe(cls, subscription_id: int) -> None:
+        """Stop a subscription; the directory watch goes when its last subscriber does."""
+        with cls._observer_lock:
+            with cls._cond:
+                entry = cls._subscriptions.pop(subscription_id, None)
+                cls._pending.pop(subscription_id, None)
+                cls._due.pop(subscription_id, None)
+                if entry is None:
+                    return
+                key = entry[0]
+                subscribers = cls._watch_subscribers.get(key, set())
+                subscribers.discard(subscription_id)
+                if subscribers:
+                    return
+                cls._watch_subscribers.pop(key, None)
+                watch = cls._watches.pop(key, None)
+                observer = cls._observer
+            if watch is not None and observer is not None:
+                try:
+                    observer.unschedule(watch)
+                except Exception:
+                    logger.debug("Error unscheduling watch on %s", key[0], exc_info=True)
+
+    @classmethod
+    def call_later(cls, delay: float, callback: Callable[[], None]) -> int:
+        """Run ``callback`` on the dispatcher thread after ``delay`` seconds.
+
+        Returns:
+            Timer id for ``cancel``.
+        """
+        with cls._cond:
+            cls._ensure_started()
+            timer_id = next(cls._ids)
+            cls._timers[timer_id] = (time.monotonic() + delay, callback)
+            cls._cond.notify()
+        return timer_id
+
+    @classmethod
+    def cancel(cls, timer_id: Optional[int]) -> None:
+        """Cancel a pending ``call_later`` callback (no-op if it already ran)."""
+        if timer_id is None:
+            return
+        with cls._cond:
+            cls._timers.pop(timer_id, None)
+
+    @classmethod
+    def _on_event(cls, key: WatchKey, path: str) -> None:
+        """Queue a changed path for every subscriber of the watch (observer thread)."""
+        now = time.monotonic()
+        with cls._cond:
+            for subscription_id in cls._watch_subscribers.get(key, ()):
+                path_filter = cls._subscriptions[subscription_id][2]
+                if path_filter is not None and not path_filter(path):
+                    continue
+                cls._pending.setdefault(subscription_id, {})[path] = None
+                first = cls._due.get(subscription_id, (now, now))[0]
+                deadline = min(now + cls.DEBOUNCE_SECONDS, first + cls.MAX_BATCH_DELAY_SECONDS)
+                cls._due[subscription_id] = (first, deadline)
+            cls._cond.notify()
+
+    @classmethod
+    def _ensure_started(cls) -> None:
+        """Start the shared observer and dispatcher thread (caller holds the lock)."""
+        if cls._observer is None:
+            observer = Observer()
+            observer.daemon = True
+            observer.start()
+            cls._observer = observer
+        if cls._dispatcher is None:
+            dispatcher = threading.Thread(
+                target=cls._dispatch_loop, name="file-event-multiplexer", daemon=True
+            )
+            cls._dispatcher = dispatcher
+            dispatcher.start()
+
+    @classmethod
+    def _next_deadline(cls) -> Optional[float]:
+        deadlines = [deadline for _, deadline in cls._due.values()]
+        deadlines.extend(deadline for deadline, _ in cls._timers.values())
+        return min(deadlines, default=None)
+
+    @classmethod
+    def _dispatch_loop(cls) -> None:
+        """Deliver due batches and timers; sleeps until the next deadline or event."""
+        me = threading.current_thread()
+        while True:
+            with cls._cond:
+                while True:
+                    if cls._dispatcher is not me:
+                        return
+                    deadline = cls._next_deadline()
+                    now = time.monotonic()
+                    if deadline is not None and deadline <= now:
+                        break
+                    cls._cond.wait(None if deadline is None else deadline - now)
+
+                batches = []
+                for subscription_id, (_, due) in list(cls._due.items()):
+                    if due <= now:
+                        del cls._due[subscription_id]
+                        paths = list(cls._pending.pop(subscription_id, {}))
+                        callback = cls._subscriptions[subscription_id][1]
+                        batches.append((callback, (paths,)))
+                for timer_id, (due, callback) in list(cls._timers.items()):
+                    if due <= now:
+                        del cls._timers[timer_id]
+                        batches.append((callback, ()))
+
+            for callback, args in batches:
+                try:
+                    callback(*args)
+                except Exception:
+                    logger.warning("File event callback failed", exc_info=True)
+
+    @classmethod
+    def reset(cls) -> None:
+        """Stop the observer and dispatcher and drop all subscriptions. Used for testing."""
+        with cls._observer_lock:
+            with cls._cond:
+                observer = cls._observer
+                cls._observer = None
+                cls._dispatcher = None
+                cls._watches, cls._watch_subscribers, cls._subscriptions = {}, {}, {}
+                cls._pending, cls._due, cls._timers = {}, {}, {}
+                cls._cond.notify_all()
+            if observer is not None:
+                try:
+                    observer.stop()
+                    observer.join(timeout=5)
+                except Exception:
+                    logger.debug("Error stopping shared observer", exc_info=True)
@@ -88,9 +88,15 @@ class GitHubService:
     def clone_repo(repo_url: str, target_dir: str = None) -> str:
         """Clone a GitHub repo with --recursive to a temp directory.
 
+        Working copies come from the shared local mirror (RepoMirrorCache) when
+        it is enabled, falling back to a direct ``gh repo clone`` if the mirror
+        cannot be created or refreshed. Call ``cleanup_clone`` when done.
+
         Returns the path to the cloned directory.
         Raises RuntimeError on failure.
         """
+        from .repo_mirror_cache import RepoMirrorCache
+
         # Validate URL format before passing to subprocess
         owner, repo_name = GitHubService.parse_repo_url(repo_url)
 
@@ -98,6 +104,17 @@ class GitHubService:
             prefix = f"agented_clone_{owner}_{repo_name}_"
             target_dir = tempfile.mkdtemp(prefix=prefix)
 
+        if RepoMirrorCache.enabled():
+            try:
+                RepoMirrorCache.checkout(owner, repo_name, target_dir)
+                logger.info("Cloned %s to %s from local mirror", repo_url, target_dir)
+                return target_dir
+            except Exception as e:
+                logger.warning("Mirror clone of %s failed, cloning directly: %s", repo_url, e)
+                # git clone needs an empty target
+                shutil.rmtree(target_dir, ignore_errors=True)
+                os.makedirs(target_dir, exist_ok=True)
+
         try:
             # Use owner/repo format instead of raw URL
             result = subprocess.run(
@@ -123,6 +140,10 @@ class GitHubService:
     @staticmethod
     def cleanup_clone(clone_path: str) -> bool:
         """Remove a cloned repository directory."""
+        from .repo_mirror_cache import RepoMirrorCache
+
+        if clone_path:
+            RepoMirrorCache.release(clone_path)
         try:
             if clone_path and os.path.isdir(clone_path):
                 shutil.rmtree(clone_path)
@@ -2,6 +2,11 @@
 
 Clones/pulls a configured git repository, compares YAML config files against
 DB state, and applies changes via ConfigExportService.import_trigger(upsert=True).
+Polls first ask the remote for the branch tip (``git ls-remote``) and only fetch
+when it moved; after a fetch, only config files changed since the last synced
+commit are processed, plus any file that failed or conflicted on an earlier
+sync. Every ``FULL_RESYNC_SECONDS`` all config files are compared against the
+DB so drift made outside Git is re-applied.
 Conflicts are detected via content hashing; Git wins by default (standard GitOps).
 """
 
@@ -19,6 +24,7 @@ import yaml
 from app.db.gitops import (
     add_sync_log,
     get_gitops_repo,
+    get_pending_files,
     list_gitops_repos,
     update_sync_state,
 )
@@ -37,12 +43,18 @@ class GitOpsSyncService:
 
     _scheduler_jobs: dict = {}
 
+    # Interval between full passes that compare every config file to the DB
+    FULL_RESYNC_SECONDS = 3600
+
     @classmethod
     def sync_repo(cls, repo_id: str, dry_run: bool = False) -> dict:
         """Sync a single GitOps repository.
 
         Clones or pulls the repo, detects YAML config changes, and applies
-        them via import_trigger(upsert=True).
+        them via import_trigger(upsert=True). Unchanged remotes are skipped
+        without fetching, and only files changed since the last synced commit
+        are re-imported, together with files that failed or conflicted on the
+        previous sync. Dry runs and periodic full passes compare every file.
 
         Args:
             repo_id: The gitops repo ID to sync.
@@ -70,6 +82,30 @@ class GitOpsSyncService:
             }
 
         local_path = cls._get_local_path(repo_id)
+        last_sha = repo.get("last_commit_sha")
+        pending = get_pending_files(repo)
+        full_pass = dry_run or not last_sha or cls._full_resync_due(repo)
+        can_skip = not dry_run and not pending and not full_pass
+
+        # Cheap pre-check: if the remote branch hasn't moved, skip the fetch entirely
+        if can_skip and os.path.isdir(os.path.join(local_path, ".git")):
+            remote_sha = cls._remote_head_sha(repo["repo_url"], repo["branch"])
+            if remote_sha == last_sha:
+                add_sync_log(
+                    repo_id=repo_id,
+                    commit_sha=last_sha,
+                    status="skipped",
+                    details=json.dumps({"reason": "no_changes"}),
+                )
+                return {
+                    "commit_sha": last_sha,
+                    "files_changed": 0,
+                    "files_applied": 0,
+                    "files_conflicted": 0,
+                    "changes": [],
+                    "status": "skipped",
+                }
+
         try:
             # Clone or pull
             current_sha = cls._ensure_repo(local_path, repo["repo_url"], repo["branch"])
@@ -100,8 +136,7 @@ class GitOpsSyncService:
             }
 
         # Check if anything changed
-        last_sha = repo.get("last_commit_sha")
-        if current_sha == last_sha and not dry_run:
+        if can_skip and current_sha == last_sha:
             add_sync_log(
                 repo_id=repo_id,
                 commit_sha=current_sha,
@@ -117,15 +152,31 @@ class GitOpsSyncService:
                 "status": "skipped",
             }
 
-        # Find YAML config files
+        # Only files touched since the last synced commit (plus earlier
+        # failures) need processing; a full pass compares every config file.
         config_dir = os.path.join(local_path, repo["config_path"])
-        yaml_files = sorted(
-            glob.glob(os.path.join(config_dir, "*.yaml"))
-            + glob.glob(os.path.join(config_dir, "*.yml"))
-        )
-
-        changes = []
-        files_changed = 0
+        changed = None
+        if not full_pass:
+            changed = cls._changed_config_files(
+                local_path, repo["config_path"], last_sha, current_sha
+            )
+        if changed is None:
+            full_pass = True
+            yaml_files = sorted(
+                glob.glob(os.path.join(config_dir, "*.yaml"))
+                + glob.glob(os.path.join(config_dir, "*.yml"))
+            )
+            removed_files = []
+        else:
+            yaml_files, removed_files = changed
+            retry = [os.path.join(config_dir, name) for name in pending]
+            yaml_files = sorted(set(yaml_files) | {p for p in retry if os.path.isfile(p)})
+
+        changes = [
+            {"file": os.path.basename(path), "action": "removed", "applied": False}
+            for path in removed_files
+        ]
+        files_changed = len(removed_files)
         files_applied = 0
         files_conflicted = 0
 
@@ -156,7 +207,18 @@ class GitOpsSyncService:
         now = datetime.now(timezone.utc).isoformat()
 
         if not dry_run:
-            update_sync_state(repo_id, current_sha, now)
+            # Keep failed and conflicted files so the next sync retries them
+            # even if their commit is never touched again.
+            retry_files = sorted(
+                {c["file"] for c in changes if c.get("error") or c.get("conflict")}
+            )
+            update_sync_state(
+                repo_id,
+                current_sha,
+                now,
+                pending_files=retry_files,
+                full_sync_at=now if full_pass else None,
+            )
 
         add_sync_log(
             repo_id=repo_id,
@@ -373,6 +435,87 @@ class GitOpsSyncService:
         """Get the local cache path for a repo clone."""
         return os.path.join(_CACHE_BASE, repo_id)
 
+    @classmethod
+    def _remote_head_sha(cls, repo_url: str, branch: str) -> Optional[str]:
+        """Return the remote branch tip via ``git ls-remote``, or None if unknown."""
+        try:
+            result = subprocess.run(
+                ["git", "ls-remote", repo_url, f"refs/heads/{branch}"],
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=30,
+            )
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+            logger.debug("git ls-remote failed for %s: %s", repo_url, e)
+            return None
+        fields = result.stdout.split()
+        return fields[0] if fields else None
+
+    @classmethod
+    def _full_resync_due(cls, repo: dict) -> bool:
+        """Return True if the repo's last full-tree pass is older than FULL_RESYNC_SECONDS."""
+        last_full = repo.get("last_full_sync_at")
+        if not last_full:
+            return True
+        try:
+            last_full_at = datetime.fromisoformat(last_full)
+        except (TypeError, ValueError):
+            return True
+        if last_full_at.tzinfo is None:
+            last_full_at = last_full_at.replace(tzinfo=timezone.utc)
+        elapsed = (datetime.now(timezone.utc) - last_full_at).total_seconds()
+        return elapsed >= cls.FULL_RESYNC_SECONDS
+
+    @classmethod
+    def _changed_config_files(
+        cls, local_path: str, config_path: str, last_sha: str, current_sha: str
+    ) -> Optional[tuple[list[str], list[str]]]:
+        """List config files added/modified and removed between two commits.
+
+        Only ``*.yaml``/``*.yml`` files directly inside ``config_path`` count
+        (matching the full-scan glob). Returns ``(changed_paths, removed_paths)``
+        as absolute paths, or None if the diff is unavailable (e.g. the last
+        synced commit was force-pushed away), in which case callers rescan.
+        """
+        try:
+            result = subprocess.run(
+                [
+                    "git",
+                    "-C",
+                    local_path,
+                    "diff",
+                    "--name-status",
+                    "--no-renames",
+                    last_sha,
+                    current_sha,
+                    "--",
+                    config_path,
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=30,
+            )
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+            logger.info("git diff unavailable for %s, rescanning all configs: %s", local_path, e)
+            return None
+
+        config_dir = os.path.normpath(config_path)
+        changed: list[str] = []
+        removed: list[str] = []
+        for line in result.stdout.splitlines():
+            status, _, rel_path = line.partition("\t")
+            if not rel_path:
+                continue
+            if os.path.normpath(os.path.dirname(rel_path) or ".") != config_dir:
+                continue
+            if not rel_path.endswith((".yaml", ".yml")):
+                continue
+            abs_path = os.path.join(local_path, rel_path)
+            (removed if status.startswith("D") else changed).append(abs_path)
+        return sorted(changed), sorted(removed)
+
     @classmethod
     def _ensure_repo(cls, local_path: str, repo_url: str, branch: str) -> str:
         """Clone or pull a git repo and return the current HEAD SHA.
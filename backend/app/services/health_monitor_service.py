@@ -1,6 +1,7 @@
 """Health monitoring service for detecting bot health issues.
 
-Runs as an APScheduler background job every 5 minutes. Detects:
+Executions update per-trigger rolling stats (trigger_health_stats) as they
+finish; an APScheduler background job sweeps that table every 5 minutes. Detects:
 - Consecutive execution failures (>= threshold)
 - Slow executions (>3x average duration)
 - Missing scheduled trigger fires (>2x expected interval)
@@ -24,6 +25,7 @@ class HealthMonitorService:
 
     CONSECUTIVE_FAILURE_THRESHOLD = 3
     SLOW_EXECUTION_MULTIPLIER = 3.0
+    MIN_DURATION_SAMPLES = 5
     MISSING_FIRE_MULTIPLIER = 2
 
     @classmethod
@@ -59,30 +61,62 @@ class HealthMonitorService:
 
         logger.info("Health monitor service initialized (5-min interval)")
 
+    @classmethod
+    def on_execution_finished(
+        cls,
+        trigger_id: str,
+        status: str,
+        duration_ms: Optional[int] = None,
+        finished_at: Optional[str] = None,
+    ) -> None:
+        """Fold a finished execution into the trigger's stats and alert immediately.
+
+        Called from ExecutionLogService.finish_execution, so failure streaks and
+        slow runs are detected as they happen rather than on the next sweep.
+        """
+        from ..db.trigger_health import record_execution_outcome
+
+        stats = record_execution_outcome(trigger_id, status, duration_ms, finished_at)
+        if not stats:
+            return
+        cls._check_consecutive_failures(stats)
+        cls._check_slow_execution(stats)
+
     @classmethod
     def _check_health(cls) -> None:
-        """Main health check loop. Iterates all triggers and checks for issues."""
+        """Main health check sweep over the per-trigger stats table."""
+        from ..db.trigger_health import get_all_trigger_health_stats
         from ..db.triggers import get_all_triggers
 
         now = datetime.now(timezone.utc)
         cls._last_check_time = now.isoformat()
 
         try:
+            all_stats = get_all_trigger_health_stats()
             triggers = get_all_triggers()
         except Exception as e:
             logger.error("Health check: failed to load triggers: %s", e, exc_info=True)
             return
 
+        for stats in all_stats:
+            try:
+                cls._check_consecutive_failures(stats)
+                cls._check_slow_execution(stats)
+            except Exception as e:
+                logger.error(
+                    "Health check failed for trigger %s: %s",
+                    stats["trigger_id"],
+                    e,
+                    exc_info=True,
+                )
+
         for trigger in triggers:
-            trigger_id = trigger["id"]
             try:
-                cls._check_consecutive_failures(trigger_id)
-                cls._check_slow_execution(trigger_id)
                 cls._check_missing_fire(trigger)
             except Exception as e:
                 logger.error(
                     "Health check failed for trigger %s: %s",
-                    trigger_id,
+                    trigger["id"],
                     e,
                     exc_info=True,
                 )
@@ -90,67 +124,43 @@ class HealthMonitorService:
         logger.debug("Health check completed at %s", cls._last_check_time)
 
     @classmethod
-    def _check_consecutive_failures(cls, trigger_id: str) -> None:
-        """Check for consecutive execution failures using a simple reverse-chronological loop."""
+    def _check_consecutive_failures(cls, stats: dict) -> None:
+        """Alert when the trigger's current failure streak reaches the threshold."""
         from ..db.health_alerts import create_health_alert
-        from ..db.triggers import get_execution_logs_for_trigger
-
-        # Get last 10 executions
-        logs = get_execution_logs_for_trigger(trigger_id, limit=10)
-        if not logs:
-            return
-
-        # Count consecutive failures from most recent
-        consecutive_failures = 0
-        for log in logs:
-            if log.get("status") == "failed":
-                consecutive_failures += 1
-            else:
-                break
 
+        consecutive_failures = stats.get("consecutive_failures") or 0
         if consecutive_failures >= cls.CONSECUTIVE_FAILURE_THRESHOLD:
             create_health_alert(
                 alert_type="consecutive_failure",
-                trigger_id=trigger_id,
+                trigger_id=stats["trigger_id"],
                 message=(f"Trigger has {consecutive_failures} consecutive failed executions"),
                 details={"consecutive_count": consecutive_failures},
                 severity="critical" if consecutive_failures >= 5 else "warning",
             )
 
     @classmethod
-    def _check_slow_execution(cls, trigger_id: str) -> None:
-        """Check if the most recent execution is abnormally slow (>3x average)."""
+    def _check_slow_execution(cls, stats: dict) -> None:
+        """Check if the most recent execution is abnormally slow (>3x typical duration).
+
+        "Typical" is the duration EWMA as it stood before the latest run.
+        """
         from ..db.health_alerts import create_health_alert
-        from ..db.triggers import get_execution_logs_for_trigger
-
-        # Get last 20 executions
-        logs = get_execution_logs_for_trigger(trigger_id, limit=20)
-        if len(logs) < 5:
-            return  # Not enough history for comparison
-
-        # Calculate average duration from completed executions with duration_ms
-        durations = [
-            log["duration_ms"]
-            for log in logs
-            if log.get("duration_ms") is not None and log["duration_ms"] > 0
-        ]
-        if len(durations) < 5:
-            return
 
-        avg_duration = sum(durations) / len(durations)
-        if avg_duration <= 0:
+        recent_duration = stats.get("last_duration_ms")
+        if recent_duration is None or recent_duration <= 0:
+            return
+        # Need enough history (excluding the latest run) for a meaningful baseline
+        if (stats.get("duration_samples") or 0) <= cls.MIN_DURATION_SAMPLES:
             return
 
-        # Check the most recent execution
-        most_recent = logs[0]
-        recent_duration = most_recent.get("duration_ms")
-        if recent_duration is None or recent_duration <= 0:
+        avg_duration = stats.get("baseline_duration_ms")
+        if not avg_duration or avg_duration <= 0:
             return
 
         if recent_duration > avg_duration * cls.SLOW_EXECUTION_MULTIPLIER:
             create_health_alert(
                 alert_type="slow_execution",
-                trigger_id=trigger_id,
+                trigger_id=stats["trigger_id"],
                 message=(
                     f"Latest execution took {recent_duration}ms "
                     f"({recent_duration / avg_duration:.1f}x average of {avg_duration:.0f}ms)"
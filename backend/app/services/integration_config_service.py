@@ -1,11 +1,16 @@
 """Integration configuration service.
 
 Handles creating, configuring, and testing integrations. Retrieves credentials
-from SecretVaultService and instantiates the appropriate adapter.
+from SecretVaultService and instantiates the appropriate adapter. Adapters are
+cached per integration so repeated notifications reuse their client
+connections instead of re-decrypting credentials and reconnecting.
 """
 
+import json
 import logging
-from typing import Optional, Tuple
+import threading
+import time
+from typing import Dict, Optional, Tuple
 
 from app.db import integrations as db_integrations
 from app.models.integration import IntegrationCreate
@@ -26,6 +31,13 @@ ADAPTER_CREDENTIAL_KEYS = {
 class IntegrationConfigService:
     """Manage integration lifecycle: create, configure, test, get adapter."""
 
+    # Cached adapters are rebuilt after this long so rotated vault secrets are picked up
+    ADAPTER_CACHE_TTL_SECONDS = 300.0
+
+    # integration_id -> (config fingerprint, cached_at monotonic, adapter)
+    _adapter_cache: Dict[str, Tuple[str, float, IntegrationAdapter]] = {}
+    _adapter_cache_lock = threading.Lock()
+
     @staticmethod
     def create_integration(data: IntegrationCreate) -> str:
         """Create an integration, validate its config, and store in DB.
@@ -74,16 +86,62 @@ class IntegrationConfigService:
 
         return integration_id
 
-    @staticmethod
-    def get_adapter_for_integration(integration_id: str) -> Optional[IntegrationAdapter]:
+    @classmethod
+    def get_adapter_for_integration(cls, integration_id: str) -> Optional[IntegrationAdapter]:
         """Load an integration from DB and return a configured adapter instance.
 
-        Retrieves credentials from SecretVaultService if a secret_name is configured.
+        The adapter is cached until the integration's type or config changes,
+        or for ADAPTER_CACHE_TTL_SECONDS.
         """
         integration = db_integrations.get_integration(integration_id)
         if not integration:
+            cls.invalidate_adapter(integration_id)
             return None
 
+        fingerprint = json.dumps(
+            [integration["type"], integration.get("config", {})], sort_keys=True, default=str
+        )
+        now = time.monotonic()
+        with cls._adapter_cache_lock:
+            cached = cls._adapter_cache.get(integration_id)
+        if cached and cached[0] == fingerprint and now - cached[1] < cls.ADAPTER_CACHE_TTL_SECONDS:
+            return cached[2]
+
+        adapter = cls._build_adapter(integration)
+        with cls._adapter_cache_lock:
+            if adapter is None:
+                evicted = cls._adapter_cache.pop(integration_id, None)
+            else:
+                evicted = cls._adapter_cache.get(integration_id)
+                cls._adapter_cache[integration_id] = (fingerprint, now, adapter)
+        if evicted:
+            cls._close_adapter(evicted[2])
+        return adapter
+
+    @classmethod
+    def invalidate_adapter(cls, integration_id: Optional[str] = None) -> None:
+        """Drop the cached adapter of one integration, or of all when None."""
+        with cls._adapter_cache_lock:
+            if integration_id is None:
+                evicted = list(cls._adapter_cache.values())
+                cls._adapter_cache.clear()
+            else:
+                entry = cls._adapter_cache.pop(integration_id, None)
+                evicted = [entry] if entry else []
+        for _, _, adapter in evicted:
+            cls._close_adapter(adapter)
+
+    @staticmethod
+    def _close_adapter(adapter: IntegrationAdapter) -> None:
+        """Close an evicted adapter's connections (called outside the cache lock)."""
+        try:
+            adapter.close()
+        except Exception:
+            logger.debug("Error closing integration adapter", exc_info=True)
+
+    @staticmethod
+    def _build_adapter(integration: dict) -> Optional[IntegrationAdapter]:
+        """Instantiate an integration's adapter, with vault credentials if a secret_name is set."""
         config = integration.get("config", {})
         adapter_type = integration["type"]
         credential_keys = ADAPTER_CREDENTIAL_KEYS.get(adapter_type, [])
@@ -101,8 +159,6 @@ class IntegrationConfigService:
                 from app.services.secret_vault_service import SecretVaultService
 
                 if SecretVaultService.is_configured():
-                    import json
-
                     from app.db import secrets as db_secrets
 
                     secret_record = db_secrets.get_secret_by_name(secret_name)
@@ -29,6 +29,9 @@ class IntegrationAdapter(ABC):
         """Validate adapter configuration. Returns (is_valid, error_message)."""
         ...
 
+    def close(self) -> None:
+        """Release connections held by the adapter. The default holds none."""
+
 
 ADAPTER_REGISTRY: Dict[str, type] = {}
 
@@ -1,6 +1,7 @@
 """Microsoft Teams integration adapter via Incoming Webhooks.
 
-Sends Adaptive Card messages to a Teams channel via webhook URL POST.
+Sends Adaptive Card messages to a Teams channel via webhook URL POST. Each
+adapter keeps one HTTP client so repeated notifications reuse the connection.
 """
 
 import logging
@@ -18,6 +19,18 @@ class TeamsAdapter(IntegrationAdapter):
 
     def __init__(self, webhook_url: str = "", **kwargs):
         self.webhook_url = webhook_url
+        self._client: Optional[httpx.Client] = None
+
+    def _get_client(self) -> httpx.Client:
+        if self._client is None:
+            self._client = httpx.Client(timeout=10.0)
+        return self._client
+
+    def close(self) -> None:
+        """Close the HTTP client; a later send opens a new one."""
+        client, self._client = self._client, None
+        if client is not None:
+            client.close()
 
     def send_notification(
         self, channel: str, message: str, metadata: Optional[dict] = None
@@ -56,11 +69,7 @@ class TeamsAdapter(IntegrationAdapter):
         }
 
         try:
-            response = httpx.post(
-                self.webhook_url,
-                json=card,
-                timeout=10.0,
-            )
+            response = self._get_client().post(self.webhook_url, json=card)
             if response.status_code == 200:
                 return True
             logger.error("Teams webhook error: %s %s", response.status_code, response.text[:200])
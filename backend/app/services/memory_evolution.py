@@ -3,6 +3,7 @@
 import logging
 import math
 import re
+import sqlite3
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
@@ -69,49 +70,55 @@ def extract_entities_from_text(text: str) -> list[dict]:
     return entities
 
 
+def _graph_item(agent_id: str, message_content: str) -> dict:
+    """Build an ``ingest_graph_batch`` item from one message's extracted entities."""
+    entities = extract_entities_from_text(message_content)
+    relations = [
+        {
+            "source": entity_data["name"],
+            "source_type": entity_data["type"],
+            "target": rel["target"],
+            "target_type": rel.get("target_type", "concept"),
+            "relation_type": rel["relation_type"],
+            "confidence": 0.3,  # Co-occurrence is low confidence
+        }
+        for entity_data in entities
+        for rel in entity_data.get("relations", [])
+    ]
+    return {"agent_id": agent_id, "entities": entities, "relations": relations}
+
+
 def process_message_entities(agent_id: str, message_content: str) -> int:
     """Extract entities from a message and upsert them into the KG.
 
+    All entities and relations are written in a single transaction.
     Returns number of entities processed.
     """
-    from ..db.knowledge_graph import upsert_entity, upsert_relation
+    from ..db.knowledge_graph import ingest_graph_batch
 
-    entities = extract_entities_from_text(message_content)
-    count = 0
-
-    for entity_data in entities:
-        try:
-            upsert_entity(agent_id, entity_data["name"], entity_data["type"])
-            count += 1
-
-            for rel in entity_data.get("relations", []):
-                try:
-                    upsert_relation(
-                        agent_id=agent_id,
-                        source_name=entity_data["name"],
-                        source_type=entity_data["type"],
-                        target_name=rel["target"],
-                        target_type=rel.get("target_type", "concept"),
-                        relation_type=rel["relation_type"],
-                        confidence=0.3,  # Co-occurrence is low confidence
-                    )
-                except Exception as e:
-                    logger.debug("Failed to upsert relation: %s", e)
-        except Exception as e:
-            logger.debug("Failed to upsert entity %s: %s", entity_data["name"], e)
-
-    return count
+    item = _graph_item(agent_id, message_content)
+    if not item["entities"]:
+        return 0
+    try:
+        ingest_graph_batch([item])
+    except Exception as e:
+        logger.warning("Failed to ingest entities for agent %s: %s", agent_id, e)
+        return 0
+    return len(item["entities"])
 
 
 def process_pending_extractions(batch_size: int = 10) -> int:
     """Process messages that haven't had entity extraction yet.
 
-    Designed to be called by APScheduler periodically.
+    Designed to be called by APScheduler periodically. The whole batch,
+    including the ``kg_extraction_log`` markers, is ingested in one
+    transaction; if that fails, messages are retried one at a time so a
+    single bad message does not block the rest.
     Returns total entities extracted.
     """
     from ..db.connection import get_connection
+    from ..db.knowledge_graph import ingest_graph_batch
 
-    total = 0
     with get_connection() as conn:
         # Get agent_ids with pending messages (via thread lookup)
         cursor = conn.execute(
@@ -125,93 +132,87 @@ def process_pending_extractions(batch_size: int = 10) -> int:
             (batch_size,),
         )
         pending = cursor.fetchall()
+    if not pending:
+        return 0
 
-    for row in pending:
-        agent_id = row["agent_id"]
-        msg_id = row["id"]
-        content = row["content"]
-
-        try:
-            count = process_message_entities(agent_id, content)
-            total += count
-            # Mark as processed
-            with get_connection() as conn:
-                conn.execute(
-                    "INSERT OR IGNORE INTO kg_extraction_log (message_id) VALUES (?)",
-                    (msg_id,),
-                )
-                conn.commit()
-        except Exception as e:
-            logger.warning("Entity extraction failed for message %s: %s", msg_id, e)
+    items = [(row["id"], _graph_item(row["agent_id"], row["content"])) for row in pending]
+    total = 0
+    try:
+        ingest_graph_batch([item for _, item in items], [msg_id for msg_id, _ in items])
+        total = sum(len(item["entities"]) for _, item in items)
+    except Exception as e:
+        logger.warning("Batched entity extraction failed, retrying per message: %s", e)
+        for msg_id, item in items:
+            try:
+                ingest_graph_batch([item], [msg_id])
+                total += len(item["entities"])
+            except Exception as e:
+                logger.warning("Entity extraction failed for message %s: %s", msg_id, e)
 
     if total > 0:
         logger.info("Extracted %d entities from %d messages", total, len(pending))
     return total
 
 
-def apply_decay(agent_id: str) -> int:
-    """Apply exponential importance decay to all entities for an agent.
-
-    decay formula: importance *= exp(-effective_lambda * days_since_seen)
+# Decays every entity (optionally one agent's) that has gone at least a day
+# since it was last seen or last decayed. Elapsed time is measured from the
+# later of the two, so repeated runs compound correctly instead of re-applying
+# the full since-last-seen decay each time.
+_DECAY_SQL = """
+    UPDATE kg_entities SET
+        importance_score = CASE
+            WHEN importance_score * exp(-? / ln(1 + due.mentions) * due.days) < ? THEN 0
+            ELSE ROUND(importance_score * exp(-? / ln(1 + due.mentions) * due.days), 4)
+        END,
+        last_decayed_at = CURRENT_TIMESTAMP
+    FROM (
+        SELECT id,
+               julianday('now')
+                 - MAX(julianday(last_seen), COALESCE(julianday(last_decayed_at), 0)) AS days,
+               COALESCE(NULLIF(mention_count, 0), 1) AS mentions
+        FROM kg_entities
+        WHERE importance_score > 0 {agent_filter}
+    ) AS due
+    WHERE kg_entities.id = due.id AND due.days >= 1
+"""
+
+
+def _ensure_math_functions(conn) -> None:
+    """Register exp/ln for SQLite builds compiled without the math extension."""
+    try:
+        conn.execute("SELECT exp(0), ln(1)")
+    except sqlite3.OperationalError:
+        conn.create_function("exp", 1, math.exp, deterministic=True)
+        conn.create_function("ln", 1, math.log, deterministic=True)
+
+
+def apply_decay(agent_id: str | None = None) -> int:
+    """Apply exponential importance decay to entities whose decay is due.
+
+    decay formula: importance *= exp(-effective_lambda * days_elapsed)
     effective_lambda = BASE_LAMBDA / log(1 + mention_count)
 
-    Archives entities below ARCHIVE_THRESHOLD.
+    ``days_elapsed`` runs from the later of ``last_seen`` and the previous
+    decay; entities with less than a day elapsed are skipped. Entities that
+    fall below ARCHIVE_THRESHOLD are archived (importance set to 0). The
+    whole pass is a single UPDATE; pass ``agent_id=None`` to decay all agents.
     Returns number of entities decayed.
     """
     from ..db.connection import get_connection
 
-    count = 0
-    now = datetime.utcnow()
+    agent_filter = "AND agent_id = ?" if agent_id else ""
+    params: list = [BASE_LAMBDA, ARCHIVE_THRESHOLD, BASE_LAMBDA]
+    if agent_id:
+        params.append(agent_id)
 
     with get_connection() as conn:
-        cursor = conn.execute(
-            "SELECT id, importance_score, mention_count, last_seen "
-            "FROM kg_entities WHERE agent_id = ?",
-            (agent_id,),
-        )
-        entities = cursor.fetchall()
-
-        for entity in entities:
-            last_seen_str = entity["last_seen"]
-            if not last_seen_str:
-                continue
-
-            try:
-                # Parse last_seen timestamp
-                if "T" in last_seen_str:
-                    last_seen = datetime.fromisoformat(last_seen_str.replace("Z", "+00:00"))
-                    last_seen = last_seen.replace(tzinfo=None)
-                else:
-                    last_seen = datetime.strptime(last_seen_str, "%Y-%m-%d %H:%M:%S")
-            except (ValueError, TypeError):
-                continue
-
-            days_since = (now - last_seen).total_seconds() / 86400
-            if days_since < 1:
-                continue
-
-            mention_count = entity["mention_count"] or 1
-            effective_lambda = BASE_LAMBDA / math.log(1 + mention_count)
-            decay_factor = math.exp(-effective_lambda * days_since)
-            new_importance = entity["importance_score"] * decay_factor
-
-            if new_importance < ARCHIVE_THRESHOLD:
-                # Archive (soft delete by setting importance to 0)
-                conn.execute(
-                    "UPDATE kg_entities SET importance_score = 0 WHERE id = ?",
-                    (entity["id"],),
-                )
-            else:
-                conn.execute(
-                    "UPDATE kg_entities SET importance_score = ? WHERE id = ?",
-                    (round(new_importance, 4), entity["id"]),
-                )
-            count += 1
-
-        if count > 0:
-            conn.commit()
-            logger.info("Applied decay to %d entities for agent %s", count, agent_id)
+        _ensure_math_functions(conn)
+        cursor = conn.execute(_DECAY_SQL.format(agent_filter=agent_filter), params)
+        count = cursor.rowcount
+        conn.commit()
 
+    if count > 0:
+        logger.info("Applied decay to %d entities for agent %s", count, agent_id or "*")
     return count
 
 
@@ -349,21 +350,12 @@ def find_related_threads(agent_id: str, thread_id: str) -> list[dict]:
 
 
 def run_decay_all() -> int:
-    """Run decay for all agents. Designed for APScheduler."""
-    from ..db.connection import get_connection
-
-    total = 0
-    with get_connection() as conn:
-        cursor = conn.execute("SELECT DISTINCT agent_id FROM kg_entities")
-        agent_ids = [row["agent_id"] for row in cursor.fetchall()]
-
-    for agent_id in agent_ids:
-        try:
-            total += apply_decay(agent_id)
-        except Exception as e:
-            logger.warning("Decay failed for agent %s: %s", agent_id, e)
-
-    return total
+    """Run decay for all agents in one pass. Designed for APScheduler."""
+    try:
+        return apply_decay()
+    except Exception as e:
+        logger.warning("Decay failed: %s", e)
+        return 0
 
 
 def run_consolidation_check() -> int:
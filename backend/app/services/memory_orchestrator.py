@@ -51,6 +51,47 @@ def evaluate_retrieval_by_score(
         )
 
 
+def _recall_candidates(
+    query: str,
+    agent_id: str,
+    thread_id: str | None,
+    top_k: int,
+    alpha: float,
+) -> list[tuple[dict, float]]:
+    """Run FTS5 and vector retrieval once each and fuse them with RRF.
+
+    Both retrievers are over-fetched to ``top_k * 2``, the widest depth any
+    consumer needs, so the hybrid ranking and the CRAG evaluation scores are
+    read off the same fused list. A failing retriever only drops its side.
+    """
+    from ..db.agent_memory import fuse_rankings, recall_messages, vector_recall
+
+    try:
+        fts_results = recall_messages(
+            thread_id=thread_id,
+            query=query,
+            resource_id=agent_id,
+            resource_type="agent",
+            top_k=top_k * 2,
+            message_range=0,
+        )
+    except Exception:
+        logger.warning("FTS recall failed", exc_info=True)
+        fts_results = []
+    try:
+        vec_results = vector_recall(
+            query=query,
+            resource_id=agent_id,
+            thread_id=thread_id,
+            resource_type="agent",
+            top_k=top_k * 2,
+        )
+    except Exception:
+        logger.warning("Vector recall failed", exc_info=True)
+        vec_results = []
+    return fuse_rankings(fts_results, vec_results, top_k, alpha)
+
+
 def orchestrated_recall(
     query: str,
     agent_id: str,
@@ -65,7 +106,7 @@ def orchestrated_recall(
     """Main orchestrated recall entry point with CRAG-style routing.
 
     Flow:
-    1. Run hybrid retrieval (FTS5 + Vector via RRF)
+    1. Run hybrid retrieval (FTS5 + Vector via RRF, each retriever once)
     2. Evaluate retrieval quality (score-based)
     3. Route: correct -> return, ambiguous -> augment with KG, incorrect -> fallback
     4. Return enriched results
@@ -74,8 +115,6 @@ def orchestrated_recall(
         _expand_with_context,
         get_messages,
         hybrid_recall,
-        recall_messages,
-        vector_recall,
     )
     from ..db.knowledge_graph import (
         get_entity_context,
@@ -86,53 +125,10 @@ def orchestrated_recall(
 
     effective_thread_id = None if include_cross_thread else thread_id
 
-    # Step 1: Hybrid retrieval
-    try:
-        results = hybrid_recall(
-            query=query,
-            resource_id=agent_id,
-            thread_id=effective_thread_id,
-            resource_type="agent",
-            top_k=top_k,
-            message_range=0,  # Expand later
-            alpha=alpha,
-        )
-    except Exception:
-        logger.warning("Hybrid recall failed, falling back to FTS", exc_info=True)
-        results = []
-
-    # Compute RRF scores for evaluation
-    try:
-        fts_results = recall_messages(
-            thread_id=effective_thread_id,
-            query=query,
-            resource_id=agent_id,
-            resource_type="agent",
-            top_k=top_k * 2,
-            message_range=0,
-        )
-        vec_results = vector_recall(
-            query=query,
-            resource_id=agent_id,
-            thread_id=effective_thread_id,
-            resource_type="agent",
-            top_k=top_k * 2,
-        )
-    except Exception:
-        logger.warning("Score computation retrieval failed", exc_info=True)
-        fts_results = []
-        vec_results = []
-
-    K = 60
-    fts_ranks = {msg["id"]: rank for rank, msg in enumerate(fts_results)}
-    vec_ranks = {msg["id"]: rank for rank, (msg, _) in enumerate(vec_results)}
-    max_rank = top_k * 2 + 1
-    scores = []
-    for msg in results:
-        fts_r = fts_ranks.get(msg["id"], max_rank)
-        vec_r = vec_ranks.get(msg["id"], max_rank)
-        score = alpha / (K + fts_r) + (1 - alpha) / (K + vec_r)
-        scores.append(score)
+    # Step 1: Hybrid retrieval — ranking and evaluation scores share one candidate set
+    scored = _recall_candidates(query, agent_id, effective_thread_id, top_k, alpha)
+    results = [msg for msg, _score in scored[:top_k]]
+    scores = [score for _msg, score in scored[:top_k]]
 
     # Step 2: Evaluate retrieval
     evaluation = evaluate_retrieval_by_score(results, scores)
@@ -1,6 +1,10 @@
 """Monitoring service for periodic rate limit window tracking with consumption rates and ETA projection."""
 
 import logging
+import math
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -16,6 +20,7 @@ class MonitoringService:
 
     _job_id = "token_usage_monitoring"
     _cleanup_job_id = "snapshot_cleanup"
+    _series_compaction_job_id = "rate_limit_series_compaction"
     _last_threshold_levels: dict = {}
     _recent_alerts: list = []
     _last_polled_at: Optional[str] = None
@@ -28,6 +33,25 @@ class MonitoringService:
     # Exposed via get_status() so callers (health checks, UI) can surface this to users.
     _scheduler_unavailable: bool = False
 
+    # Concurrent provider fetches: one bounded pool shared by every poll cycle, so an
+    # overlapping poll (e.g. the startup poll racing the first scheduled run) cannot
+    # double the number of outbound requests.
+    _FETCH_MAX_WORKERS: int = 8
+    # Timeout for a single account fetch, passed to each provider request (HTTP round
+    # trip or Codex PTY scrape)
+    _FETCH_TIMEOUT_SECONDS: float = 30.0
+    _fetch_executor: Optional[ThreadPoolExecutor] = None
+    # Single-flight map: credential cache key -> in-progress fetch, shared across polls
+    _inflight_fetches: dict = {}
+    _fetch_lock = threading.Lock()
+
+    # Built status (see get_monitoring_status): (snapshot version, built_at monotonic, status).
+    # Rebuilt when a poll changes the snapshot model, on reconfigure, and after the TTL so
+    # account edits and aging windows show up.
+    _STATUS_TTL_SECONDS: float = 60.0
+    _status_cache: Optional[tuple] = None
+    _status_lock = threading.Lock()
+
     # Threshold level ordering for comparison
     _LEVEL_ORDER = {"normal": 0, "info": 1, "warning": 2, "critical": 3}
 
@@ -96,6 +120,7 @@ class MonitoringService:
         from ..database import save_monitoring_config
 
         save_monitoring_config(config)
+        cls.invalidate_status()
 
         if config.get("enabled"):
             cls._register_job(config.get("polling_minutes", 5))
@@ -163,15 +188,86 @@ class MonitoringService:
             kwargs={"days": 31},
         )
 
+        from ..database import compact_rate_limit_series
+
+        SchedulerService._scheduler.add_job(
+            func=compact_rate_limit_series,
+            trigger="interval",
+            hours=1,
+            id=cls._series_compaction_job_id,
+            replace_existing=True,
+        )
+
+    @classmethod
+    def _get_fetch_executor(cls) -> ThreadPoolExecutor:
+        """Return the shared provider-fetch pool, creating it on first use."""
+        with cls._fetch_lock:
+            if cls._fetch_executor is None:
+                cls._fetch_executor = ThreadPoolExecutor(
+                    max_workers=cls._FETCH_MAX_WORKERS, thread_name_prefix="usage-poll"
+                )
+            return cls._fetch_executor
+
+    @classmethod
+    def _submit_fetch(cls, cache_key: Optional[str], account: dict, backend_type: str) -> Future:
+        """Submit a provider usage fetch, joining an in-flight fetch for the same credentials.
+
+        Accounts without a resolvable fingerprint (``cache_key`` is None) always get
+        their own fetch.
+        """
+        from .provider_usage_client import ProviderUsageClient
+
+        executor = cls._get_fetch_executor()
+        with cls._fetch_lock:
+            if cache_key:
+                existing = cls._inflight_fetches.get(cache_key)
+                if existing is not None:
+                    return existing
+            future = executor.submit(
+                ProviderUsageClient.fetch_usage,
+                account,
+                backend_type,
+                timeout=cls._FETCH_TIMEOUT_SECONDS,
+            )
+            if cache_key:
+                cls._inflight_fetches[cache_key] = future
+
+        if cache_key:
+            # Registered outside the lock: the callback runs inline if already done
+            future.add_done_callback(lambda f, key=cache_key: cls._release_inflight(key, f))
+        return future
+
+    @classmethod
+    def _release_inflight(cls, cache_key: str, future: Future) -> None:
+        """Drop a completed fetch from the single-flight map."""
+        with cls._fetch_lock:
+            if cls._inflight_fetches.get(cache_key) is future:
+                del cls._inflight_fetches[cache_key]
+
+    @classmethod
+    def reset_fetch_pool(cls) -> None:
+        """Shut down the provider-fetch pool and forget in-flight fetches. Used for testing."""
+        with cls._fetch_lock:
+            executor = cls._fetch_executor
+            cls._fetch_executor = None
+            cls._inflight_fetches = {}
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
     @classmethod
     def _poll_usage(cls) -> None:
-        """Periodic polling job: call real provider APIs per enabled account, record snapshots."""
+        """Periodic polling job: call real provider APIs per enabled account, record snapshots.
+
+        Fetches run concurrently on a bounded pool with a per-account timeout. Accounts that
+        share credentials (same token fingerprint and plan) share a single fetch, including
+        across overlapping poll cycles. All snapshots are written in one transaction.
+        """
         from ..database import (
             get_all_accounts_with_health,
             get_monitoring_config,
-            insert_rate_limit_snapshot,
+            insert_rate_limit_snapshots,
         )
-        from .provider_usage_client import ProviderUsageClient
+        from .provider_usage_client import CredentialResolver
 
         cls._recent_alerts = []
         now = datetime.now(timezone.utc)
@@ -211,14 +307,10 @@ class MonitoringService:
 
         account_map = {str(a["id"]): a for a in all_accounts}
 
-        # Track fetched tokens to deduplicate accounts sharing the same credentials
-        fetched_tokens: dict[str, list[dict]] = {}  # fingerprint -> windows
-
-        # Track whether at least one provider API call succeeded for backoff logic
-        any_fetch_succeeded = False
-        # Count enabled, non-deduplicated accounts attempted so we can detect total failure
-        fetch_attempted = 0
-
+        # Submit one fetch per distinct credential; accounts sharing a token reuse it
+        targets: list[tuple[dict, str, Future]] = []
+        futures_by_key: dict[str, Future] = {}
+        unique_futures: list[Future] = []
         for acct_id_str, acct_cfg in accounts_config.items():
             if not acct_cfg.get("enabled", False):
                 continue
@@ -227,65 +319,86 @@ class MonitoringService:
             if not account:
                 continue
 
-            account_id = account["id"]
             backend_type = account.get("backend_type", "claude")
-
-            # Deduplicate: if this token was already fetched, reuse results
-            from .provider_usage_client import CredentialResolver
-
             fingerprint = CredentialResolver.get_token_fingerprint(account, backend_type)
             # Include plan in cache key so accounts with different plans
             # don't share cached results (e.g. plus vs pro have different models)
             plan = (account.get("plan") or "").lower()
             cache_key = f"{fingerprint}:{plan}" if fingerprint else None
-            if cache_key and cache_key in fetched_tokens:
-                windows = fetched_tokens[cache_key]
+
+            if cache_key and cache_key in futures_by_key:
+                future = futures_by_key[cache_key]
                 logger.info(
-                    f"Monitoring poll: account {account_id} shares credentials "
+                    f"Monitoring poll: account {account['id']} shares credentials "
                     f"(fingerprint {fingerprint}), reusing cached data"
                 )
             else:
-                fetch_attempted += 1
-                try:
-                    windows = ProviderUsageClient.fetch_usage(account, backend_type)
-                    any_fetch_succeeded = True
-                except Exception as e:
-                    logger.debug(
-                        f"Monitoring poll: provider API skipped for account {account_id}: {e}",
-                    )
-                    continue
-
+                future = cls._submit_fetch(cache_key, account, backend_type)
+                unique_futures.append(future)
                 if cache_key:
-                    fetched_tokens[cache_key] = windows
+                    futures_by_key[cache_key] = future
+            targets.append((account, backend_type, future))
+
+        # Each request enforces the per-account timeout; this wait only backstops a
+        # fetch stuck outside a provider request (e.g. a credential store lookup)
+        rounds = max(1, math.ceil(len(unique_futures) / cls._FETCH_MAX_WORKERS))
+        _done, not_done = wait(unique_futures, timeout=cls._FETCH_TIMEOUT_SECONDS * rounds)
 
+        # Track whether at least one provider API call succeeded for backoff logic
+        fetch_attempted = len(unique_futures)
+        any_fetch_succeeded = any(
+            f not in not_done and f.exception() is None for f in unique_futures
+        )
+
+        snapshot_rows: list[dict] = []
+        for account, backend_type, future in targets:
+            account_id = account["id"]
+            if future in not_done:
+                logger.warning(
+                    "Monitoring poll: provider fetch timed out for account %s", account_id
+                )
+                continue
+            if future.exception() is not None:
+                logger.debug(
+                    f"Monitoring poll: provider API skipped for account {account_id}: "
+                    f"{future.exception()}",
+                )
+                continue
+
+            windows = future.result()
             if not windows:
                 logger.debug(f"Monitoring poll: no windows returned for account {account_id}")
                 continue
 
             for window_data in windows:
-                # Determine threshold level
                 pct = window_data.get("percentage", 0)
-                level = cls._compute_threshold_level(pct)
-
-                # Record snapshot
-                try:
-                    insert_rate_limit_snapshot(
-                        account_id=account_id,
-                        backend_type=backend_type,
-                        window_type=window_data["window_type"],
-                        tokens_used=window_data.get("tokens_used", 0),
-                        tokens_limit=window_data.get("tokens_limit", 0),
-                        percentage=pct,
-                        threshold_level=level,
-                        resets_at=window_data.get("resets_at"),
-                    )
-                except Exception as e:
-                    logger.error(f"Monitoring poll: snapshot insert failed: {e}", exc_info=True)
-                    continue
+                snapshot_rows.append(
+                    {
+                        "account_id": account_id,
+                        "backend_type": backend_type,
+                        "window_type": window_data["window_type"],
+                        "tokens_used": window_data.get("tokens_used", 0),
+                        "tokens_limit": window_data.get("tokens_limit", 0),
+                        "percentage": pct,
+                        "threshold_level": cls._compute_threshold_level(pct),
+                        "resets_at": window_data.get("resets_at"),
+                    }
+                )
 
-                # Check threshold transition
+        # Record all snapshots in a single transaction, then evaluate transitions
+        inserted = 0
+        if snapshot_rows:
+            try:
+                inserted = insert_rate_limit_snapshots(snapshot_rows)
+            except Exception as e:
+                logger.error(f"Monitoring poll: snapshot insert failed: {e}", exc_info=True)
+        if inserted:
+            from .monitoring_snapshot import MonitoringSnapshot
+
+            MonitoringSnapshot.apply(snapshot_rows, int(time.time()))
+            for row in snapshot_rows:
                 transition = cls._check_threshold_transition(
-                    account_id, window_data["window_type"], pct
+                    row["account_id"], row["window_type"], row["percentage"]
                 )
                 if transition:
                     cls._recent_alerts.append(transition)
@@ -426,66 +539,6 @@ class MonitoringService:
 
         return delta / time_delta_minutes
 
-    @classmethod
-    def get_consumption_rates(cls, account_id: int, window_type: str, now: datetime) -> dict:
-        """Compute consumption rates using all available snapshot data.
-
-        Returns dict with rate/hour values. Unit is '%/hr' when percentage-only mode,
-        'tok/hr' otherwise. The `unit` field indicates which.
-        """
-        from ..database import get_snapshot_history
-
-        # Use a large window (31 days) to capture all available data
-        all_snapshots = get_snapshot_history(account_id, window_type, since_minutes=44640)
-        is_pct_only = False
-        if all_snapshots and all_snapshots[-1].get("tokens_limit", 0) == 0:
-            is_pct_only = True
-
-        result = {}
-        for label, minutes in [
-            ("24h", 1440),
-            ("48h", 2880),
-            ("72h", 4320),
-            ("96h", 5760),
-            ("120h", 7200),
-        ]:
-            # Filter snapshots to this window from the LATEST snapshot, not from now
-            if len(all_snapshots) >= 2:
-                try:
-                    newest_time = datetime.fromisoformat(
-                        all_snapshots[-1]["recorded_at"].replace("Z", "+00:00")
-                    )
-                    cutoff = newest_time - timedelta(minutes=minutes)
-                    windowed = [
-                        s
-                        for s in all_snapshots
-                        if datetime.fromisoformat(s["recorded_at"].replace("Z", "+00:00")) >= cutoff
-                    ]
-                    if len(windowed) >= 2:
-                        oldest = windowed[0]
-                        newest = windowed[-1]
-                        if is_pct_only:
-                            delta = newest["percentage"] - oldest["percentage"]
-                        else:
-                            delta = newest["tokens_used"] - oldest["tokens_used"]
-                        oldest_t = datetime.fromisoformat(
-                            oldest["recorded_at"].replace("Z", "+00:00")
-                        )
-                        newest_t = datetime.fromisoformat(
-                            newest["recorded_at"].replace("Z", "+00:00")
-                        )
-                        time_delta_min = (newest_t - oldest_t).total_seconds() / 60.0
-                        if time_delta_min > 0:
-                            rate_per_min = delta / time_delta_min
-                            result[label] = round(rate_per_min * 60, 1)
-                            continue
-                except (ValueError, TypeError) as e:
-                    logger.debug("Failed to compute consumption rate for %s: %s", label, e)
-            result[label] = None
-
-        result["unit"] = "%/hr" if is_pct_only else "tok/hr"
-        return result
-
     @classmethod
     def compute_rate_limit_eta(
         cls, window_data: dict, consumption_rate_per_minute: Optional[float], now: datetime
@@ -553,14 +606,46 @@ class MonitoringService:
         else:
             return f"~{int(minutes // 1440)}d {int((minutes % 1440) // 60)}h"
 
+    @classmethod
+    def invalidate_status(cls) -> None:
+        """Drop the built status so the next read rebuilds it."""
+        with cls._status_lock:
+            cls._status_cache = None
+
     @classmethod
     def get_monitoring_status(cls) -> dict:
-        """Return comprehensive monitoring status for the GET /admin/monitoring/status endpoint."""
-        from ..database import (
-            get_all_accounts_with_health,
-            get_latest_snapshots,
-            get_monitoring_config,
-        )
+        """Return comprehensive monitoring status for the GET /admin/monitoring/status endpoint.
+
+        Rotation checks, the agent scheduler and the endpoint all read this one
+        status, built from the shared ``MonitoringSnapshot`` model and reused until
+        it changes or ``_STATUS_TTL_SECONDS`` pass.
+        """
+        from .monitoring_snapshot import MonitoringSnapshot
+
+        version = MonitoringSnapshot.version()
+        with cls._status_lock:
+            cached = cls._status_cache
+            if (
+                cached is None
+                or cached[0] != version
+                or time.monotonic() - cached[1] >= cls._STATUS_TTL_SECONDS
+            ):
+                cached = (version, time.monotonic(), cls._build_monitoring_status())
+                cls._status_cache = cached
+            status = cached[2]
+
+        return {
+            **status,
+            "threshold_alerts": cls._recent_alerts.copy(),
+            "last_polled_at": cls._last_polled_at,
+            "scheduler_unavailable": cls._scheduler_unavailable,
+        }
+
+    @classmethod
+    def _build_monitoring_status(cls) -> dict:
+        """Build the account/window part of the monitoring status from the snapshot model."""
+        from ..database import get_all_accounts_with_health, get_monitoring_config
+        from .monitoring_snapshot import MonitoringSnapshot
 
         config = get_monitoring_config()
         now = datetime.now(timezone.utc)
@@ -595,21 +680,19 @@ class MonitoringService:
         except Exception as e:
             logger.debug("Credential fingerprint detection: %s", e, exc_info=True)
 
-        # Get latest snapshots (exclude data older than 3x polling interval)
+        # Latest snapshots (excluding data older than 3x polling interval) with their
+        # incrementally maintained consumption rates
         polling_min = config.get("polling_minutes", 5)
         max_age = max(polling_min * 3, 30)  # at least 30 min to avoid gaps
-        snapshots = get_latest_snapshots(max_age_minutes=max_age)
+        _version, snapshots = MonitoringSnapshot.windows(max_age)
 
         windows = []
         accounts_with_data: set[int] = set()
-        for snap in snapshots:
+        for snap, rates in snapshots:
             account_id = snap["account_id"]
             window_type = snap["window_type"]
             accounts_with_data.add(account_id)
 
-            # Compute consumption rates
-            rates = cls.get_consumption_rates(account_id, window_type, now)
-
             # Use best available rate for ETA projection (prefer longer windows for stability)
             rate_per_minute = None
             for rate_key in ("120h", "96h", "72h", "48h", "24h"):
@@ -682,7 +765,4 @@ class MonitoringService:
             "enabled": config.get("enabled", False),
             "polling_minutes": config.get("polling_minutes", 5),
             "windows": windows,
-            "threshold_alerts": cls._recent_alerts.copy(),
-            "last_polled_at": cls._last_polled_at,
-            "scheduler_unavailable": cls._scheduler_unavailable,
         }
@@ -0,0 +1,207 @@
+"""In-memory monitoring model shared by rotation, scheduling and the status endpoint.
+
+Holds the latest snapshot and the 5-minute rate series of every
+(account, window). ``MonitoringService._poll_usage`` applies each poll's
+snapshot rows here, so only the polled windows' series are extended and
+only their consumption rates are recomputed; readers never reload snapshot
+history. The model is loaded from the database once, on first use.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+WindowKey = Tuple[int, str]
+
+# Consumption-rate windows reported per snapshot: (label, minutes)
+RATE_WINDOWS = (
+    ("24h", 1440),
+    ("48h", 2880),
+    ("72h", 4320),
+    ("96h", 5760),
+    ("120h", 7200),
+)
+
+
+def rate_series_since(now: datetime) -> int:
+    """Epoch from which rate series are kept (the 5-minute rollup retention)."""
+    from ..db.monitoring import SERIES_5MIN, SERIES_RETENTION
+
+    return int(now.timestamp()) - SERIES_RETENTION[SERIES_5MIN]
+
+
+def rates_from_series(points: list) -> dict:
+    """Compute per-window hourly rates from time-ordered series points.
+
+    Each window is measured back from the LATEST point, not from now, and uses
+    the first point inside the window as its baseline.
+    """
+    import numpy as np
+
+    is_pct_only = bool(points) and not points[-1][4]
+    result: dict = {label: None for label, _ in RATE_WINDOWS}
+    result["unit"] = "%/hr" if is_pct_only else "tok/hr"
+    if len(points) < 2:
+        return result
+
+    ts = np.fromiter((p[2] for p in points), dtype=np.int64, count=len(points))
+    column = 5 if is_pct_only else 3
+    values = np.fromiter((p[column] or 0 for p in points), dtype=np.float64, count=len(points))
+
+    window_seconds = np.array([m * 60 for _, m in RATE_WINDOWS], dtype=np.int64)
+    starts = np.searchsorted(ts, ts[-1] - window_seconds, side="left")
+    elapsed_hours = (ts[-1] - ts[starts]) / 3600.0
+    deltas = values[-1] - values[starts]
+
+    for (label, _), start, hours, delta in zip(RATE_WINDOWS, starts, elapsed_hours, deltas):
+        if len(points) - start >= 2 and hours > 0:
+            result[label] = round(float(delta / hours), 1)
+    return result
+
+
+class MonitoringSnapshot:
+    """Latest snapshot, rate series and consumption rates per (account_id, window_type)."""
+
+    # Oldest snapshot loaded as a window's latest on startup (same horizon as
+    # MonitoringService.init uses for threshold levels)
+    LOAD_MAX_AGE_MINUTES = 44640
+
+    _latest: Dict[WindowKey, Tuple[int, dict]] = {}
+    _series: Dict[WindowKey, List[tuple]] = {}
+    _rates: Dict[WindowKey, dict] = {}
+    _loaded = False
+    # Bumped on every change; never reset, so consumers can key caches on it
+    _version = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def version(cls) -> int:
+        """Current model version, loading the model first if needed."""
+        with cls._lock:
+            cls._ensure_loaded()
+            return cls._version
+
+    @classmethod
+    def windows(cls, max_age_minutes: int) -> Tuple[int, List[Tuple[dict, dict]]]:
+        """Return ``(version, [(snapshot, consumption_rates), ...])``.
+
+        Only windows recorded within ``max_age_minutes`` are included, ordered by
+        account and window type like ``get_latest_snapshots``.
+        """
+        cutoff = time.time() - max_age_minutes * 60
+        with cls._lock:
+            cls._ensure_loaded()
+            result = [
+                (row, cls._rates.get(key) or rates_from_series([]))
+                for key, (ts, row) in sorted(cls._latest.items())
+                if ts >= cutoff
+            ]
+            return cls._version, result
+
+    @classmethod
+    def apply(cls, rows: List[dict], ts: Optional[int] = None) -> None:
+        """Fold snapshot rows just written by a poll (at epoch ``ts``) into the model."""
+        from ..database import SERIES_5MIN, is_reported_window_type
+
+        if not rows:
+            return
+        ts = int(time.time()) if ts is None else ts
+        recorded_at = time.strftime("%Y-%m-%d %H:%M:%SZ", time.gmtime(ts))
+        bucket = ts - ts % SERIES_5MIN
+        cutoff = rate_series_since(datetime.fromtimestamp(ts, timezone.utc))
+        cutoff -= cutoff % SERIES_5MIN
+
+        with cls._lock:
+            if not cls._loaded:
+                # The rows are already in the database; the first load picks them up
+                cls._ensure_loaded()
+                return
+            touched = set()
+            for row in rows:
+                key = (row["account_id"], row["window_type"])
+                point = (
+                    key[0],
+                    key[1],
+                    ts,
+                    row.get("tokens_used", 0),
+                    row.get("tokens_limit", 0),
+                    row.get("percentage", 0.0),
+                )
+                # Same roll-up as the rate_limit_series table: last sample per bucket wins
+                series = cls._series.setdefault(key, [])
+                if series and series[-1][2] - series[-1][2] % SERIES_5MIN == bucket:
+                    if ts >= series[-1][2]:
+                        series[-1] = point
+                else:
+                    series.append(point)
+                while series and series[0][2] < cutoff:
+                    series.pop(0)
+                touched.add(key)
+
+                if is_reported_window_type(key[1]):
+                    # Same columns and defaults as the rate_limit_snapshots row
+                    cls._latest[key] = (
+                        ts,
+                        {
+                            "account_id": key[0],
+                            "backend_type": row.get("backend_type"),
+                            "window_type": key[1],
+                            "tokens_used": point[3],
+                            "tokens_limit": point[4],
+                            "percentage": point[5],
+                            "threshold_level": row.get("threshold_level", "normal"),
+                            "resets_at": row.get("resets_at"),
+                            "recorded_at": recorded_at,
+                        },
+                    )
+
+            for key in touched:
+                cls._rates[key] = rates_from_series(cls._series[key])
+            cls._version += 1
+
+    @classmethod
+    def _ensure_loaded(cls) -> None:
+        """Load latest snapshots and rate series from the database (caller holds _lock)."""
+        if cls._loaded:
+            return
+        from itertools import groupby
+
+        from ..database import SERIES_5MIN, get_latest_snapshots, get_rate_limit_series
+
+        now = datetime.now(timezone.utc)
+        latest = {}
+        for row in get_latest_snapshots(max_age_minutes=cls.LOAD_MAX_AGE_MINUTES):
+            latest[(row["account_id"], row["window_type"])] = (
+                cls._parse_epoch(row.get("recorded_at")),
+                row,
+            )
+        points = get_rate_limit_series(rate_series_since(now), resolution=SERIES_5MIN)
+        series = {key: list(group) for key, group in groupby(points, key=lambda p: (p[0], p[1]))}
+
+        cls._latest = latest
+        cls._series = series
+        cls._rates = {key: rates_from_series(pts) for key, pts in series.items()}
+        cls._loaded = True
+        cls._version += 1
+
+    @staticmethod
+    def _parse_epoch(recorded_at: Optional[str]) -> int:
+        try:
+            parsed = datetime.fromisoformat(recorded_at.replace("Z", "+00:00"))
+        except (AttributeError, ValueError):
+            return 0
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return int(parsed.timestamp())
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop the model so the next read reloads it. Used for testing."""
+        with cls._lock:
+            cls._latest, cls._series, cls._rates = {}, {}, {}
+            cls._loaded = False
+            cls._version += 1
@@ -1,12 +1,23 @@
 """Unified notification dispatch service.
 
 Dispatches notifications to all configured integrations for a given trigger.
-Uses background threads to avoid blocking webhook responses.
+Completions are queued per integration and delivered by a bounded worker pool,
+so webhook responses never block and a burst of completions cannot fan out
+into one thread and one outbound call per completion:
+
+- completions reaching an integration within ``COALESCE_WINDOW_SECONDS`` are
+  sent as one digest message
+- each integration has at most one delivery in flight and is held to its
+  adapter type's rate limit
+- failed deliveries are retried with exponential backoff
 """
 
 import logging
 import threading
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 
 from app.db import integrations as db_integrations
 from app.services.audit_log_service import AuditLogService
@@ -15,11 +26,50 @@ from app.services.integration_config_service import IntegrationConfigService
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _IntegrationQueue:
+    """Pending notifications of one integration."""
+
+    integration: dict
+    items: List[Tuple[str, dict]] = field(default_factory=list)
+    # Monotonic time the pending batch becomes deliverable (None: nothing pending)
+    due: Optional[float] = None
+    in_flight: bool = False
+    # A batch whose send failed, retried on its own before newer items go out
+    retry: List[Tuple[str, dict]] = field(default_factory=list)
+    # Delivery attempts already made for ``retry`` and when it is next due
+    attempts: int = 0
+    retry_due: Optional[float] = None
+    dropped: int = 0
+
+
 class NotificationService:
     """Dispatch notifications and create tickets across configured integrations."""
 
-    @staticmethod
+    # Completions arriving within this window are delivered as one digest
+    COALESCE_WINDOW_SECONDS = 2.0
+    MAX_WORKERS = 4
+    # Oldest notifications are dropped beyond this many pending per integration
+    MAX_PENDING_PER_INTEGRATION = 200
+    # Executions listed individually in a digest message
+    DIGEST_MAX_LINES = 20
+    MAX_ATTEMPTS = 3
+    RETRY_BACKOFF_SECONDS = 2.0
+    # Sends per second per integration (Slack allows ~1 message/s per channel)
+    RATE_LIMITS = {"slack": 1.0, "teams": 2.0}
+    DEFAULT_RATE_LIMIT = 1.0
+
+    _queues: Dict[str, _IntegrationQueue] = {}
+    # integration_id -> earliest monotonic time its rate limit allows the next send;
+    # outlives the queue, which is dropped whenever it drains
+    _next_allowed: Dict[str, float] = {}
+    _executor: Optional[ThreadPoolExecutor] = None
+    _scheduler: Optional[threading.Thread] = None
+    _cond = threading.Condition()
+
+    @classmethod
     def on_execution_complete(
+        cls,
         execution_id: str,
         trigger_id: str,
         status: str,
@@ -28,7 +78,8 @@ class NotificationService:
     ) -> None:
         """Notify all configured integrations when an execution completes.
 
-        Spawns a background thread for each integration to avoid blocking.
+        Queues the notification for each integration; delivery happens in the
+        background worker pool.
 
         Args:
             execution_id: The execution that completed.
@@ -51,22 +102,167 @@ class NotificationService:
         }
 
         for integration in integrations:
-            thread = threading.Thread(
-                target=NotificationService._send_to_integration,
-                args=(integration, message, metadata),
-                daemon=True,
+            cls._enqueue(integration, message, metadata)
+
+    @classmethod
+    def _enqueue(cls, integration: dict, message: str, metadata: dict) -> None:
+        """Add a notification to its integration's queue."""
+        integration_id = integration["id"]
+        with cls._cond:
+            cls._ensure_started()
+            queue = cls._queues.get(integration_id)
+            if queue is None:
+                queue = cls._queues[integration_id] = _IntegrationQueue(integration)
+            queue.integration = integration
+            queue.items.append((message, metadata))
+            if len(queue.items) > cls.MAX_PENDING_PER_INTEGRATION:
+                queue.items.pop(0)
+                queue.dropped += 1
+            if queue.due is None:
+                queue.due = time.monotonic() + cls.COALESCE_WINDOW_SECONDS
+            cls._cond.notify_all()
+
+    @classmethod
+    def _ensure_started(cls) -> None:
+        """Start the worker pool and scheduler thread (caller holds _cond)."""
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(
+                max_workers=cls.MAX_WORKERS, thread_name_prefix="notify"
             )
-            thread.start()
+        if cls._scheduler is None:
+            cls._scheduler = threading.Thread(
+                target=cls._schedule_loop, name="notification-scheduler", daemon=True
+            )
+            cls._scheduler.start()
+
+    @classmethod
+    def _ready_at(cls, integration_id: str, queue: _IntegrationQueue) -> Optional[float]:
+        if queue.in_flight:
+            return None
+        due = queue.retry_due if queue.retry else queue.due if queue.items else None
+        if due is None:
+            return None
+        return max(due, cls._next_allowed.get(integration_id, 0.0))
+
+    @classmethod
+    def _schedule_loop(cls) -> None:
+        """Hand due batches to the worker pool; sleeps until the next one is due."""
+        me = threading.current_thread()
+        while True:
+            with cls._cond:
+                if cls._scheduler is not me:
+                    return
+                now = time.monotonic()
+                ready_times = [
+                    (ready, integration_id)
+                    for integration_id, queue in cls._queues.items()
+                    if (ready := cls._ready_at(integration_id, queue)) is not None
+                ]
+                due = [integration_id for ready, integration_id in ready_times if ready <= now]
+                if not due:
+                    next_ready = min((ready for ready, _ in ready_times), default=None)
+                    cls._cond.wait(None if next_ready is None else next_ready - now)
+                    continue
+                for integration_id in due:
+                    queue = cls._queues[integration_id]
+                    if queue.dropped:
+                        logger.warning(
+                            "Dropped %d queued notifications for integration %s",
+                            queue.dropped,
+                            integration_id,
+                        )
+                        queue.dropped = 0
+                    if queue.retry:
+                        batch, queue.retry = queue.retry, []
+                        attempts, queue.retry_due = queue.attempts, None
+                    else:
+                        batch, queue.items = queue.items, []
+                        attempts, queue.due = 0, None
+                    queue.in_flight = True
+                    cls._executor.submit(
+                        cls._deliver, integration_id, queue.integration, batch, attempts
+                    )
+
+    @classmethod
+    def _deliver(
+        cls, integration_id: str, integration: dict, batch: List[Tuple[str, dict]], attempts: int
+    ) -> None:
+        """Send one batch to an integration (worker thread), retrying on failure."""
+        final = attempts + 1 >= cls.MAX_ATTEMPTS
+        retry = False
+        try:
+            sent = cls._send_to_integration(integration, batch, final=final)
+            if not sent and final:
+                logger.warning(
+                    "Giving up on %d notifications for integration %s after %d attempts",
+                    len(batch),
+                    integration_id,
+                    cls.MAX_ATTEMPTS,
+                )
+            retry = not sent and not final
+        finally:
+            rate = cls.RATE_LIMITS.get(integration.get("type"), cls.DEFAULT_RATE_LIMIT)
+            with cls._cond:
+                now = time.monotonic()
+                cls._next_allowed[integration_id] = now + 1.0 / rate
+                queue = cls._queues.get(integration_id)
+                if queue is not None:
+                    queue.in_flight = False
+                    if retry:
+                        # Retried apart from items queued meanwhile, so those
+                        # still get every attempt of their own
+                        queue.retry = batch
+                        queue.attempts = attempts + 1
+                        queue.retry_due = now + cls.RETRY_BACKOFF_SECONDS * 2**attempts
+                    elif not queue.items:
+                        del cls._queues[integration_id]
+                    cls._cond.notify_all()
+
+    @classmethod
+    def _compose(cls, batch: List[Tuple[str, dict]]) -> Tuple[str, dict]:
+        """One message for a batch: the notification itself, or a digest of several."""
+        if len(batch) == 1:
+            return batch[0]
+        statuses: Dict[str, int] = {}
+        for _, metadata in batch:
+            status = metadata.get("status", "completed")
+            statuses[status] = statuses.get(status, 0) + 1
+        counts = ", ".join(f"{count} {status}" for status, count in sorted(statuses.items()))
+        lines = [f"{len(batch)} executions completed ({counts})"]
+        for message, metadata in batch[: cls.DIGEST_MAX_LINES]:
+            lines.append(f"- {metadata.get('duration', 'N/A')}: {message}")
+        if len(batch) > cls.DIGEST_MAX_LINES:
+            lines.append(f"...and {len(batch) - cls.DIGEST_MAX_LINES} more")
+        failed = any(m.get("status") != "success" for _, m in batch)
+        metadata = {
+            "status": "failed" if failed else "success",
+            "bot_name": batch[0][1].get("bot_name", "Agented"),
+            "duration": f"{len(batch)} executions",
+        }
+        return "\n".join(lines), metadata
 
     @staticmethod
-    def _send_to_integration(integration: dict, message: str, metadata: dict) -> None:
-        """Send notification to a single integration (runs in background thread)."""
+    def _send_to_integration(
+        integration: dict, batch: List[Tuple[str, dict]], final: bool = True
+    ) -> bool:
+        """Send a batch to a single integration (runs in a worker thread).
+
+        Returns False if the send failed and should be retried; failures are
+        audited once no retry follows (``final``).
+        """
         integration_id = integration["id"]
+        message, metadata = NotificationService._compose(batch)
+        execution_ids = [m.get("execution_id") for _, m in batch]
+        details = (
+            {"execution_id": execution_ids[0], "status": metadata.get("status")}
+            if len(batch) == 1
+            else {"execution_ids": execution_ids, "status": metadata.get("status")}
+        )
         try:
             adapter = IntegrationConfigService.get_adapter_for_integration(integration_id)
             if not adapter:
                 logger.warning("No adapter for integration %s", integration_id)
-                return
+                return True
 
             config = integration.get("config", {})
             channel = config.get("channel", config.get("webhook_url", ""))
@@ -76,26 +272,59 @@ class NotificationService:
                 message=message,
                 metadata=metadata,
             )
-
-            AuditLogService.log(
-                action="notification.send",
-                entity_type="integration",
-                entity_id=integration_id,
-                outcome="success" if success else "failed",
-                details={
-                    "execution_id": metadata.get("execution_id"),
-                    "status": metadata.get("status"),
-                },
-            )
+            if success or final:
+                AuditLogService.log(
+                    action="notification.send",
+                    entity_type="integration",
+                    entity_id=integration_id,
+                    outcome="success" if success else "failed",
+                    details=details,
+                )
+            return bool(success)
         except Exception as e:
             logger.error("Notification to %s failed: %s", integration_id, e, exc_info=True)
-            AuditLogService.log(
-                action="notification.send",
-                entity_type="integration",
-                entity_id=integration_id,
-                outcome="error",
-                details={"error": str(e)},
-            )
+            if final:
+                AuditLogService.log(
+                    action="notification.send",
+                    entity_type="integration",
+                    entity_id=integration_id,
+                    outcome="error",
+                    details={"error": str(e), **details},
+                )
+            return False
+
+    @classmethod
+    def flush(cls, timeout: float = 10.0) -> bool:
+        """Deliver pending notifications now, waiting up to ``timeout`` seconds.
+
+        Skips the coalescing window (not rate limits or retry backoff). Returns
+        True once every queue is empty.
+        """
+        deadline = time.monotonic() + timeout
+        with cls._cond:
+            for queue in cls._queues.values():
+                if queue.due is not None:
+                    queue.due = time.monotonic()
+            cls._cond.notify_all()
+            while cls._queues:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                cls._cond.wait(remaining)
+            return True
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop pending notifications and stop the workers. Used for testing."""
+        with cls._cond:
+            executor = cls._executor
+            cls._executor = None
+            cls._scheduler = None
+            cls._queues = {}
+            cls._next_allowed = {}
+            cls._cond.notify_all()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     @staticmethod
     def create_tickets_from_findings(trigger_id: str, findings: list) -> list:
@@ -0,0 +1,283 @@
+"""Low-overhead per-stage tracing for the execution pipeline.
+
+Spans are timed in memory and kept on their trace until it finishes; the
+finished trace is then queued and written together with other traces in one
+batched transaction (``insert_trace_batch``). The hot path therefore never
+touches the database.
+
+A trace is bound to the thread that opened it, so a pipeline started inside
+another one (e.g. ``run_trigger`` called by the queue dispatcher or a workflow
+node) nests as a span of the outer trace instead of starting a new one.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+from app import config as app_config
+
+from ..db.ids import generate_span_id, generate_trace_id
+from ..db.tracing import insert_trace_batch
+
+logger = logging.getLogger(__name__)
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+def _duration_ms(start: float, end: float) -> int:
+    return max(0, int(round((end - start) * 1000)))
+
+
+class PipelineTrace:
+    """One pipeline run: a trace row plus its stage spans."""
+
+    def __init__(
+        self,
+        name: str,
+        entity_type: str,
+        entity_id: str,
+        execution_id: Optional[str] = None,
+        metadata: Optional[dict] = None,
+        enabled: bool = True,
+    ):
+        self.id = generate_trace_id() if enabled else ""
+        self.name = name
+        self.entity_type = entity_type
+        self.entity_id = entity_id
+        self.execution_id = execution_id
+        self.metadata = metadata
+        self.enabled = enabled
+        self.started = time.time()
+        self.marks: Dict[str, float] = {}
+        # Values earlier stages hand to later ones (kept even when tracing is off)
+        self.context: Dict[str, object] = {}
+        self._spans: List[dict] = []
+        # Open spans, innermost last; new spans are parented to the top
+        self._stack: List[dict] = []
+        # Spans opened by nested PipelineTracer.begin() calls
+        self._scopes: List[dict] = []
+        self._lock = threading.Lock()
+
+    def open_span(self, name: str, span_type: str = "stage", **attributes) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        span = {
+            "id": generate_span_id(),
+            "trace_id": self.id,
+            "parent_span_id": self._stack[-1]["id"] if self._stack else None,
+            "name": name,
+            "span_type": span_type,
+            "attributes": attributes,
+            "_start": time.time(),
+        }
+        self._stack.append(span)
+        return span
+
+    def close_span(
+        self, span: Optional[dict], status: str = "completed", error_message: Optional[str] = None
+    ) -> None:
+        if span is None:
+            return
+        if span in self._stack:
+            self._stack.remove(span)
+        self._add(span, span.pop("_start"), time.time(), status, error_message)
+
+    @contextmanager
+    def span(self, name: str, span_type: str = "stage", **attributes) -> Iterator[dict]:
+        """Time the enclosed block; yields the span's attribute dict for annotation."""
+        span = self.open_span(name, span_type, **attributes)
+        try:
+            yield span["attributes"] if span else {}
+        except BaseException as e:
+            self.close_span(span, "error", str(e))
+            raise
+        self.close_span(span)
+
+    def record_span(
+        self,
+        name: str,
+        start: float,
+        end: Optional[float] = None,
+        span_type: str = "stage",
+        status: str = "completed",
+        **attributes,
+    ) -> None:
+        """Record a span measured elsewhere (``start``/``end`` are epoch seconds)."""
+        if not self.enabled:
+            return
+        span = {
+            "id": generate_span_id(),
+            "trace_id": self.id,
+            "parent_span_id": self._stack[-1]["id"] if self._stack else None,
+            "name": name,
+            "span_type": span_type,
+            "attributes": attributes,
+        }
+        self._add(span, start, end if end is not None else time.time(), status, None)
+
+    def mark(self, name: str) -> float:
+        """Record the first time ``name`` happened (thread-safe, first call wins)."""
+        with self._lock:
+            return self.marks.setdefault(name, time.time())
+
+    def _add(
+        self, span: dict, start: float, end: float, status: str, error_message: Optional[str]
+    ) -> None:
+        span.update(
+            status=status,
+            error_message=error_message,
+            duration_ms=_duration_ms(start, end),
+            started_at=_iso(start),
+            finished_at=_iso(end),
+            _sort=start,
+        )
+        with self._lock:
+            self._spans.append(span)
+
+    def _rows(self, status: str, error_message: Optional[str]) -> tuple:
+        end = time.time()
+        trace = {
+            "id": self.id,
+            "name": self.name,
+            "entity_type": self.entity_type,
+            "entity_id": self.entity_id,
+            "execution_id": self.execution_id,
+            "status": status,
+            "metadata": self.metadata,
+            "error_message": error_message,
+            "duration_ms": _duration_ms(self.started, end),
+            "started_at": _iso(self.started),
+            "finished_at": _iso(end),
+        }
+        # Parents start no later than their children, so start order satisfies the FK
+        with self._lock:
+            spans = sorted(self._spans, key=lambda s: s["_sort"])
+        for span in spans:
+            span.pop("_sort", None)
+        return trace, spans
+
+
+class PipelineTracer:
+    """Thread-bound trace registry with a batched writer."""
+
+    FLUSH_BATCH_ROWS = 200
+    FLUSH_INTERVAL_SECONDS = 5.0
+
+    _local = threading.local()
+    _by_execution: Dict[str, PipelineTrace] = {}
+    _pending_traces: List[dict] = []
+    _pending_spans: List[dict] = []
+    _last_flush = time.monotonic()
+    _lock = threading.Lock()
+    _flush_lock = threading.Lock()
+
+    @classmethod
+    def current(cls) -> Optional[PipelineTrace]:
+        return getattr(cls._local, "trace", None)
+
+    @classmethod
+    def begin(
+        cls,
+        name: str,
+        entity_type: str,
+        entity_id: str,
+        execution_id: Optional[str] = None,
+        metadata: Optional[dict] = None,
+    ) -> PipelineTrace:
+        """Start a trace on this thread, or nest under the one already running.
+
+        Every ``begin`` must be paired with ``end`` (typically in a ``finally``).
+        """
+        trace = cls.current()
+        if trace is not None:
+            trace._scopes.append(trace.open_span(name, span_type=entity_type, entity_id=entity_id))
+            return trace
+        trace = PipelineTrace(
+            name,
+            entity_type,
+            entity_id,
+            execution_id=execution_id,
+            metadata=metadata,
+            enabled=app_config.PIPELINE_TRACING_ENABLED,
+        )
+        cls._local.trace = trace
+        return trace
+
+    @classmethod
+    def end(
+        cls, trace: PipelineTrace, status: str = "completed", error_message: Optional[str] = None
+    ) -> None:
+        """Close the matching ``begin``; the outermost one finishes and queues the trace."""
+        if trace._scopes:
+            trace.close_span(trace._scopes.pop(), status, error_message)
+            return
+        if cls.current() is trace:
+            cls._local.trace = None
+        with cls._lock:
+            for execution_id in [k for k, v in cls._by_execution.items() if v is trace]:
+                cls._by_execution.pop(execution_id, None)
+        if not trace.enabled:
+            return
+        # Spans left open by an early exit still show how far the run got
+        for span in list(reversed(trace._stack)):
+            trace.close_span(span, "error", "not closed")
+        row, spans = trace._rows(status, error_message)
+        with cls._lock:
+            cls._pending_traces.append(row)
+            cls._pending_spans.extend(spans)
+            due = (
+                len(cls._pending_traces) + len(cls._pending_spans) >= cls.FLUSH_BATCH_ROWS
+                or time.monotonic() - cls._last_flush >= cls.FLUSH_INTERVAL_SECONDS
+            )
+        if due:
+            cls.flush()
+
+    @classmethod
+    def bind_execution(cls, execution_id: str, trace: PipelineTrace) -> None:
+        """Let other threads of this execution (e.g. pipe readers) find its trace."""
+        if trace.execution_id is None:
+            trace.execution_id = execution_id
+        with cls._lock:
+            cls._by_execution[execution_id] = trace
+
+    @classmethod
+    def for_execution(cls, execution_id: str) -> Optional[PipelineTrace]:
+        return cls._by_execution.get(execution_id)
+
+    @classmethod
+    def mark(cls, execution_id: str, name: str) -> None:
+        """Record a first-occurrence timestamp on an execution's trace, if any."""
+        trace = cls._by_execution.get(execution_id)
+        if trace is not None and name not in trace.marks:
+            trace.mark(name)
+
+    @classmethod
+    def flush(cls) -> int:
+        """Write all queued traces in one transaction. Returns the number written."""
+        with cls._flush_lock:
+            with cls._lock:
+                traces, spans = cls._pending_traces, cls._pending_spans
+                cls._pending_traces, cls._pending_spans = [], []
+                cls._last_flush = time.monotonic()
+            if not traces:
+                return 0
+            try:
+                insert_trace_batch(traces, spans)
+            except Exception as e:
+                logger.warning("Dropped %d pipeline trace(s): %s", len(traces), e)
+                return 0
+            return len(traces)
+
+    @classmethod
+    def reset(cls) -> None:
+        """Discard queued traces and bindings. Used for testing."""
+        with cls._lock:
+            cls._pending_traces, cls._pending_spans = [], []
+            cls._by_execution.clear()
+            cls._last_flush = time.monotonic()
+        cls._local.trace = None
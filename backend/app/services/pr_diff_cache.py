@@ -0,0 +1,183 @@
+"""Process-wide cache of PR diffs shared by every trigger a webhook dispatches.
+
+A single PR event can fan out to many triggers, each of which used to fetch
+and parse the same ``{pr_url}.diff``. Entries are keyed by
+``(repo_full_name, pr_number, head_sha)`` so a new push to the PR naturally
+misses, concurrent requests for the same key share one in-flight fetch, and
+the rendered context (per token budget) is memoized alongside the raw text.
+Both count toward ``MAX_BYTES``; the parsed PatchSet, whose in-memory size is
+several times the text's and cannot be measured cheaply, is not kept. Events
+without a head SHA (e.g. PR comments) are cached for ``UNPINNED_TTL_SECONDS``
+only.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
+
+from unidiff import PatchSet
+
+from app import config as app_config
+
+from .diff_context_service import DiffContextService
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str, str]
+
+
+class _DiffEntry:
+    __slots__ = ("text", "size", "created", "contexts", "lock")
+
+    def __init__(self, text: str):
+        self.text = text
+        # Text plus memoized contexts; updated under PRDiffCache._lock
+        self.size = len(text)
+        self.created = time.monotonic()
+        self.contexts: Dict[Optional[int], str] = {}
+        self.lock = threading.Lock()
+
+
+class PRDiffCache:
+    """Single-flight, size-bounded LRU of fetched PR diffs."""
+
+    MAX_BYTES = 32 * 1024 * 1024
+    UNPINNED_TTL_SECONDS = 60
+
+    _lock = threading.Lock()
+    _entries: "OrderedDict[CacheKey, _DiffEntry]" = OrderedDict()
+    _inflight: Dict[CacheKey, Future] = {}
+    _total_bytes = 0
+
+    @staticmethod
+    def _key(event: dict) -> CacheKey:
+        repo = event.get("repo_full_name") or event.get("pr_url", "")
+        return (repo, str(event.get("pr_number", "")), event.get("head_sha") or "")
+
+    @staticmethod
+    def _fetch(event: dict) -> Optional[str]:
+        from .execution_runner import fetch_pr_diff
+
+        return fetch_pr_diff(event)
+
+    @classmethod
+    def _lookup(cls, key: CacheKey) -> Optional[_DiffEntry]:
+        """Return a live entry and mark it recently used. Caller holds ``_lock``."""
+        entry = cls._entries.get(key)
+        if entry is None:
+            return None
+        if not key[2] and time.monotonic() - entry.created > cls.UNPINNED_TTL_SECONDS:
+            cls._remove(key)
+            return None
+        cls._entries.move_to_end(key)
+        return entry
+
+    @classmethod
+    def _remove(cls, key: CacheKey) -> None:
+        entry = cls._entries.pop(key, None)
+        if entry is not None:
+            cls._total_bytes -= entry.size
+
+    @classmethod
+    def _store(cls, key: CacheKey, entry: _DiffEntry) -> None:
+        """Insert an entry and evict least-recently-used ones. Caller holds ``_lock``."""
+        if entry.size > cls.MAX_BYTES:
+            return
+        cls._remove(key)
+        cls._entries[key] = entry
+        cls._total_bytes += entry.size
+        cls._evict()
+
+    @classmethod
+    def _evict(cls) -> None:
+        """Drop least-recently-used entries until within ``MAX_BYTES``. Caller holds ``_lock``."""
+        while cls._total_bytes > cls.MAX_BYTES:
+            old_key, _ = next(iter(cls._entries.items()))
+            cls._remove(old_key)
+
+    @classmethod
+    def _grow(cls, key: CacheKey, entry: _DiffEntry, added: int) -> None:
+        """Count memoized data added to ``entry`` toward the size bound."""
+        with cls._lock:
+            entry.size += added
+            if cls._entries.get(key) is entry:
+                cls._total_bytes += added
+                cls._evict()
+
+    @classmethod
+    def _get_entry(cls, event: dict) -> Optional[_DiffEntry]:
+        if not event.get("pr_url"):
+            return None
+        key = cls._key(event)
+        with cls._lock:
+            entry = cls._lookup(key)
+            if entry is not None:
+                return entry
+            future = cls._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = cls._inflight[key] = Future()
+
+        if not owner:
+            return future.result()
+
+        entry = None
+        try:
+            text = cls._fetch(event)
+            if text:
+                entry = _DiffEntry(text)
+        except Exception as e:
+            logger.debug("PR diff fetch failed for %s: %s", key, e)
+        finally:
+            with cls._lock:
+                # Failed fetches are not cached so the next trigger retries
+                if entry is not None:
+                    cls._store(key, entry)
+                cls._inflight.pop(key, None)
+            future.set_result(entry)
+        return entry
+
+    @classmethod
+    def get(cls, event: dict) -> Optional[str]:
+        """Return the raw diff for the event's PR, fetching it at most once."""
+        entry = cls._get_entry(event)
+        return entry.text if entry else None
+
+    @classmethod
+    def get_context(cls, event: dict, token_budget: Optional[int] = None) -> str:
+        """Return focused diff context for the event's PR.
+
+        ``token_budget`` defaults to ``PR_DIFF_TOKEN_BUDGET``. Returns an empty
+        string when the diff is unavailable.
+        """
+        if token_budget is None:
+            token_budget = app_config.PR_DIFF_TOKEN_BUDGET or None
+        entry = cls._get_entry(event)
+        if entry is None:
+            return ""
+        with entry.lock:
+            context = entry.contexts.get(token_budget)
+            if context is not None:
+                return context
+            if not entry.text.strip():
+                context = ""
+            else:
+                try:
+                    patch_set = PatchSet(entry.text)
+                except Exception as e:
+                    logger.warning("Failed to parse diff: %s", e)
+                    return f"[Failed to parse diff: {e}]"
+                context = DiffContextService.render_patch_set(patch_set, token_budget=token_budget)
+            entry.contexts[token_budget] = context
+        cls._grow(cls._key(event), entry, len(context))
+        return context
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop all cached diffs (in-flight fetches still complete normally)."""
+        with cls._lock:
+            cls._entries.clear()
+            cls._total_bytes = 0
@@ -1,14 +1,19 @@
-"""Stateless prompt template rendering helper extracted from ExecutionService.
+"""Prompt template rendering helper extracted from ExecutionService.
 
 Handles placeholder substitution in trigger prompt templates and warns about
-any unresolved placeholders that remain after rendering.  Pure functions --
-no side effects, no I/O, no instance state.
+any unresolved placeholders that remain after rendering.  Templates are
+compiled once per trigger (snippets resolved, split into literal and
+placeholder segments) and cached; rendering is then a single join.  Cached
+templates are dropped when a snippet they depend on is created, edited or
+deleted (see ``invalidate_snippets``).
 
 Reference: Fowler "Refactoring" (2018) Extract Class pattern.
 """
 
 import logging
 import re
+import threading
+from typing import Dict, Iterable, Set, Tuple
 
 from .prompt_snippet_service import SnippetService
 
@@ -47,8 +52,8 @@ class PromptRenderer:
     #
     # Adding a new placeholder:
     #   1. Add the name to ``_KNOWN_PLACEHOLDERS`` below.
-    #   2. Perform the substitution in ``render()`` (use
-    #      ``prompt.replace("{name}", value)``).
+    #   2. Provide its value in ``_placeholder_values()``; placeholders with
+    #      no value are left in the prompt as the literal ``{name}``.
     #   3. If the value comes from a new event type, gate on
     #      ``event.get("type")`` like the GitHub PR block does.
     #   4. Add the placeholder to ``TriggerGenerationService.PLACEHOLDERS_BY_SOURCE``
@@ -67,8 +72,97 @@ class PromptRenderer:
         "repo_full_name",  # GitHub PR – "owner/repo" identifier
     }
 
+    # re.split with a capturing group yields [literal, name, literal, name, ..., literal]
+    _PLACEHOLDER_RE = re.compile(
+        r"\{(" + "|".join(sorted(_KNOWN_PLACEHOLDERS, key=len, reverse=True)) + r")\}"
+    )
+
+    # Compiled templates: {trigger_id: (prompt_template, segments)}
+    _compiled: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+    # Snippet dependency graph: {snippet_name: {trigger_id, ...}}
+    _snippet_dependents: Dict[str, Set[str]] = {}
+    # Bumped on every invalidation so a compile racing an edit is not cached
+    _cache_generation = 0
+    # _cache_lock guards _compiled, _snippet_dependents and _cache_generation.
+    _cache_lock = threading.Lock()
+
+    @classmethod
+    def _compile(cls, trigger_id: str, template: str) -> Tuple[str, ...]:
+        """Return the cached segment list for a trigger's template, compiling on miss.
+
+        A changed ``prompt_template`` for the same trigger is a cache miss, so
+        trigger edits need no explicit invalidation.
+        """
+        with cls._cache_lock:
+            cached = cls._compiled.get(trigger_id)
+            generation = cls._cache_generation
+        if cached is not None and cached[0] == template:
+            return cached[1]
+
+        dependencies: Set[str] = set()
+        # Resolve {{snippet}} references before {placeholder} substitution
+        resolved = SnippetService.resolve_snippets(template, dependencies=dependencies)
+        segments = tuple(cls._PLACEHOLDER_RE.split(resolved))
+
+        with cls._cache_lock:
+            if generation != cls._cache_generation:
+                return segments
+            cls._compiled[trigger_id] = (template, segments)
+            for name in dependencies:
+                cls._snippet_dependents.setdefault(name, set()).add(trigger_id)
+        return segments
+
+    @classmethod
+    def invalidate_snippets(cls, names: Iterable[str]) -> int:
+        """Drop compiled templates that reference any of the given snippet names.
+
+        Call after a snippet is created, edited, renamed or deleted.  Returns the
+        number of cached templates removed.
+        """
+        removed = 0
+        with cls._cache_lock:
+            cls._cache_generation += 1
+            for name in names:
+                for trigger_id in cls._snippet_dependents.pop(name, ()):
+                    if cls._compiled.pop(trigger_id, None) is not None:
+                        removed += 1
+        return removed
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all compiled templates."""
+        with cls._cache_lock:
+            cls._cache_generation += 1
+            cls._compiled.clear()
+            cls._snippet_dependents.clear()
+
     @staticmethod
+    def _placeholder_values(
+        trigger_id: str, message_text: str, paths_str: str, event: dict = None
+    ) -> Dict[str, str]:
+        """Build the placeholder values available for this render."""
+        values = {
+            "trigger_id": trigger_id,
+            "bot_id": trigger_id,  # Legacy placeholder support
+            "paths": paths_str,
+            "message": message_text,
+        }
+        # Add trigger context if available
+        if event and event.get("type") == "github_pr":
+            # Handle GitHub PR placeholders
+            values.update(
+                pr_url=event.get("pr_url", ""),
+                pr_number=str(event.get("pr_number", "")),
+                pr_title=event.get("pr_title", ""),
+                pr_author=event.get("pr_author", ""),
+                repo_url=event.get("repo_url", ""),
+                repo_full_name=event.get("repo_full_name", ""),
+            )
+        return values
+
+    @classmethod
     def render(
+        cls,
         trigger: dict,
         trigger_id: str,
         message_text: str,
@@ -84,6 +178,10 @@ class PromptRenderer:
         4. GitHub PR placeholders when *event* is a ``github_pr`` type.
         5. Prepends ``skill_command`` if configured and not already present.
 
+        Substitution is a single pass over the compiled template, so
+        substituted values (e.g. a message containing ``{paths}``) are never
+        themselves expanded.
+
         Note: the security-audit threat-report logic (file I/O) is intentionally
         kept in ``ExecutionService.run_trigger`` because it has side effects.
 
@@ -99,24 +197,11 @@ class PromptRenderer:
         Returns:
             The fully rendered prompt string.
         """
-        prompt = trigger["prompt_template"]
-        # Resolve {{snippet}} references before {placeholder} substitution
-        prompt = SnippetService.resolve_snippets(prompt)
-        prompt = prompt.replace("{trigger_id}", trigger_id)
-        prompt = prompt.replace("{bot_id}", trigger_id)  # Legacy placeholder support
-        prompt = prompt.replace("{paths}", paths_str)
-        prompt = prompt.replace("{message}", message_text)
-
-        # Add trigger context if available
-        if event:
-            # Handle GitHub PR placeholders
-            if event.get("type") == "github_pr":
-                prompt = prompt.replace("{pr_url}", event.get("pr_url", ""))
-                prompt = prompt.replace("{pr_number}", str(event.get("pr_number", "")))
-                prompt = prompt.replace("{pr_title}", event.get("pr_title", ""))
-                prompt = prompt.replace("{pr_author}", event.get("pr_author", ""))
-                prompt = prompt.replace("{repo_url}", event.get("repo_url", ""))
-                prompt = prompt.replace("{repo_full_name}", event.get("repo_full_name", ""))
+        segments = cls._compile(trigger_id, trigger["prompt_template"])
+        values = cls._placeholder_values(trigger_id, message_text, paths_str, event)
+        prompt = "".join(
+            seg if i % 2 == 0 else values.get(seg, f"{{{seg}}}") for i, seg in enumerate(segments)
+        )
 
         # Prepend skill_command if configured and not already in prompt
         skill_command = trigger.get("skill_command", "")
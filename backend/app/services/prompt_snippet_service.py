@@ -2,13 +2,14 @@
 
 Resolves {{snippet_name}} references in prompt templates by looking up
 named snippets from the database. Supports nested snippets with circular
-reference detection (max depth 5).
+reference detection (max depth 5). References at each nesting level are
+fetched in a single query.
 """
 
 import logging
 import re
 
-from ..db.prompt_snippets import get_snippet_by_name
+from ..db.prompt_snippets import get_snippets_by_names
 
 logger = logging.getLogger(__name__)
 
@@ -18,14 +19,25 @@ class SnippetService:
 
     MAX_DEPTH = 5
 
+    _SNIPPET_REF = re.compile(r"\{\{(\w[\w\-]*)\}\}")
+
     @classmethod
-    def resolve_snippets(cls, text: str, depth: int = 0, visited: set = None) -> str:
+    def resolve_snippets(
+        cls,
+        text: str,
+        depth: int = 0,
+        visited: set = None,
+        dependencies: set = None,
+    ) -> str:
         """Resolve all {{snippet_name}} references in the given text.
 
         Args:
             text: The text containing {{snippet}} references.
             depth: Current recursion depth (for nested snippets).
             visited: Set of snippet names already being resolved (cycle detection).
+            dependencies: Optional set that collects every snippet name referenced,
+                including nested and missing ones, so callers can invalidate
+                cached output when any of them changes.
 
         Returns:
             Text with all resolvable {{snippet}} references expanded.
@@ -37,17 +49,24 @@ class SnippetService:
         if visited is None:
             visited = set()
 
+        names = set(cls._SNIPPET_REF.findall(text))
+        if not names:
+            return text
+        if dependencies is not None:
+            dependencies.update(names)
+        snippets = get_snippets_by_names(names - visited)
+
         def replacer(match) -> str:
             name = match.group(1)
             if name in visited:
                 # Circular reference -- leave unresolved
                 return match.group(0)
-            snippet = get_snippet_by_name(name)
+            snippet = snippets.get(name)
             if snippet is None:
                 # Missing snippet -- leave unresolved
                 return match.group(0)
             # Recursively resolve nested snippets
             new_visited = visited | {name}
-            return cls.resolve_snippets(snippet["content"], depth + 1, new_visited)
+            return cls.resolve_snippets(snippet["content"], depth + 1, new_visited, dependencies)
 
-        return re.sub(r"\{\{(\w[\w\-]*)\}\}", replacer, text)
+        return cls._SNIPPET_REF.sub(replacer, text)
@@ -11,18 +11,25 @@ import os
 import platform
 import re
 import subprocess
-import urllib.error
+import threading
+import time
 import urllib.parse
-import urllib.request
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+import httpx
+
 logger = logging.getLogger(__name__)
 
 # Default timeout for HTTP requests (seconds)
 _HTTP_TIMEOUT = 15
 
+# Pooled HTTP clients keyed by provider host, so repeated polls reuse TLS connections
+# instead of opening a fresh socket per account per cycle. httpx.Client is thread-safe.
+_http_clients: dict[str, httpx.Client] = {}
+_http_clients_lock = threading.Lock()
+
 # Gemini CLI well-known OAuth credentials (public, embedded in the open-source CLI).
 # See: https://github.com/anthropics/gemini-cli → code_assist/oauth2.js
 _GEMINI_CLI_CLIENT_ID = "681255809395-oo8ft2oprdrnp9e3aqf6av3hmdib135j.apps.googleusercontent.com"
@@ -32,6 +39,20 @@ _GEMINI_CLI_CLIENT_SECRET = "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"
 class CredentialResolver:
     """Resolves OAuth tokens for each provider from local credential stores."""
 
+    # Token fingerprints keyed by (backend, credential files), valid while the files'
+    # mtimes are unchanged. Keychain entries have no mtime, so on macOS an entry
+    # also expires after _FINGERPRINT_KEYCHAIN_TTL seconds.
+    _FINGERPRINT_KEYCHAIN_TTL = 300.0
+    _fingerprint_cache: dict = {}
+    _fingerprint_lock = threading.Lock()
+
+    # Credential file names per backend, under config_path and the default config dir
+    _CREDENTIAL_FILES = {
+        "claude": (".claude", ".credentials.json"),
+        "codex": (".codex", "auth.json"),
+        "gemini": (".gemini", "oauth_creds.json"),
+    }
+
     @staticmethod
     def get_claude_token(account: dict) -> Optional[str]:
         """Read Claude OAuth token.
@@ -85,12 +106,52 @@ class CredentialResolver:
 
         return None
 
-    @staticmethod
-    def get_token_fingerprint(account: dict, backend_type: str) -> Optional[str]:
+    @classmethod
+    def get_token_fingerprint(cls, account: dict, backend_type: str) -> Optional[str]:
         """Return a short hash fingerprint of the resolved token for deduplication.
 
         Accounts sharing the same credential will produce the same fingerprint.
+        Results are cached until one of the account's credential files changes.
         """
+        files = cls._credential_files(account, backend_type)
+        if not files:
+            return cls._resolve_token_fingerprint(account, backend_type)
+
+        key = (backend_type, files)
+        signature = tuple(_file_mtime_ns(path) for path in files)
+        now = time.monotonic()
+        with cls._fingerprint_lock:
+            cached = cls._fingerprint_cache.get(key)
+        if cached is not None and cached[0] == signature and (cached[1] is None or now < cached[1]):
+            return cached[2]
+
+        fingerprint = cls._resolve_token_fingerprint(account, backend_type)
+        expires = now + cls._FINGERPRINT_KEYCHAIN_TTL if platform.system() == "Darwin" else None
+        with cls._fingerprint_lock:
+            cls._fingerprint_cache[key] = (signature, expires, fingerprint)
+        return fingerprint
+
+    @classmethod
+    def _credential_files(cls, account: dict, backend_type: str) -> tuple:
+        """Credential files a backend's token may be read from, most specific first."""
+        names = cls._CREDENTIAL_FILES.get(backend_type)
+        if not names:
+            return ()
+        default_dir, file_name = names
+        files = []
+        config_path = account.get("config_path")
+        if config_path:
+            files.append(str(Path(os.path.expanduser(config_path)) / file_name))
+        files.append(str(Path.home() / default_dir / file_name))
+        return tuple(files)
+
+    @classmethod
+    def clear_fingerprint_cache(cls) -> None:
+        with cls._fingerprint_lock:
+            cls._fingerprint_cache.clear()
+
+    @staticmethod
+    def _resolve_token_fingerprint(account: dict, backend_type: str) -> Optional[str]:
         token = None
         if backend_type == "claude":
             token = CredentialResolver.get_claude_token(account)
@@ -197,24 +258,28 @@ class ProviderUsageClient:
     """Fetches real rate limit utilization from provider APIs."""
 
     @classmethod
-    def fetch_usage(cls, account: dict, backend_type: str) -> list[dict]:
+    def fetch_usage(
+        cls, account: dict, backend_type: str, timeout: float = _HTTP_TIMEOUT
+    ) -> list[dict]:
         """Dispatch to the correct provider fetcher.
 
+        ``timeout`` bounds each provider request (and the Codex PTY scrape).
+
         Returns a list of window dicts:
             {window_type, percentage, resets_at, tokens_used, tokens_limit}
         """
         if backend_type == "claude":
-            return cls._fetch_claude(account)
+            return cls._fetch_claude(account, timeout=timeout)
         elif backend_type == "codex":
-            return cls._fetch_codex(account)
+            return cls._fetch_codex(account, timeout=timeout)
         elif backend_type == "gemini":
-            return cls._fetch_gemini(account)
+            return cls._fetch_gemini(account, timeout=timeout)
         else:
             logger.debug(f"No provider API for backend_type={backend_type}")
             return []
 
     @classmethod
-    def _fetch_claude(cls, account: dict) -> list[dict]:
+    def _fetch_claude(cls, account: dict, timeout: float = _HTTP_TIMEOUT) -> list[dict]:
         """Fetch Claude usage from Anthropic OAuth API.
 
         GET https://api.anthropic.com/api/oauth/usage
@@ -231,7 +296,7 @@ class ProviderUsageClient:
             "anthropic-beta": "oauth-2025-04-20",
         }
 
-        data = _http_get(url, headers)
+        data = _http_get(url, headers, timeout=timeout)
         if data is None:
             return []
 
@@ -254,7 +319,7 @@ class ProviderUsageClient:
         return windows
 
     @classmethod
-    def _fetch_codex(cls, account: dict) -> list[dict]:
+    def _fetch_codex(cls, account: dict, timeout: float = _HTTP_TIMEOUT) -> list[dict]:
         """Fetch Codex usage — tries PTY /status first (default account only), falls back to HTTP API.
 
         PTY method: Launch `codex` interactively, send `/status`, parse usage.
@@ -268,7 +333,7 @@ class ProviderUsageClient:
             Path.home() / ".codex"
         )
         if is_default:
-            pty_result = cls._fetch_codex_via_pty()
+            pty_result = cls._fetch_codex_via_pty(timeout=timeout)
             if pty_result:
                 return pty_result
 
@@ -285,7 +350,7 @@ class ProviderUsageClient:
         if chatgpt_account_id:
             headers["ChatGPT-Account-Id"] = chatgpt_account_id
 
-        data = _http_get(url, headers)
+        data = _http_get(url, headers, timeout=timeout)
         if data is None:
             return []
 
@@ -349,7 +414,7 @@ class ProviderUsageClient:
         return windows
 
     @classmethod
-    def _fetch_codex_via_pty(cls) -> Optional[list[dict]]:
+    def _fetch_codex_via_pty(cls, timeout: float = _HTTP_TIMEOUT) -> Optional[list[dict]]:
         """Fetch Codex usage by running `codex` in PTY and sending /status.
 
         Parses percentage usage and reset times from the /status output.
@@ -361,7 +426,7 @@ class ProviderUsageClient:
             output = PtyRunner.run_interactive(
                 cmd_list=["codex"],
                 input_lines=["/status"],
-                timeout=15,
+                timeout=min(15, timeout),
                 ready_pattern=r"(>|codex|prompt)",
                 settle_time=2.0,
             )
@@ -407,7 +472,7 @@ class ProviderUsageClient:
             return None
 
     @classmethod
-    def _fetch_gemini(cls, account: dict) -> list[dict]:
+    def _fetch_gemini(cls, account: dict, timeout: float = _HTTP_TIMEOUT) -> list[dict]:
         """Fetch Gemini usage from Google Cloud Code API.
 
         POST https://cloudcode-pa.googleapis.com/v1internal:retrieveUserQuota
@@ -425,7 +490,7 @@ class ProviderUsageClient:
         }
         body = json.dumps({"project": "cloud-code-assist"}).encode("utf-8")
 
-        data = _http_post(url, headers, body)
+        data = _http_post(url, headers, body, timeout=timeout)
         if data is None:
             return []
 
@@ -509,42 +574,64 @@ def _get_codex_model_name(config_path: Optional[str]) -> Optional[str]:
     return None
 
 
-def _http_get(url: str, headers: dict) -> Optional[dict]:
-    """Perform an HTTP GET and return parsed JSON, or None on failure."""
-    req = urllib.request.Request(url, headers=headers, method="GET")
+def _get_http_client(url: str) -> httpx.Client:
+    """Return the shared pooled client for the URL's host, creating it on first use."""
+    host = urllib.parse.urlsplit(url).netloc
+    with _http_clients_lock:
+        client = _http_clients.get(host)
+        if client is None:
+            client = httpx.Client(
+                timeout=_HTTP_TIMEOUT,
+                limits=httpx.Limits(max_connections=8, max_keepalive_connections=4),
+            )
+            _http_clients[host] = client
+        return client
+
+
+def close_http_clients() -> None:
+    """Close all pooled provider HTTP clients (registered with atexit by create_app; tests)."""
+    with _http_clients_lock:
+        clients = list(_http_clients.values())
+        _http_clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass  # Intentionally silenced: cleanup/IO operation is best-effort
+
+
+def _http_get(url: str, headers: dict, timeout: float = _HTTP_TIMEOUT) -> Optional[dict]:
+    """Perform an HTTP GET over the pooled client and return parsed JSON, or None on failure."""
     try:
-        with urllib.request.urlopen(req, timeout=_HTTP_TIMEOUT) as resp:
-            if resp.status != 200:
-                logger.error(f"HTTP GET {url} returned {resp.status}")
-                return None
-            return json.loads(resp.read().decode("utf-8"))
-    except urllib.error.HTTPError as e:
-        logger.warning(f"HTTP GET {url} failed: {e.code} {e.reason}")
-        return None
-    except (urllib.error.URLError, TimeoutError, OSError) as e:
+        resp = _get_http_client(url).get(url, headers=headers, timeout=timeout)
+    except httpx.HTTPError as e:
         logger.warning(f"HTTP GET {url} network error: {e}")
         return None
-    except json.JSONDecodeError:
+    if resp.status_code != 200:
+        logger.warning(f"HTTP GET {url} failed: {resp.status_code} {resp.reason_phrase}")
+        return None
+    try:
+        return resp.json()
+    except ValueError:
         logger.warning(f"HTTP GET {url} returned invalid JSON")
         return None
 
 
-def _http_post(url: str, headers: dict, body: bytes) -> Optional[dict]:
-    """Perform an HTTP POST and return parsed JSON, or None on failure."""
-    req = urllib.request.Request(url, data=body, headers=headers, method="POST")
+def _http_post(
+    url: str, headers: dict, body: bytes, timeout: float = _HTTP_TIMEOUT
+) -> Optional[dict]:
+    """Perform an HTTP POST over the pooled client and return parsed JSON, or None on failure."""
     try:
-        with urllib.request.urlopen(req, timeout=_HTTP_TIMEOUT) as resp:
-            if resp.status not in (200, 201):
-                logger.error(f"HTTP POST {url} returned {resp.status}")
-                return None
-            return json.loads(resp.read().decode("utf-8"))
-    except urllib.error.HTTPError as e:
-        logger.error(f"HTTP POST {url} failed: {e.code} {e.reason}", exc_info=True)
-        return None
-    except (urllib.error.URLError, TimeoutError, OSError) as e:
+        resp = _get_http_client(url).post(url, headers=headers, content=body, timeout=timeout)
+    except httpx.HTTPError as e:
         logger.error(f"HTTP POST {url} network error: {e}", exc_info=True)
         return None
-    except json.JSONDecodeError:
+    if resp.status_code not in (200, 201):
+        logger.error(f"HTTP POST {url} failed: {resp.status_code} {resp.reason_phrase}")
+        return None
+    try:
+        return resp.json()
+    except ValueError:
         logger.error(f"HTTP POST {url} returned invalid JSON", exc_info=True)
         return None
 
@@ -584,6 +671,13 @@ def _read_keychain_raw(service: str) -> Optional[str]:
     return None
 
 
+def _file_mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
 def _read_json_file(path: Path) -> Optional[dict]:
     """Read and parse a JSON file. Returns None if not found or invalid."""
     try:
@@ -8,16 +8,22 @@ lock. If the Flask server restarts, all active monitors are lost. Sessions must
 manually after a server restart.
 
 The circuit breaker halts a Ralph session after N consecutive no-progress checks (default 3).
-Progress is detected by comparing the latest git commit hash in the working directory. A
-secondary signal (PTY output activity) is also considered -- if the session is still producing
-output, it is assumed to be working even without new commits (e.g., during compilation).
+Progress is detected from the repository's refs: ``HEAD``, ``packed-refs`` and ``refs/`` are
+subscribed to the shared FileEventMultiplexer, and on a change the commit hash is read straight
+from those files (``git log`` is only spawned for layouts that cannot be read directly). A
+no-progress check runs on the multiplexer's dispatcher once per check interval without a new
+commit. A secondary signal (PTY output activity) is also considered -- if the session is still
+producing output, it is assumed to be working even without new commits (e.g., during
+compilation).
 """
 
 import logging
+import os
 import subprocess
 import threading
-import time
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+from .file_event_multiplexer import FileEventMultiplexer
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +38,9 @@ class RalphMonitorService:
     _monitors: Dict[str, dict] = {}
     _lock = threading.Lock()
 
+    # Seconds without a new commit before a no-progress check
+    CHECK_INTERVAL_SECONDS = 30
+
     @classmethod
     def start_monitoring(
         cls,
@@ -42,8 +51,8 @@ class RalphMonitorService:
     ) -> None:
         """Start monitoring a Ralph loop session for iteration progress.
 
-        Records the initial git commit hash and starts a daemon thread that
-        polls for new commits every 30 seconds.
+        Records the initial git commit hash, watches the repository's refs for
+        new commits and schedules the first no-progress check.
 
         Args:
             session_id: The session to monitor.
@@ -51,130 +60,225 @@ class RalphMonitorService:
             max_iterations: Maximum iterations configured for the Ralph loop.
             no_progress_threshold: Consecutive no-progress checks before circuit break.
         """
+        git_dir = cls._find_git_dir(cwd)
         initial_hash = cls._get_latest_commit(cwd)
 
         state = {
             "iteration": 0,
             "max_iterations": max_iterations,
+            "threshold": no_progress_threshold,
+            "cwd": cwd,
             "last_commit_hash": initial_hash,
             "no_progress_count": 0,
             "triggered": False,
             "active": True,
-            "thread": None,
+            "subscriptions": [],
+            "check_timer": None,
         }
 
-        monitor_thread = threading.Thread(
-            target=cls._monitor_loop,
-            args=(session_id, cwd, max_iterations, no_progress_threshold),
-            daemon=True,
-        )
-        state["thread"] = monitor_thread
-
         with cls._lock:
             cls._monitors[session_id] = state
 
-        monitor_thread.start()
+        subscriptions = cls._watch_refs(session_id, git_dir) if git_dir else []
+        with cls._lock:
+            state["subscriptions"] = subscriptions
+            if state["active"]:
+                cls._schedule_check(session_id, state)
+                subscriptions = []
+        # stop_monitoring ran while subscribing
+        for subscription_id in subscriptions:
+            FileEventMultiplexer.unsubscribe(subscription_id)
+
         logger.info(
             f"Started Ralph monitor for session {session_id} "
             f"(max_iterations={max_iterations}, threshold={no_progress_threshold})"
         )
 
     @classmethod
-    def _monitor_loop(
-        cls,
-        session_id: str,
-        cwd: str,
-        max_iterations: int,
-        threshold: int,
-    ) -> None:
-        """Poll git commits every 30s, track iterations, trigger circuit breaker.
+    def _watch_refs(cls, session_id: str, git_dir: str) -> List[int]:
+        """Subscribe to the files a commit changes: HEAD, packed-refs and refs/."""
+        common_dir = cls._common_dir(git_dir)
+
+        def on_change(paths: List[str]) -> None:
+            cls._on_refs_changed(session_id)
+
+        def is_ref(path: str) -> bool:
+            return not path.endswith(".lock")
+
+        watched = {"HEAD", "packed-refs"} if common_dir == git_dir else {"HEAD"}
+        subscriptions = []
+        try:
+            subscriptions.append(
+                FileEventMultiplexer.subscribe(
+                    git_dir,
+                    on_change,
+                    recursive=False,
+                    path_filter=lambda path: os.path.basename(path) in watched,
+                )
+            )
+            if common_dir != git_dir:
+                subscriptions.append(
+                    FileEventMultiplexer.subscribe(
+                        common_dir,
+                        on_change,
+                        recursive=False,
+                        path_filter=lambda path: os.path.basename(path) == "packed-refs",
+                    )
+                )
+            refs_dir = os.path.join(common_dir, "refs")
+            if os.path.isdir(refs_dir):
+                subscriptions.append(
+                    FileEventMultiplexer.subscribe(refs_dir, on_change, path_filter=is_ref)
+                )
+        except Exception:
+            # Unwatchable repo: the periodic check still compares commits
+            logger.warning(f"Could not watch git refs in {git_dir}", exc_info=True)
+        return subscriptions
+
+    @classmethod
+    def _schedule_check(cls, session_id: str, state: dict) -> None:
+        """(Re)arm the no-progress check for a session (caller holds _lock)."""
+        FileEventMultiplexer.cancel(state.get("check_timer"))
+        state["check_timer"] = FileEventMultiplexer.call_later(
+            cls.CHECK_INTERVAL_SECONDS, lambda: cls._check_progress(session_id)
+        )
+
+    @classmethod
+    def _on_refs_changed(cls, session_id: str) -> None:
+        """Count an iteration when a ref change moved HEAD to a new commit."""
+        with cls._lock:
+            state = cls._monitors.get(session_id)
+            if not state or not state["active"]:
+                return
+            cwd = state["cwd"]
+
+        cls._record_commit(session_id, cls._get_latest_commit(cwd))
+
+    @classmethod
+    def _record_commit(cls, session_id: str, current_hash: str) -> bool:
+        """Record ``current_hash`` as progress if it is a new commit.
+
+        Returns:
+            True if an iteration was counted.
+        """
+        from .project_session_manager import ProjectSessionManager
+
+        with cls._lock:
+            state = cls._monitors.get(session_id)
+            if not state or not state["active"]:
+                return False
+            if not current_hash or current_hash == state["last_commit_hash"]:
+                return False
+
+            # Progress detected -- new commit
+            state["iteration"] += 1
+            state["last_commit_hash"] = current_hash
+            state["no_progress_count"] = 0
+            cls._schedule_check(session_id, state)
+
+            ProjectSessionManager._broadcast(
+                session_id,
+                "ralph_iteration",
+                {
+                    "iteration": state["iteration"],
+                    "max_iterations": state["max_iterations"],
+                },
+            )
+            logger.debug(f"Ralph session {session_id}: iteration {state['iteration']}")
+            return True
 
-        Runs in a daemon thread. Exits when state["active"] is set to False
-        or when the circuit breaker triggers.
+    @classmethod
+    def _check_progress(cls, session_id: str) -> None:
+        """No-progress check, run one check interval after the last commit or check.
+
+        Runs on the multiplexer's dispatcher thread. Stops the monitor when the
+        session is no longer active or the circuit breaker triggers.
         """
         # Import here to avoid circular imports at module level
         from .project_session_manager import ProjectSessionManager
 
-        while True:
-            time.sleep(30)
+        with cls._lock:
+            state = cls._monitors.get(session_id)
+            if not state or not state["active"]:
+                return
+            cwd = state["cwd"]
 
-            with cls._lock:
-                state = cls._monitors.get(session_id)
-                if not state or not state["active"]:
-                    return
+        # Catches commits whose ref events were missed (or repos that cannot be watched)
+        if cls._record_commit(session_id, cls._get_latest_commit(cwd)):
+            return
 
-            current_hash = cls._get_latest_commit(cwd)
-            session_info = ProjectSessionManager.get_session_info(session_id)
+        session_info = ProjectSessionManager.get_session_info(session_id)
 
-            with cls._lock:
-                state = cls._monitors.get(session_id)
-                if not state or not state["active"]:
-                    return
+        with cls._lock:
+            state = cls._monitors.get(session_id)
+            if not state or not state["active"]:
+                return
 
-                if current_hash and current_hash != state["last_commit_hash"]:
-                    # Progress detected -- new commit
-                    state["iteration"] += 1
-                    state["last_commit_hash"] = current_hash
+            if session_info and session_info.get("status") == "active":
+                # No new commit -- check secondary signal (PTY output)
+                output_lines = session_info.get("output_lines", 0)
+                if output_lines > 0:
+                    # Output is being produced, assume still working
                     state["no_progress_count"] = 0
-
-                    ProjectSessionManager._broadcast(
-                        session_id,
-                        "ralph_iteration",
-                        {
-                            "iteration": state["iteration"],
-                            "max_iterations": max_iterations,
-                        },
-                    )
-                    logger.debug(f"Ralph session {session_id}: iteration {state['iteration']}")
-                elif session_info and session_info.get("status") == "active":
-                    # No new commit -- check secondary signal (PTY output)
-                    output_lines = session_info.get("output_lines", 0)
-                    if output_lines > 0:
-                        # Output is being produced, assume still working
-                        state["no_progress_count"] = 0
-                    else:
-                        state["no_progress_count"] += 1
                 else:
-                    # Session no longer active
-                    state["active"] = False
-                    return
-
-                # Check circuit breaker
-                if state["no_progress_count"] >= threshold:
-                    state["triggered"] = True
-                    state["active"] = False
-
-                    logger.warning(
-                        f"Circuit breaker triggered for Ralph session {session_id} "
-                        f"after {state['no_progress_count']} consecutive no-progress checks"
-                    )
+                    state["no_progress_count"] += 1
+            else:
+                # Session no longer active
+                state["active"] = False
 
-                    ProjectSessionManager._broadcast(
-                        session_id,
-                        "circuit_breaker",
-                        {
-                            "reason": "no_progress",
-                            "iterations_without_progress": state["no_progress_count"],
-                        },
-                    )
+            # Check circuit breaker
+            if state["active"] and state["no_progress_count"] >= state["threshold"]:
+                state["triggered"] = True
+                state["active"] = False
 
-            # Stop session outside lock to avoid deadlock
-            if state.get("triggered"):
-                ProjectSessionManager.stop_session(session_id)
+                logger.warning(
+                    f"Circuit breaker triggered for Ralph session {session_id} "
+                    f"after {state['no_progress_count']} consecutive no-progress checks"
+                )
+
+                ProjectSessionManager._broadcast(
+                    session_id,
+                    "circuit_breaker",
+                    {
+                        "reason": "no_progress",
+                        "iterations_without_progress": state["no_progress_count"],
+                    },
+                )
+
+            if state["active"]:
+                cls._schedule_check(session_id, state)
                 return
+            subscriptions = state["subscriptions"]
+            state["subscriptions"] = []
+            triggered = state["triggered"]
+
+        for subscription_id in subscriptions:
+            FileEventMultiplexer.unsubscribe(subscription_id)
+        # Stop session off the dispatcher thread so file events keep flowing
+        if triggered:
+            threading.Thread(
+                target=ProjectSessionManager.stop_session, args=(session_id,), daemon=True
+            ).start()
 
     @classmethod
     def stop_monitoring(cls, session_id: str) -> None:
         """Stop monitoring a Ralph loop session.
 
-        Sets active=False so the monitor thread will exit on its next cycle,
-        then removes the entry from _monitors to prevent memory leaks.
+        Cancels the pending no-progress check, unsubscribes the ref watches and
+        removes the entry from _monitors to prevent memory leaks.
         """
         with cls._lock:
             state = cls._monitors.pop(session_id, None)
-            if state:
-                state["active"] = False
-                logger.info(f"Stopped Ralph monitor for session {session_id}")
+            if not state:
+                return
+            state["active"] = False
+            FileEventMultiplexer.cancel(state.get("check_timer"))
+            subscriptions = state["subscriptions"]
+            state["subscriptions"] = []
+            logger.info(f"Stopped Ralph monitor for session {session_id}")
+
+        for subscription_id in subscriptions:
+            FileEventMultiplexer.unsubscribe(subscription_id)
 
     @classmethod
     def get_state(cls, session_id: str) -> Optional[dict]:
@@ -188,7 +292,7 @@ class RalphMonitorService:
             state = cls._monitors.get(session_id)
             if not state:
                 return None
-            # Return a copy without the thread reference
+            # Return a copy without the watch and timer references
             return {
                 "iteration": state["iteration"],
                 "max_iterations": state["max_iterations"],
@@ -198,13 +302,21 @@ class RalphMonitorService:
                 "active": state["active"],
             }
 
-    @staticmethod
-    def _get_latest_commit(cwd: str) -> str:
+    @classmethod
+    def _get_latest_commit(cls, cwd: str) -> str:
         """Get the latest git commit hash from the working directory.
 
+        Reads HEAD and refs directly; runs ``git log`` only when they cannot
+        be resolved (e.g. reftable repositories or an unborn branch).
+
         Returns:
             The commit hash string, or empty string on error.
         """
+        git_dir = cls._find_git_dir(cwd)
+        if git_dir:
+            commit = cls._read_head_commit(git_dir)
+            if commit:
+                return commit
         try:
             result = subprocess.run(
                 ["git", "log", "-1", "--format=%H"],
@@ -216,3 +328,70 @@ class RalphMonitorService:
             return result.stdout.strip()
         except Exception:
             return ""
+
+    @staticmethod
+    def _find_git_dir(cwd: str) -> Optional[str]:
+        """Locate the git directory for ``cwd``, following ``.git`` files of worktrees."""
+        path = os.path.abspath(cwd)
+        while True:
+            dot_git = os.path.join(path, ".git")
+            if os.path.isdir(dot_git):
+                return dot_git
+            if os.path.isfile(dot_git):
+                try:
+                    with open(dot_git, "r") as f:
+                        content = f.read().strip()
+                except OSError:
+                    return None
+                if content.startswith("gitdir:"):
+                    return os.path.normpath(os.path.join(path, content[len("gitdir:") :].strip()))
+                return None
+            parent = os.path.dirname(path)
+            if parent == path:
+                return None
+            path = parent
+
+    @staticmethod
+    def _common_dir(git_dir: str) -> str:
+        """Directory holding shared refs (differs from ``git_dir`` for linked worktrees)."""
+        try:
+            with open(os.path.join(git_dir, "commondir"), "r") as f:
+                return os.path.normpath(os.path.join(git_dir, f.read().strip()))
+        except OSError:
+            return git_dir
+
+    @classmethod
+    def _read_head_commit(cls, git_dir: str) -> str:
+        """Resolve HEAD to a commit hash from loose refs or packed-refs, or ``""``."""
+        common_dir = cls._common_dir(git_dir)
+        try:
+            with open(os.path.join(git_dir, "HEAD"), "r") as f:
+                value = f.read().strip()
+        except OSError:
+            return ""
+        # Symbolic refs may point at other symbolic refs; bound the chain
+        for _ in range(5):
+            if not value.startswith("ref:"):
+                return value
+            ref = value[len("ref:") :].strip()
+            try:
+                with open(os.path.join(common_dir, ref), "r") as f:
+                    value = f.read().strip()
+            except OSError:
+                return cls._packed_ref(common_dir, ref)
+        return ""
+
+    @staticmethod
+    def _packed_ref(common_dir: str, ref: str) -> str:
+        """Look up ``ref`` in packed-refs, or ``""`` if it is not there."""
+        try:
+            with open(os.path.join(common_dir, "packed-refs"), "r") as f:
+                for line in f:
+                    if line.startswith(("#", "^")):
+                        continue
+                    parts = line.split()
+                    if len(parts) == 2 and parts[1] == ref:
+                        return parts[0]
+        except OSError:
+            pass
+        return ""
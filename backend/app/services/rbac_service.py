@@ -9,11 +9,11 @@ import logging
 from http import HTTPStatus
 from typing import Callable, Optional
 
-from flask import request
+from flask import g, request
 
 from app.models.common import error_response
 
-from ..db.rbac import count_user_roles, get_role_for_api_key
+from ..db.rbac import get_role_for_api_key, has_any_keys
 from ..services.audit_log_service import AuditLogService
 
 logger = logging.getLogger(__name__)
@@ -30,14 +30,19 @@ ROLE_PERMISSIONS = {
 def get_role_for_request(req=None) -> Optional[str]:
     """Extract the role for the current request from the X-API-Key header.
 
+    For the current request the role is resolved once and kept on ``flask.g``,
+    so the auth gate and ``require_role`` share a single lookup.
+
     Returns:
         Role string (e.g. 'admin'), or None if no key or key not found.
     """
-    req = req or request
-    api_key = req.headers.get("X-API-Key")
-    if not api_key:
-        return None
-    return get_role_for_api_key(api_key)
+    if req is not None:
+        api_key = req.headers.get("X-API-Key")
+        return get_role_for_api_key(api_key) if api_key else None
+    if "api_key_role" not in g:
+        api_key = request.headers.get("X-API-Key")
+        g.api_key_role = get_role_for_api_key(api_key) if api_key else None
+    return g.api_key_role
 
 
 def has_permission(api_key: str, permission: str) -> bool:
@@ -80,7 +85,7 @@ def require_role(*allowed_roles) -> Callable:
         @functools.wraps(fn)
         def wrapper(*args, **kwargs):
             # Graceful bootstrap: if no roles configured, allow all requests
-            if count_user_roles() == 0:
+            if not has_any_keys():
                 return fn(*args, **kwargs)
 
             api_key = request.headers.get("X-API-Key")
@@ -94,7 +99,7 @@ def require_role(*allowed_roles) -> Callable:
                 )
                 return error_response("FORBIDDEN", "API key required", HTTPStatus.FORBIDDEN)
 
-            role = get_role_for_api_key(api_key)
+            role = get_role_for_request()
             if role is None:
                 AuditLogService.log(
                     action="rbac.denied",
@@ -0,0 +1,231 @@
+"""Shared bare-mirror cache for GitHub repository clones.
+
+Each GitHub repo is mirrored once under ``REPO_MIRROR_DIR`` (``git clone
+--mirror``) and refreshed with an incremental ``git fetch`` before use.
+Executions then get a ``git clone --shared`` working copy from the local
+mirror, which borrows the mirror's object store instead of downloading the
+repository again. Mirrors are evicted least-recently-used first once the
+cache exceeds ``REPO_MIRROR_BUDGET_MB``; mirrors with live working copies are
+never evicted.
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+from typing import Dict, List, Optional
+
+from app import config as app_config
+
+logger = logging.getLogger(__name__)
+
+
+class RepoMirrorCache:
+    """Per-repo bare mirrors with locked refresh and disk-budget LRU eviction."""
+
+    _guard = threading.Lock()
+    _repo_locks: Dict[str, threading.Lock] = {}
+    _last_fetch: Dict[str, float] = {}
+    # mirror key -> number of live working copies borrowing its objects
+    _in_use: Dict[str, int] = {}
+    # working copy path -> mirror key
+    _checkouts: Dict[str, str] = {}
+    # mirror key -> bytes on disk, measured after each clone or fetch
+    _sizes: Dict[str, int] = {}
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return app_config.REPO_MIRROR_BUDGET_MB > 0
+
+    @staticmethod
+    def _key(owner: str, repo: str) -> str:
+        return f"{owner}__{repo}".lower()
+
+    @classmethod
+    def mirror_path(cls, owner: str, repo: str) -> str:
+        return os.path.join(app_config.REPO_MIRROR_DIR, f"{cls._key(owner, repo)}.git")
+
+    @classmethod
+    def _lock_for(cls, key: str) -> threading.Lock:
+        with cls._guard:
+            lock = cls._repo_locks.get(key)
+            if lock is None:
+                lock = cls._repo_locks[key] = threading.Lock()
+            return lock
+
+    @staticmethod
+    def _mirror_clone_cmd(owner: str, repo: str, dest: str) -> List[str]:
+        """Command that creates a bare mirror of owner/repo at dest (gh handles auth)."""
+        return ["gh", "repo", "clone", f"{owner}/{repo}", dest, "--", "--mirror"]
+
+    @staticmethod
+    def _git(args: List[str], cwd: Optional[str] = None, timeout: Optional[int] = None) -> str:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            timeout=timeout or app_config.GIT_OP_TIMEOUT,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"git {args[0]} failed: {result.stderr.strip()}")
+        return result.stdout.strip()
+
+    @classmethod
+    def ensure_mirror(cls, owner: str, repo: str) -> str:
+        """Create or refresh the mirror for owner/repo and return its path.
+
+        Concurrent callers for the same repo serialize on a per-repo lock, and
+        a mirror fetched within ``REPO_MIRROR_FRESH_SECONDS`` is reused as is.
+        Raises RuntimeError if the mirror cannot be created or refreshed.
+        """
+        key = cls._key(owner, repo)
+        path = cls.mirror_path(owner, repo)
+        with cls._lock_for(key):
+            if not os.path.isdir(path):
+                os.makedirs(app_config.REPO_MIRROR_DIR, exist_ok=True)
+                partial = f"{path}.partial"
+                shutil.rmtree(partial, ignore_errors=True)
+                try:
+                    result = subprocess.run(
+                        cls._mirror_clone_cmd(owner, repo, partial),
+                        capture_output=True,
+                        text=True,
+                        timeout=app_config.CLONE_TIMEOUT,
+                    )
+                    if result.returncode != 0:
+                        raise RuntimeError(f"mirror clone failed: {result.stderr.strip()}")
+                    os.rename(partial, path)
+                except subprocess.TimeoutExpired:
+                    raise RuntimeError(f"mirror clone timed out for {owner}/{repo}")
+                finally:
+                    shutil.rmtree(partial, ignore_errors=True)
+                logger.info("Created repo mirror %s", path)
+                cls._sizes[key] = cls._mirror_size(path)
+            elif time.monotonic() - cls._last_fetch.get(key, 0) > (
+                app_config.REPO_MIRROR_FRESH_SECONDS
+            ):
+                try:
+                    cls._git(["fetch", "--prune", "origin"], cwd=path)
+                except subprocess.TimeoutExpired:
+                    raise RuntimeError(f"mirror fetch timed out for {owner}/{repo}")
+                logger.debug("Refreshed repo mirror %s", path)
+                cls._sizes[key] = cls._mirror_size(path)
+            cls._last_fetch[key] = time.monotonic()
+            # mtime doubles as the LRU timestamp
+            os.utime(path)
+        return path
+
+    @classmethod
+    def checkout(cls, owner: str, repo: str, target_dir: str) -> str:
+        """Materialize a working copy of owner/repo in target_dir from its mirror.
+
+        The working copy's ``origin`` points at GitHub (not the mirror), so
+        branches pushed from it land upstream. Call ``release`` when done.
+        """
+        key = cls._key(owner, repo)
+        # Pin the mirror before touching it so a concurrent evict() skips it
+        with cls._guard:
+            cls._in_use[key] = cls._in_use.get(key, 0) + 1
+            cls._checkouts[os.path.abspath(target_dir)] = key
+        try:
+            mirror = cls.ensure_mirror(owner, repo)
+            cls._git(["clone", "--shared", mirror, target_dir], timeout=app_config.CLONE_TIMEOUT)
+            origin_url = cls._git(["remote", "get-url", "origin"], cwd=mirror)
+            cls._git(["remote", "set-url", "origin", origin_url], cwd=target_dir)
+            if os.path.exists(os.path.join(target_dir, ".gitmodules")):
+                cls._git(
+                    ["submodule", "update", "--init", "--recursive"],
+                    cwd=target_dir,
+                    timeout=app_config.CLONE_TIMEOUT,
+                )
+        except Exception:
+            cls.release(target_dir)
+            raise
+        try:
+            cls.evict()
+        except Exception as e:
+            logger.warning("Repo mirror eviction failed: %s", e)
+        return target_dir
+
+    @classmethod
+    def release(cls, clone_path: str) -> None:
+        """Mark a working copy as finished so its mirror becomes evictable."""
+        with cls._guard:
+            key = cls._checkouts.pop(os.path.abspath(clone_path), None)
+            if key is None:
+                return
+            remaining = cls._in_use.get(key, 1) - 1
+            if remaining > 0:
+                cls._in_use[key] = remaining
+            else:
+                cls._in_use.pop(key, None)
+
+    @staticmethod
+    def _dir_size(path: str) -> int:
+        total = 0
+        for root, _dirs, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.lstat(os.path.join(root, name)).st_size
+                except OSError:
+                    pass
+        return total
+
+    @classmethod
+    def _mirror_size(cls, path: str) -> int:
+        """Bytes held by a mirror's object store, from git's own accounting.
+
+        ``git count-objects`` reads the pack index sizes and loose-object
+        directories instead of walking the whole tree; a mirror git cannot
+        read is measured with a full walk.
+        """
+        try:
+            output = cls._git(["count-objects", "-v"], cwd=path)
+        except (RuntimeError, OSError, subprocess.TimeoutExpired):
+            return cls._dir_size(path)
+        fields = dict(line.split(": ", 1) for line in output.splitlines() if ": " in line)
+        kib = sum(int(fields.get(name, 0)) for name in ("size", "size-pack", "size-garbage"))
+        return kib * 1024
+
+    @classmethod
+    def evict(cls, budget_bytes: Optional[int] = None) -> List[str]:
+        """Delete least-recently-used idle mirrors until the cache fits the budget.
+
+        Sizes come from ``_sizes``, recorded whenever a mirror is cloned or
+        fetched; a mirror left on disk by an earlier process is measured once.
+        Returns the paths of evicted mirrors.
+        """
+        if budget_bytes is None:
+            budget_bytes = app_config.REPO_MIRROR_BUDGET_MB * 1024 * 1024
+        root = app_config.REPO_MIRROR_DIR
+        if not os.path.isdir(root):
+            return []
+
+        mirrors = []
+        for name in os.listdir(root):
+            path = os.path.join(root, name)
+            if name.endswith(".git") and os.path.isdir(path):
+                key = name[: -len(".git")]
+                if key not in cls._sizes:
+                    cls._sizes[key] = cls._mirror_size(path)
+                mirrors.append((os.path.getmtime(path), path, key))
+        total = sum(cls._sizes.get(key, 0) for _, _, key in mirrors)
+
+        evicted = []
+        for _, path, key in sorted(mirrors):
+            if total <= budget_bytes:
+                break
+            with cls._lock_for(key):
+                with cls._guard:
+                    if cls._in_use.get(key):
+                        continue
+                shutil.rmtree(path, ignore_errors=True)
+                cls._last_fetch.pop(key, None)
+                size = cls._sizes.pop(key, 0)
+            total -= size
+            evicted.append(path)
+            logger.info("Evicted repo mirror %s (%d bytes)", path, size)
+        return evicted
@@ -1,13 +1,16 @@
 """Report service for generating weekly team impact reports.
 
-Queries execution_logs and pr_reviews tables directly to produce
-team impact digests without over-engineering (no Jinja2, no PDF).
+Reads the daily execution aggregate (``execution_daily_stats``) and the
+pr_reviews table to produce team impact digests without over-engineering
+(no Jinja2, no PDF).
 """
 
 import logging
 from datetime import datetime, timedelta, timezone
 
 from ..db.connection import get_connection
+from ..db.cross_team_insights import get_cross_team_insights
+from .execution_report_cache import ExecutionReportCache
 
 logger = logging.getLogger(__name__)
 
@@ -18,10 +21,17 @@ class ReportService:
     TIME_SAVED_PER_PR_REVIEW_MINUTES = 15
     TIME_SAVED_PER_SECURITY_AUDIT_MINUTES = 30
 
+    @classmethod
+    def get_cross_team_insights(cls) -> dict:
+        """Cross-team insights, cached until the next execution finishes."""
+        return ExecutionReportCache.get_or_compute("cross_team_insights", get_cross_team_insights)
+
     @classmethod
     def generate_weekly_report(cls, team_id: str = None) -> dict:
         """Generate a team impact report for the last 7 days.
 
+        Results are cached until the next execution finishes.
+
         Args:
             team_id: Optional team filter (currently unused, reserved for future).
 
@@ -29,21 +39,46 @@ class ReportService:
             Dict with prs_reviewed, issues_found, estimated_time_saved_minutes,
             top_bots, bots_needing_attention, period_start, period_end.
         """
+        return ExecutionReportCache.get_or_compute(
+            ("weekly_report", team_id), cls._build_weekly_report
+        )
+
+    @classmethod
+    def _build_weekly_report(cls) -> dict:
         now = datetime.now(timezone.utc)
         period_end = now.strftime("%Y-%m-%d")
         period_start = (now - timedelta(days=7)).strftime("%Y-%m-%d")
 
         with get_connection() as conn:
-            # prs_reviewed: count of GitHub-triggered executions that completed
+            # Every execution count comes from one pass over the daily aggregate
             cursor = conn.execute(
                 """
-                SELECT COUNT(*) as cnt FROM execution_logs
-                WHERE trigger_type = 'github'
-                  AND status = 'completed'
-                  AND started_at >= datetime('now', '-7 days')
-                """
+                SELECT s.trigger_id, t.name AS trigger_name, s.trigger_type, s.status,
+                       SUM(s.runs) AS runs
+                FROM execution_daily_stats s
+                LEFT JOIN triggers t ON t.id = s.trigger_id
+                WHERE s.day >= ? AND s.runs > 0
+                GROUP BY s.trigger_id, s.trigger_type, s.status
+                """,
+                (period_start,),
             )
-            prs_reviewed = cursor.fetchone()["cnt"]
+            prs_reviewed = security_audits = 0
+            per_trigger: dict = {}
+            for row in cursor.fetchall():
+                runs = row["runs"]
+                if row["status"] == "completed":
+                    # GitHub-triggered completions are PR reviews, webhook ones security audits
+                    if row["trigger_type"] == "github":
+                        prs_reviewed += runs
+                    elif row["trigger_type"] == "webhook":
+                        security_audits += runs
+                trigger_id = row["trigger_id"] or None
+                counts = per_trigger.setdefault(
+                    trigger_id, {"trigger_name": row["trigger_name"], "total": 0, "failed": 0}
+                )
+                counts["total"] += runs
+                if row["status"] == "failed":
+                    counts["failed"] += runs
 
             # issues_found: count of PR reviews with review_status = 'changes_requested'
             cursor = conn.execute(
@@ -55,17 +90,6 @@ class ReportService:
             )
             issues_found = cursor.fetchone()["cnt"]
 
-            # Count security audits (webhook-triggered completions)
-            cursor = conn.execute(
-                """
-                SELECT COUNT(*) as cnt FROM execution_logs
-                WHERE trigger_type = 'webhook'
-                  AND status = 'completed'
-                  AND started_at >= datetime('now', '-7 days')
-                """
-            )
-            security_audits = cursor.fetchone()["cnt"]
-
             # estimated_time_saved
             estimated_time_saved = (
                 prs_reviewed * cls.TIME_SAVED_PER_PR_REVIEW_MINUTES
@@ -73,53 +97,33 @@ class ReportService:
             )
 
             # top_bots: top 5 triggers by execution count in the period
-            cursor = conn.execute(
-                """
-                SELECT e.trigger_id, t.name as trigger_name, COUNT(*) as execution_count
-                FROM execution_logs e
-                LEFT JOIN triggers t ON e.trigger_id = t.id
-                WHERE e.started_at >= datetime('now', '-7 days')
-                GROUP BY e.trigger_id
-                ORDER BY execution_count DESC
-                LIMIT 5
-                """
-            )
+            ranked = sorted(per_trigger.items(), key=lambda item: item[1]["total"], reverse=True)
             top_bots = [
                 {
-                    "trigger_id": row["trigger_id"],
-                    "trigger_name": row["trigger_name"],
-                    "execution_count": row["execution_count"],
+                    "trigger_id": trigger_id,
+                    "trigger_name": counts["trigger_name"],
+                    "execution_count": counts["total"],
                 }
-                for row in cursor.fetchall()
+                for trigger_id, counts in ranked[:5]
             ]
 
             # bots_needing_attention: triggers with >50% failure rate or active health alerts
-            cursor = conn.execute(
-                """
-                SELECT e.trigger_id, t.name as trigger_name,
-                       COUNT(*) as total,
-                       SUM(CASE WHEN e.status = 'failed' THEN 1 ELSE 0 END) as failed
-                FROM execution_logs e
-                LEFT JOIN triggers t ON e.trigger_id = t.id
-                WHERE e.started_at >= datetime('now', '-7 days')
-                GROUP BY e.trigger_id
-                HAVING total > 0 AND (CAST(failed AS FLOAT) / total) > 0.5
-                """
-            )
             bots_needing_attention = []
             seen_trigger_ids = set()
-            for row in cursor.fetchall():
-                failure_rate = round(row["failed"] / row["total"], 2) if row["total"] > 0 else 0
+            for trigger_id, counts in per_trigger.items():
+                if not counts["total"] or counts["failed"] / counts["total"] <= 0.5:
+                    continue
+                failure_rate = round(counts["failed"] / counts["total"], 2)
                 bots_needing_attention.append(
                     {
-                        "trigger_id": row["trigger_id"],
-                        "trigger_name": row["trigger_name"],
+                        "trigger_id": trigger_id,
+                        "trigger_name": counts["trigger_name"],
                         "reason": f"High failure rate: {failure_rate:.0%}",
                         "failure_rate": failure_rate,
                         "active_alerts": 0,
                     }
                 )
-                seen_trigger_ids.add(row["trigger_id"])
+                seen_trigger_ids.add(trigger_id)
 
             # Also add triggers with active (unacknowledged) health alerts
             cursor = conn.execute(
@@ -2,7 +2,9 @@
 
 Detects when running sessions approach rate limits, selects the best target account
 via weighted scoring, gracefully terminates the current process (SIGTERM + SIGKILL
-fallback), and starts a continuation execution on the target account.
+fallback), and starts a continuation execution on the target account. The
+continuation takes over the execution's workspace (see execution_workspace) and,
+where the CLI supports it, resumes the same session under the new account.
 
 Composes existing infrastructure: ProcessManager (process lifecycle), ExecutionLogService
 (log capture), MonitoringService (utilization data), rotation_events CRUD (audit trail),
@@ -36,6 +38,11 @@ class RotationService:
     ROTATION_UTILIZATION_THRESHOLD = 80.0  # Percentage threshold to trigger rotation
     SIGTERM_TIMEOUT = 5  # Seconds to wait after SIGTERM before SIGKILL
     DEFAULT_CONTEXT_LINES = 200  # Lines of output to include in continuation prompt
+    RESUME_PROMPT = (
+        "This session was moved to another account for rate limit management. "
+        "The working directory still contains all changes made so far. Continue the "
+        "task from where you left off; do not repeat work that was already completed."
+    )
 
     @classmethod
     def should_rotate(cls, execution_id: str, account_id: int) -> dict:
@@ -205,11 +212,13 @@ class RotationService:
         execution_id: str,
         original_prompt: str,
         context_lines: int = 200,
+        workspace_preserved: bool = False,
     ) -> str:
         """Build a continuation prompt with last N lines of context.
 
         MUST be called BEFORE process termination, as log buffers are cleared
-        after process exits.
+        after process exits. ``workspace_preserved`` tells the model that the
+        previous session's file changes are still on disk.
         """
         from .execution_log_service import ExecutionLogService
 
@@ -228,7 +237,12 @@ class RotationService:
             f"```\n{context}\n```\n\n"
             "## Instructions\n"
             "Review the previous session output above and continue the task. "
-            "Do not repeat work that was already completed."
+            + (
+                "The working directory still contains all changes made so far. "
+                if workspace_preserved
+                else ""
+            )
+            + "Do not repeat work that was already completed."
         )
 
     @classmethod
@@ -246,8 +260,11 @@ class RotationService:
         """
         from ..db.rotations import add_rotation_event, update_rotation_event
         from .execution_log_service import ExecutionLogService
+        from .execution_workspace import WorkspaceRegistry
 
         rotation_event_id = None
+        workspace = None
+        continuation_started = False
 
         try:
             # Step 1: Get current execution's account_id
@@ -294,10 +311,14 @@ class RotationService:
             target_account = target["account"]
             target_account_id = target_account["id"]
 
-            # Step 4: Capture continuation prompt BEFORE termination
+            # Step 4: Capture continuation prompt BEFORE termination (used when
+            # the session itself cannot be resumed)
             original_prompt = execution.get("prompt", message_text)
             continuation_prompt = cls.build_continuation_prompt(
-                execution_id, original_prompt, cls.DEFAULT_CONTEXT_LINES
+                execution_id,
+                original_prompt,
+                cls.DEFAULT_CONTEXT_LINES,
+                workspace_preserved=WorkspaceRegistry.get(execution_id) is not None,
             )
 
             # Step 5: Record rotation event as pending
@@ -309,10 +330,18 @@ class RotationService:
                 urgency="normal",
             )
 
-            # Step 6: Terminate current process
+            # Step 6: Take over the workspace, then terminate the current process.
+            # The hand-off must come first so the original run, seeing its process
+            # exit, leaves the clones and the "rotated" status alone.
+            workspace = WorkspaceRegistry.hand_off(execution_id)
             terminated = cls._terminate_process(execution_id, timeout=cls.SIGTERM_TIMEOUT)
             if not terminated:
-                logger.warning(f"Rotation: could not terminate process for {execution_id}")
+                # The original run may still be using the workspace: give it back
+                # and abort. If that run already ended while the workspace was
+                # handed off, the failure handler below cleans it up.
+                if workspace is not None and WorkspaceRegistry.reclaim(execution_id):
+                    workspace = None
+                raise RuntimeError(f"could not terminate process for {execution_id}")
 
             # Step 7: Cleanup process tracking and finalize execution
             from .process_manager import ProcessManager
@@ -325,20 +354,27 @@ class RotationService:
 
             env_overrides = OrchestrationService._build_account_env(target_account)
 
-            # Step 9: Start continuation execution
+            # Step 9: Resume the session under the target account if possible
+            resume_session_id = cls._carry_session(workspace, backend_type, env_overrides)
+            prompt = cls.RESUME_PROMPT if resume_session_id else continuation_prompt
+
+            # Step 10: Start continuation execution in the preserved workspace
             from .execution_service import ExecutionService
 
             modified_trigger = {**trigger, "backend_type": backend_type}
+            continuation_started = True
             continuation_execution_id = ExecutionService.run_trigger(
                 modified_trigger,
-                continuation_prompt,
+                prompt,
                 event,
                 trigger_type,
                 env_overrides=env_overrides,
                 account_id=target_account_id,
+                workspace=workspace,
+                resume_session_id=resume_session_id,
             )
 
-            # Step 10: Update rotation event with completion
+            # Step 11: Update rotation event with completion
             if rotation_event_id:
                 completed_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
                 update_rotation_event(
@@ -354,7 +390,7 @@ class RotationService:
                 f"(account {account_id} -> {target_account_id})"
             )
 
-            # Step 11: Write audit log entry so rotation is visible in the UI
+            # Step 12: Write audit log entry so rotation is visible in the UI
             try:
                 from .audit_log_service import AuditLogService
 
@@ -370,16 +406,23 @@ class RotationService:
                         "utilization_pct": utilization_pct,
                         "reason": decision["reason"],
                         "rotation_event_id": rotation_event_id,
+                        "workspace_preserved": workspace is not None,
+                        "session_resumed": resume_session_id is not None,
                     },
                 )
             except Exception as audit_err:
                 logger.warning(f"Failed to write rotation audit log: {audit_err}")
 
-            # Step 12: Return continuation execution ID
+            # Step 13: Return continuation execution ID
             return continuation_execution_id
 
         except Exception as e:
             logger.error(f"Rotation failed for {execution_id}: {e}", exc_info=True)
+            # A handed-off workspace has no owner left unless the continuation started
+            if workspace is not None and not continuation_started:
+                from .execution_service import ExecutionService
+
+                ExecutionService.cleanup_workspace(workspace.cloned_dirs)
             # Update rotation event to failed status
             if rotation_event_id:
                 try:
@@ -405,6 +448,32 @@ class RotationService:
                 pass  # Intentionally silenced: failure is non-critical
             return None
 
+    @classmethod
+    def _carry_session(
+        cls, workspace, backend_type: str, env_overrides: Optional[dict]
+    ) -> Optional[str]:
+        """Make the rotated execution's CLI session resumable under the target account.
+
+        Returns the session id to resume, or None to fall back to a continuation prompt.
+        """
+        from .command_builder import CommandBuilder
+        from .execution_workspace import carry_claude_session, claude_config_dir
+
+        if workspace is None or not workspace.session_id:
+            return None
+        if not CommandBuilder.supports_session_resume(backend_type):
+            return None
+        source_dir = workspace.config_dir or claude_config_dir()
+        if not carry_claude_session(
+            workspace.session_id, source_dir, claude_config_dir(env_overrides)
+        ):
+            logger.info(
+                f"Rotation: session {workspace.session_id} not found under {source_dir}, "
+                "falling back to continuation prompt"
+            )
+            return None
+        return workspace.session_id
+
     @classmethod
     def _terminate_process(cls, execution_id: str, timeout: int = 5) -> bool:
         """Gracefully terminate a running process. SIGTERM first, SIGKILL fallback.
@@ -11,7 +11,9 @@ NEVER logs plaintext secret values.
 
 import logging
 import os
-from typing import Optional
+import threading
+import time
+from typing import Dict, Optional, Tuple
 
 from cryptography.fernet import Fernet, MultiFernet
 
@@ -24,7 +26,13 @@ logger = logging.getLogger(__name__)
 class SecretVaultService:
     """Fernet-based encrypted secrets vault with audit logging on every access."""
 
+    # Decrypted execution env per scope; dropped on any secret or key change
+    ENV_CACHE_TTL_SECONDS = 30.0
+
     _fernet: Optional[MultiFernet] = None
+    _env_cache: Dict[str, Tuple[float, dict]] = {}
+    _env_generation = 0
+    _env_lock = threading.Lock()
 
     @classmethod
     def _get_fernet(cls) -> MultiFernet:
@@ -59,6 +67,14 @@ class SecretVaultService:
     def reset(cls) -> None:
         """Reset the cached Fernet instance (useful for testing key rotation)."""
         cls._fernet = None
+        cls.invalidate_env_cache()
+
+    @classmethod
+    def invalidate_env_cache(cls) -> None:
+        """Drop cached execution environments so the next run re-reads the vault."""
+        with cls._env_lock:
+            cls._env_cache.clear()
+            cls._env_generation += 1
 
     @classmethod
     def is_configured(cls) -> bool:
@@ -114,6 +130,7 @@ class SecretVaultService:
             scope=scope,
             created_by=created_by,
         )
+        cls.invalidate_env_cache()
         AuditLogService.log(
             action="secret.create",
             entity_type="secret",
@@ -157,6 +174,7 @@ class SecretVaultService:
         )
         if not updated:
             return False
+        cls.invalidate_env_cache()
 
         # Audit log field changes for description
         new_metadata = {
@@ -205,6 +223,7 @@ class SecretVaultService:
         deleted = db_secrets.delete_secret(secret_id)
         if not deleted:
             return False
+        cls.invalidate_env_cache()
 
         AuditLogService.log_field_changes(
             action="secret.delete",
@@ -236,30 +255,67 @@ class SecretVaultService:
         return plaintext
 
     @classmethod
-    def get_secrets_for_execution(cls, scope: str = "global") -> dict:
+    def get_secrets_for_execution(
+        cls, scope: str = "global", execution_id: Optional[str] = None
+    ) -> dict:
         """Get all secrets for a scope as env vars for subprocess injection.
 
+        The scope is read in one query and the decrypted result is cached for
+        ``ENV_CACHE_TTL_SECONDS``. Each call writes a single ``secret.access``
+        audit record listing the secrets handed to the execution.
+
         Returns a dict of {"AGENTED_SECRET_{NAME}": plaintext} entries.
         """
-        secrets_list = db_secrets.list_secrets(scope=scope)
-        result = {}
-        for secret_meta in secrets_list:
-            secret = db_secrets.get_secret(secret_meta["id"])
-            if not secret:
-                continue
+        with cls._env_lock:
+            cached = cls._env_cache.get(scope)
+            generation = cls._env_generation
+        now = time.monotonic()
+        if cached and now - cached[0] < cls.ENV_CACHE_TTL_SECONDS:
+            env, secret_ids = cached[1]
+            from_cache = True
+        else:
+            env, secret_ids, complete = cls._decrypt_scope(scope)
+            from_cache = False
+            # Skip caching partial results and fills that raced an invalidation
+            with cls._env_lock:
+                if complete and generation == cls._env_generation:
+                    cls._env_cache[scope] = (now, (env, secret_ids))
+
+        if secret_ids:
+            AuditLogService.log(
+                action="secret.access",
+                entity_type="execution" if execution_id else "secret",
+                entity_id=execution_id or scope,
+                outcome="accessed",
+                details={
+                    "accessor": "execution_service",
+                    "scope": scope,
+                    "secret_ids": list(secret_ids),
+                    "cached": from_cache,
+                },
+            )
+        return dict(env)
+
+    @classmethod
+    def _decrypt_scope(cls, scope: str) -> Tuple[dict, tuple, bool]:
+        """Decrypt every secret in ``scope``. Returns (env, secret ids, all decrypted)."""
+        env = {}
+        secret_ids = []
+        complete = True
+        rows = db_secrets.get_secret_values(scope)
+        if not rows:
+            return env, (), complete
+        fernet = cls._get_fernet()
+        for row in rows:
             try:
-                plaintext = cls.decrypt(
-                    secret["encrypted_value"],
-                    purpose=secret["id"],
-                    accessor="execution_service",
-                )
-                env_name = f"AGENTED_SECRET_{secret_meta['name'].upper()}"
-                result[env_name] = plaintext
+                plaintext = fernet.decrypt(row["encrypted_value"].encode()).decode()
             except Exception as e:
-                logger.warning(
-                    "Failed to decrypt secret '%s' for execution: %s", secret_meta["name"], e
-                )
-        return result
+                complete = False
+                logger.warning("Failed to decrypt secret '%s' for execution: %s", row["name"], e)
+                continue
+            env[f"AGENTED_SECRET_{row['name'].upper()}"] = plaintext
+            secret_ids.append(row["id"])
+        return env, tuple(secret_ids), complete
 
     @classmethod
     def rotate_key(cls, new_key: str) -> int:
@@ -288,6 +344,7 @@ class SecretVaultService:
                 logger.error(
                     "Failed to rotate secret '%s': %s", secret_meta["name"], e, exc_info=True
                 )
+        cls.invalidate_env_cache()
         AuditLogService.log(
             action="secret.key_rotation",
             entity_type="vault",
@@ -7,49 +7,39 @@ This service is intentionally NOT crash-recoverable. Watchdog observers and team
 If the Flask server restarts, all active watchers are lost and team monitoring must be
 re-started manually for any running team sessions.
 
-Uses watchdog to monitor ~/.claude/teams/{team_name}/ and ~/.claude/tasks/{team_name}/
-for real-time updates to team configuration and task status. A fallback polling thread
-(every 5s) catches missed watchdog events on macOS where FSEvents can batch/delay under
-high filesystem activity.
+Subscribes ~/.claude/teams/{team_name}/ and ~/.claude/tasks/{team_name}/ to the shared
+FileEventMultiplexer for real-time updates to team configuration and task status. Events
+are debounced into batches there, so FSEvents bursts on macOS collapse into one parse per
+changed file and no per-session polling thread is needed.
 """
 
 import json
 import logging
 import os
 import threading
-import time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
-from watchdog.events import FileSystemEventHandler
-from watchdog.observers import Observer
+from .file_event_multiplexer import FileEventMultiplexer
 
 logger = logging.getLogger(__name__)
 
 
-class TeamFileHandler(FileSystemEventHandler):
-    """Watchdog event handler for team config and task file changes.
+class TeamFileHandler:
+    """Handler for batches of changed team config and task files.
 
     Parses JSON files from ~/.claude/teams/ and ~/.claude/tasks/ and broadcasts
     updates via ProjectSessionManager SSE.
     """
 
     def __init__(self, session_id: str, team_name: str) -> None:
-        super().__init__()
         self.session_id = session_id
         self.team_name = team_name
 
-    def on_modified(self, event) -> None:
-        """Handle file modification events."""
-        if event.is_directory:
-            return
-        self._process_event(event.src_path)
-
-    def on_created(self, event) -> None:
-        """Handle file creation events."""
-        if event.is_directory:
-            return
-        self._process_event(event.src_path)
+    def process_batch(self, paths: List[str]) -> None:
+        """Handle a debounced batch of changed file paths."""
+        for path in paths:
+            self._process_event(path)
 
     def _process_event(self, src_path: str) -> None:
         """Process a file event, broadcasting team or task updates."""
@@ -83,7 +73,7 @@ class TeamFileHandler(FileSystemEventHandler):
 
 
 class TeamMonitorService:
-    """Monitors Claude Code agent team directories using watchdog filesystem watchers.
+    """Monitors Claude Code agent team directories through the shared file-event multiplexer.
 
     Follows the classmethod singleton pattern from ProjectSessionManager.
     All state is class-level, protected by a threading lock.
@@ -96,8 +86,8 @@ class TeamMonitorService:
     def start_monitoring(cls, session_id: str, team_name: str) -> None:
         """Start monitoring a team's filesystem directories.
 
-        Creates watchdog observers for ~/.claude/teams/{team_name}/ and
-        ~/.claude/tasks/{team_name}/, plus a fallback polling thread.
+        Subscribes ~/.claude/teams/{team_name}/ and ~/.claude/tasks/{team_name}/
+        to the shared FileEventMultiplexer and parses any files already present.
 
         Args:
             session_id: The session that owns this team.
@@ -113,137 +103,80 @@ class TeamMonitorService:
 
         handler = TeamFileHandler(session_id, team_name)
 
-        observer = Observer()
-        observer.schedule(handler, str(teams_dir), recursive=True)
-        observer.schedule(handler, str(tasks_dir), recursive=True)
-        observer.daemon = True
-        observer.start()
-
-        # Start fallback polling thread to catch missed watchdog events on macOS
-        poll_thread = threading.Thread(
-            target=cls._polling_loop,
-            args=(session_id, team_name, str(teams_dir), str(tasks_dir)),
-            daemon=True,
-        )
-
         state = {
             "team_name": team_name,
-            "observer": observer,
             "handler": handler,
             "members": [],
             "tasks": [],
             "active": True,
-            "poll_thread": poll_thread,
             "teams_dir": str(teams_dir),
             "tasks_dir": str(tasks_dir),
-            "last_config_mtime": 0.0,
-            "known_task_files": {},
+            "subscriptions": [],
         }
 
         with cls._lock:
             cls._monitors[session_id] = state
 
-        poll_thread.start()
+        subscriptions = [
+            FileEventMultiplexer.subscribe(str(directory), handler.process_batch)
+            for directory in (teams_dir, tasks_dir)
+        ]
+        with cls._lock:
+            state["subscriptions"] = subscriptions
+            stopped = not state["active"]
+        if stopped:
+            # stop_monitoring ran while subscribing
+            for subscription_id in subscriptions:
+                FileEventMultiplexer.unsubscribe(subscription_id)
+            return
+
+        # Files written before the watch existed produce no events
+        handler.process_batch(cls._existing_files(str(teams_dir), str(tasks_dir)))
 
         logger.info(
             f"Started team monitor for session {session_id} "
             f"(team={team_name}, teams_dir={teams_dir}, tasks_dir={tasks_dir})"
         )
 
-    @classmethod
-    def _polling_loop(
-        cls,
-        session_id: str,
-        team_name: str,
-        teams_dir: str,
-        tasks_dir: str,
-    ) -> None:
-        """Fallback polling loop to catch missed watchdog events.
-
-        Checks team config and task files every 5 seconds. Exits when
-        state["active"] is False.
-        """
-        from .project_session_manager import ProjectSessionManager
-
-        while True:
-            time.sleep(5)
-
-            with cls._lock:
-                state = cls._monitors.get(session_id)
-                if not state or not state["active"]:
-                    return
-
-            # Check team config
-            config_path = os.path.join(teams_dir, "config.json")
-            try:
-                if os.path.exists(config_path):
-                    mtime = os.path.getmtime(config_path)
-                    with cls._lock:
-                        state = cls._monitors.get(session_id)
-                        if state and mtime > state.get("last_config_mtime", 0):
-                            state["last_config_mtime"] = mtime
-                            team_data = cls._parse_team_config(config_path)
-                            if team_data is not None:
-                                cls._update_members(session_id, team_data)
-                                ProjectSessionManager._broadcast(
-                                    session_id,
-                                    "team_update",
-                                    {"type": "config", "data": team_data},
-                                )
-            except Exception:
-                pass  # Intentionally silenced: failure is non-critical
-
-            # Check task files
-            try:
-                if os.path.isdir(tasks_dir):
-                    for fname in os.listdir(tasks_dir):
-                        fpath = os.path.join(tasks_dir, fname)
-                        if not os.path.isfile(fpath):
-                            continue
-                        try:
-                            mtime = os.path.getmtime(fpath)
-                            with cls._lock:
-                                state = cls._monitors.get(session_id)
-                                if not state:
-                                    return
-                                known = state.get("known_task_files", {})
-                                if mtime > known.get(fname, 0):
-                                    known[fname] = mtime
-                                    task_data = cls._parse_task(fpath)
-                                    if task_data is not None:
-                                        cls._update_task(session_id, task_data)
-                                        ProjectSessionManager._broadcast(
-                                            session_id,
-                                            "team_update",
-                                            {"type": "task", "data": task_data},
-                                        )
-                        except Exception:
-                            pass  # Intentionally silenced: failure is non-critical
-            except Exception:
-                pass  # Intentionally silenced: failure is non-critical
+    @staticmethod
+    def _existing_files(teams_dir: str, tasks_dir: str) -> List[str]:
+        """Config and task files already on disk, config first."""
+        paths = []
+        config_path = os.path.join(teams_dir, "config.json")
+        if os.path.isfile(config_path):
+            paths.append(config_path)
+        try:
+            names = sorted(os.listdir(tasks_dir))
+        except OSError:
+            names = []
+        for name in names:
+            path = os.path.join(tasks_dir, name)
+            if os.path.isfile(path):
+                paths.append(path)
+        return paths
 
     @classmethod
     def stop_monitoring(cls, session_id: str) -> None:
         """Stop monitoring a team session.
 
-        Stops the watchdog observer, marks the monitor as inactive,
-        and removes the entry from _monitors to prevent memory leaks.
+        Unsubscribes its directories from the shared multiplexer, marks the
+        monitor as inactive, and removes the entry from _monitors to prevent
+        memory leaks.
         """
         with cls._lock:
             state = cls._monitors.pop(session_id, None)
             if not state:
                 return
             state["active"] = False
+            subscriptions = list(state.get("subscriptions", []))
 
-        # Stop observer outside lock
-        observer = state.get("observer")
-        if observer:
+        # Unsubscribe outside lock
+        for subscription_id in subscriptions:
             try:
-                observer.stop()
-                observer.join(timeout=5)
+                FileEventMultiplexer.unsubscribe(subscription_id)
             except Exception:
                 logger.warning(
-                    f"Error stopping watchdog observer for session {session_id}",
+                    f"Error unsubscribing team watch for session {session_id}",
                     exc_info=True,
                 )
 
@@ -0,0 +1,309 @@
+"""Incremental token-usage extraction from CLI output.
+
+Each backend gets a parser that is fed stdout one line at a time while the
+process runs and keeps running totals, so usage (and cost) of an in-flight
+execution is known before it finishes and no post-run pass over the full
+stdout log is needed.
+
+Formats handled (see ``CommandBuilder``):
+
+- claude: ``--output-format json`` (one result object, or with ``--verbose``
+  a one-line array of events ending in the result) and ``stream-json``
+  NDJSON (per-message usage, then a ``result`` event with the final totals)
+- gemini: one, usually pretty-printed, object with ``stats.models.*.tokens``
+- codex: JSONL events; each ``turn.completed`` carries the usage so far
+- opencode: best-effort ``usage`` / ``stats`` keys on any JSON object
+"""
+
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class UsageStreamParser(ABC):
+    """Base parser: assembles JSON values from lines and hands them to ``_on_value``."""
+
+    # Cap on a buffered multi-line JSON value; larger output is not usage data
+    MAX_BUFFER_CHARS = 4 * 1024 * 1024
+
+    def __init__(self):
+        self._buffer: list = []
+        self._buffered_chars = 0
+        self.model: Optional[str] = None
+
+    def feed(self, line: str) -> None:
+        """Consume one stdout line (without its trailing newline)."""
+        if self._buffer:
+            head = line[:1]
+            if head in ("}", "]"):
+                # Pretty-printed values close at column 0; only then is a parse worth trying
+                self._buffer.append(line)
+                value = self._parse("\n".join(self._buffer))
+                if value is not None:
+                    self._reset_buffer()
+                    self._dispatch(value)
+                    return
+            elif not head or head.isspace():
+                self._buffer.append(line)
+            else:
+                # Unindented text cannot continue a pretty-printed value: start over
+                self._reset_buffer()
+                self.feed(line)
+                return
+            self._buffered_chars += len(line)
+            if self._buffered_chars > self.MAX_BUFFER_CHARS:
+                self._reset_buffer()
+            return
+        stripped = line.strip()
+        if not stripped or stripped[0] not in "{[":
+            return
+        value = self._parse(stripped)
+        if value is not None:
+            self._dispatch(value)
+        elif line[:1] in ("{", "["):
+            self._buffer.append(line)
+            self._buffered_chars = len(line)
+
+    @abstractmethod
+    def usage(self) -> Optional[dict]:
+        """Usage seen so far in ``BudgetService.record_usage`` shape, or None."""
+
+    @abstractmethod
+    def _on_value(self, value: dict) -> None:
+        """Handle one parsed JSON object from the output."""
+
+    def _dispatch(self, value) -> None:
+        if isinstance(value, dict):
+            self._on_value(value)
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, dict):
+                    self._on_value(item)
+
+    def _reset_buffer(self) -> None:
+        self._buffer = []
+        self._buffered_chars = 0
+
+    @staticmethod
+    def _parse(text: str):
+        try:
+            return json.loads(text)
+        except (json.JSONDecodeError, ValueError):
+            return None
+
+    @staticmethod
+    def _usage(
+        input_tokens=0,
+        output_tokens=0,
+        cache_read_tokens=0,
+        cache_creation_tokens=0,
+        total_cost_usd=0.0,
+        **extra,
+    ) -> dict:
+        return {
+            "input_tokens": input_tokens or 0,
+            "output_tokens": output_tokens or 0,
+            "cache_read_tokens": cache_read_tokens or 0,
+            "cache_creation_tokens": cache_creation_tokens or 0,
+            "total_cost_usd": total_cost_usd or 0.0,
+            **extra,
+            "source": "cli_output",
+        }
+
+
+class ClaudeUsageParser(UsageStreamParser):
+    """Claude CLI: final ``result`` object, plus per-message usage in stream-json mode."""
+
+    def __init__(self):
+        super().__init__()
+        self._final: Optional[dict] = None
+        self._running = {"input_tokens": 0, "output_tokens": 0, "cache_read": 0, "cache_write": 0}
+        self._saw_running = False
+
+    def _on_value(self, value: dict) -> None:
+        message = value.get("message")
+        if value.get("type") == "assistant" and isinstance(message, dict):
+            usage = message.get("usage") or {}
+            self.model = message.get("model") or self.model
+            self._running["input_tokens"] += usage.get("input_tokens", 0) or 0
+            self._running["output_tokens"] += usage.get("output_tokens", 0) or 0
+            self._running["cache_read"] += usage.get("cache_read_input_tokens", 0) or 0
+            self._running["cache_write"] += usage.get("cache_creation_input_tokens", 0) or 0
+            self._saw_running = True
+        elif "usage" in value and (value.get("type") in (None, "result")):
+            self._final = value
+
+    def usage(self) -> Optional[dict]:
+        if self._final is not None:
+            usage = self._final.get("usage") or {}
+            return self._usage(
+                usage.get("input_tokens", 0),
+                usage.get("output_tokens", 0),
+                usage.get("cache_read_input_tokens", 0),
+                usage.get("cache_creation_input_tokens", 0),
+                self._final.get("total_cost_usd", 0.0),
+                num_turns=self._final.get("num_turns", 0),
+                duration_api_ms=self._final.get("duration_api_ms", 0),
+                session_id=self._final.get("session_id"),
+            )
+        if self._saw_running:
+            running = self._running
+            return self._usage(
+                running["input_tokens"],
+                running["output_tokens"],
+                running["cache_read"],
+                running["cache_write"],
+            )
+        return None
+
+
+class GeminiUsageParser(UsageStreamParser):
+    """Gemini CLI: token counts summed across ``stats.models``."""
+
+    def __init__(self):
+        super().__init__()
+        self._totals: Optional[dict] = None
+
+    def _on_value(self, value: dict) -> None:
+        models = (value.get("stats") or {}).get("models") or {}
+        if not isinstance(models, dict) or not models:
+            return
+        totals = {"prompt": 0, "candidates": 0, "cached": 0}
+        for model_data in models.values():
+            tokens = (model_data or {}).get("tokens") or {}
+            for key in totals:
+                totals[key] += tokens.get(key, 0) or 0
+        self._totals = totals
+
+    def usage(self) -> Optional[dict]:
+        totals = self._totals
+        if not totals or (totals["prompt"] == 0 and totals["candidates"] == 0):
+            return None
+        return self._usage(totals["prompt"], totals["candidates"], totals["cached"])
+
+
+class CodexUsageParser(UsageStreamParser):
+    """Codex CLI: the latest ``turn.completed`` usage wins."""
+
+    def __init__(self):
+        super().__init__()
+        self._last: Optional[dict] = None
+
+    def feed(self, line: str) -> None:
+        # JSONL only: skip the multi-line buffering of the base class
+        stripped = line.strip()
+        if stripped.startswith("{") and '"turn.completed"' in stripped:
+            value = self._parse(stripped)
+            if isinstance(value, dict):
+                self._on_value(value)
+
+    def _on_value(self, value: dict) -> None:
+        if value.get("type") == "turn.completed" and value.get("usage"):
+            self._last = value["usage"]
+
+    def usage(self) -> Optional[dict]:
+        if not self._last:
+            return None
+        return self._usage(
+            self._last.get("input_tokens", 0),
+            self._last.get("output_tokens", 0),
+            self._last.get("cached_input_tokens", 0),
+        )
+
+
+class OpenCodeUsageParser(UsageStreamParser):
+    """OpenCode CLI: best-effort ``usage`` or ``stats`` token keys on the latest object."""
+
+    def __init__(self):
+        super().__init__()
+        self._last: Optional[dict] = None
+
+    def _on_value(self, value: dict) -> None:
+        for key in ("usage", "stats"):
+            block = value.get(key)
+            if isinstance(block, dict) and (
+                block.get("input_tokens") or block.get("output_tokens")
+            ):
+                self._last = block
+                return
+
+    def usage(self) -> Optional[dict]:
+        if not self._last:
+            return None
+        return self._usage(
+            self._last.get("input_tokens", 0),
+            self._last.get("output_tokens", 0),
+            self._last.get("cache_read_tokens", 0),
+        )
+
+
+PARSERS = {
+    "claude": ClaudeUsageParser,
+    "gemini": GeminiUsageParser,
+    "codex": CodexUsageParser,
+    "opencode": OpenCodeUsageParser,
+}
+
+
+def parser_for_backend(backend_type: Optional[str]) -> Optional[UsageStreamParser]:
+    """Return a fresh parser for ``backend_type``, or None if usage is not reported."""
+    parser_cls = PARSERS.get(backend_type or "")
+    return parser_cls() if parser_cls else None
+
+
+class LiveUsageTracker:
+    """Per-execution usage parsers fed by the stdout reader thread."""
+
+    _parsers: Dict[str, UsageStreamParser] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def start(cls, execution_id: str, backend_type: Optional[str]) -> None:
+        parser = parser_for_backend(backend_type)
+        if parser is None:
+            return
+        with cls._lock:
+            cls._parsers[execution_id] = parser
+
+    @classmethod
+    def feed(cls, execution_id: str, line: str) -> None:
+        parser = cls._parsers.get(execution_id)
+        if parser is None:
+            return
+        try:
+            parser.feed(line)
+        except Exception as e:
+            # Usage is best effort; never break log streaming over it
+            logger.debug("Usage parsing failed for %s: %s", execution_id, e)
+
+    @classmethod
+    def usage(cls, execution_id: str) -> Optional[dict]:
+        """Usage reported so far by a running execution, or None."""
+        parser = cls._parsers.get(execution_id)
+        return parser.usage() if parser else None
+
+    @classmethod
+    def model(cls, execution_id: str) -> Optional[str]:
+        parser = cls._parsers.get(execution_id)
+        return parser.model if parser else None
+
+    @classmethod
+    def is_tracking(cls, execution_id: str) -> bool:
+        return execution_id in cls._parsers
+
+    @classmethod
+    def finish(cls, execution_id: str) -> Optional[dict]:
+        """Stop tracking an execution and return its final usage, if any."""
+        with cls._lock:
+            parser = cls._parsers.pop(execution_id, None)
+        return parser.usage() if parser else None
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop all tracked executions. Used for testing."""
+        with cls._lock:
+            cls._parsers.clear()
@@ -10,6 +10,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional
 
 from ..models.workflow import NodeErrorMode, WorkflowMessage
+from .pipeline_tracer import PipelineTrace, PipelineTracer
 
 # Re-export evaluate_condition so existing imports continue to work:
 #   from app.services.workflow_execution_service import evaluate_condition
@@ -335,6 +336,45 @@ class WorkflowExecutionService:
         input_json: Optional[str],
         trigger_type: str,
         timeout_seconds: int,
+    ) -> None:
+        """Run the workflow DAG under a pipeline trace with one span per node."""
+        trace = PipelineTracer.begin(
+            "workflow",
+            "workflow",
+            workflow_id,
+            execution_id=execution_id,
+            metadata={"trigger_type": trigger_type},
+        )
+        try:
+            cls._execute_dag(
+                trace,
+                execution_id,
+                workflow_id,
+                graph_parsed,
+                input_json,
+                trigger_type,
+                timeout_seconds,
+            )
+        except Exception as e:
+            PipelineTracer.end(trace, "error", str(e))
+            raise
+        with cls._lock:
+            entry = dict(cls._executions.get(execution_id) or {})
+        if entry.get("status") == "failed":
+            PipelineTracer.end(trace, "error", entry.get("error"))
+        else:
+            PipelineTracer.end(trace)
+
+    @classmethod
+    def _execute_dag(
+        cls,
+        trace: PipelineTrace,
+        execution_id: str,
+        workflow_id: str,
+        graph_parsed: dict,
+        input_json: Optional[str],
+        trigger_type: str,
+        timeout_seconds: int,
     ) -> None:
         """Execute the workflow DAG in topological order.
 
@@ -492,6 +532,9 @@ class WorkflowExecutionService:
             last_error = None
             attempts = 0
             max_attempts = 1 + retry_max
+            node_span = trace.open_span(
+                "workflow.node", span_type="workflow_node", node_id=node_id, node_type=node_type
+            )
 
             while attempts < max_attempts:
                 attempts += 1
@@ -522,6 +565,12 @@ class WorkflowExecutionService:
                             delay = retry_backoff * (2 ** (attempts - 1))
                         time.sleep(delay)
 
+            if node_span is not None:
+                node_span["attributes"]["attempts"] = attempts
+            trace.close_span(
+                node_span, "error" if last_error is not None else "completed", last_error
+            )
+
             # Handle result
             now = datetime.now(timezone.utc).isoformat()
 
@@ -79,6 +79,116 @@ def reset_rbac_cache():
         logger.debug("Could not import invalidate_key_cache (module not loaded)")
 
 
+@pytest.fixture(autouse=True)
+def reset_prompt_template_cache():
+    """Clear compiled prompt templates so snippets from a previous test's DB don't leak."""
+    from app.services.prompt_renderer import PromptRenderer
+
+    PromptRenderer.clear_cache()
+    yield
+    PromptRenderer.clear_cache()
+
+
+@pytest.fixture(autouse=True)
+def reset_pipeline_tracer():
+    """Drop buffered pipeline traces so they aren't written into another test's DB."""
+    from app.services.pipeline_tracer import PipelineTracer
+
+    PipelineTracer.reset()
+    yield
+    PipelineTracer.reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_pr_diff_cache():
+    """Clear cached PR diffs so one test's fetched diff isn't served to another."""
+    from app.services.pr_diff_cache import PRDiffCache
+
+    PRDiffCache.clear()
+    yield
+    PRDiffCache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_query_embedding_cache():
+    """Drop cached query embeddings so a previous test's mocked vectors aren't reused."""
+    from app.services.embedding_service import clear_query_cache
+
+    clear_query_cache()
+    yield
+    clear_query_cache()
+
+
+@pytest.fixture(autouse=True)
+def reset_secret_env_cache():
+    """Drop cached decrypted secret envs so one test's vault isn't served to another."""
+    from app.services.secret_vault_service import SecretVaultService
+
+    SecretVaultService.invalidate_env_cache()
+    yield
+    SecretVaultService.invalidate_env_cache()
+
+
+@pytest.fixture(autouse=True)
+def reset_execution_workspaces():
+    """Forget registered execution workspaces between tests."""
+    from app.services.execution_workspace import WorkspaceRegistry
+
+    WorkspaceRegistry.reset()
+    yield
+    WorkspaceRegistry.reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_file_event_multiplexer():
+    """Stop the shared file watcher and drop subscriptions started by a test."""
+    from app.services.file_event_multiplexer import FileEventMultiplexer
+
+    yield
+    FileEventMultiplexer.reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_notification_delivery():
+    """Drop queued notifications and cached integration adapters between tests."""
+    from app.services.integration_config_service import IntegrationConfigService
+    from app.services.notification_service import NotificationService
+
+    NotificationService.reset()
+    IntegrationConfigService.invalidate_adapter()
+    yield
+    NotificationService.reset()
+    IntegrationConfigService.invalidate_adapter()
+
+
+@pytest.fixture(autouse=True)
+def reset_execution_report_cache():
+    """Start each test without cached insights or weekly reports."""
+    from app.services.execution_report_cache import ExecutionReportCache
+
+    ExecutionReportCache.reset()
+    yield
+    ExecutionReportCache.reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_monitoring_snapshot():
+    """Reload the monitoring model, fetch pool and credential fingerprints for each test."""
+    from app.services.monitoring_service import MonitoringService
+    from app.services.monitoring_snapshot import MonitoringSnapshot
+    from app.services.provider_usage_client import CredentialResolver
+
+    MonitoringSnapshot.reset()
+    MonitoringService.invalidate_status()
+    MonitoringService.reset_fetch_pool()
+    CredentialResolver.clear_fingerprint_cache()
+    yield
+    MonitoringSnapshot.reset()
+    MonitoringService.invalidate_status()
+    MonitoringService.reset_fetch_pool()
+    CredentialResolver.clear_fingerprint_cache()
+
+
 @pytest.fixture(autouse=True)
 def reset_github_webhook_rate_limit():
     """Clear per-repo rate limit state between tests to prevent cross-test interference."""
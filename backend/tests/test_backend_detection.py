@@ -9,9 +9,20 @@ from app.services.backend_detection_service import (
     get_all_backends_status,
     get_capabilities,
 )
-from app.services.budget_service import BudgetService
 from app.services.execution_service import ExecutionService
 from app.services.rate_limit_service import RateLimitService
+from app.services.usage_stream import parser_for_backend
+
+
+def _parse_usage(stdout: str, backend_type: str):
+    """Run the backend's usage parser over a complete CLI output."""
+    parser = parser_for_backend(backend_type)
+    if parser is None:
+        return None
+    for line in stdout.splitlines():
+        parser.feed(line)
+    return parser.usage()
+
 
 # =============================================================================
 # BackendDetectionService.detect_backend() tests
@@ -164,12 +175,12 @@ class TestGetAllBackendsStatus:
 
 
 # =============================================================================
-# BudgetService token extraction tests
+# Multi-backend token extraction tests
 # =============================================================================
 
 
-class TestBudgetServiceTokenExtraction:
-    """Tests for multi-backend token extraction in BudgetService."""
+class TestTokenExtraction:
+    """Tests for multi-backend token extraction from CLI output."""
 
     def test_extract_claude_usage(self):
         """Claude JSON output with usage section extracts correctly."""
@@ -188,7 +199,7 @@ class TestBudgetServiceTokenExtraction:
             }
         )
 
-        result = BudgetService.extract_token_usage(claude_json, "claude")
+        result = _parse_usage(claude_json, "claude")
 
         assert result is not None
         assert result["input_tokens"] == 500
@@ -219,7 +230,7 @@ class TestBudgetServiceTokenExtraction:
             }
         )
 
-        result = BudgetService.extract_token_usage(gemini_json, "gemini")
+        result = _parse_usage(gemini_json, "gemini")
 
         assert result is not None
         assert result["input_tokens"] == 100
@@ -246,7 +257,7 @@ class TestBudgetServiceTokenExtraction:
             }
         )
 
-        result = BudgetService.extract_token_usage(gemini_json, "gemini")
+        result = _parse_usage(gemini_json, "gemini")
 
         assert result is not None
         assert result["input_tokens"] == 300
@@ -272,7 +283,7 @@ class TestBudgetServiceTokenExtraction:
             ]
         )
 
-        result = BudgetService.extract_token_usage(codex_jsonl, "codex")
+        result = _parse_usage(codex_jsonl, "codex")
 
         assert result is not None
         assert result["input_tokens"] == 1000
@@ -309,7 +320,7 @@ class TestBudgetServiceTokenExtraction:
             ]
         )
 
-        result = BudgetService.extract_token_usage(codex_jsonl, "codex")
+        result = _parse_usage(codex_jsonl, "codex")
 
         assert result is not None
         assert result["input_tokens"] == 500
@@ -320,7 +331,7 @@ class TestBudgetServiceTokenExtraction:
         """OpenCode parser returns None for unrecognized JSON format."""
         opencode_json = json.dumps({"some_unknown_key": "value"})
 
-        result = BudgetService.extract_token_usage(opencode_json, "opencode")
+        result = _parse_usage(opencode_json, "opencode")
 
         # MEDIUM confidence parser -- returns None if format not recognized
         assert result is None
@@ -337,7 +348,7 @@ class TestBudgetServiceTokenExtraction:
             }
         )
 
-        result = BudgetService.extract_token_usage(opencode_json, "opencode")
+        result = _parse_usage(opencode_json, "opencode")
 
         assert result is not None
         assert result["input_tokens"] == 300
@@ -345,19 +356,19 @@ class TestBudgetServiceTokenExtraction:
 
     def test_extract_unknown_backend_returns_none(self):
         """Unknown backend type returns None."""
-        result = BudgetService.extract_token_usage('{"data": 1}', "unknown_backend")
+        result = _parse_usage('{"data": 1}', "unknown_backend")
         assert result is None
 
     def test_extract_empty_log(self):
         """Empty log returns None for all backends."""
-        assert BudgetService.extract_token_usage("", "claude") is None
-        assert BudgetService.extract_token_usage("", "gemini") is None
-        assert BudgetService.extract_token_usage("", "codex") is None
-        assert BudgetService.extract_token_usage("", "opencode") is None
+        assert _parse_usage("", "claude") is None
+        assert _parse_usage("", "gemini") is None
+        assert _parse_usage("", "codex") is None
+        assert _parse_usage("", "opencode") is None
 
     def test_extract_whitespace_only_log(self):
         """Whitespace-only log returns None."""
-        assert BudgetService.extract_token_usage("   \n  ", "claude") is None
+        assert _parse_usage("   \n  ", "claude") is None
 
     def test_extract_gemini_zero_tokens_returns_none(self):
         """Gemini output with all zero tokens returns None."""
@@ -371,7 +382,7 @@ class TestBudgetServiceTokenExtraction:
             }
         )
 
-        result = BudgetService.extract_token_usage(gemini_json, "gemini")
+        result = _parse_usage(gemini_json, "gemini")
         assert result is None
 
     def test_extract_codex_no_turn_completed_returns_none(self):
@@ -383,7 +394,7 @@ class TestBudgetServiceTokenExtraction:
             ]
         )
 
-        result = BudgetService.extract_token_usage(codex_jsonl, "codex")
+        result = _parse_usage(codex_jsonl, "codex")
         assert result is None
 
 
@@ -0,0 +1,163 @@
+"""Tests for bot SLA buckets, quantile sketches and the SLA endpoint."""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+from app.db.bot_sla import get_sla_buckets, record_sla_sample
+from app.db.connection import get_connection
+from app.db.migrations import _migrate_107_bot_sla_buckets
+from app.db.triggers import create_trigger
+from app.services.bot_sla_service import BotSlaService
+from app.services.execution_log_service import ExecutionLogService
+from app.services.pipeline_tracer import PipelineTracer
+from app.utils.quantile_sketch import RELATIVE_ACCURACY, QuantileSketch
+
+
+def _create_trigger(name="sla-bot", trigger_source="webhook", **kwargs):
+    return create_trigger(
+        name=name,
+        prompt_template="test {paths}",
+        trigger_source=trigger_source,
+        **kwargs,
+    )
+
+
+def _hours_ago(hours):
+    return datetime.now(timezone.utc) - timedelta(hours=hours)
+
+
+class TestQuantileSketch:
+    def test_quantiles_within_relative_accuracy(self):
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(8, 1.5) for _ in range(5000))
+        sketch = QuantileSketch()
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.5, 0.95, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            assert abs(sketch.quantile(q) - exact) <= exact * RELATIVE_ACCURACY * 1.01
+
+    def test_merge_matches_single_sketch_and_round_trips(self):
+        whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for value in range(0, 2000, 3):
+            whole.add(value)
+            (left if value % 2 else right).add(value)
+
+        merged = QuantileSketch.from_json(left.to_json()).merge(right)
+        assert merged.count == whole.count
+        for q in (0.0, 0.5, 0.99, 1.0):
+            assert merged.quantile(q) == whole.quantile(q)
+        assert QuantileSketch().quantile(0.5) is None
+
+
+class TestSlaBuckets:
+    def test_samples_accumulate_per_hour(self, isolated_db):
+        trigger_id = _create_trigger()
+        now = datetime.now(timezone.utc)
+        for status in ("success", "success", "failed", "cancelled"):
+            record_sla_sample(trigger_id, status, duration_ms=1000, finished_at=now)
+        record_sla_sample(trigger_id, "success", duration_ms=2000, finished_at=_hours_ago(2))
+
+        buckets = get_sla_buckets(now - timedelta(days=1))[trigger_id]
+        assert [b["total_runs"] for b in buckets] == [1, 4]
+        latest = buckets[-1]
+        assert (latest["success_runs"], latest["failed_runs"]) == (2, 1)
+        assert QuantileSketch.from_json(latest["duration_sketch"]).count == 4
+
+    def test_unknown_trigger_is_ignored(self, isolated_db):
+        assert record_sla_sample("trig-missing", "success", duration_ms=10) is False
+
+    def test_finish_execution_records_queue_wait_from_trace(self, isolated_db):
+        trigger_id = _create_trigger()
+        exec_id = ExecutionLogService.start_execution(
+            trigger_id, "webhook", "test prompt", "claude", "claude -p test"
+        )
+        trace = PipelineTracer.begin("queue.dispatch", "queue_entry", "qe-1")
+        trace.context["queue_wait_ms"] = 4500
+        PipelineTracer.bind_execution(exec_id, trace)
+        try:
+            ExecutionLogService.finish_execution(exec_id, "success", exit_code=0)
+        finally:
+            PipelineTracer.end(trace)
+
+        (bucket,) = get_sla_buckets(_hours_ago(24))[trigger_id]
+        waits = QuantileSketch.from_json(bucket["queue_wait_sketch"])
+        assert waits.count == 1
+        assert abs(waits.quantile(0.5) - 4500) <= 4500 * RELATIVE_ACCURACY
+
+    def test_migration_backfills_recent_executions(self, isolated_db):
+        trigger_id = _create_trigger()
+        with get_connection() as conn:
+            for i, status in enumerate(("success", "failed", "success")):
+                conn.execute(
+                    "INSERT INTO execution_logs (execution_id, trigger_id, trigger_type, "
+                    "backend_type, started_at, finished_at, duration_ms, status) "
+                    "VALUES (?, ?, 'webhook', 'claude', ?, ?, ?, ?)",
+                    (
+                        f"exec-bf-{i}",
+                        trigger_id,
+                        "2000-01-01T00:00:00",
+                        datetime.now().isoformat(),
+                        1000 * (i + 1),
+                        status,
+                    ),
+                )
+            conn.execute("DELETE FROM bot_sla_buckets")
+            _migrate_107_bot_sla_buckets(conn)
+            conn.commit()
+
+        (bucket,) = get_sla_buckets(_hours_ago(24))[trigger_id]
+        assert (bucket["total_runs"], bucket["success_runs"], bucket["failed_runs"]) == (3, 2, 1)
+        assert QuantileSketch.from_json(bucket["duration_sketch"]).count == 3
+
+
+class TestSlaEndpoint:
+    def test_entries_report_rates_and_percentiles(self, client):
+        trigger_id = _create_trigger(name="pr-bot", trigger_source="github")
+        for i in range(1, 11):
+            record_sla_sample(
+                trigger_id, "success", duration_ms=i * 1000, queue_wait_ms=100, finished_at=None
+            )
+        record_sla_sample(trigger_id, "failed", duration_ms=500, finished_at=_hours_ago(24 * 10))
+
+        response = client.get("/admin/bots/sla")
+        assert response.status_code == 200
+        entry = next(e for e in response.get_json()["entries"] if e["bot_id"] == trigger_id)
+        assert entry["bot_name"] == "pr-bot"
+        assert entry["expected_frequency_h"] is None
+        assert entry["success_rate_7d"] == 100.0
+        assert entry["success_rate_30d"] == round(100 * 10 / 11, 1)
+        assert entry["uptime_7d"] == entry["success_rate_7d"]
+
+        week = entry["windows"]["7d"]
+        assert week["runs"] == 10
+        assert abs(week["duration_ms"]["p50"] - 5000) <= 5000 * 0.02 + 1000
+        assert week["duration_ms"]["p99"] >= week["duration_ms"]["p95"] >= 9000
+        assert abs(week["queue_wait_ms"]["p95"] - 100) <= 100 * RELATIVE_ACCURACY
+
+    def test_scheduled_uptime_counts_slots_with_a_success(self, isolated_db):
+        trigger_id = _create_trigger(
+            name="nightly-bot",
+            trigger_source="scheduled",
+            schedule_type="daily",
+            schedule_time="09:00",
+        )
+        with get_connection() as conn:
+            conn.execute(
+                "UPDATE triggers SET created_at = ? WHERE id = ?",
+                ((_hours_ago(24 * 40)).strftime("%Y-%m-%d %H:%M:%S"), trigger_id),
+            )
+            conn.commit()
+        now = datetime.now(timezone.utc)
+        # Runs on 5 of the last 7 days, one of them failing
+        for day in (0, 1, 2, 4, 5):
+            status = "failed" if day == 5 else "success"
+            record_sla_sample(
+                trigger_id, status, 1000, finished_at=now - timedelta(hours=24 * day + 1)
+            )
+
+        entry = next(e for e in BotSlaService.get_sla_entries(now) if e["bot_id"] == trigger_id)
+        assert entry["expected_frequency_h"] == 24
+        assert entry["uptime_7d"] == round(100 * 4 / 7, 1)
+        assert entry["uptime_30d"] == round(100 * 4 / 30, 1)
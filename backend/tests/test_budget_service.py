@@ -1,22 +1,36 @@
 """Tests for BudgetService — token extraction, cost estimation, and budget checks."""
 
+import io
 import json
+from unittest.mock import patch
 
 import pytest
 
+from app.db.budgets import set_budget_limit
 from app.services.budget_service import BudgetService
+from app.services.execution_runner import stream_pipe
+from app.services.usage_stream import LiveUsageTracker, parser_for_backend
+
+
+def _parse_usage(stdout: str, backend_type: str):
+    """Run the backend's usage parser over a complete CLI output."""
+    parser = parser_for_backend(backend_type)
+    if parser is None:
+        return None
+    for line in stdout.splitlines():
+        parser.feed(line)
+    return parser.usage()
 
 
 class TestExtractTokenUsage:
-    """Tests for extract_token_usage dispatcher and backend-specific parsers."""
+    """Tests for the backend-specific usage parsers over complete CLI output."""
 
     def test_empty_stdout_returns_none(self):
-        assert BudgetService.extract_token_usage("", "claude") is None
-        assert BudgetService.extract_token_usage("  ", "claude") is None
-        assert BudgetService.extract_token_usage(None, "claude") is None
+        assert _parse_usage("", "claude") is None
+        assert _parse_usage("  ", "claude") is None
 
     def test_unknown_backend_returns_none(self):
-        assert BudgetService.extract_token_usage('{"usage":{}}', "unknown_backend") is None
+        assert _parse_usage('{"usage":{}}', "unknown_backend") is None
 
     # --- Claude ---
 
@@ -35,7 +49,7 @@ class TestExtractTokenUsage:
                 "session_id": "sess-123",
             }
         )
-        result = BudgetService.extract_token_usage(data, "claude")
+        result = _parse_usage(data, "claude")
         assert result is not None
         assert result["input_tokens"] == 1000
         assert result["output_tokens"] == 500
@@ -48,13 +62,13 @@ class TestExtractTokenUsage:
 
     def test_claude_json_embedded_in_text(self):
         stdout = 'Some debug output\n{"usage": {"input_tokens": 100, "output_tokens": 50}}\n'
-        result = BudgetService.extract_token_usage(stdout, "claude")
+        result = _parse_usage(stdout, "claude")
         assert result is not None
         assert result["input_tokens"] == 100
         assert result["output_tokens"] == 50
 
     def test_claude_no_json_returns_none(self):
-        assert BudgetService.extract_token_usage("just plain text", "claude") is None
+        assert _parse_usage("just plain text", "claude") is None
 
     # --- Gemini ---
 
@@ -74,7 +88,7 @@ class TestExtractTokenUsage:
                 }
             }
         )
-        result = BudgetService.extract_token_usage(data, "gemini")
+        result = _parse_usage(data, "gemini")
         assert result is not None
         assert result["input_tokens"] == 800
         assert result["output_tokens"] == 400
@@ -91,14 +105,14 @@ class TestExtractTokenUsage:
                 }
             }
         )
-        result = BudgetService.extract_token_usage(data, "gemini")
+        result = _parse_usage(data, "gemini")
         assert result["input_tokens"] == 300
         assert result["output_tokens"] == 150
         assert result["cache_read_tokens"] == 30
 
     def test_gemini_zero_tokens_returns_none(self):
         data = json.dumps({"stats": {"models": {"m": {"tokens": {"prompt": 0, "candidates": 0}}}}})
-        assert BudgetService.extract_token_usage(data, "gemini") is None
+        assert _parse_usage(data, "gemini") is None
 
     # --- Codex ---
 
@@ -116,7 +130,7 @@ class TestExtractTokenUsage:
                 }
             ),
         ]
-        result = BudgetService.extract_token_usage("\n".join(lines), "codex")
+        result = _parse_usage("\n".join(lines), "codex")
         assert result is not None
         assert result["input_tokens"] == 500
         assert result["output_tokens"] == 250
@@ -131,58 +145,101 @@ class TestExtractTokenUsage:
                 {"type": "turn.completed", "usage": {"input_tokens": 200, "output_tokens": 100}}
             ),
         ]
-        result = BudgetService.extract_token_usage("\n".join(lines), "codex")
+        result = _parse_usage("\n".join(lines), "codex")
         assert result["input_tokens"] == 200
         assert result["output_tokens"] == 100
 
     def test_codex_no_turn_completed_returns_none(self):
         lines = [json.dumps({"type": "message.start"})]
-        assert BudgetService.extract_token_usage("\n".join(lines), "codex") is None
+        assert _parse_usage("\n".join(lines), "codex") is None
 
     # --- OpenCode ---
 
     def test_opencode_usage_key(self):
         data = json.dumps({"usage": {"input_tokens": 300, "output_tokens": 150}})
-        result = BudgetService.extract_token_usage(data, "opencode")
+        result = _parse_usage(data, "opencode")
         assert result is not None
         assert result["input_tokens"] == 300
         assert result["output_tokens"] == 150
 
     def test_opencode_stats_key(self):
         data = json.dumps({"stats": {"input_tokens": 400, "output_tokens": 200}})
-        result = BudgetService.extract_token_usage(data, "opencode")
+        result = _parse_usage(data, "opencode")
         assert result is not None
         assert result["input_tokens"] == 400
 
     def test_opencode_no_tokens_returns_none(self):
         data = json.dumps({"some_other": "data"})
-        assert BudgetService.extract_token_usage(data, "opencode") is None
-
+        assert _parse_usage(data, "opencode") is None
 
-class TestTryParseJson:
-    def test_valid_json(self):
-        assert BudgetService._try_parse_json('{"a": 1}') == {"a": 1}
 
-    def test_invalid_json(self):
-        assert BudgetService._try_parse_json("not json") is None
+class TestUsageStreamParser:
+    """Line-by-line usage parsing used while an execution streams."""
 
-    def test_non_dict_json(self):
-        assert BudgetService._try_parse_json("[1,2,3]") is None
+    def _feed(self, backend, text):
+        parser = parser_for_backend(backend)
+        for line in text.splitlines():
+            parser.feed(line)
+        return parser
 
+    def test_pretty_printed_gemini_object(self):
+        data = {"response": "{not json}", "stats": {"models": {"m": {"tokens": {"prompt": 7}}}}}
+        text = "Loaded cached credentials.\n" + json.dumps(data, indent=2) + "\ntrailing"
+        assert self._feed("gemini", text).usage()["input_tokens"] == 7
 
-class TestFindLastJsonObject:
-    def test_finds_json_in_mixed_text(self):
-        text = 'Debug line\nMore debug\n{"key": "value"}\ntrailing'
-        result = BudgetService._find_last_json_object(text)
-        assert result == {"key": "value"}
+    def test_unterminated_object_does_not_swallow_later_output(self):
+        text = '{ partial log line\nplain text\n{"usage": {"input_tokens": 5}}'
+        assert self._feed("claude", text).usage()["input_tokens"] == 5
 
-    def test_no_json_returns_none(self):
-        assert BudgetService._find_last_json_object("no json here") is None
-
-    def test_nested_json(self):
-        text = '{"outer": {"inner": 1}}'
-        result = BudgetService._find_last_json_object(text)
-        assert result == {"outer": {"inner": 1}}
+    def test_claude_verbose_event_array_uses_result(self):
+        events = [
+            {"type": "system", "subtype": "init"},
+            {"type": "assistant", "message": {"usage": {"input_tokens": 1, "output_tokens": 1}}},
+            {"type": "result", "usage": {"input_tokens": 90}, "total_cost_usd": 0.5},
+        ]
+        usage = self._feed("claude", json.dumps(events)).usage()
+        assert usage["input_tokens"] == 90
+        assert usage["total_cost_usd"] == 0.5
+
+    def test_claude_stream_json_keeps_running_totals(self):
+        parser = parser_for_backend("claude")
+        message = {"model": "claude-sonnet-4-5-20250929", "usage": {"output_tokens": 40}}
+        for _ in range(2):
+            parser.feed(json.dumps({"type": "assistant", "message": message}))
+        assert parser.usage()["output_tokens"] == 80
+        assert parser.model == "claude-sonnet-4-5-20250929"
+
+        parser.feed(json.dumps({"type": "result", "usage": {"output_tokens": 81}}))
+        assert parser.usage()["output_tokens"] == 81
+
+    def test_unknown_backend_has_no_parser(self):
+        assert parser_for_backend("unknown_backend") is None
+
+
+class TestLiveUsage:
+    def test_stream_pipe_feeds_live_tracker(self):
+        pipe = io.StringIO('progress\n{"type":"turn.completed","usage":{"input_tokens":9}}\n')
+        LiveUsageTracker.start("exec-live", "codex")
+        with patch("app.services.execution_runner.ExecutionLogService"):
+            stream_pipe("exec-live", "stdout", pipe)
+
+        assert LiveUsageTracker.usage("exec-live")["input_tokens"] == 9
+        assert LiveUsageTracker.finish("exec-live")["input_tokens"] == 9
+        assert LiveUsageTracker.usage("exec-live") is None
+
+    def test_usage_cost_prices_tokens_when_cli_reports_none(self):
+        usage = {"input_tokens": 1_000_000, "output_tokens": 0, "total_cost_usd": 0.0}
+        assert BudgetService.usage_cost(usage, "claude-sonnet-4-5-20250929") == 3.0
+        assert BudgetService.usage_cost({**usage, "total_cost_usd": 1.25}, "x") == 1.25
+        assert BudgetService.usage_cost(usage, "unknown-model") == 0.0
+        assert BudgetService.usage_cost(None) == 0.0
+
+    def test_pending_spend_counts_toward_hard_limit(self, isolated_db):
+        set_budget_limit("trigger", "trig-live", hard_limit_usd=5.0)
+        assert BudgetService.check_budget("trigger", "trig-live")["allowed"] is True
+        result = BudgetService.check_budget("trigger", "trig-live", pending_usd=6.0)
+        assert result["allowed"] is False
+        assert result["current_spend"] == 6.0
 
 
 class TestEstimateCost:
@@ -63,8 +63,10 @@ class TestBulkAgents:
         assert data["succeeded"] == 5
         assert data["failed"] == 0
 
-    def test_per_item_failure_isolation(self, client):
-        """One item failing does not affect others."""
+    def test_invalid_item_rejects_whole_batch(self, client):
+        """One invalid item rejects the batch; nothing is written."""
+        from app.db import get_all_agents
+
         items = [
             {"name": "Good Agent 1"},
             {"description": "Missing name"},  # No name - should fail
@@ -74,13 +76,84 @@ class TestBulkAgents:
         assert resp.status_code == 200
         data = resp.get_json()
         assert data["total"] == 3
-        assert data["succeeded"] == 2
-        assert data["failed"] == 1
-        # Item 0 and 2 succeed, item 1 fails
-        assert data["results"][0]["success"] is True
-        assert data["results"][1]["success"] is False
+        assert data["succeeded"] == 0
+        assert data["failed"] == 3
+        assert data["committed"] is False
+        # Item 1 carries the validation error, the others report they were not applied
         assert "name" in data["results"][1]["error"].lower()
-        assert data["results"][2]["success"] is True
+        assert "not applied" in data["results"][0]["error"].lower()
+        assert "not applied" in data["results"][2]["error"].lower()
+        assert get_all_agents() == []
+
+    def test_update_with_missing_id_changes_nothing(self, client):
+        """A missing row found during the existence check rolls back every update."""
+        from app.db import get_agent
+
+        resp = client.post(
+            "/admin/bulk/agents", json={"action": "create", "items": [{"name": "Keep"}]}
+        )
+        agent_id = resp.get_json()["results"][0]["id"]
+
+        updates = [{"id": agent_id, "name": "Renamed"}, {"id": "agent-missing", "name": "x"}]
+        resp = client.post("/admin/bulk/agents", json={"action": "update", "items": updates})
+        data = resp.get_json()
+        assert data["committed"] is False
+        assert data["results"][1]["error"] == "Agent not found"
+        assert get_agent(agent_id)["name"] == "Keep"
+
+    def test_duplicate_and_unknown_fields_rejected(self, client):
+        """Duplicate ids and fields the entity does not have fail validation."""
+        resp = client.post(
+            "/admin/bulk/agents",
+            json={
+                "action": "update",
+                "items": [
+                    {"id": "agent-a", "name": "x"},
+                    {"id": "agent-a", "name": "y"},
+                    {"id": "agent-b", "colour": "red"},
+                ],
+            },
+        )
+        results = resp.get_json()["results"]
+        assert "duplicate" in results[1]["error"].lower()
+        assert "colour" in results[2]["error"]
+
+    def test_unsafe_set_expression_rejected_before_writing(self, client):
+        """bulk_update validates every SET expression before any statement runs."""
+        from app.db import get_agent
+        from app.db.bulk import bulk_update
+
+        resp = client.post(
+            "/admin/bulk/agents", json={"action": "create", "items": [{"name": "Keep"}]}
+        )
+        agent_id = resp.get_json()["results"][0]["id"]
+
+        changes = [
+            (agent_id, ["name = ?"], ["Renamed"]),
+            (agent_id, ["name = (SELECT 1)"], []),
+        ]
+        with pytest.raises(ValueError, match="Unsafe expression"):
+            bulk_update("agent", changes)
+        assert get_agent(agent_id)["name"] == "Keep"
+
+    def test_batch_commits_once(self, client, monkeypatch):
+        """A bulk create opens one connection and commits once."""
+        import app.db.bulk as bulk_db
+
+        connections = []
+        real_get_connection = bulk_db.get_connection
+
+        def counting_get_connection():
+            connections.append(1)
+            return real_get_connection()
+
+        monkeypatch.setattr(bulk_db, "get_connection", counting_get_connection)
+        items = [{"name": f"Agent {i}"} for i in range(50)]
+        resp = client.post("/admin/bulk/agents", json={"action": "create", "items": items})
+        data = resp.get_json()
+        assert data["succeeded"] == 50
+        assert len(set(r["id"] for r in data["results"])) == 50
+        assert connections == [1]
 
     def test_max_items_limit(self, client):
         """Send 101 items, should be rejected."""
@@ -123,6 +196,28 @@ class TestBulkAgents:
         resp = client.post("/admin/bulk/agents", json={"action": "create", "items": "not a list"})
         assert resp.status_code == 400
 
+    def test_bulk_create_matches_single_create(self, client):
+        """Bulk-created agents get the same column defaults as create_agent."""
+        from app.db import create_agent, get_agent
+
+        items = [{"name": "Bulk", "effort_level": "bogus", "model": "opus"}]
+        resp = client.post("/admin/bulk/agents", json={"action": "create", "items": items})
+        bulk = get_agent(resp.get_json()["results"][0]["id"])
+        single = get_agent(create_agent(name="Bulk", effort_level="bogus", model="opus"))
+
+        ignored = {"id", "created_at", "updated_at"}
+        assert {k: v for k, v in bulk.items() if k not in ignored} == {
+            k: v for k, v in single.items() if k not in ignored
+        }
+
+    def test_bulk_create_unknown_field_rejected(self, client):
+        """Create items are validated against the create_agent fields."""
+        items = [{"name": "Ok"}, {"name": "Bad", "colour": "red"}]
+        resp = client.post("/admin/bulk/agents", json={"action": "create", "items": items})
+        data = resp.get_json()
+        assert data["committed"] is False
+        assert "colour" in data["results"][1]["error"]
+
 
 # =============================================================================
 # Bulk trigger tests
@@ -140,6 +235,20 @@ class TestBulkTriggers:
         for r in data["results"]:
             assert r["success"] is True
 
+    def test_bulk_create_matches_single_create(self, client):
+        """Bulk-created triggers get the same column defaults as create_trigger."""
+        from app.db import create_trigger, get_trigger
+
+        items = [{"name": "Bulk", "prompt_template": "t", "backend_type": "bogus"}]
+        resp = client.post("/admin/bulk/triggers", json={"action": "create", "items": items})
+        bulk = get_trigger(resp.get_json()["results"][0]["id"])
+        single = get_trigger(create_trigger(name="Bulk", prompt_template="t", backend_type="bogus"))
+
+        ignored = {"id", "created_at", "updated_at"}
+        assert {k: v for k, v in bulk.items() if k not in ignored} == {
+            k: v for k, v in single.items() if k not in ignored
+        }
+
     def test_bulk_delete_predefined_trigger_rejected(self, client):
         """Predefined triggers cannot be bulk-deleted."""
         items = [{"id": "bot-security"}]
@@ -149,6 +258,24 @@ class TestBulkTriggers:
         assert data["failed"] == 1
         assert "predefined" in data["results"][0]["error"].lower()
 
+    def test_constraint_violation_rolls_back_batch(self, client):
+        """A database error part-way through the writes leaves every row unchanged."""
+        from app.db import get_trigger
+
+        items = [{"name": f"Trigger {i}", "prompt_template": "t"} for i in range(2)]
+        resp = client.post("/admin/bulk/triggers", json={"action": "create", "items": items})
+        first, second = [r["id"] for r in resp.get_json()["results"]]
+
+        updates = [
+            {"id": first, "name": "Renamed"},
+            {"id": second, "team_id": "team-missing"},  # Violates the teams foreign key
+        ]
+        resp = client.post("/admin/bulk/triggers", json={"action": "update", "items": updates})
+        data = resp.get_json()
+        assert data["committed"] is False
+        assert all("rolled back" in r["error"].lower() for r in data["results"])
+        assert get_trigger(first)["name"] == "Trigger 0"
+
 
 # =============================================================================
 # Bulk plugin tests
@@ -200,3 +327,35 @@ class TestBulkHooks:
         resp = client.post("/admin/bulk/hooks", json={"action": "update", "items": updates})
         assert resp.status_code == 200
         assert resp.get_json()["succeeded"] == 2
+
+    def test_bulk_created_hook_ids_match_rows(self, client):
+        """AUTOINCREMENT ids are returned in item order."""
+        from app.db import get_hook
+
+        items = [{"name": f"Hook {i}", "event": "on_push"} for i in range(3)]
+        resp = client.post("/admin/bulk/hooks", json={"action": "create", "items": items})
+        for i, r in enumerate(resp.get_json()["results"]):
+            assert get_hook(r["id"])["name"] == f"Hook {i}"
+
+    def test_bulk_create_matches_single_create(self, client):
+        """Bulk-created hooks keep every create_hook field, source_path included."""
+        from app.db import create_hook, get_hook
+
+        items = [{"name": "Bulk", "event": "on_push", "source_path": "hooks/a.sh"}]
+        resp = client.post("/admin/bulk/hooks", json={"action": "create", "items": items})
+        bulk = get_hook(resp.get_json()["results"][0]["id"])
+        single = get_hook(create_hook(name="Bulk", event="on_push", source_path="hooks/a.sh"))
+
+        ignored = {"id", "created_at", "updated_at"}
+        assert bulk["source_path"] == "hooks/a.sh"
+        assert {k: v for k, v in bulk.items() if k not in ignored} == {
+            k: v for k, v in single.items() if k not in ignored
+        }
+
+    def test_bulk_create_unknown_field_rejected(self, client):
+        """Create items are validated against the create_hook fields."""
+        items = [{"name": "Ok", "event": "on_push"}, {"name": "Bad", "event": "x", "path": "a"}]
+        resp = client.post("/admin/bulk/hooks", json={"action": "create", "items": items})
+        data = resp.get_json()
+        assert data["committed"] is False
+        assert "path" in data["results"][1]["error"]
@@ -0,0 +1,140 @@
+"""Tests for the chunked-execution result cache and chunk worker pool."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.db.chunk_results import (
+    delete_expired_chunk_cache,
+    get_cached_chunk_outputs,
+    get_chunk_results,
+    get_chunked_execution,
+    put_cached_chunk_output,
+)
+from app.db.connection import get_connection
+from app.services.chunk_service import ChunkService
+
+
+def _create_bot(client, prompt_template="/audit {message}"):
+    resp = client.post(
+        "/admin/triggers/",
+        json={
+            "name": "chunk-cache-bot",
+            "trigger_source": "webhook",
+            "prompt_template": prompt_template,
+        },
+    )
+    assert resp.status_code == 201
+    return resp.get_json()["trigger_id"]
+
+
+def _wait_for_status(chunked_execution_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        execution = get_chunked_execution(chunked_execution_id)
+        if execution["status"] in ("completed", "failed"):
+            return execution
+        time.sleep(0.05)
+    raise AssertionError(f"chunked execution {chunked_execution_id} did not finish")
+
+
+def _content(*sections):
+    return "\n".join(f"def func_{name}():\n    return {name!r}\n" for name in sections)
+
+
+class TestChunkKeys:
+    def test_whitespace_only_edits_share_hash(self):
+        assert ChunkService.chunk_hash("a = 1\r\nb = 2  \n\n") == ChunkService.chunk_hash(
+            "a = 1\nb = 2"
+        )
+        assert ChunkService.chunk_hash("a = 1") != ChunkService.chunk_hash("a = 2")
+
+    def test_prompt_hash_tracks_template(self):
+        assert ChunkService.prompt_hash(None) == ChunkService.prompt_hash("")
+        assert ChunkService.prompt_hash("/audit") != ChunkService.prompt_hash("/review")
+
+
+class TestChunkCacheDB:
+    def test_put_and_get(self):
+        put_cached_chunk_output("bot-1", "p1", "h1", "finding", 42, ttl_seconds=60)
+
+        found = get_cached_chunk_outputs("bot-1", "p1", ["h1", "h2"])
+        assert found == {"h1": {"bot_output": "finding", "token_count": 42}}
+        # Different prompt hash is a different key
+        assert get_cached_chunk_outputs("bot-1", "p2", ["h1"]) == {}
+
+    def test_expired_entries_are_ignored_and_purged(self):
+        put_cached_chunk_output("bot-1", "p1", "h1", "old", 1, ttl_seconds=60)
+        with get_connection() as conn:
+            conn.execute("UPDATE chunk_result_cache SET expires_at = datetime('now', '-1 second')")
+            conn.commit()
+
+        assert get_cached_chunk_outputs("bot-1", "p1", ["h1"]) == {}
+        assert delete_expired_chunk_cache() == 1
+
+
+class TestRunChunkedCache:
+    @pytest.fixture(autouse=True)
+    def _fake_bot(self):
+        calls = []
+
+        def fake_run(bot, chunk_content):
+            calls.append(chunk_content)
+            return f"finding for {chunk_content.split()[1]}", 10, True
+
+        with patch("app.routes.chunks._run_bot_on_chunk", side_effect=fake_run):
+            yield calls
+
+    def _run(self, client, bot_id, content):
+        resp = client.post(
+            f"/admin/bots/{bot_id}/run-chunked",
+            json={"content": content, "max_chunk_chars": 40},
+        )
+        assert resp.status_code == 201
+        return resp.get_json()
+
+    def test_rerun_only_runs_changed_chunks(self, client, _fake_bot):
+        bot_id = _create_bot(client)
+        first = self._run(client, bot_id, _content("a", "b", "c"))
+        _wait_for_status(first["chunked_execution_id"])
+        first_calls = len(_fake_bot)
+        assert first_calls == first["total_chunks"]
+        assert first["cached_chunks"] == 0
+
+        second = self._run(client, bot_id, _content("a", "b", "changed"))
+        _wait_for_status(second["chunked_execution_id"])
+
+        rerun = len(_fake_bot) - first_calls
+        assert second["cached_chunks"] >= 1
+        assert rerun == second["total_chunks"] - second["cached_chunks"]
+        results = get_chunk_results(second["chunked_execution_id"])
+        assert sum(r["cached"] for r in results) == second["cached_chunks"]
+        assert all(r["bot_output"].startswith("finding") for r in results)
+
+    def test_fully_cached_run_completes_immediately(self, client, _fake_bot):
+        bot_id = _create_bot(client)
+        first = self._run(client, bot_id, _content("a", "b"))
+        _wait_for_status(first["chunked_execution_id"])
+
+        second = self._run(client, bot_id, _content("a", "b"))
+        assert second["status"] == "completed"
+        assert second["cached_chunks"] == second["total_chunks"]
+        execution = get_chunked_execution(second["chunked_execution_id"])
+        assert execution["completed_chunks"] == second["total_chunks"]
+        assert execution["merged_output"]
+
+    def test_failed_runs_are_not_cached(self, client, _fake_bot):
+        bot_id = _create_bot(client)
+        with patch("app.routes.chunks._run_bot_on_chunk", return_value=("", 0, False)):
+            first = self._run(client, bot_id, _content("a"))
+            _wait_for_status(first["chunked_execution_id"])
+
+        second = self._run(client, bot_id, _content("a"))
+        assert second["cached_chunks"] == 0
+
+    def test_full_backlog_rejects(self, client):
+        bot_id = _create_bot(client)
+        with patch("app.routes.chunks._MAX_QUEUED_CHUNKS", 0):
+            resp = client.post(f"/admin/bots/{bot_id}/run-chunked", json={"content": _content("a")})
+        assert resp.status_code == 429
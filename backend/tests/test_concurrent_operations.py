@@ -22,19 +22,9 @@ def reset_execution_service_state():
     """Reset class-level mutable state between tests."""
     ExecutionService._rate_limit_detected.clear()
     ExecutionService._transient_failure_detected.clear()
-    ExecutionService._pending_retries.clear()
-    for timer in ExecutionService._retry_timers.values():
-        timer.cancel()
-    ExecutionService._retry_timers.clear()
-    ExecutionService._retry_counts.clear()
     yield
     ExecutionService._rate_limit_detected.clear()
     ExecutionService._transient_failure_detected.clear()
-    ExecutionService._pending_retries.clear()
-    for timer in ExecutionService._retry_timers.values():
-        timer.cancel()
-    ExecutionService._retry_timers.clear()
-    ExecutionService._retry_counts.clear()
 
 
 @pytest.fixture(autouse=True)
@@ -561,10 +551,7 @@ class TestConcurrentRetryScheduling:
             try:
                 barrier.wait(timeout=5)
                 trigger = _make_trigger(id=f"trg-retry-{i}")
-                with (
-                    patch("app.services.audit_log_service.AuditLogService"),
-                    patch("app.services.execution_retry.upsert_pending_retry"),
-                ):
+                with patch("app.services.audit_log_service.AuditLogService"):
                     ExecutionService.schedule_retry(
                         trigger=trigger,
                         message_text=f"msg-{i}",
@@ -582,9 +569,6 @@ class TestConcurrentRetryScheduling:
             t.join(timeout=10)
 
         assert not errors
-        assert len(ExecutionService._retry_timers) == num_triggers
-        assert len(ExecutionService._pending_retries) == num_triggers
-
-        # Cleanup timers
-        for timer in ExecutionService._retry_timers.values():
-            timer.cancel()
+        pending = ExecutionService.get_pending_retries()
+        assert len(pending) == num_triggers
+        assert all(r["attempt"] == 1 for r in pending.values())
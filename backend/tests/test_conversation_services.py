@@ -794,6 +794,210 @@ class TestConversationBranchService:
         tree = ConversationBranchService.get_branch_tree(conv_id)
         assert tree["branches"] == []
 
+    def test_fork_references_parent_without_copying(self):
+        from app.db.connection import get_connection
+        from app.services.conversation_branch_service import ConversationBranchService
+
+        conv_id = self._create_agent_conversation_with_messages()
+        first = ConversationBranchService.create_branch(conv_id, fork_message_index=3)
+        second = ConversationBranchService.create_branch(conv_id, fork_message_index=1)
+
+        main = ConversationBranchService.get_conversation_branches(conv_id)[0]
+        assert main["name"] == "main"
+        assert first["parent_branch_id"] == second["parent_branch_id"] == main["id"]
+        assert (first["fork_index"], first["message_count"]) == (3, 4)
+        with get_connection() as conn:
+            rows = conn.execute(
+                "SELECT branch_id, COUNT(*) FROM conversation_messages "
+                "WHERE conversation_id = ? GROUP BY branch_id",
+                (conv_id,),
+            ).fetchall()
+        # The transcript is stored once, on the main branch
+        assert {r[0]: r[1] for r in rows} == {main["id"]: 5}
+        fork_msg = ConversationBranchService.get_branch_messages(first["id"])[-1]
+        assert fork_msg["id"] == first["fork_message_id"]
+        assert fork_msg["content"] == "Help me"
+
+    def test_nested_fork_resolves_through_ancestry(self):
+        from app.services.conversation_branch_service import ConversationBranchService
+
+        conv_id = self._create_agent_conversation_with_messages()
+        fork = ConversationBranchService.create_branch(conv_id, fork_message_index=2)
+        added = ConversationBranchService.add_message(fork["id"], "user", "Try another way")
+        assert added["message_index"] == 3
+        assert added["parent_message_id"] == fork["fork_message_id"]
+        ConversationBranchService.add_message(fork["id"], "assistant", "Here it is")
+
+        nested = ConversationBranchService.create_branch(
+            conv_id, fork_message_index=3, name="nested", parent_branch_id=fork["id"]
+        )
+        ConversationBranchService.add_message(nested["id"], "user", "Shorter please")
+
+        msgs = ConversationBranchService.get_branch_messages(nested["id"])
+        assert [m["content"] for m in msgs] == [
+            "System prompt",
+            "Hello",
+            "Hi there!",
+            "Try another way",
+            "Shorter please",
+        ]
+        assert [m["message_index"] for m in msgs] == [0, 1, 2, 3, 4]
+        counts = {
+            b["id"]: b["message_count"]
+            for b in ConversationBranchService.get_conversation_branches(conv_id)
+        }
+        assert (counts[fork["id"]], counts[nested["id"]]) == (5, 5)
+
+        tree = ConversationBranchService.get_branch_tree(conv_id)
+        (main,) = tree["branches"]
+        (fork_node,) = main["children"]
+        assert fork_node["children"][0]["branch_id"] == nested["id"]
+
+    def test_fork_from_other_conversation_branch_rejected(self):
+        from app.services.conversation_branch_service import ConversationBranchService
+
+        conv_id = self._create_agent_conversation_with_messages()
+        other_id = self._create_agent_conversation_with_messages()
+        other = ConversationBranchService.create_branch(other_id, fork_message_index=1)
+
+        with pytest.raises(ValueError, match="Branch not found"):
+            ConversationBranchService.create_branch(
+                conv_id, fork_message_index=0, parent_branch_id=other["id"]
+            )
+        with pytest.raises(ValueError, match="out of bounds"):
+            ConversationBranchService.create_branch(
+                other_id, fork_message_index=2, parent_branch_id=other["id"]
+            )
+
+    def test_main_branch_catches_up_with_transcript(self):
+        from app.database import update_agent_conversation
+        from app.services.conversation_branch_service import ConversationBranchService
+
+        conv_id = self._create_agent_conversation_with_messages()
+        ConversationBranchService.create_branch(conv_id, fork_message_index=0)
+        messages = [{"role": "user", "content": f"m{i}"} for i in range(5)]
+        messages.append({"role": "assistant", "content": "Later reply"})
+        update_agent_conversation(conv_id, messages=json.dumps(messages))
+
+        fork = ConversationBranchService.create_branch(conv_id, fork_message_index=5)
+        msgs = ConversationBranchService.get_branch_messages(fork["id"])
+        assert len(msgs) == 6
+        assert msgs[-1]["content"] == "Later reply"
+
+    def test_legacy_root_fork_is_not_used_as_main(self):
+        from app.database import update_agent_conversation
+        from app.db.conversation_branches import create_branch, create_message
+        from app.services.conversation_branch_service import ConversationBranchService
+
+        conv_id = self._create_agent_conversation_with_messages()
+        transcript = [{"role": "user", "content": f"m{i}"} for i in range(6)]
+        update_agent_conversation(conv_id, messages=json.dumps(transcript))
+        # A fork deep-copied before copy-on-write: a root branch that diverged at index 2
+        legacy = create_branch(conv_id, name="explore")
+        for idx, content in enumerate(["m0", "m1", "EXPLORE"]):
+            create_message(conv_id, legacy, "user", content, message_index=idx)
+
+        fork = ConversationBranchService.create_branch(conv_id, fork_message_index=4)
+
+        legacy_msgs = ConversationBranchService.get_branch_messages(legacy)
+        assert [m["content"] for m in legacy_msgs] == ["m0", "m1", "EXPLORE"]
+        fork_msgs = ConversationBranchService.get_branch_messages(fork["id"])
+        assert [m["content"] for m in fork_msgs] == ["m0", "m1", "m2", "m3", "m4"]
+        assert fork["parent_branch_id"] != legacy
+
+    def test_diverged_main_branch_is_left_alone(self):
+        from app.database import update_agent_conversation
+        from app.db.connection import get_connection
+        from app.db.conversation_branches import get_branch
+        from app.services.conversation_branch_service import ConversationBranchService
+
+        conv_id = self._create_agent_conversation_with_messages()
+        first = ConversationBranchService.create_branch(conv_id, fork_message_index=0)
+        main_id = first["parent_branch_id"]
+        ConversationBranchService.add_message(main_id, "user", "Typed on main")
+        update_agent_conversation(
+            conv_id,
+            messages=json.dumps(
+                [
+                    {"role": "system", "content": "System prompt"},
+                    {"role": "user", "content": "Hello"},
+                    {"role": "assistant", "content": "Hi there!"},
+                    {"role": "user", "content": "Help me"},
+                    {"role": "assistant", "content": "Sure thing!"},
+                    {"role": "user", "content": "Next question"},
+                    {"role": "assistant", "content": "Next answer"},
+                ]
+            ),
+        )
+
+        fork = ConversationBranchService.create_branch(conv_id, fork_message_index=6)
+
+        main_msgs = ConversationBranchService.get_branch_messages(main_id)
+        assert [m["content"] for m in main_msgs][-1] == "Typed on main"
+        assert len(main_msgs) == 6
+        new_main = get_branch(fork["parent_branch_id"])
+        assert new_main["parent_branch_id"] == main_id
+        assert new_main["fork_index"] == 4
+        fork_msgs = ConversationBranchService.get_branch_messages(fork["id"])
+        assert [m["content"] for m in fork_msgs][-2:] == ["Next question", "Next answer"]
+        with get_connection() as conn:
+            (stored,) = conn.execute(
+                "SELECT COUNT(*) FROM conversation_messages WHERE branch_id = ?",
+                (new_main["id"],),
+            ).fetchone()
+        # The new main branch shares the common prefix instead of copying it
+        assert stored == 2
+
+    def test_main_branch_diverged_by_repeated_message_is_not_reused(self):
+        from app.database import update_agent_conversation
+        from app.db.conversation_branches import get_branch
+        from app.services.conversation_branch_service import ConversationBranchService
+
+        conv_id = self._create_agent_conversation_with_messages()
+        main_id = ConversationBranchService.create_main_branch(conv_id)["id"]
+        # Typed on main, and the transcript later gets the very same message
+        ConversationBranchService.add_message(main_id, "user", "continue")
+        transcript = [
+            {"role": "system", "content": "System prompt"},
+            {"role": "user", "content": "Hello"},
+            {"role": "assistant", "content": "Hi there!"},
+            {"role": "user", "content": "Help me"},
+            {"role": "assistant", "content": "Sure thing!"},
+            {"role": "user", "content": "continue"},
+            {"role": "assistant", "content": "Continuing"},
+        ]
+        update_agent_conversation(conv_id, messages=json.dumps(transcript))
+
+        fork = ConversationBranchService.create_branch(conv_id, fork_message_index=6)
+
+        assert get_branch(main_id)["message_count"] == 6
+        new_main = get_branch(fork["parent_branch_id"])
+        assert new_main["id"] != main_id
+        assert (new_main["parent_branch_id"], new_main["fork_index"]) == (main_id, 4)
+        assert new_main["diverged_index"] is None
+        fork_msgs = ConversationBranchService.get_branch_messages(fork["id"])
+        assert [m["content"] for m in fork_msgs] == [m["content"] for m in transcript]
+
+    def test_migration_backfills_message_counts(self):
+        from app.db.connection import get_connection
+        from app.db.conversation_branches import create_branch, create_message
+        from app.db.migrations import _migrate_109_conversation_branch_cow
+
+        conv_id = self._create_agent_conversation_with_messages()
+        branch_id = create_branch(conv_id, name="legacy")
+        for idx in range(3):
+            create_message(conv_id, branch_id, "user", f"m{idx}", message_index=idx)
+        with get_connection() as conn:
+            conn.execute("ALTER TABLE conversation_branches DROP COLUMN message_count")
+            _migrate_109_conversation_branch_cow(conn)
+            conn.commit()
+
+        from app.services.conversation_branch_service import ConversationBranchService
+
+        (branch,) = ConversationBranchService.get_conversation_branches(conv_id)
+        assert branch["message_count"] == 3
+        assert len(ConversationBranchService.get_branch_messages(branch_id)) == 3
+
 
 # ---------------------------------------------------------------------------
 # Conversation lifecycle integration
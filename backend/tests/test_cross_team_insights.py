@@ -0,0 +1,134 @@
+"""Tests for the daily execution aggregate, cross-team insights and report caching."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.db.connection import get_connection
+from app.db.cross_team_insights import get_cross_team_insights
+from app.db.migrations import _migrate_110_execution_daily_stats
+from app.db.teams import create_team
+from app.db.triggers import create_execution_log, create_trigger, delete_trigger
+from app.services.execution_log_service import ExecutionLogService
+from app.services.report_service import ReportService
+
+
+def _create_trigger(name, team_id=None, trigger_source="webhook"):
+    return create_trigger(
+        name=name,
+        prompt_template="test {paths}",
+        trigger_source=trigger_source,
+        team_id=team_id,
+    )
+
+
+def _add_execution(trigger_id, status="success", days_ago=0, trigger_type="webhook"):
+    exec_id = f"exec-{uuid.uuid4().hex[:8]}"
+    started = datetime.now(timezone.utc) - timedelta(days=days_ago)
+    create_execution_log(
+        execution_id=exec_id,
+        trigger_id=trigger_id,
+        trigger_type=trigger_type,
+        started_at=started.isoformat(),
+        prompt="test prompt",
+        backend_type="claude",
+        command="claude -p test",
+    )
+    with get_connection() as conn:
+        conn.execute(
+            "UPDATE execution_logs SET status = ? WHERE execution_id = ?", (status, exec_id)
+        )
+        conn.commit()
+    return exec_id
+
+
+def _daily_stats(trigger_id):
+    with get_connection() as conn:
+        rows = conn.execute(
+            "SELECT status, SUM(runs) AS runs FROM execution_daily_stats "
+            "WHERE trigger_id = ? GROUP BY status",
+            (trigger_id,),
+        ).fetchall()
+    return {row["status"]: row["runs"] for row in rows if row["runs"]}
+
+
+class TestExecutionDailyStats:
+    def test_inserts_and_status_changes_move_counts(self, isolated_db):
+        trigger_id = _create_trigger("stats-bot")
+        _add_execution(trigger_id, "success")
+        failed_id = _add_execution(trigger_id, "failed")
+        assert _daily_stats(trigger_id) == {"success": 1, "failed": 1}
+
+        with get_connection() as conn:
+            conn.execute("DELETE FROM execution_logs WHERE execution_id = ?", (failed_id,))
+            conn.commit()
+        assert _daily_stats(trigger_id) == {"success": 1}
+
+    def test_deleting_trigger_drops_its_cascaded_executions(self, isolated_db):
+        trigger_id = _create_trigger("doomed-bot")
+        _add_execution(trigger_id, "success")
+        delete_trigger(trigger_id)
+        assert _daily_stats(trigger_id) == {}
+
+    def test_migration_rebuilds_from_history(self, isolated_db):
+        trigger_id = _create_trigger("history-bot")
+        for status in ("success", "success", "failed"):
+            _add_execution(trigger_id, status, days_ago=3)
+        with get_connection() as conn:
+            conn.execute("UPDATE execution_daily_stats SET runs = 99")
+            _migrate_110_execution_daily_stats(conn)
+            conn.commit()
+        assert _daily_stats(trigger_id) == {"success": 2, "failed": 1}
+
+
+class TestCrossTeamInsights:
+    def test_single_pass_per_team_stats(self, isolated_db):
+        team_a = create_team(name="Team A")
+        team_b = create_team(name="Team B")
+        busy = _create_trigger("busy-bot", team_id=team_a)
+        quiet = _create_trigger("quiet-bot", team_id=team_a)
+        for _ in range(3):
+            _add_execution(busy, "success", days_ago=1)
+        _add_execution(busy, "failed", days_ago=10)
+        _add_execution(quiet, "success", days_ago=30)
+        # Executions of triggers outside any team are not attributed
+        _add_execution(_create_trigger("teamless-bot"), "success")
+
+        teams = {t["teamId"]: t for t in get_cross_team_insights()["teams"]}
+        a = teams[team_a]
+        assert a["totalExecutions"] == 5
+        assert a["successRate"] == 80.0
+        assert a["mostActiveBotName"] == "busy-bot"
+        # 3 runs in the last week against 1 in the week before
+        assert a["weekOverWeekChange"] == 200
+
+        b = teams[team_b]
+        assert (b["totalExecutions"], b["successRate"], b["mostActiveBotName"]) == (0, 0.0, "")
+        assert b["weekOverWeekChange"] == 0
+
+
+class TestReportCaching:
+    def test_weekly_report_cached_until_an_execution_finishes(self, isolated_db):
+        trigger_id = _create_trigger("pr-bot", trigger_source="github")
+        _add_execution(trigger_id, "completed", trigger_type="github")
+        assert ReportService.generate_weekly_report()["prs_reviewed"] == 1
+
+        _add_execution(trigger_id, "completed", trigger_type="github")
+        assert ReportService.generate_weekly_report()["prs_reviewed"] == 1
+
+        exec_id = ExecutionLogService.start_execution(
+            trigger_id, "github", "review PR", "claude", "claude -p review"
+        )
+        ExecutionLogService.finish_execution(exec_id, "completed", exit_code=0)
+        report = ReportService.generate_weekly_report()
+        assert report["prs_reviewed"] == 3
+        assert report["top_bots"][0] == {
+            "trigger_id": trigger_id,
+            "trigger_name": "pr-bot",
+            "execution_count": 3,
+        }
+
+    def test_cached_insights_are_copies(self, isolated_db):
+        create_team(name="Team A")
+        first = ReportService.get_cross_team_insights()
+        first["teams"].clear()
+        assert len(ReportService.get_cross_team_insights()["teams"]) == 1
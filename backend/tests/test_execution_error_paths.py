@@ -19,19 +19,9 @@ def reset_execution_service_state():
     """Reset class-level mutable state between tests."""
     ExecutionService._rate_limit_detected.clear()
     ExecutionService._transient_failure_detected.clear()
-    ExecutionService._pending_retries.clear()
-    for timer in ExecutionService._retry_timers.values():
-        timer.cancel()
-    ExecutionService._retry_timers.clear()
-    ExecutionService._retry_counts.clear()
     yield
     ExecutionService._rate_limit_detected.clear()
     ExecutionService._transient_failure_detected.clear()
-    ExecutionService._pending_retries.clear()
-    for timer in ExecutionService._retry_timers.values():
-        timer.cancel()
-    ExecutionService._retry_timers.clear()
-    ExecutionService._retry_counts.clear()
 
 
 def _make_trigger(**overrides):
@@ -304,14 +294,13 @@ class TestTransientFailureDetection:
 
 
 class TestRetryScheduling:
-    def test_schedule_retry_creates_timer(self, isolated_db):
-        """schedule_retry should create an active timer in _retry_timers."""
+    def test_schedule_retry_enqueues_delayed_entry(self, isolated_db):
+        """schedule_retry should persist a delayed retry entry in the execution queue."""
+        from app.db.execution_queue import get_pending_entries
+
         trigger = _make_trigger()
-        with (
-            patch("app.services.audit_log_service.AuditLogService"),
-            patch("app.services.execution_retry.upsert_pending_retry"),
-        ):
-            ExecutionService.schedule_retry(
+        with patch("app.services.audit_log_service.AuditLogService"):
+            entry_id = ExecutionService.schedule_retry(
                 trigger=trigger,
                 message_text="test",
                 event=None,
@@ -319,72 +308,73 @@ class TestRetryScheduling:
                 cooldown_seconds=10,
             )
 
-        assert "trg-test01" in ExecutionService._retry_timers
-        assert "trg-test01" in ExecutionService._pending_retries
-        # Cancel the timer to prevent it from firing during test teardown
-        ExecutionService._retry_timers["trg-test01"].cancel()
+        pending = ExecutionService.get_pending_retries()
+        assert pending["trg-test01"]["entry_id"] == entry_id
+        assert pending["trg-test01"]["attempt"] == 1
+        assert pending["trg-test01"]["cooldown_seconds"] >= 10
+        # Not dispatchable until the backoff delay elapses
+        assert get_pending_entries() == []
 
-    def test_schedule_retry_replaces_existing_timer(self, isolated_db):
-        """A new retry should cancel the existing timer for the same trigger."""
-        trigger = _make_trigger()
-        with (
-            patch("app.services.audit_log_service.AuditLogService"),
-            patch("app.services.execution_retry.upsert_pending_retry"),
-        ):
-            ExecutionService.schedule_retry(trigger, "msg1", None, "webhook", 10)
-            first_timer = ExecutionService._retry_timers["trg-test01"]
+    def test_schedule_retry_replaces_existing_entry(self, isolated_db):
+        """A new retry should supersede the queued retry for the same trigger."""
+        from app.db.execution_queue import get_pending_retry_entries
 
-            ExecutionService.schedule_retry(trigger, "msg2", None, "webhook", 20)
-            second_timer = ExecutionService._retry_timers["trg-test01"]
+        trigger = _make_trigger()
+        with patch("app.services.audit_log_service.AuditLogService"):
+            first_id = ExecutionService.schedule_retry(trigger, "msg1", None, "webhook", 10)
+            second_id = ExecutionService.schedule_retry(trigger, "msg2", None, "webhook", 20)
 
-        assert first_timer is not second_timer
-        # First timer should have been cancelled
-        assert first_timer.finished.is_set() or not first_timer.is_alive()
-        second_timer.cancel()
+        entries = get_pending_retry_entries()
+        assert [e["id"] for e in entries] == [second_id]
+        assert first_id != second_id
+        assert entries[0]["message_text"] == "msg2"
+        assert entries[0]["attempt"] == 2
 
     def test_schedule_retry_exceeds_max_attempts(self, isolated_db):
         """After MAX_RETRY_ATTEMPTS, schedule_retry should give up."""
+        from app.config import MAX_RETRY_ATTEMPTS
+        from app.db.execution_queue import enqueue_execution
+
         trigger = _make_trigger()
-        ExecutionService._retry_counts["trg-test01"] = 100  # Well above max
+        enqueue_execution(
+            "trg-test01", "webhook", "msg", delay_seconds=60, attempt=MAX_RETRY_ATTEMPTS
+        )
 
         with (
             patch("app.services.audit_log_service.AuditLogService"),
             patch("app.services.execution_log_service.ExecutionLogService") as mock_log,
-            patch("app.services.execution_retry.upsert_pending_retry"),
-            patch("app.services.execution_retry.delete_pending_retry"),
         ):
             mock_log.start_execution.return_value = "exec-exhaust"
-            ExecutionService.schedule_retry(trigger, "msg", None, "webhook", 10)
+            entry_id = ExecutionService.schedule_retry(trigger, "msg", None, "webhook", 10)
 
-        # Should NOT have created a timer
-        assert "trg-test01" not in ExecutionService._retry_timers
+        # Should NOT have queued another retry, and the superseded one is cancelled
+        assert entry_id is None
+        assert ExecutionService.get_pending_retries() == {}
         # Should have created a terminal failure execution record
         mock_log.finish_execution.assert_called_once()
         call_kwargs = mock_log.finish_execution.call_args[1]
         assert call_kwargs["status"] == ExecutionState.FAILED
         assert "exhausted" in call_kwargs["error_message"].lower()
 
-    def test_pending_retries_snapshot(self, isolated_db):
-        """get_pending_retries should return in-memory state merged with DB."""
-        ExecutionService._pending_retries["trg-mem"] = {
-            "trigger_id": "trg-mem",
-            "cooldown_seconds": 30,
-        }
+    def test_running_retry_continues_attempt_count(self, isolated_db):
+        """A retry that is being dispatched counts toward the next attempt number."""
+        from app.db.execution_queue import update_entry_status
+
+        trigger = _make_trigger()
+        with patch("app.services.audit_log_service.AuditLogService"):
+            first_id = ExecutionService.schedule_retry(trigger, "msg", None, "webhook", 10)
+            update_entry_status(first_id, "dispatching", expected_status="pending")
+            ExecutionService.schedule_retry(trigger, "msg", None, "webhook", 10)
+
+        assert ExecutionService.get_pending_retries()["trg-test01"]["attempt"] == 2
+
+    def test_pending_retries_db_error(self, isolated_db):
+        """A DB error while listing retries should return an empty snapshot."""
         with patch(
-            "app.services.execution_retry.get_all_pending_retries",
-            return_value=[
-                {
-                    "trigger_id": "trg-db",
-                    "cooldown_seconds": 60,
-                    "retry_at": "2026-01-01T00:00:00",
-                    "created_at": "2026-01-01T00:00:00",
-                }
-            ],
+            "app.services.execution_retry.get_pending_retry_entries",
+            side_effect=RuntimeError("DB corrupt"),
         ):
-            result = ExecutionService.get_pending_retries()
-
-        assert "trg-mem" in result
-        assert "trg-db" in result
+            assert ExecutionService.get_pending_retries() == {}
 
 
 # ---------------------------------------------------------------------------
@@ -661,7 +651,6 @@ class TestIncompleteOutput:
             patch("threading.Thread") as mock_thread_cls,
         ):
             mock_budget.check_budget.return_value = {"allowed": True}
-            mock_budget.extract_token_usage.return_value = None
             mock_log_svc.start_execution.return_value = "exec-alive"
             mock_log_svc.get_stdout_log.return_value = ""
             mock_pm.is_cancelled.return_value = False
@@ -679,55 +668,45 @@ class TestIncompleteOutput:
 
 
 # ---------------------------------------------------------------------------
-# restore_pending_retries
+# Legacy pending_retries migration
 # ---------------------------------------------------------------------------
 
 
-class TestRestorePendingRetries:
-    def test_restore_with_empty_db(self, isolated_db):
-        """Restore with no DB rows should return 0."""
-        with patch("app.services.execution_retry.get_all_pending_retries", return_value=[]):
-            count = ExecutionService.restore_pending_retries()
-        assert count == 0
-
-    def test_restore_db_error(self, isolated_db):
-        """DB error during restore should return 0 without crashing."""
-        with patch(
-            "app.services.execution_retry.get_all_pending_retries",
-            side_effect=RuntimeError("DB corrupt"),
-        ):
-            count = ExecutionService.restore_pending_retries()
-        assert count == 0
-
-    def test_restore_creates_timers(self, isolated_db):
-        """Valid DB rows should create in-memory timers."""
-        import datetime
-        import json
-
-        retry_at = (datetime.datetime.now() + datetime.timedelta(seconds=30)).isoformat()
-        trigger = _make_trigger()
-
-        rows = [
-            {
-                "trigger_id": "trg-test01",
-                "trigger_json": json.dumps(trigger),
-                "message_text": "test",
-                "event_json": "{}",
-                "trigger_type": "webhook",
-                "cooldown_seconds": 10,
-                "retry_at": retry_at,
-                "created_at": datetime.datetime.now().isoformat(),
-            }
-        ]
-
-        with (
-            patch("app.services.execution_retry.get_all_pending_retries", return_value=rows),
-            patch("app.services.execution_retry.delete_pending_retry"),
-        ):
-            count = ExecutionService.restore_pending_retries()
-
-        assert count == 1
-        assert "trg-test01" in ExecutionService._retry_timers
-        assert "trg-test01" in ExecutionService._pending_retries
-        # Cleanup
-        ExecutionService._retry_timers["trg-test01"].cancel()
+class TestLegacyPendingRetriesMigration:
+    def test_legacy_rows_move_into_queue(self, isolated_db):
+        """Timer-era pending_retries rows become delayed retry entries in the queue."""
+        import os
+        import time
+
+        from app.db.connection import get_connection
+        from app.db.execution_queue import get_pending_retry_entries
+        from app.db.migrations import _migrate_102_execution_queue_delayed_retries
+
+        # retry_at was written in local time; not_before is UTC
+        saved_tz = os.environ.get("TZ")
+        os.environ["TZ"] = "Asia/Seoul"
+        time.tzset()
+        try:
+            with get_connection() as conn:
+                conn.executemany(
+                    "INSERT INTO pending_retries (trigger_id, trigger_json, message_text, "
+                    "event_json, trigger_type, cooldown_seconds, retry_at) "
+                    "VALUES (?, '{}', 'test', '{}', 'webhook', 30, '2099-01-01T09:00:00')",
+                    [("bot-security",), ("trg-deleted",)],
+                )
+                _migrate_102_execution_queue_delayed_retries(conn)
+                conn.commit()
+                remaining = conn.execute("SELECT COUNT(*) FROM pending_retries").fetchone()[0]
+        finally:
+            if saved_tz is None:
+                os.environ.pop("TZ", None)
+            else:
+                os.environ["TZ"] = saved_tz
+            time.tzset()
+
+        entries = get_pending_retry_entries()
+        assert remaining == 0
+        # Rows for triggers that no longer exist are dropped
+        assert [e["trigger_id"] for e in entries] == ["bot-security"]
+        assert entries[0]["not_before"] == "2099-01-01 00:00:00"
+        assert entries[0]["attempt"] == 1
@@ -8,11 +8,14 @@ import pytest
 
 from app.db.execution_queue import (
     cancel_pending_entries,
+    cancel_pending_retries,
     count_active_for_trigger,
     enqueue_execution,
     get_pending_entries,
+    get_pending_retry_entries,
     get_queue_depth,
     get_queue_summary,
+    get_retry_attempt,
     reset_stale_dispatching,
     update_entry_status,
 )
@@ -151,6 +154,48 @@ class TestExecutionQueueDB:
         assert len(entries) == 2
         assert all(e["status"] == "pending" for e in entries)
 
+    def test_delayed_entry_not_dispatchable_until_due(self, isolated_db):
+        """Entries with a future not_before are held back from get_pending_entries."""
+        from app.db.connection import get_connection
+
+        delayed_id = enqueue_execution("trig-abc", "webhook", "later", delay_seconds=300)
+        now_id = enqueue_execution("trig-abc", "webhook", "now")
+
+        assert [e["id"] for e in get_pending_entries()] == [now_id]
+        # Delayed entries still count toward depth so the per-trigger cap holds
+        assert get_queue_depth("trig-abc") == 2
+
+        with get_connection() as conn:
+            conn.execute(
+                "UPDATE execution_queue SET not_before = datetime('now', '-1 second') WHERE id = ?",
+                (delayed_id,),
+            )
+            conn.commit()
+        assert {e["id"] for e in get_pending_entries()} == {delayed_id, now_id}
+
+    def test_retry_attempt_tracking(self, isolated_db):
+        """Retry attempt is the max over pending and dispatching entries."""
+        assert get_retry_attempt("trig-abc") == 0
+
+        first = enqueue_execution("trig-abc", "webhook", "r1", delay_seconds=60, attempt=1)
+        assert get_retry_attempt("trig-abc") == 1
+
+        # A dispatched retry keeps its attempt visible while it runs
+        update_entry_status(first, "dispatching", expected_status="pending")
+        assert get_retry_attempt("trig-abc") == 1
+        update_entry_status(first, "completed", expected_status="dispatching")
+        assert get_retry_attempt("trig-abc") == 0
+
+    def test_cancel_pending_retries_leaves_regular_entries(self, isolated_db):
+        """Only pending retry entries (attempt > 0) are cancelled."""
+        enqueue_execution("trig-abc", "webhook", "retry", delay_seconds=60, attempt=2)
+        enqueue_execution("trig-abc", "webhook", "fresh")
+
+        assert len(get_pending_retry_entries()) == 1
+        assert cancel_pending_retries("trig-abc") == 1
+        assert get_pending_retry_entries() == []
+        assert get_queue_depth("trig-abc") == 1
+
 
 # --- Service tests ---
 
@@ -401,17 +446,8 @@ class TestQueueAPIEndpoints:
 
     def test_get_pending_retries_with_data(self, client, isolated_db):
         """GET /admin/executions/retries returns populated retry entries."""
-        from app.db.monitoring import upsert_pending_retry
-
-        upsert_pending_retry(
-            trigger_id="trig-abc",
-            trigger_json='{"id": "trig-abc"}',
-            message_text="test",
-            event_json="{}",
-            trigger_type="webhook",
-            cooldown_seconds=60,
-            retry_at="2026-03-05T12:00:00",
-        )
+        enqueue_execution("trig-abc", "webhook", "test", delay_seconds=60, attempt=1)
+        enqueue_execution("trig-abc", "webhook", "not a retry")
 
         resp = client.get("/admin/executions/retries")
         assert resp.status_code == 200
@@ -419,3 +455,4 @@ class TestQueueAPIEndpoints:
         assert data["total"] == 1
         assert data["retries"][0]["trigger_id"] == "trig-abc"
         assert data["retries"][0]["cooldown_seconds"] == 60
+        assert data["retries"][0]["attempt"] == 1
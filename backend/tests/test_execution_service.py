@@ -8,6 +8,7 @@ from unittest.mock import MagicMock, patch, ANY
 import pytest
 
 from app.services.execution_service import ExecutionService, ExecutionState
+from app.services.usage_stream import LiveUsageTracker
 
 
 # ---------------------------------------------------------------------------
@@ -20,20 +21,9 @@ def reset_execution_service_state():
     """Reset class-level mutable state between tests."""
     ExecutionService._rate_limit_detected.clear()
     ExecutionService._transient_failure_detected.clear()
-    ExecutionService._pending_retries.clear()
-    # Cancel any lingering timers
-    for timer in ExecutionService._retry_timers.values():
-        timer.cancel()
-    ExecutionService._retry_timers.clear()
-    ExecutionService._retry_counts.clear()
     yield
     ExecutionService._rate_limit_detected.clear()
     ExecutionService._transient_failure_detected.clear()
-    ExecutionService._pending_retries.clear()
-    for timer in ExecutionService._retry_timers.values():
-        timer.cancel()
-    ExecutionService._retry_timers.clear()
-    ExecutionService._retry_counts.clear()
 
 
 def _make_trigger(**overrides):
@@ -129,6 +119,17 @@ class TestBuildCommand:
         )
         assert "--reasoning-effort" not in cmd
 
+    def test_claude_session_flags(self):
+        cmd = ExecutionService.build_command("claude", "p", session_id="sid-1")
+        assert cmd[cmd.index("--session-id") + 1] == "sid-1"
+        cmd = ExecutionService.build_command("claude", "p", session_id="sid-1", resume=True)
+        assert cmd[cmd.index("--resume") + 1] == "sid-1"
+        assert "--session-id" not in cmd
+
+    def test_session_ignored_by_other_backends(self):
+        cmd = ExecutionService.build_command("gemini", "p", session_id="sid-1")
+        assert "sid-1" not in cmd
+
 
 # ---------------------------------------------------------------------------
 # build_resolve_command
@@ -519,11 +520,6 @@ class TestRunTriggerSuccess:
     ):
         mock_log_svc.start_execution.return_value = "exec-ok"
         mock_budget.check_budget.return_value = {"allowed": True}
-        mock_budget.extract_token_usage.return_value = {
-            "input_tokens": 100,
-            "output_tokens": 50,
-        }
-        mock_log_svc.get_stdout_log.return_value = '{"usage": {"input_tokens": 100}}'
         mock_pm.is_cancelled.return_value = False
 
         mock_proc = MagicMock(spec=subprocess.Popen)
@@ -534,23 +530,25 @@ class TestRunTriggerSuccess:
         mock_proc.stderr.readline = MagicMock(return_value="")
         mock_proc.poll.return_value = 0
 
+        def stream_stdout(*args, **kwargs):
+            # Stand in for the stdout reader thread feeding the live usage parser
+            LiveUsageTracker.feed("exec-ok", '{"usage": {"input_tokens": 100}}')
+            return MagicMock(is_alive=MagicMock(return_value=False))
+
         with (
             patch("subprocess.Popen", return_value=mock_proc),
-            patch("threading.Thread") as mock_thread_cls,
+            patch("threading.Thread", side_effect=stream_stdout),
         ):
-            mock_thread = MagicMock()
-            mock_thread.is_alive.return_value = False
-            mock_thread_cls.return_value = mock_thread
-
             trigger = _make_trigger()
             result = ExecutionService.run_trigger(trigger, "scan this")
 
         assert result == "exec-ok"
-        mock_budget.extract_token_usage.assert_called_once()
         mock_budget.record_usage.assert_called_once()
         call_kwargs = mock_budget.record_usage.call_args[1]
         assert call_kwargs["execution_id"] == "exec-ok"
         assert call_kwargs["backend_type"] == "claude"
+        assert call_kwargs["usage_data"]["input_tokens"] == 100
+        assert not LiveUsageTracker.is_tracking("exec-ok")
 
     @patch("app.services.execution_service.GitHubService")
     @patch("app.services.execution_service.ProcessManager")
@@ -599,6 +597,117 @@ class TestRunTriggerSuccess:
         assert finish_call[1]["exit_code"] == 1
 
 
+class TestRunTriggerWorkspaceHandoff:
+    """A rotated execution leaves its workspace to the continuation run."""
+
+    def _proc(self, wait):
+        mock_proc = MagicMock(spec=subprocess.Popen)
+        mock_proc.wait.side_effect = wait
+        mock_proc.stdout = MagicMock()
+        mock_proc.stderr = MagicMock()
+        return mock_proc
+
+    def _clone(self, path_entries, cloned_dirs, github_repo_map):
+        cloned_dirs.append("/tmp/clone-1")
+        github_repo_map["/tmp/clone-1"] = "https://github.com/o/r"
+        return ["/tmp/clone-1"]
+
+    @patch("app.services.execution_service.GitHubService")
+    @patch("app.services.execution_service.ProcessManager")
+    @patch("app.services.execution_service.BudgetService")
+    @patch("app.services.execution_service.AuditLogService")
+    @patch("app.services.execution_service.ExecutionLogService")
+    @patch("app.services.execution_service.get_paths_for_trigger_detailed", return_value=[])
+    @patch("shutil.which", return_value=None)
+    def test_handed_off_run_keeps_clones_and_status(
+        self,
+        mock_which,
+        mock_paths,
+        mock_log_svc,
+        mock_audit,
+        mock_budget,
+        mock_pm,
+        mock_github,
+        isolated_db,
+    ):
+        from app.services.execution_workspace import WorkspaceRegistry
+
+        mock_log_svc.start_execution.return_value = "exec-rot"
+        mock_budget.check_budget.return_value = {"allowed": True}
+        handed = {}
+
+        def rotate(timeout=None):
+            # RotationService takes the workspace over, then stops the process
+            handed["ws"] = WorkspaceRegistry.hand_off("exec-rot")
+            return -15
+
+        with (
+            patch.object(ExecutionService, "_clone_repos", side_effect=self._clone),
+            patch("subprocess.Popen", return_value=self._proc(rotate)) as mock_popen,
+            patch("threading.Thread"),
+        ):
+            ExecutionService.run_trigger(_make_trigger(), "scan this")
+
+        cmd = mock_popen.call_args[0][0]
+        workspace = handed["ws"]
+        assert workspace.session_id == cmd[cmd.index("--session-id") + 1]
+        assert workspace.cloned_dirs == ["/tmp/clone-1"]
+        mock_log_svc.finish_execution.assert_not_called()
+        mock_github.cleanup_clone.assert_not_called()
+        assert WorkspaceRegistry.get("exec-rot") is None
+
+    @patch("app.services.execution_service.GitHubService")
+    @patch("app.services.execution_service.ProcessManager")
+    @patch("app.services.execution_service.BudgetService")
+    @patch("app.services.execution_service.AuditLogService")
+    @patch("app.services.execution_service.ExecutionLogService")
+    @patch("app.services.execution_service.get_paths_for_trigger_detailed")
+    @patch("shutil.which", return_value=None)
+    def test_continuation_reuses_workspace_and_resumes_session(
+        self,
+        mock_which,
+        mock_paths,
+        mock_log_svc,
+        mock_audit,
+        mock_budget,
+        mock_pm,
+        mock_github,
+        isolated_db,
+    ):
+        from app.services.execution_workspace import ExecutionWorkspace
+
+        mock_log_svc.start_execution.return_value = "exec-cont"
+        mock_budget.check_budget.return_value = {"allowed": True}
+        mock_pm.is_cancelled.return_value = False
+        workspace = ExecutionWorkspace(
+            execution_id="exec-rot",
+            cwd="/tmp/clone-1",
+            paths=["/tmp/clone-1"],
+            cloned_dirs=["/tmp/clone-1"],
+            session_id="sid-1",
+            handed_off=True,
+        )
+
+        with (
+            patch("subprocess.Popen", return_value=self._proc([0])) as mock_popen,
+            patch("threading.Thread"),
+        ):
+            ExecutionService.run_trigger(
+                _make_trigger(),
+                "keep going",
+                workspace=workspace,
+                resume_session_id="sid-1",
+            )
+
+        mock_paths.assert_not_called()
+        cmd = mock_popen.call_args[0][0]
+        assert cmd[cmd.index("-p") + 1] == "keep going"
+        assert cmd[cmd.index("--resume") + 1] == "sid-1"
+        assert mock_popen.call_args[1]["cwd"] == "/tmp/clone-1"
+        # The continuation owns the clones now and removes them when it ends
+        mock_github.cleanup_clone.assert_called_once_with("/tmp/clone-1")
+
+
 # ---------------------------------------------------------------------------
 # save_trigger_event / save_threat_report
 # ---------------------------------------------------------------------------
@@ -659,34 +768,3 @@ class TestExecutionState:
         assert ExecutionState.TIMEOUT == "timeout"
         assert ExecutionState.CANCELLED == "cancelled"
         assert ExecutionState.IDLE == "idle"
-
-
-# ---------------------------------------------------------------------------
-# _fetch_pr_diff
-# ---------------------------------------------------------------------------
-
-
-class TestFetchPrDiff:
-    def test_returns_none_for_empty_pr_url(self):
-        result = ExecutionService._fetch_pr_diff({})
-        assert result is None
-
-    def test_returns_none_for_missing_pr_url(self):
-        result = ExecutionService._fetch_pr_diff({"pr_url": ""})
-        assert result is None
-
-    @patch("urllib.request.urlopen")
-    def test_returns_diff_text(self, mock_urlopen):
-        mock_response = MagicMock()
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_response.read.return_value = b"diff --git a/file.py b/file.py\n"
-        mock_urlopen.return_value = mock_response
-
-        result = ExecutionService._fetch_pr_diff({"pr_url": "https://github.com/o/r/pull/1"})
-        assert result == "diff --git a/file.py b/file.py\n"
-
-    @patch("urllib.request.urlopen", side_effect=Exception("network error"))
-    def test_returns_none_on_network_error(self, mock_urlopen):
-        result = ExecutionService._fetch_pr_diff({"pr_url": "https://github.com/o/r/pull/1"})
-        assert result is None
@@ -0,0 +1,177 @@
+"""Tests for the shared file-event multiplexer and the ref-watching Ralph monitor."""
+
+import subprocess
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.services.file_event_multiplexer import FileEventMultiplexer
+from app.services.ralph_monitor_service import RalphMonitorService
+
+
+@pytest.fixture(autouse=True)
+def fast_debounce(monkeypatch):
+    monkeypatch.setattr(FileEventMultiplexer, "DEBOUNCE_SECONDS", 0.05)
+    RalphMonitorService._monitors.clear()
+    yield
+    RalphMonitorService._monitors.clear()
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def _git(cwd, *args):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def _commit(repo, message):
+    _git(repo, "commit", "--allow-empty", "-q", "-m", message)
+    return _git(repo, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = tmp_path / "repo"
+    path.mkdir()
+    _git(path, "init", "-q", "-b", "main")
+    _git(path, "config", "user.email", "dev@example.com")
+    _git(path, "config", "user.name", "dev")
+    _commit(path, "initial")
+    return path
+
+
+class TestFileEventMultiplexer:
+    def test_batches_share_one_watch_and_respect_filters(self, tmp_path):
+        batches, json_only = [], []
+        first = FileEventMultiplexer.subscribe(str(tmp_path), batches.append)
+        FileEventMultiplexer.subscribe(
+            str(tmp_path), json_only.append, path_filter=lambda p: p.endswith(".json")
+        )
+        assert len(FileEventMultiplexer._watches) == 1
+
+        for _ in range(3):
+            (tmp_path / "a.json").write_text("{}")
+        (tmp_path / "b.txt").write_text("x")
+
+        assert _wait_for(lambda: batches and json_only)
+        time.sleep(0.2)
+        seen = [p for batch in batches for p in batch]
+        assert sorted(set(seen)) == [str(tmp_path / "a.json"), str(tmp_path / "b.txt")]
+        # Repeated writes to one file are debounced into a single entry
+        assert seen.count(str(tmp_path / "a.json")) == 1
+        assert [p for batch in json_only for p in batch] == [str(tmp_path / "a.json")]
+
+        FileEventMultiplexer.unsubscribe(first)
+        assert len(FileEventMultiplexer._watches) == 1
+
+    def test_resubscribing_while_another_watch_receives_events_does_not_deadlock(self, tmp_path):
+        busy = tmp_path / "busy"
+        busy.mkdir()
+        others = [tmp_path / f"other-{i}" for i in range(5)]
+        for other in others:
+            other.mkdir()
+        received = []
+        FileEventMultiplexer.subscribe(str(busy), received.append)
+
+        stop = threading.Event()
+
+        def write_continuously():
+            i = 0
+            while not stop.is_set():
+                (busy / f"f{i % 10}.txt").write_text(str(i))
+                i += 1
+
+        def churn_subscriptions():
+            for _ in range(20):
+                ids = [FileEventMultiplexer.subscribe(str(o), lambda paths: None) for o in others]
+                for subscription_id in ids:
+                    FileEventMultiplexer.unsubscribe(subscription_id)
+
+        writer = threading.Thread(target=write_continuously, daemon=True)
+        churner = threading.Thread(target=churn_subscriptions, daemon=True)
+        writer.start()
+        churner.start()
+        churner.join(timeout=15)
+        stop.set()
+        writer.join(timeout=5)
+
+        assert not churner.is_alive()
+        assert _wait_for(lambda: received)
+        assert len(FileEventMultiplexer._watches) == 1
+
+    def test_call_later_runs_once_and_can_be_cancelled(self):
+        fired = threading.Event()
+        cancelled = []
+        FileEventMultiplexer.call_later(0.01, fired.set)
+        FileEventMultiplexer.cancel(
+            FileEventMultiplexer.call_later(0.01, lambda: cancelled.append(1))
+        )
+
+        assert fired.wait(2)
+        time.sleep(0.1)
+        assert cancelled == []
+        assert FileEventMultiplexer._timers == {}
+
+
+class TestRalphCommitDetection:
+    def test_reads_head_from_loose_and_packed_refs(self, repo):
+        head = _git(repo, "rev-parse", "HEAD")
+        with patch("subprocess.run") as mock_run:
+            assert RalphMonitorService._get_latest_commit(str(repo / "sub")) == head
+        _git(repo, "pack-refs", "--all")
+        assert not (repo / ".git" / "refs" / "heads" / "main").exists()
+        with patch("subprocess.run") as mock_packed_run:
+            assert RalphMonitorService._get_latest_commit(str(repo)) == head
+        mock_run.assert_not_called()
+        mock_packed_run.assert_not_called()
+
+    def test_reads_head_of_linked_worktree(self, repo, tmp_path):
+        worktree = tmp_path / "wt"
+        _git(repo, "worktree", "add", "-q", "-b", "feature", str(worktree))
+        head = _commit(worktree, "on feature")
+
+        assert RalphMonitorService._get_latest_commit(str(worktree)) == head
+        assert RalphMonitorService._get_latest_commit(str(repo)) != head
+
+    def test_commit_counts_iteration_without_polling(self, repo, monkeypatch):
+        monkeypatch.setattr(RalphMonitorService, "CHECK_INTERVAL_SECONDS", 3600)
+        with patch("app.services.project_session_manager.ProjectSessionManager") as psm:
+            RalphMonitorService.start_monitoring("ralph-1", str(repo), max_iterations=5)
+            head = _commit(repo, "iteration 1")
+
+            assert _wait_for(lambda: RalphMonitorService.get_state("ralph-1")["iteration"] == 1)
+            assert RalphMonitorService.get_state("ralph-1")["last_commit_hash"] == head
+            psm._broadcast.assert_called_with(
+                "ralph-1", "ralph_iteration", {"iteration": 1, "max_iterations": 5}
+            )
+
+            RalphMonitorService.stop_monitoring("ralph-1")
+        assert FileEventMultiplexer._subscriptions == {}
+        assert FileEventMultiplexer._timers == {}
+
+    def test_circuit_breaker_after_consecutive_idle_checks(self, repo, monkeypatch):
+        monkeypatch.setattr(RalphMonitorService, "CHECK_INTERVAL_SECONDS", 3600)
+        with patch("app.services.project_session_manager.ProjectSessionManager") as psm:
+            psm.get_session_info.return_value = {"status": "active", "output_lines": 0}
+            RalphMonitorService.start_monitoring(
+                "ralph-2", str(repo), max_iterations=5, no_progress_threshold=2
+            )
+            RalphMonitorService._check_progress("ralph-2")
+            assert RalphMonitorService.get_state("ralph-2")["no_progress_count"] == 1
+            RalphMonitorService._check_progress("ralph-2")
+
+            state = RalphMonitorService.get_state("ralph-2")
+            assert (state["triggered"], state["active"]) == (True, False)
+            assert _wait_for(lambda: psm.stop_session.called)
+            psm.stop_session.assert_called_once_with("ralph-2")
+        assert FileEventMultiplexer._subscriptions == {}
@@ -4,6 +4,7 @@ All git operations are mocked -- no real cloning or remote access.
 """
 
 import json
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -82,6 +83,16 @@ class TestGitOpsRepoCRUD:
         repo = get_gitops_repo(repo_id)
         assert repo["last_commit_sha"] == "abc123"
         assert repo["last_sync_at"] == "2026-03-05T00:00:00Z"
+        assert repo["pending_files"] is None
+        assert repo["last_full_sync_at"] is None
+
+        update_sync_state(
+            repo_id, "def456", "2026-03-06T00:00:00Z", ["bot.yaml"], "2026-03-06T00:00:00Z"
+        )
+        update_sync_state(repo_id, "ghi789", "2026-03-07T00:00:00Z")
+        repo = get_gitops_repo(repo_id)
+        assert repo["pending_files"] is None
+        assert repo["last_full_sync_at"] == "2026-03-06T00:00:00Z"
 
     def test_sync_log_crud(self, isolated_db):
         repo_id = create_gitops_repo("log-test", "https://example.com/repo.git")
@@ -128,6 +139,16 @@ def _make_trigger_yaml(name="test-trigger", prompt="test prompt"):
     return yaml.dump(config, default_flow_style=False, sort_keys=False)
 
 
+def _git_stub(sha, diff=""):
+    """subprocess.run stub: `git diff` returns ``diff``, every other git call ``sha``."""
+
+    def run(cmd, **kwargs):
+        stdout = diff if "diff" in cmd else f"{sha}\n"
+        return MagicMock(stdout=stdout, stderr="", returncode=0)
+
+    return run
+
+
 class TestGitOpsSyncService:
     """Test GitOps sync engine with mocked git operations."""
 
@@ -191,7 +212,8 @@ class TestGitOpsSyncService:
         """Test sync skips when commit SHA hasn't changed."""
         repo_id = create_gitops_repo("skip-test", "https://example.com/repo.git")
         # Set last_commit_sha to match what git will return
-        update_sync_state(repo_id, "same_sha", "2026-03-05T00:00:00Z")
+        now = datetime.now(timezone.utc).isoformat()
+        update_sync_state(repo_id, "same_sha", now, full_sync_at=now)
 
         clone_dir = self._mock_git_clone(tmp_path, {})
         with patch.object(GitOpsSyncService, "_get_local_path", return_value=str(clone_dir)):
@@ -232,7 +254,7 @@ class TestGitOpsSyncService:
         )
 
         with patch.object(GitOpsSyncService, "_get_local_path", return_value=str(clone_dir)):
-            mock_run.return_value = MagicMock(stdout="sha2\n", stderr="", returncode=0)
+            mock_run.side_effect = _git_stub("sha2", "M\tagented/bot-upsert.yaml\n")
             result2 = GitOpsSyncService.sync_repo(repo_id)
 
         assert result2["files_applied"] >= 1
@@ -300,7 +322,7 @@ class TestGitOpsSyncService:
         )
 
         with patch.object(GitOpsSyncService, "_get_local_path", return_value=str(clone_dir)):
-            mock_run.return_value = MagicMock(stdout="sha-v2\n", stderr="", returncode=0)
+            mock_run.side_effect = _git_stub("sha-v2", "M\tagented/bot-conflict.yaml\n")
             result = GitOpsSyncService.sync_repo(repo_id)
 
         assert result["status"] == "success"
@@ -310,6 +332,123 @@ class TestGitOpsSyncService:
         trigger_after = get_trigger_by_name("conflict-bot")
         assert trigger_after["prompt_template"] == "git-modified prompt"
 
+    @patch("app.services.gitops_sync_service.subprocess.run")
+    def test_unchanged_remote_skips_fetch(self, mock_run, isolated_db, tmp_path):
+        """ls-remote reporting the synced SHA short-circuits before any fetch."""
+        repo_id = create_gitops_repo("ls-remote-test", "https://example.com/repo.git")
+        now = datetime.now(timezone.utc).isoformat()
+        update_sync_state(repo_id, "same_sha", now, full_sync_at=now)
+
+        clone_dir = self._mock_git_clone(tmp_path, {})
+        with patch.object(GitOpsSyncService, "_get_local_path", return_value=str(clone_dir)):
+            mock_run.side_effect = _git_stub("same_sha\trefs/heads/main")
+            result = GitOpsSyncService.sync_repo(repo_id)
+
+        assert result["status"] == "skipped"
+        commands = [call.args[0] for call in mock_run.call_args_list]
+        assert [cmd[1] for cmd in commands] == ["ls-remote"]
+
+    @patch("app.services.gitops_sync_service.subprocess.run")
+    def test_only_changed_files_are_processed(self, mock_run, isolated_db, tmp_path):
+        """After the first sync, only files in the commit diff are re-imported."""
+        repo_id = create_gitops_repo("diff-test", "https://example.com/repo.git")
+        clone_dir = self._mock_git_clone(
+            tmp_path,
+            {
+                "bot-a.yaml": _make_trigger_yaml("diff-bot-a", "a v1"),
+                "bot-b.yaml": _make_trigger_yaml("diff-bot-b", "b v1"),
+            },
+        )
+        with patch.object(GitOpsSyncService, "_get_local_path", return_value=str(clone_dir)):
+            mock_run.side_effect = _git_stub("sha1")
+            assert GitOpsSyncService.sync_repo(repo_id)["files_applied"] == 2
+
+        config_dir = clone_dir / "agented"
+        (config_dir / "bot-a.yaml").write_text(_make_trigger_yaml("diff-bot-a", "a v2"))
+        (config_dir / "bot-b.yaml").write_text(_make_trigger_yaml("diff-bot-b", "b v2"))
+        diff = "M\tagented/bot-a.yaml\nD\tagented/old.yaml\nM\tagented/nested/c.yaml\n"
+        with patch.object(GitOpsSyncService, "_get_local_path", return_value=str(clone_dir)):
+            mock_run.side_effect = _git_stub("sha2", diff)
+            result = GitOpsSyncService.sync_repo(repo_id)
+
+        from app.db import get_trigger_by_name
+
+        assert result["files_applied"] == 1
+        assert {c["file"]: c.get("action") for c in result["changes"]} == {
+            "old.yaml": "removed",
+            "bot-a.yaml": "update",
+        }
+        assert get_trigger_by_name("diff-bot-a")["prompt_template"] == "a v2"
+        # bot-b.yaml wasn't in the diff, so it is left alone
+        assert get_trigger_by_name("diff-bot-b")["prompt_template"] == "b v1"
+
+    @patch("app.services.gitops_sync_service.subprocess.run")
+    def test_failed_file_is_retried_after_unrelated_commit(self, mock_run, isolated_db, tmp_path):
+        """A file that failed to apply is re-processed even if later commits don't touch it."""
+        from app.db import get_trigger_by_name
+        from app.services import config_export_service
+
+        repo_id = create_gitops_repo("retry-test", "https://example.com/repo.git")
+        clone_dir = self._mock_git_clone(
+            tmp_path,
+            {
+                "bot-a.yaml": _make_trigger_yaml("retry-bot-a", "a v1"),
+                "bot-b.yaml": _make_trigger_yaml("retry-bot-b", "b v1"),
+            },
+        )
+        real_import = config_export_service.import_trigger
+
+        def flaky_import(config_str, **kwargs):
+            if "retry-bot-b" in config_str:
+                raise RuntimeError("database is locked")
+            return real_import(config_str, **kwargs)
+
+        with patch.object(GitOpsSyncService, "_get_local_path", return_value=str(clone_dir)):
+            mock_run.side_effect = _git_stub("sha1")
+            with patch.object(config_export_service, "import_trigger", flaky_import):
+                first = GitOpsSyncService.sync_repo(repo_id)
+        assert first["files_applied"] == 1
+        assert get_trigger_by_name("retry-bot-b") is None
+        assert json.loads(get_gitops_repo(repo_id)["pending_files"]) == ["bot-b.yaml"]
+
+        # Commit B touches neither file, but the failed one is retried anyway
+        with patch.object(GitOpsSyncService, "_get_local_path", return_value=str(clone_dir)):
+            mock_run.side_effect = _git_stub("sha2", "M\tREADME.md\n")
+            second = GitOpsSyncService.sync_repo(repo_id)
+
+        assert [c["file"] for c in second["changes"]] == ["bot-b.yaml"]
+        assert get_trigger_by_name("retry-bot-b")["prompt_template"] == "b v1"
+        assert get_gitops_repo(repo_id)["pending_files"] is None
+
+    @patch("app.services.gitops_sync_service.subprocess.run")
+    def test_periodic_full_pass_reapplies_db_drift(self, mock_run, isolated_db, tmp_path):
+        """Once FULL_RESYNC_SECONDS pass, an unchanged remote is still compared in full."""
+        from app.db import get_trigger_by_name, update_trigger
+
+        repo_id = create_gitops_repo("drift-test", "https://example.com/repo.git")
+        clone_dir = self._mock_git_clone(
+            tmp_path, {"bot-drift.yaml": _make_trigger_yaml("drift-bot", "git prompt")}
+        )
+        with patch.object(GitOpsSyncService, "_get_local_path", return_value=str(clone_dir)):
+            mock_run.side_effect = _git_stub("sha1")
+            GitOpsSyncService.sync_repo(repo_id)
+
+        trigger = get_trigger_by_name("drift-bot")
+        update_trigger(trigger["id"], prompt_template="edited in the UI")
+        with patch.object(GitOpsSyncService, "_get_local_path", return_value=str(clone_dir)):
+            mock_run.side_effect = _git_stub("sha1\trefs/heads/main")
+            assert GitOpsSyncService.sync_repo(repo_id)["status"] == "skipped"
+
+        stale = (datetime.now(timezone.utc) - timedelta(hours=2)).isoformat()
+        update_sync_state(repo_id, "sha1", stale, full_sync_at=stale)
+        with patch.object(GitOpsSyncService, "_get_local_path", return_value=str(clone_dir)):
+            mock_run.side_effect = _git_stub("sha1")
+            result = GitOpsSyncService.sync_repo(repo_id)
+
+        assert result["status"] == "success"
+        assert get_trigger_by_name("drift-bot")["prompt_template"] == "git prompt"
+        assert get_gitops_repo(repo_id)["last_full_sync_at"] > stale
+
     @patch("app.services.gitops_sync_service.subprocess.run")
     def test_sync_disabled_repo_returns_disabled(self, mock_run, isolated_db):
         """Test that syncing a disabled repo returns disabled status."""
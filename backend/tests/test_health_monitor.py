@@ -6,6 +6,7 @@ Uses isolated_db fixture for real SQLite data -- no mocking of the DB layer.
 from datetime import datetime, timedelta, timezone
 
 from app.db.health_alerts import get_recent_alerts
+from app.db.trigger_health import get_trigger_health_stats, record_execution_outcome
 from app.db.triggers import (
     add_pr_review,
     create_execution_log,
@@ -62,15 +63,21 @@ def _create_execution(trigger_id, status="completed", duration_ms=60000, offset_
 # ===========================================================================
 
 
+def _record(trigger_id, *statuses, duration_ms=60000):
+    """Fold finished executions (oldest first) into the trigger's rolling stats."""
+    for status in statuses:
+        record_execution_outcome(trigger_id, status, duration_ms)
+    return get_trigger_health_stats(trigger_id)
+
+
 def test_consecutive_failure_detection(isolated_db):
     """5 consecutive failed executions should trigger a consecutive_failure alert."""
     trigger_id = _create_trigger(name="fail-bot")
 
-    # Create 5 failed executions (most recent first when queried)
-    for i in range(5):
-        _create_execution(trigger_id, status="failed", offset_hours=i)
+    stats = _record(trigger_id, *["failed"] * 5)
+    assert stats["consecutive_failures"] == 5
 
-    HealthMonitorService._check_consecutive_failures(trigger_id)
+    HealthMonitorService._check_consecutive_failures(stats)
 
     alerts = get_recent_alerts(trigger_id=trigger_id)
     assert len(alerts) == 1
@@ -82,15 +89,11 @@ def test_no_false_positive_on_mixed_results(isolated_db):
     """Mixed pass/fail results should NOT trigger consecutive failure alert."""
     trigger_id = _create_trigger(name="mixed-bot")
 
-    # Create: 2 failed, 1 success, 2 failed (newest first in query order)
-    # offset_hours=0 is most recent
-    _create_execution(trigger_id, status="failed", offset_hours=0)
-    _create_execution(trigger_id, status="failed", offset_hours=1)
-    _create_execution(trigger_id, status="completed", offset_hours=2)
-    _create_execution(trigger_id, status="failed", offset_hours=3)
-    _create_execution(trigger_id, status="failed", offset_hours=4)
+    # Oldest first: 2 failed, 1 success, 2 failed
+    stats = _record(trigger_id, "failed", "failed", "completed", "failed", "failed")
+    assert stats["consecutive_failures"] == 2
 
-    HealthMonitorService._check_consecutive_failures(trigger_id)
+    HealthMonitorService._check_consecutive_failures(stats)
 
     alerts = get_recent_alerts(trigger_id=trigger_id)
     assert len(alerts) == 0, "Success in the middle should break consecutive streak"
@@ -100,20 +103,64 @@ def test_slow_execution_detection(isolated_db):
     """Execution >3x average duration should trigger a slow_execution alert."""
     trigger_id = _create_trigger(name="slow-bot")
 
-    # Create 10 executions with ~5 minute average (300000 ms)
-    for i in range(10):
-        _create_execution(trigger_id, status="completed", duration_ms=300000, offset_hours=i + 1)
-
-    # Create one very slow recent execution: 20 minutes (1200000 ms) = 4x average
-    _create_execution(trigger_id, status="completed", duration_ms=1200000, offset_hours=0)
+    # 10 executions of ~5 minutes (300000 ms), then one 20-minute run (4x)
+    _record(trigger_id, *["completed"] * 10, duration_ms=300000)
+    stats = _record(trigger_id, "completed", duration_ms=1200000)
+    assert stats["baseline_duration_ms"] == 300000
 
-    HealthMonitorService._check_slow_execution(trigger_id)
+    HealthMonitorService._check_slow_execution(stats)
 
     alerts = get_recent_alerts(trigger_id=trigger_id)
     assert len(alerts) == 1
     assert alerts[0]["alert_type"] == "slow_execution"
 
 
+def test_slow_execution_needs_history(isolated_db):
+    """A slow run with too little history should not alert."""
+    trigger_id = _create_trigger(name="new-bot")
+
+    _record(trigger_id, *["completed"] * 3, duration_ms=300000)
+    stats = _record(trigger_id, "completed", duration_ms=1200000)
+    HealthMonitorService._check_slow_execution(stats)
+
+    assert get_recent_alerts(trigger_id=trigger_id) == []
+
+
+def test_finish_execution_updates_stats_and_alerts(isolated_db):
+    """Finishing executions folds them into stats and alerts without a sweep."""
+    from app.services.execution_log_service import ExecutionLogService
+
+    trigger_id = _create_trigger(name="event-bot")
+    for _ in range(3):
+        exec_id = ExecutionLogService.start_execution(
+            trigger_id, "webhook", "test prompt", "claude", "claude -p test"
+        )
+        ExecutionLogService.finish_execution(exec_id, "failed", exit_code=1)
+
+    stats = get_trigger_health_stats(trigger_id)
+    assert stats["total_runs"] == 3
+    assert stats["consecutive_failures"] == 3
+    assert stats["last_status"] == "failed"
+    assert stats["last_finished_at"]
+
+    alerts = get_recent_alerts(trigger_id=trigger_id)
+    assert [a["alert_type"] for a in alerts] == ["consecutive_failure"]
+
+
+def test_check_health_sweeps_stats_table(isolated_db):
+    """The periodic sweep evaluates every trigger from the stats table."""
+    failing = _create_trigger(name="sweep-fail-bot")
+    healthy = _create_trigger(name="sweep-ok-bot")
+    _record(failing, *["failed"] * 4)
+    _record(healthy, "failed", "completed")
+
+    HealthMonitorService._check_health()
+
+    assert len(get_recent_alerts(trigger_id=failing)) == 1
+    assert get_recent_alerts(trigger_id=healthy) == []
+    assert HealthMonitorService.get_status()["last_check_time"]
+
+
 def test_missing_fire_scheduled_only(isolated_db):
     """Missing fire should only alert for scheduled triggers, not webhook."""
     # Scheduled trigger with last_run 3 days ago (>2x daily interval)
@@ -155,16 +202,15 @@ def test_alert_deduplication(isolated_db):
     trigger_id = _create_trigger(name="dedup-bot")
 
     # Create enough failures
-    for i in range(5):
-        _create_execution(trigger_id, status="failed", offset_hours=i)
+    stats = _record(trigger_id, *["failed"] * 5)
 
     # First check
-    HealthMonitorService._check_consecutive_failures(trigger_id)
+    HealthMonitorService._check_consecutive_failures(stats)
     alerts1 = get_recent_alerts(trigger_id=trigger_id)
     assert len(alerts1) == 1
 
     # Second check (within 30 minutes)
-    HealthMonitorService._check_consecutive_failures(trigger_id)
+    HealthMonitorService._check_consecutive_failures(stats)
     alerts2 = get_recent_alerts(trigger_id=trigger_id)
     assert len(alerts2) == 1, "Duplicate alert should be prevented by 30-min dedup window"
 
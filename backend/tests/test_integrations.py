@@ -8,6 +8,7 @@ import time
 from unittest.mock import MagicMock, patch
 
 from app.db import integrations as db_integrations
+from app.services.integration_config_service import IntegrationConfigService
 from app.services.integrations import ADAPTER_REGISTRY, IntegrationAdapter, get_adapter
 from app.services.integrations.jira_adapter import JiraAdapter
 from app.services.integrations.linear_adapter import LinearAdapter
@@ -107,9 +108,10 @@ class TestSlackAdapter:
 
 
 class TestTeamsAdapter:
-    @patch("app.services.integrations.teams_adapter.httpx.post")
-    def test_send_notification_posts_card(self, mock_post):
+    @patch("app.services.integrations.teams_adapter.httpx.Client")
+    def test_send_notification_posts_card(self, mock_client_cls):
         """Teams adapter POSTs MessageCard to webhook URL."""
+        mock_post = mock_client_cls.return_value.post
         mock_post.return_value = MagicMock(status_code=200)
         adapter = TeamsAdapter(webhook_url="https://outlook.office.com/webhook/test")
 
@@ -352,8 +354,8 @@ class TestNotificationService:
             summary="All checks passed",
         )
 
-        # Wait for background threads
-        time.sleep(0.5)
+        # Wait for the delivery workers
+        assert NotificationService.flush()
 
         # At least 2 calls (one per integration)
         assert mock_config_service.get_adapter_for_integration.call_count >= 2
@@ -381,12 +383,192 @@ class TestNotificationService:
                 status="success",
                 duration_ms=1000,
             )
-            # Wait for all background threads
-            time.sleep(1.0)
+            # Wait for all delivery workers
+            assert NotificationService.flush()
             elapsed = time.perf_counter() - start
 
             assert elapsed < 30, f"Notification dispatch took {elapsed:.1f}s (>30s limit)"
 
+    @patch("app.services.notification_service.IntegrationConfigService")
+    def test_burst_is_coalesced_into_one_digest(self, mock_config_service):
+        """Completions within the coalescing window reach an integration as one message."""
+        db_integrations.create_integration(
+            "Slack", "slack", config={"channel": "#alerts"}, trigger_id="bot-security"
+        )
+        mock_adapter = MagicMock()
+        mock_adapter.send_notification.return_value = True
+        mock_config_service.get_adapter_for_integration.return_value = mock_adapter
+
+        for i in range(5):
+            NotificationService.on_execution_complete(
+                execution_id=f"exec-{i}",
+                trigger_id="bot-security",
+                status="failed" if i == 0 else "success",
+                duration_ms=1000,
+            )
+        assert NotificationService.flush()
+
+        mock_adapter.send_notification.assert_called_once()
+        kwargs = mock_adapter.send_notification.call_args.kwargs
+        assert kwargs["channel"] == "#alerts"
+        assert kwargs["message"].startswith("5 executions completed (1 failed, 4 success)")
+        assert "exec-4" in kwargs["message"]
+        assert kwargs["metadata"]["status"] == "failed"
+
+    @patch("app.services.notification_service.IntegrationConfigService")
+    def test_failed_send_is_retried_with_backoff(self, mock_config_service, monkeypatch):
+        """A failed delivery is retried until it succeeds, within MAX_ATTEMPTS."""
+        monkeypatch.setattr(NotificationService, "RETRY_BACKOFF_SECONDS", 0.01)
+        monkeypatch.setattr(NotificationService, "RATE_LIMITS", {"slack": 1000.0})
+        db_integrations.create_integration(
+            "Slack", "slack", config={"channel": "#alerts"}, trigger_id="bot-security"
+        )
+        mock_adapter = MagicMock()
+        mock_adapter.send_notification.side_effect = [False, RuntimeError("boom"), True]
+        mock_config_service.get_adapter_for_integration.return_value = mock_adapter
+
+        NotificationService.on_execution_complete(
+            execution_id="exec-retry", trigger_id="bot-security", status="success", duration_ms=1
+        )
+        assert NotificationService.flush()
+
+        assert mock_adapter.send_notification.call_count == 3
+
+    @patch("app.services.notification_service.AuditLogService")
+    @patch("app.services.notification_service.IntegrationConfigService")
+    def test_permanent_failure_is_dropped_after_max_attempts(
+        self, mock_config_service, mock_audit, monkeypatch
+    ):
+        """A batch that always fails is dropped and audited once; later items still go out."""
+        monkeypatch.setattr(NotificationService, "RETRY_BACKOFF_SECONDS", 0.01)
+        monkeypatch.setattr(NotificationService, "RATE_LIMITS", {"slack": 1000.0})
+        db_integrations.create_integration(
+            "Slack", "slack", config={"channel": "#alerts"}, trigger_id="bot-security"
+        )
+        mock_adapter = MagicMock()
+        mock_adapter.send_notification.return_value = False
+        mock_config_service.get_adapter_for_integration.return_value = mock_adapter
+
+        NotificationService.on_execution_complete(
+            execution_id="exec-doomed", trigger_id="bot-security", status="success", duration_ms=1
+        )
+        assert NotificationService.flush()
+        assert mock_adapter.send_notification.call_count == NotificationService.MAX_ATTEMPTS
+        outcomes = [c.kwargs["outcome"] for c in mock_audit.log.call_args_list]
+        assert outcomes == ["failed"]
+
+        mock_adapter.send_notification.return_value = True
+        NotificationService.on_execution_complete(
+            execution_id="exec-next", trigger_id="bot-security", status="success", duration_ms=1
+        )
+        assert NotificationService.flush()
+        assert mock_adapter.send_notification.call_count == NotificationService.MAX_ATTEMPTS + 1
+        last_message = mock_adapter.send_notification.call_args.kwargs["message"]
+        assert "exec-next" in last_message and "exec-doomed" not in last_message
+
+    @patch("app.services.notification_service.AuditLogService")
+    @patch("app.services.notification_service.IntegrationConfigService")
+    def test_items_queued_during_retry_get_their_own_attempts(
+        self, mock_config_service, mock_audit, monkeypatch
+    ):
+        """A notification queued while a batch is being retried is not dropped with it."""
+        monkeypatch.setattr(NotificationService, "COALESCE_WINDOW_SECONDS", 0.0)
+        monkeypatch.setattr(NotificationService, "RETRY_BACKOFF_SECONDS", 0.05)
+        monkeypatch.setattr(NotificationService, "RATE_LIMITS", {"slack": 1000.0})
+        db_integrations.create_integration(
+            "Slack", "slack", config={"channel": "#alerts"}, trigger_id="bot-security"
+        )
+        sent = []
+
+        def send_notification(channel, message, metadata):
+            # The first batch always fails; the late one fails once, then succeeds
+            sent.append(message)
+            if "exec-doomed" in message:
+                if len(sent) == 1:
+                    NotificationService.on_execution_complete(
+                        execution_id="exec-late",
+                        trigger_id="bot-security",
+                        status="success",
+                        duration_ms=1,
+                    )
+                return False
+            return sum("exec-late" in m for m in sent) > 1
+
+        mock_adapter = MagicMock()
+        mock_adapter.send_notification.side_effect = send_notification
+        mock_config_service.get_adapter_for_integration.return_value = mock_adapter
+
+        NotificationService.on_execution_complete(
+            execution_id="exec-doomed", trigger_id="bot-security", status="success", duration_ms=1
+        )
+        assert NotificationService.flush()
+
+        attempts = NotificationService.MAX_ATTEMPTS
+        assert sum("exec-doomed" in m for m in sent) == attempts
+        assert not any("exec-doomed" in m and "exec-late" in m for m in sent)
+        assert sum("exec-late" in m for m in sent) == 2
+
+    @patch("app.services.notification_service.IntegrationConfigService")
+    def test_sends_to_one_integration_respect_rate_limit(self, mock_config_service, monkeypatch):
+        """Batches after the first wait for the integration's rate limit."""
+        monkeypatch.setattr(NotificationService, "COALESCE_WINDOW_SECONDS", 0.0)
+        monkeypatch.setattr(NotificationService, "RATE_LIMITS", {"slack": 5.0})
+        db_integrations.create_integration(
+            "Slack", "slack", config={"channel": "#alerts"}, trigger_id="bot-security"
+        )
+        send_times = []
+        mock_adapter = MagicMock()
+        mock_adapter.send_notification.side_effect = lambda **_: (
+            send_times.append(time.monotonic()) or True
+        )
+        mock_config_service.get_adapter_for_integration.return_value = mock_adapter
+
+        for i in range(2):
+            NotificationService.on_execution_complete(
+                execution_id=f"exec-{i}", trigger_id="bot-security", status="success", duration_ms=1
+            )
+            assert NotificationService.flush()
+
+        assert len(send_times) == 2
+        assert send_times[1] - send_times[0] >= 0.19
+
+    def test_adapter_lookup_is_cached_until_config_changes(self):
+        """The same adapter instance is reused until the integration is edited."""
+        integration_id = db_integrations.create_integration(
+            "Teams", "teams", config={"webhook_url": "https://a.example.com"}
+        )
+        first = IntegrationConfigService.get_adapter_for_integration(integration_id)
+        assert IntegrationConfigService.get_adapter_for_integration(integration_id) is first
+
+        db_integrations.update_integration(
+            integration_id, config={"webhook_url": "https://b.example.com"}
+        )
+        second = IntegrationConfigService.get_adapter_for_integration(integration_id)
+        assert second is not first
+        assert second.webhook_url == "https://b.example.com"
+
+        db_integrations.delete_integration(integration_id)
+        assert IntegrationConfigService.get_adapter_for_integration(integration_id) is None
+
+    def test_evicted_teams_adapter_closes_its_client(self):
+        """Replacing or dropping a cached Teams adapter closes its HTTP client."""
+        integration_id = db_integrations.create_integration(
+            "Teams", "teams", config={"webhook_url": "https://a.example.com"}
+        )
+        first = IntegrationConfigService.get_adapter_for_integration(integration_id)
+        first_client = first._get_client()
+
+        db_integrations.update_integration(
+            integration_id, config={"webhook_url": "https://b.example.com"}
+        )
+        second = IntegrationConfigService.get_adapter_for_integration(integration_id)
+        second_client = second._get_client()
+        assert first_client.is_closed
+        assert not second_client.is_closed
+
+        IntegrationConfigService.invalidate_adapter(integration_id)
+        assert second_client.is_closed
+
 
 # =============================================================================
 # Integration CRUD route tests
@@ -12,6 +12,7 @@ from app.db.knowledge_graph import (
     get_entity,
     get_entity_context,
     get_entity_relations,
+    ingest_graph_batch,
     list_entities,
     promote_entity,
     search_entities,
@@ -111,6 +112,58 @@ class TestUpsertRelation:
         assert acme is not None
 
 
+class TestIngestGraphBatch:
+    """Single-transaction bulk ingestion."""
+
+    def test_batch_accumulates_mentions(self, agent_id):
+        rel = {
+            "source": "Python",
+            "source_type": "technology",
+            "target": "Flask",
+            "target_type": "technology",
+            "relation_type": "co_occurs_with",
+            "confidence": 0.3,
+        }
+        entities = [
+            {"name": "Python", "type": "technology"},
+            {"name": "Flask", "type": "technology"},
+        ]
+        result = ingest_graph_batch(
+            [
+                {"agent_id": agent_id, "entities": entities, "relations": [rel]},
+                {"agent_id": agent_id, "entities": entities, "relations": [rel]},
+            ],
+            processed_message_ids=["msg-1", "msg-2"],
+        )
+
+        assert result == {"entities": 2, "relations": 1}
+        assert get_entity(agent_id, "python", "technology")["mention_count"] == 2
+        relations = get_entity_relations(get_entity(agent_id, "python", "technology")["id"])
+        assert len(relations) == 1
+        assert relations[0]["mention_count"] == 2
+
+        from app.db.connection import get_connection
+
+        with get_connection() as conn:
+            logged = conn.execute("SELECT COUNT(*) FROM kg_extraction_log").fetchone()[0]
+        assert logged == 2
+
+    def test_failure_rolls_back_everything(self, agent_id):
+        bad_relation = {"source": "python", "target": "flask"}  # missing relation_type
+        with pytest.raises(KeyError):
+            ingest_graph_batch(
+                [
+                    {
+                        "agent_id": agent_id,
+                        "entities": [{"name": "Python", "type": "technology"}],
+                        "relations": [bad_relation],
+                    }
+                ],
+                processed_message_ids=["msg-1"],
+            )
+        assert count_entities(agent_id) == 0
+
+
 class TestGetAndListEntities:
     """Entity retrieval operations."""
 
@@ -188,6 +241,35 @@ class TestTraverseGraph:
         assert subgraph["entities"] == []
         assert subgraph["relations"] == []
 
+    def test_traverse_caps_keep_strongest_edges(self, agent_id):
+        for _ in range(3):
+            upsert_relation(agent_id, "python", "technology", "flask", "technology", "powers")
+        upsert_relation(agent_id, "python", "technology", "django", "technology", "powers")
+        upsert_relation(agent_id, "python", "technology", "numpy", "technology", "powers")
+
+        subgraph = traverse_graph(agent_id, "python", hops=2, max_edges=1)
+        assert len(subgraph["relations"]) == 1
+        assert {e["name"] for e in subgraph["entities"]} == {"python", "flask"}
+
+        subgraph = traverse_graph(agent_id, "python", hops=2, max_nodes=2)
+        assert len(subgraph["entities"]) == 2
+
+    def test_traverse_min_importance(self, agent_id):
+        from app.db.connection import get_connection
+
+        upsert_relation(agent_id, "python", "technology", "flask", "technology", "powers")
+        upsert_relation(agent_id, "python", "technology", "django", "technology", "powers")
+        with get_connection() as conn:
+            conn.execute(
+                "UPDATE kg_entities SET importance_score = 0.1 WHERE agent_id = ? AND name = ?",
+                (agent_id, "django"),
+            )
+            conn.commit()
+
+        subgraph = traverse_graph(agent_id, "python", hops=1, min_importance=0.3)
+        assert {e["name"] for e in subgraph["entities"]} == {"python", "flask"}
+        assert len(subgraph["relations"]) == 1
+
 
 class TestSearchEntities:
     """LIKE-based entity search."""
@@ -228,6 +310,18 @@ class TestGetEntityContext:
         ctx = get_entity_context(agent_id, ["orphan"])
         assert "orphan" in ctx
 
+    def test_context_for_multiple_entities(self, agent_id):
+        upsert_relation(agent_id, "python", "technology", "flask", "technology", "powers")
+        upsert_relation(agent_id, "vue", "technology", "vite", "tool", "built_with")
+        upsert_entity(agent_id, "orphan", "concept")
+
+        lines = get_entity_context(agent_id, ["python", "orphan", "vue"]).splitlines()
+        assert lines == [
+            "- python --[powers]--> flask",
+            "- orphan (concept)",
+            "- vue --[built_with]--> vite",
+        ]
+
     def test_context_empty_list(self, agent_id):
         assert get_entity_context(agent_id, []) == ""
 
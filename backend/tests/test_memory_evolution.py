@@ -6,13 +6,14 @@ import pytest
 
 from app.db.agent_memory import create_thread, save_messages
 from app.db.agents import create_agent
-from app.db.knowledge_graph import count_entities, list_entities, upsert_entity
+from app.db.knowledge_graph import list_entities, upsert_entity
 from app.services.memory_evolution import (
     apply_decay,
     consolidate_thread,
     extract_entities_from_text,
     find_related_threads,
     process_message_entities,
+    process_pending_extractions,
     should_consolidate,
 )
 
@@ -93,6 +94,25 @@ class TestProcessMessageEntities:
         assert count == 0
 
 
+class TestProcessPendingExtractions:
+    """Batched extraction of unprocessed thread messages."""
+
+    def test_processes_batch_and_marks_messages(self, agent_id, thread_with_messages):
+        from app.db.connection import get_connection
+
+        total = process_pending_extractions(batch_size=10)
+        assert total >= 4
+        # Flask is mentioned in two messages, so it is counted twice
+        flask = next(e for e in list_entities(agent_id) if e["name"] == "flask")
+        assert flask["mention_count"] == 2
+        with get_connection() as conn:
+            logged = conn.execute("SELECT COUNT(*) FROM kg_extraction_log").fetchone()[0]
+        assert logged == 3
+
+        # Everything is marked, so a second pass is a no-op
+        assert process_pending_extractions(batch_size=10) == 0
+
+
 class TestApplyDecay:
     """Exponential importance decay."""
 
@@ -144,6 +164,44 @@ class TestApplyDecay:
         if forgotten:
             assert forgotten["importance_score"] == 0
 
+    def test_matches_formula_and_is_incremental(self, agent_id):
+        import math
+
+        from app.db.connection import get_connection
+        from app.services.memory_evolution import BASE_LAMBDA
+
+        upsert_entity(agent_id, "OldTech", "technology")
+        old_date = (datetime.utcnow() - timedelta(days=10)).strftime("%Y-%m-%d %H:%M:%S")
+        with get_connection() as conn:
+            conn.execute(
+                "UPDATE kg_entities SET last_seen = ?, importance_score = 1.0 WHERE agent_id = ?",
+                (old_date, agent_id),
+            )
+            conn.commit()
+
+        assert apply_decay(agent_id) == 1
+        expected = math.exp(-BASE_LAMBDA / math.log(2) * 10)
+        oldtech = list_entities(agent_id)[0]
+        assert oldtech["importance_score"] == pytest.approx(expected, abs=1e-3)
+
+        # Decayed just now, so the next run has nothing due
+        assert apply_decay(agent_id) == 0
+        assert list_entities(agent_id)[0]["importance_score"] == oldtech["importance_score"]
+
+    def test_run_decay_all_covers_every_agent(self, agent_id):
+        from app.db.connection import get_connection
+        from app.services.memory_evolution import run_decay_all
+
+        other_agent = create_agent("Other Evolution Agent")
+        upsert_entity(agent_id, "OldTech", "technology")
+        upsert_entity(other_agent, "OldTech", "technology")
+        old_date = (datetime.utcnow() - timedelta(days=30)).strftime("%Y-%m-%d %H:%M:%S")
+        with get_connection() as conn:
+            conn.execute("UPDATE kg_entities SET last_seen = ?", (old_date,))
+            conn.commit()
+
+        assert run_decay_all() == 2
+
 
 class TestShouldConsolidate:
     """Consolidation trigger logic."""
@@ -90,7 +90,6 @@ class TestOrchestratedRecallCorrectPath:
         mock_vec = [(mock_results[0], 0.9)]
 
         with (
-            patch(_HR, return_value=mock_results),
             patch(_FTS, return_value=mock_fts),
             patch(_VEC, return_value=mock_vec),
         ):
@@ -117,7 +116,6 @@ class TestOrchestratedRecallCorrectPath:
         mock_vec = [(mock_results[0], 0.9)]
 
         with (
-            patch(_HR, return_value=mock_results),
             patch(_FTS, return_value=mock_fts),
             patch(_VEC, return_value=mock_vec),
         ):
@@ -148,7 +146,6 @@ class TestOrchestratedRecallAmbiguousPath:
         mock_vec = [(mock_results[0], 0.3)]  # Only vec rank 0
 
         with (
-            patch(_HR, return_value=mock_results),
             patch(_FTS, return_value=mock_fts),
             patch(_VEC, return_value=mock_vec),
         ):
@@ -180,17 +177,9 @@ class TestOrchestratedRecallAmbiguousPath:
         mock_fts = []
         mock_vec = [(mock_results[0], 0.3)]
 
-        call_count = {"n": 0}
-
-        def mock_hybrid_side_effect(**kwargs):
-            call_count["n"] += 1
-            if call_count["n"] == 1:
-                return mock_results
-            # Second call is for cross-thread broadening — return empty
-            return []
-
+        # hybrid_recall is only used for cross-thread broadening
         with (
-            patch(_HR, side_effect=mock_hybrid_side_effect),
+            patch(_HR, return_value=[]) as mock_hybrid,
             patch(_FTS, return_value=mock_fts),
             patch(_VEC, return_value=mock_vec),
         ):
@@ -200,10 +189,58 @@ class TestOrchestratedRecallAmbiguousPath:
                 thread_id=thread["id"],
                 top_k=5,
                 message_range=0,
+                alpha=0.9,  # Vector-only match scores in the ambiguous band
                 include_cross_thread=False,
             )
 
+        assert result["retrieval_evaluation"] == "ambiguous"
         assert result["count"] >= 1
+        mock_hybrid.assert_called_once()
+        assert mock_hybrid.call_args.kwargs["thread_id"] is None
+
+
+class TestOrchestratedRecallPlan:
+    """Each retriever runs once and the query is embedded once."""
+
+    def test_runs_each_retriever_once_at_widest_k(self, isolated_db):
+        thread, msgs = _setup_agent_memory()
+        hit = {"id": msgs[1]["id"], "thread_id": thread["id"], "content": "Decorators"}
+        other = {"id": msgs[3]["id"], "thread_id": thread["id"], "content": "Flask"}
+
+        with (
+            patch(_FTS, return_value=[hit]) as mock_fts,
+            patch(_VEC, return_value=[(other, 0.8), (hit, 0.7)]) as mock_vec,
+            patch(_HR) as mock_hybrid,
+        ):
+            result = orchestrated_recall(
+                query="decorators",
+                agent_id="agent-test01",
+                thread_id=thread["id"],
+                top_k=3,
+                message_range=0,
+            )
+
+        assert mock_fts.call_count == 1
+        assert mock_vec.call_count == 1
+        assert mock_fts.call_args.kwargs["top_k"] == 6
+        assert mock_vec.call_args.kwargs["top_k"] == 6
+        mock_hybrid.assert_not_called()
+        # Found by both retrievers, so it outranks the vector-only match
+        assert [m["id"] for m in result["results"]] == [hit["id"], other["id"]]
+
+    def test_query_embedding_reused_across_recalls(self, isolated_db):
+        from app.db.agent_memory import hybrid_recall, vector_recall
+
+        _setup_agent_memory()
+        with (
+            patch("app.services.embedding_service.is_available", return_value=True),
+            patch("app.services.embedding_service.embed_text", return_value=[1.0, 0.0]) as embed,
+        ):
+            vector_recall(query="flask", resource_id="agent-test01")
+            hybrid_recall(query="flask", resource_id="agent-test01", message_range=0)
+            vector_recall(query="python", resource_id="agent-test01")
+
+        assert [c.args[0] for c in embed.call_args_list] == ["flask", "python"]
 
 
 class TestOrchestratedRecallIncorrectPath:
@@ -213,7 +250,6 @@ class TestOrchestratedRecallIncorrectPath:
         thread, msgs = _setup_agent_memory()
 
         with (
-            patch(_HR, return_value=[]),
             patch(_FTS, return_value=[]),
             patch(_VEC, return_value=[]),
         ):
@@ -235,7 +271,6 @@ class TestOrchestratedRecallIncorrectPath:
         _setup_agent_memory()
 
         with (
-            patch(_HR, return_value=[]),
             patch(_FTS, return_value=[]),
             patch(_VEC, return_value=[]),
         ):
@@ -270,7 +305,6 @@ class TestOrchestratedRecallEntityPromotion:
         mock_vec = [(mock_results[0], 0.9)]
 
         with (
-            patch(_HR, return_value=mock_results),
             patch(_FTS, return_value=mock_fts),
             patch(_VEC, return_value=mock_vec),
         ):
@@ -300,7 +334,6 @@ class TestOrchestratedRecallResilience:
         mock_vec = [(mock_results[0], 0.9)]
 
         with (
-            patch(_HR, return_value=mock_results),
             patch(_FTS, return_value=mock_fts),
             patch(_VEC, return_value=mock_vec),
             patch(_KG_SEARCH, side_effect=Exception("KG down")),
@@ -317,13 +350,12 @@ class TestOrchestratedRecallResilience:
         assert result["count"] >= 1
         assert result["related_entities"] == []
 
-    def test_handles_hybrid_recall_failure(self, isolated_db):
+    def test_handles_retriever_failure(self, isolated_db):
         thread, msgs = _setup_agent_memory()
 
         with (
-            patch(_HR, side_effect=Exception("Search down")),
-            patch(_FTS, return_value=[]),
-            patch(_VEC, return_value=[]),
+            patch(_FTS, side_effect=Exception("Search down")),
+            patch(_VEC, side_effect=Exception("Search down")),
         ):
             result = orchestrated_recall(
                 query="test",
@@ -70,6 +70,17 @@ def _create_test_account(conn, backend_type="claude"):
     return cursor.lastrowid
 
 
+def _insert_series_samples(samples):
+    """Record series-only samples at their own ``ts``, as each poll's snapshot write does."""
+    from app.database import get_connection
+    from app.db.monitoring import _append_series_samples
+
+    with get_connection() as conn:
+        for sample in samples:
+            _append_series_samples(conn, [sample], sample["ts"])
+        conn.commit()
+
+
 def _insert_token_usage(
     conn, account_id, input_tokens, output_tokens, recorded_at_str, backend_type="claude"
 ):
@@ -624,6 +635,38 @@ class TestDBHelpers:
         assert len(matching) == 1
         assert matching[0]["tokens_used"] == 2000
 
+    def test_latest_snapshots_match_reported_window_types(self, isolated_db):
+        """The SQL filter and is_reported_window_type agree on which windows are reported."""
+        from app.database import (
+            get_connection,
+            get_latest_snapshots,
+            insert_rate_limit_snapshots,
+            is_reported_window_type,
+        )
+
+        with get_connection() as conn:
+            account_id = _create_test_account(conn)
+        window_types = [
+            "five_hour",
+            "gemini-3-pro_vertex",
+            "gemini-2.0-flash",
+            "gemini-2.5-pro",
+            "gemini-3-pro-preview",
+            "primary_window",
+            "secondary_window",
+            "vertex",
+        ]
+        insert_rate_limit_snapshots(
+            [
+                {"account_id": account_id, "backend_type": "gemini", "window_type": w}
+                for w in window_types
+            ]
+        )
+
+        reported = sorted(s["window_type"] for s in get_latest_snapshots())
+        assert reported == sorted(w for w in window_types if is_reported_window_type(w))
+        assert reported == ["five_hour", "gemini-3-pro-preview", "vertex"]
+
     def test_get_snapshot_history(self, isolated_db):
         """Get snapshot history for a given account/window."""
         from app.database import get_connection, get_snapshot_history
@@ -673,6 +716,330 @@ class TestDBHelpers:
         assert len(matching) == 1
         assert matching[0]["tokens_used"] == 1000
 
+    def test_insert_rate_limit_snapshots_batch(self, isolated_db):
+        """Batch insert writes every row in one call."""
+        from app.database import get_connection, get_snapshot_history, insert_rate_limit_snapshots
+
+        with get_connection() as conn:
+            account_id = _create_test_account(conn)
+
+        rows = [
+            {
+                "account_id": account_id,
+                "backend_type": "claude",
+                "window_type": window_type,
+                "percentage": pct,
+                "threshold_level": "normal",
+            }
+            for window_type, pct in [("five_hour", 10.0), ("seven_day", 20.0)]
+        ]
+        assert insert_rate_limit_snapshots(rows) == 2
+        assert insert_rate_limit_snapshots([]) == 0
+
+        history = get_snapshot_history(account_id, "seven_day", since_minutes=10)
+        assert len(history) == 1
+        assert history[0]["percentage"] == 20.0
+
+
+class TestRateLimitSeries:
+    """Tests for the downsampled rate-limit time series and rates computed from it."""
+
+    def test_snapshot_insert_populates_all_resolutions(self, isolated_db):
+        """Each snapshot write lands in the raw, 5-minute and hourly series."""
+        from app.database import (
+            SERIES_5MIN,
+            SERIES_HOURLY,
+            SERIES_RAW,
+            get_connection,
+            get_rate_limit_series,
+            insert_rate_limit_snapshot,
+        )
+
+        with get_connection() as conn:
+            account_id = _create_test_account(conn)
+
+        insert_rate_limit_snapshot(account_id, "claude", "five_hour", percentage=12.0)
+
+        since = int(datetime.now(timezone.utc).timestamp()) - 3600
+        for resolution in (SERIES_RAW, SERIES_5MIN, SERIES_HOURLY):
+            points = get_rate_limit_series(since, account_id, "five_hour", resolution=resolution)
+            assert len(points) == 1
+            assert points[0][5] == 12.0
+
+    def test_rollup_keeps_last_sample_per_bucket(self, isolated_db):
+        """Samples in the same 5-minute bucket collapse to the latest one."""
+        from app.database import (
+            SERIES_5MIN,
+            SERIES_RAW,
+            get_connection,
+            get_rate_limit_series,
+        )
+
+        with get_connection() as conn:
+            account_id = _create_test_account(conn)
+
+        base = 1_700_000_100  # 100s into a 5-minute bucket
+        samples = [
+            {"account_id": account_id, "window_type": "w", "percentage": pct, "ts": base + off}
+            for off, pct in [(60, 2.0), (0, 1.0), (120, 3.0)]
+        ]
+        _insert_series_samples(samples)
+
+        raw = get_rate_limit_series(base - 1, account_id, "w", resolution=SERIES_RAW)
+        assert [p[5] for p in raw] == [1.0, 2.0, 3.0]
+        rolled = get_rate_limit_series(base - 1, account_id, "w", resolution=SERIES_5MIN)
+        assert len(rolled) == 1
+        assert rolled[0][2] == base + 120
+        assert rolled[0][5] == 3.0
+
+    def test_compaction_prunes_by_resolution(self, isolated_db):
+        """Raw points age out after 48h while 5-minute buckets survive."""
+        from app.database import (
+            SERIES_5MIN,
+            SERIES_RAW,
+            compact_rate_limit_series,
+            get_connection,
+            get_rate_limit_series,
+        )
+
+        with get_connection() as conn:
+            account_id = _create_test_account(conn)
+
+        now_ts = 1_700_000_000
+        old = now_ts - 3 * 86400
+        _insert_series_samples(
+            [{"account_id": account_id, "window_type": "w", "percentage": 5.0, "ts": old}]
+        )
+
+        compact_rate_limit_series(now_ts=now_ts)
+
+        assert get_rate_limit_series(old - 1, account_id, "w", resolution=SERIES_RAW) == []
+        assert len(get_rate_limit_series(old - 300, account_id, "w", resolution=SERIES_5MIN)) == 1
+
+    def test_consumption_rates_insufficient_data(self):
+        """Fewer than two points yields no rates."""
+        from app.services.monitoring_snapshot import rates_from_series
+
+        rates = rates_from_series([])
+        assert rates["24h"] is None
+        assert rates["unit"] == "tok/hr"
+
+
+class TestMonitoringSnapshot:
+    """Tests for the shared, incrementally maintained monitoring model."""
+
+    def _seed(self, account_id, now_ts):
+        """Two days of 1 %/hr history in the series, latest snapshot one poll ago."""
+        from app.database import insert_rate_limit_snapshot
+
+        _insert_series_samples(
+            [
+                {
+                    "account_id": account_id,
+                    "window_type": "five_hour",
+                    "percentage": (48 * 60 - minutes) / 60.0,
+                    "tokens_limit": 0,
+                    "ts": now_ts - 300 - minutes * 60,
+                }
+                for minutes in range(48 * 60, -1, -10)
+            ]
+        )
+        insert_rate_limit_snapshot(account_id, "claude", "five_hour", 0, 0, 48.0, "info")
+
+    def test_poll_rows_update_rates_like_the_series_table(self, isolated_db):
+        """Applying a poll gives the same rates as recomputing from the database."""
+        from app.database import get_connection, insert_rate_limit_snapshots
+        from app.services.monitoring_snapshot import MonitoringSnapshot
+
+        with get_connection() as conn:
+            account_id = _create_test_account(conn)
+        now = datetime.now(timezone.utc)
+        self._seed(account_id, int(now.timestamp()))
+
+        version, windows = MonitoringSnapshot.windows(30)
+        ((snap, rates),) = windows
+        assert snap["percentage"] == 48.0
+        assert rates["24h"] == 1.0
+
+        row = {
+            "account_id": account_id,
+            "backend_type": "claude",
+            "window_type": "five_hour",
+            "tokens_used": 0,
+            "tokens_limit": 0,
+            "percentage": 49.0,
+            "threshold_level": "info",
+            "resets_at": None,
+        }
+        insert_rate_limit_snapshots([row])
+        MonitoringSnapshot.apply([row], int(now.timestamp()))
+
+        new_version, ((snap, rates),) = MonitoringSnapshot.windows(30)
+        assert new_version > version
+        assert snap["percentage"] == 49.0
+        assert snap["recorded_at"].endswith("Z")
+        MonitoringSnapshot.reset()
+        _, ((_, reloaded),) = MonitoringSnapshot.windows(30)
+        assert rates == reloaded
+
+    def test_status_is_shared_until_the_model_changes(self, isolated_db):
+        """Repeated reads reuse one built status; a poll's rows trigger one rebuild."""
+        from unittest.mock import patch
+
+        from app.database import get_connection
+        from app.services.monitoring_service import MonitoringService
+        from app.services.monitoring_snapshot import MonitoringSnapshot
+
+        with get_connection() as conn:
+            account_id = _create_test_account(conn)
+        self._seed(account_id, int(datetime.now(timezone.utc).timestamp()))
+
+        with patch.object(
+            MonitoringService,
+            "_build_monitoring_status",
+            wraps=MonitoringService._build_monitoring_status,
+        ) as mock_build:
+            first = MonitoringService.get_monitoring_status()
+            for _ in range(5):
+                assert MonitoringService.get_monitoring_status()["windows"] == first["windows"]
+            assert mock_build.call_count == 1
+
+            MonitoringSnapshot.apply(
+                [
+                    {
+                        "account_id": account_id,
+                        "backend_type": "claude",
+                        "window_type": "five_hour",
+                        "percentage": 60.0,
+                        "threshold_level": "info",
+                    }
+                ]
+            )
+            status = MonitoringService.get_monitoring_status()
+            assert mock_build.call_count == 2
+
+        (window,) = status["windows"]
+        assert window["percentage"] == 60.0
+        assert window["eta"]["status"] == "projected"
+
+    def test_fingerprint_cached_until_credentials_change(self, tmp_path, monkeypatch):
+        """Credential files are re-read only when their mtime changes."""
+        import json
+        import os
+        from pathlib import Path
+        from unittest.mock import patch
+
+        from app.services import provider_usage_client
+        from app.services.provider_usage_client import CredentialResolver
+
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+        monkeypatch.setattr(provider_usage_client.platform, "system", lambda: "Linux")
+        cred_file = tmp_path / ".claude" / ".credentials.json"
+        cred_file.parent.mkdir()
+        cred_file.write_text(json.dumps({"claudeAiOauth": {"accessToken": "tok-1"}}))
+
+        with patch.object(
+            provider_usage_client, "_read_json_field", wraps=provider_usage_client._read_json_field
+        ) as mock_read:
+            first = CredentialResolver.get_token_fingerprint({}, "claude")
+            assert CredentialResolver.get_token_fingerprint({}, "claude") == first
+            assert mock_read.call_count == 1
+
+            cred_file.write_text(json.dumps({"claudeAiOauth": {"accessToken": "tok-2"}}))
+            os.utime(cred_file, ns=(1, 1))
+            assert CredentialResolver.get_token_fingerprint({}, "claude") != first
+
+
+class TestConcurrentPoll:
+    """Tests for concurrent, deduplicated provider polling."""
+
+    def test_shared_credentials_fetched_once_and_batched(self, isolated_db):
+        """Accounts sharing a token fingerprint share one fetch; snapshots land in one batch."""
+        from unittest.mock import patch
+
+        from app.database import (
+            get_connection,
+            get_latest_snapshots,
+            insert_rate_limit_snapshots,
+        )
+        from app.services.monitoring_service import MonitoringService
+
+        with get_connection() as conn:
+            first = _create_test_account(conn)
+            second = _create_test_account(conn)
+
+        config = {
+            "enabled": True,
+            "polling_minutes": 5,
+            "accounts": {str(first): {"enabled": True}, str(second): {"enabled": True}},
+        }
+        accounts = [
+            {"id": first, "account_name": "a", "backend_type": "claude"},
+            {"id": second, "account_name": "b", "backend_type": "claude"},
+        ]
+        windows = [{"window_type": "five_hour", "percentage": 42.0}]
+
+        with (
+            patch("app.database.get_monitoring_config", return_value=config),
+            patch("app.database.get_all_accounts_with_health", return_value=accounts),
+            patch(
+                "app.services.provider_usage_client.CredentialResolver.get_token_fingerprint",
+                return_value="abc123",
+            ),
+            patch(
+                "app.services.provider_usage_client.ProviderUsageClient.fetch_usage",
+                return_value=windows,
+            ) as mock_fetch,
+            patch(
+                "app.database.insert_rate_limit_snapshots", wraps=insert_rate_limit_snapshots
+            ) as mock_insert,
+            patch(
+                "app.services.agent_scheduler_service.AgentSchedulerService.evaluate_all_accounts"
+            ),
+        ):
+            MonitoringService._poll_usage()
+
+        assert mock_fetch.call_count == 1
+        assert mock_insert.call_count == 1
+        latest = get_latest_snapshots()
+        assert {s["account_id"] for s in latest} == {first, second}
+
+    def test_fetch_failure_skips_account(self, isolated_db):
+        """A fetch that raises is skipped without aborting the poll."""
+        from unittest.mock import patch
+
+        from app.database import get_connection, get_latest_snapshots
+        from app.services.monitoring_service import MonitoringService
+
+        with get_connection() as conn:
+            account_id = _create_test_account(conn)
+
+        config = {"enabled": True, "polling_minutes": 5, "accounts": {}}
+        accounts = [{"id": account_id, "account_name": "a", "backend_type": "claude"}]
+
+        with (
+            patch("app.database.get_monitoring_config", return_value=config),
+            patch("app.database.get_all_accounts_with_health", return_value=accounts),
+            patch("app.database.save_monitoring_config"),
+            patch(
+                "app.services.provider_usage_client.CredentialResolver.get_token_fingerprint",
+                return_value=None,
+            ),
+            patch(
+                "app.services.provider_usage_client.ProviderUsageClient.fetch_usage",
+                side_effect=RuntimeError("boom"),
+            ),
+            patch.object(MonitoringService, "_apply_poll_backoff") as mock_backoff,
+            patch(
+                "app.services.agent_scheduler_service.AgentSchedulerService.evaluate_all_accounts"
+            ),
+        ):
+            MonitoringService._poll_usage()
+
+        mock_backoff.assert_called_once()
+        MonitoringService._consecutive_poll_failures = 0
+        assert get_latest_snapshots() == []
+
 
 # ===========================================================================
 # Format ETA Tests
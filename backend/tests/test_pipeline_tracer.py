@@ -0,0 +1,175 @@
+"""Tests for per-stage pipeline tracing and its batched writer."""
+
+import subprocess
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.db.tracing import get_trace_with_spans, list_traces
+from app.services.execution_queue_service import ExecutionQueueService
+from app.services.execution_service import ExecutionService
+from app.services.pipeline_tracer import PipelineTracer
+
+
+@pytest.fixture(autouse=True)
+def _no_auto_flush():
+    with patch.object(PipelineTracer, "FLUSH_INTERVAL_SECONDS", 3600):
+        yield
+
+
+def _span_names(nodes):
+    names = []
+    for node in nodes:
+        names.append(node["name"])
+        names.extend(_span_names(node["children"]))
+    return names
+
+
+class TestPipelineTracer:
+    def test_spans_are_buffered_until_flush(self, isolated_db):
+        trace = PipelineTracer.begin("execution", "trigger", "trig-1")
+        with trace.span("prompt.render") as attrs:
+            attrs["chars"] = 12
+        PipelineTracer.end(trace)
+
+        assert list_traces() == []
+        assert PipelineTracer.flush() == 1
+
+        stored = get_trace_with_spans(trace.id)
+        assert stored["status"] == "completed"
+        assert stored["spans"][0]["name"] == "prompt.render"
+        assert stored["spans"][0]["attributes"] == {"chars": 12}
+        assert PipelineTracer.current() is None
+
+    def test_batch_threshold_triggers_flush(self, isolated_db):
+        with patch.object(PipelineTracer, "FLUSH_BATCH_ROWS", 2):
+            first = PipelineTracer.begin("a", "trigger", "t")
+            PipelineTracer.end(first)
+            assert list_traces() == []
+            second = PipelineTracer.begin("b", "trigger", "t")
+            PipelineTracer.end(second)
+        assert {t["id"] for t in list_traces()} == {first.id, second.id}
+
+    def test_nested_begin_becomes_child_span(self, isolated_db):
+        outer = PipelineTracer.begin("queue.dispatch", "queue_entry", "qe-1")
+        inner = PipelineTracer.begin("execution", "trigger", "trig-1")
+        assert inner is outer
+        with inner.span("budget.check"):
+            pass
+        PipelineTracer.end(inner)
+        PipelineTracer.end(outer)
+        PipelineTracer.flush()
+
+        stored = get_trace_with_spans(outer.id)
+        (execution,) = stored["spans"]
+        assert execution["name"] == "execution"
+        assert [c["name"] for c in execution["children"]] == ["budget.check"]
+
+    def test_failed_span_records_error(self, isolated_db):
+        trace = PipelineTracer.begin("execution", "trigger", "trig-1")
+        with pytest.raises(RuntimeError):
+            with trace.span("process.spawn"):
+                raise RuntimeError("boom")
+        PipelineTracer.end(trace, "error", "boom")
+        PipelineTracer.flush()
+
+        stored = get_trace_with_spans(trace.id)
+        assert stored["status"] == "error"
+        assert stored["spans"][0]["status"] == "error"
+        assert stored["spans"][0]["error_message"] == "boom"
+
+    def test_mark_reaches_bound_execution(self, isolated_db):
+        trace = PipelineTracer.begin("execution", "trigger", "trig-1")
+        PipelineTracer.bind_execution("exec-1", trace)
+        PipelineTracer.mark("exec-1", "first_output")
+        first = trace.marks["first_output"]
+        PipelineTracer.mark("exec-1", "first_output")
+        assert trace.marks["first_output"] == first
+        assert trace.execution_id == "exec-1"
+        PipelineTracer.end(trace)
+        assert PipelineTracer._by_execution == {}
+
+    def test_disabled_tracing_writes_nothing(self, isolated_db):
+        with patch("app.config.PIPELINE_TRACING_ENABLED", False):
+            trace = PipelineTracer.begin("execution", "trigger", "trig-1")
+        with trace.span("prompt.render"):
+            pass
+        PipelineTracer.end(trace)
+        assert PipelineTracer.flush() == 0
+
+
+class TestInstrumentedPipelines:
+    def test_run_trigger_records_stages(self, isolated_db):
+        proc = MagicMock(spec=subprocess.Popen)
+        proc.pid = 4242
+        proc.stdout, proc.stderr = MagicMock(), MagicMock()
+        proc.wait.return_value = 0
+        thread = MagicMock()
+        thread.is_alive.return_value = False
+
+        with (
+            patch("app.services.execution_service.get_paths_for_trigger_detailed", return_value=[]),
+            patch("app.services.execution_service.ExecutionLogService") as log_svc,
+            patch("app.services.execution_service.AuditLogService"),
+            patch("app.services.execution_service.BudgetService") as budget,
+            patch("app.services.execution_service.ProcessManager") as pm,
+            patch("app.services.execution_service.GitHubService"),
+            patch("shutil.which", return_value=None),
+            patch("subprocess.Popen", return_value=proc),
+            patch("threading.Thread", return_value=thread),
+        ):
+            budget.check_budget.return_value = {"allowed": True}
+            log_svc.start_execution.return_value = "exec-traced"
+            pm.is_cancelled.return_value = False
+            ExecutionService.run_trigger(
+                {
+                    "id": "trig-1",
+                    "name": "Traced",
+                    "backend_type": "claude",
+                    "prompt_template": "{message}",
+                },
+                "hello",
+            )
+
+        PipelineTracer.flush()
+        (trace,) = list_traces()
+        assert trace["execution_id"] == "exec-traced"
+        names = _span_names(get_trace_with_spans(trace["id"])["spans"])
+        for stage in (
+            "paths.resolve_and_clone",
+            "prompt.render",
+            "budget.check",
+            "process.spawn",
+            "output.stream",
+            "log.flush",
+            "usage.extract",
+        ):
+            assert stage in names
+
+    def test_queue_dispatch_records_wait_and_execution(self, isolated_db):
+        def fake_execute(trigger, message_text, event, trigger_type):
+            trace = PipelineTracer.begin("execution", "trigger", trigger["id"])
+            PipelineTracer.end(trace)
+
+        entry = {
+            "id": "qe-1",
+            "trigger_id": "trig-1",
+            "trigger_type": "webhook",
+            "created_at": "2026-01-01 00:00:00",
+            "not_before": None,
+        }
+        with (
+            patch("app.database.get_trigger", return_value={"id": "trig-1"}),
+            patch(
+                "app.services.orchestration_service.OrchestrationService.execute_with_fallback",
+                side_effect=fake_execute,
+            ),
+            patch("app.services.execution_queue_service.update_entry_status"),
+        ):
+            ExecutionQueueService._dispatch_entry(entry)
+
+        PipelineTracer.flush()
+        (trace,) = list_traces(entity_type="queue_entry")
+        spans = get_trace_with_spans(trace["id"])["spans"]
+        assert [s["name"] for s in spans] == ["queue.wait", "execution"]
+        assert spans[0]["duration_ms"] > 0
@@ -0,0 +1,150 @@
+"""Tests for the shared PR diff cache and token-budgeted diff context."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from app.services.diff_context_service import DiffContextService
+from app.services.pr_diff_cache import PRDiffCache
+
+EVENT = {
+    "repo_full_name": "acme/widgets",
+    "pr_number": 7,
+    "pr_url": "https://github.com/acme/widgets/pull/7",
+    "head_sha": "abc123",
+}
+
+
+def _file_diff(path, added_lines):
+    body = "".join(f"+{line}\n" for line in added_lines)
+    return (
+        f"diff --git a/{path} b/{path}\n"
+        f"--- a/{path}\n"
+        f"+++ b/{path}\n"
+        f"@@ -0,0 +1,{len(added_lines)} @@\n"
+        f"{body}"
+    )
+
+
+SMALL_DIFF = _file_diff("app.py", ["print('hi')"])
+
+
+class TestPRDiffCache:
+    def test_concurrent_requests_share_one_fetch(self):
+        calls = []
+        release = threading.Event()
+
+        def slow_fetch(event):
+            calls.append(event["pr_number"])
+            release.wait(2)
+            return SMALL_DIFF
+
+        with patch.object(PRDiffCache, "_fetch", side_effect=slow_fetch):
+            with ThreadPoolExecutor(max_workers=5) as pool:
+                futures = [pool.submit(PRDiffCache.get, dict(EVENT)) for _ in range(5)]
+                time.sleep(0.1)
+                release.set()
+                results = [f.result() for f in futures]
+
+        assert calls == [7]
+        assert results == [SMALL_DIFF] * 5
+
+    def test_returns_none_without_pr_url(self):
+        assert PRDiffCache.get({}) is None
+        assert PRDiffCache.get({"pr_url": ""}) is None
+
+    @patch("urllib.request.urlopen")
+    def test_fetches_diff_text(self, mock_urlopen):
+        mock_response = MagicMock()
+        mock_response.__enter__ = MagicMock(return_value=mock_response)
+        mock_response.__exit__ = MagicMock(return_value=False)
+        mock_response.read.return_value = b"diff --git a/file.py b/file.py\n"
+        mock_urlopen.return_value = mock_response
+
+        assert PRDiffCache.get(EVENT) == "diff --git a/file.py b/file.py\n"
+
+    @patch("urllib.request.urlopen", side_effect=Exception("network error"))
+    def test_returns_none_on_network_error(self, mock_urlopen):
+        assert PRDiffCache.get(EVENT) is None
+
+    def test_new_head_sha_refetches(self):
+        with patch.object(PRDiffCache, "_fetch", return_value=SMALL_DIFF) as fetch:
+            PRDiffCache.get(EVENT)
+            PRDiffCache.get(EVENT)
+            PRDiffCache.get({**EVENT, "head_sha": "def456"})
+        assert fetch.call_count == 2
+
+    def test_failed_fetch_is_not_cached(self):
+        with patch.object(PRDiffCache, "_fetch", side_effect=[None, SMALL_DIFF]) as fetch:
+            assert PRDiffCache.get(EVENT) is None
+            assert PRDiffCache.get(EVENT) == SMALL_DIFF
+        assert fetch.call_count == 2
+
+    def test_unpinned_entries_expire(self):
+        event = {**EVENT, "head_sha": ""}
+        with patch.object(PRDiffCache, "_fetch", return_value=SMALL_DIFF) as fetch:
+            PRDiffCache.get(event)
+            with patch.object(PRDiffCache, "UNPINNED_TTL_SECONDS", -1):
+                PRDiffCache.get(event)
+        assert fetch.call_count == 2
+
+    def test_lru_eviction_by_size(self):
+        with patch.object(PRDiffCache, "MAX_BYTES", len(SMALL_DIFF) * 2):
+            with patch.object(PRDiffCache, "_fetch", return_value=SMALL_DIFF) as fetch:
+                for pr in (1, 2, 1, 3):
+                    PRDiffCache.get({**EVENT, "pr_number": pr})
+                # PR 2 was least recently used when PR 3 arrived
+                PRDiffCache.get({**EVENT, "pr_number": 1})
+                assert fetch.call_count == 3
+                PRDiffCache.get({**EVENT, "pr_number": 2})
+                assert fetch.call_count == 4
+
+    def test_memoized_context_counts_toward_size_bound(self):
+        with patch.object(PRDiffCache, "_fetch", return_value=SMALL_DIFF) as fetch:
+            context = PRDiffCache.get_context(EVENT, token_budget=None)
+            assert PRDiffCache._total_bytes == len(SMALL_DIFF) + len(context)
+
+            # Room for the text alone: rendering a context pushes the entry out
+            with patch.object(PRDiffCache, "MAX_BYTES", len(SMALL_DIFF) + 1):
+                PRDiffCache.clear()
+                PRDiffCache.get_context(EVENT, token_budget=None)
+                assert PRDiffCache._total_bytes == 0
+                PRDiffCache.get(EVENT)
+        assert fetch.call_count == 3
+
+    def test_context_is_memoized_per_budget(self):
+        with patch.object(PRDiffCache, "_fetch", return_value=SMALL_DIFF):
+            with patch.object(
+                DiffContextService,
+                "render_patch_set",
+                wraps=DiffContextService.render_patch_set,
+            ) as render:
+                first = PRDiffCache.get_context(EVENT, token_budget=None)
+                second = PRDiffCache.get_context(EVENT, token_budget=None)
+                PRDiffCache.get_context(EVENT, token_budget=1000)
+
+        assert first == second
+        assert "## app.py" in first
+        assert render.call_count == 2
+
+
+class TestTokenBudget:
+    def test_low_value_hunks_dropped_first(self):
+        diff = _file_diff("package-lock.json", [f'"dep{i}": "1.0.{i}",' for i in range(200)])
+        diff += _file_diff("src/core.py", ["def run():", "    return 42"])
+
+        full = DiffContextService.extract_pr_diff_context(diff)
+        trimmed = DiffContextService.extract_pr_diff_context(diff, token_budget=100)
+
+        assert '"dep199"' in full
+        assert '"dep199"' not in trimmed
+        assert "+def run():" in trimmed
+        assert "## package-lock.json" in trimmed
+        assert "[1 hunk(s) omitted to fit token budget]" in trimmed
+        assert len(trimmed) < len(full)
+
+    def test_within_budget_is_unchanged(self):
+        assert DiffContextService.extract_pr_diff_context(
+            SMALL_DIFF, token_budget=10_000
+        ) == DiffContextService.extract_pr_diff_context(SMALL_DIFF)
@@ -96,6 +96,56 @@ class TestRender:
         assert result == "Input: json: {key: value}"
 
 
+class TestCompiledTemplateCache:
+    def _trigger(self, template):
+        return {"prompt_template": template}
+
+    def test_snippets_resolved_once_per_template(self):
+        trigger = self._trigger("{{rules}} for {message}")
+        with patch(
+            "app.services.prompt_renderer.SnippetService.resolve_snippets",
+            return_value="RULES for {message}",
+        ) as mock_resolve:
+            first = PromptRenderer.render(trigger, "trg-c01", "a", "")
+            second = PromptRenderer.render(trigger, "trg-c01", "b", "")
+
+        assert (first, second) == ("RULES for a", "RULES for b")
+        mock_resolve.assert_called_once()
+
+    def test_template_edit_recompiles(self):
+        PromptRenderer.render(self._trigger("old {message}"), "trg-c02", "x", "")
+        result = PromptRenderer.render(self._trigger("new {message}"), "trg-c02", "x", "")
+        assert result == "new x"
+
+    def test_substituted_values_not_reexpanded(self):
+        trigger = self._trigger("{message} in {paths}")
+        result = PromptRenderer.render(trigger, "trg-c03", "literal {paths}", "/repo")
+        assert result == "literal {paths} in /repo"
+
+    def test_snippet_edit_invalidates_dependents(self, isolated_db):
+        from app.db.prompt_snippets import create_snippet, get_snippet_by_name, update_snippet
+
+        create_snippet(name="inner", content="v1")
+        create_snippet(name="outer", content="[{{inner}}]")
+        trigger = self._trigger("{{outer}} {message}")
+        assert PromptRenderer.render(trigger, "trg-c04", "m", "") == "[v1] m"
+
+        update_snippet(get_snippet_by_name("inner")["id"], content="v2")
+        # Stale until the nested dependency is invalidated
+        assert PromptRenderer.render(trigger, "trg-c04", "m", "") == "[v1] m"
+        assert PromptRenderer.invalidate_snippets(["inner"]) == 1
+        assert PromptRenderer.render(trigger, "trg-c04", "m", "") == "[v2] m"
+
+    def test_creating_missing_snippet_invalidates(self, isolated_db):
+        from app.db.prompt_snippets import create_snippet
+
+        trigger = self._trigger("{{later}}")
+        assert PromptRenderer.render(trigger, "trg-c05", "", "") == "{{later}}"
+        create_snippet(name="later", content="now here")
+        PromptRenderer.invalidate_snippets(["later"])
+        assert PromptRenderer.render(trigger, "trg-c05", "", "") == "now here"
+
+
 class TestWarnUnresolved:
     def test_no_warnings_when_fully_resolved(self):
         mock_logger = logging.getLogger("test.no_warn")
@@ -114,3 +114,19 @@ def test_resolve_endpoint(client):
     assert resp.status_code == 200
     data = resp.get_json()
     assert data["resolved"] == "Use resolved text here"
+
+
+def test_snippet_update_endpoint_invalidates_compiled_templates(client):
+    """Editing a snippet through the API re-renders dependent trigger prompts."""
+    from app.services.prompt_renderer import PromptRenderer
+
+    resp = client.post("/admin/prompt-snippets/", json={"name": "tone", "content": "be brief"})
+    snippet_id = resp.get_json()["snippet"]["id"]
+    trigger = {"prompt_template": "{{tone}}: {message}"}
+    assert PromptRenderer.render(trigger, "trg-snip", "hi", "") == "be brief: hi"
+
+    client.put(f"/admin/prompt-snippets/{snippet_id}", json={"content": "be thorough"})
+    assert PromptRenderer.render(trigger, "trg-snip", "hi", "") == "be thorough: hi"
+
+    client.delete(f"/admin/prompt-snippets/{snippet_id}")
+    assert PromptRenderer.render(trigger, "trg-snip", "hi", "") == "{{tone}}: hi"
@@ -1,21 +1,24 @@
 """Tests for ProviderUsageClient and CredentialResolver."""
 
 import json
-import urllib.error
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 
 from app.services.provider_usage_client import (
+    _HTTP_TIMEOUT,
     CredentialResolver,
     ProviderUsageClient,
+    _get_http_client,
     _http_get,
     _http_post,
     _read_json_field,
     _read_json_file,
     _refresh_google_token,
+    close_http_clients,
 )
 
 
@@ -24,41 +27,42 @@ from app.services.provider_usage_client import (
 # ---------------------------------------------------------------------------
 
 
+def _mock_client(status=200, body=b"", exc=None):
+    """Build a mock pooled httpx client whose get/post return a canned response."""
+    client = MagicMock()
+    if exc is not None:
+        client.get.side_effect = exc
+        client.post.side_effect = exc
+        return client
+    resp = httpx.Response(status, content=body)
+    client.get.return_value = resp
+    client.post.return_value = resp
+    return client
+
+
 class TestHttpGet:
     """Tests for the _http_get helper."""
 
-    @patch("app.services.provider_usage_client.urllib.request.urlopen")
-    def test_success(self, mock_urlopen):
-        resp = MagicMock()
-        resp.status = 200
-        resp.read.return_value = b'{"ok": true}'
-        resp.__enter__ = lambda s: s
-        resp.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = resp
+    @patch("app.services.provider_usage_client._get_http_client")
+    def test_success(self, mock_get_client):
+        mock_get_client.return_value = _mock_client(body=b'{"ok": true}')
 
         result = _http_get("https://example.com/api", {"Authorization": "Bearer tok"})
         assert result == {"ok": True}
 
-    @patch("app.services.provider_usage_client.urllib.request.urlopen")
-    def test_http_error_returns_none(self, mock_urlopen):
-        mock_urlopen.side_effect = urllib.error.HTTPError(
-            "https://example.com", 403, "Forbidden", {}, None
-        )
+    @patch("app.services.provider_usage_client._get_http_client")
+    def test_http_error_returns_none(self, mock_get_client):
+        mock_get_client.return_value = _mock_client(status=403)
         assert _http_get("https://example.com", {}) is None
 
-    @patch("app.services.provider_usage_client.urllib.request.urlopen")
-    def test_network_error_returns_none(self, mock_urlopen):
-        mock_urlopen.side_effect = urllib.error.URLError("Connection refused")
+    @patch("app.services.provider_usage_client._get_http_client")
+    def test_network_error_returns_none(self, mock_get_client):
+        mock_get_client.return_value = _mock_client(exc=httpx.ConnectError("Connection refused"))
         assert _http_get("https://example.com", {}) is None
 
-    @patch("app.services.provider_usage_client.urllib.request.urlopen")
-    def test_invalid_json_returns_none(self, mock_urlopen):
-        resp = MagicMock()
-        resp.status = 200
-        resp.read.return_value = b"not json"
-        resp.__enter__ = lambda s: s
-        resp.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = resp
+    @patch("app.services.provider_usage_client._get_http_client")
+    def test_invalid_json_returns_none(self, mock_get_client):
+        mock_get_client.return_value = _mock_client(body=b"not json")
 
         assert _http_get("https://example.com", {}) is None
 
@@ -66,26 +70,33 @@ class TestHttpGet:
 class TestHttpPost:
     """Tests for the _http_post helper."""
 
-    @patch("app.services.provider_usage_client.urllib.request.urlopen")
-    def test_success(self, mock_urlopen):
-        resp = MagicMock()
-        resp.status = 200
-        resp.read.return_value = b'{"result": "ok"}'
-        resp.__enter__ = lambda s: s
-        resp.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = resp
+    @patch("app.services.provider_usage_client._get_http_client")
+    def test_success(self, mock_get_client):
+        mock_get_client.return_value = _mock_client(body=b'{"result": "ok"}')
 
         result = _http_post("https://example.com/api", {}, b'{"data": 1}')
         assert result == {"result": "ok"}
 
-    @patch("app.services.provider_usage_client.urllib.request.urlopen")
-    def test_http_error_returns_none(self, mock_urlopen):
-        mock_urlopen.side_effect = urllib.error.HTTPError(
-            "https://example.com", 500, "Server Error", {}, None
-        )
+    @patch("app.services.provider_usage_client._get_http_client")
+    def test_http_error_returns_none(self, mock_get_client):
+        mock_get_client.return_value = _mock_client(status=500)
         assert _http_post("https://example.com", {}, b"{}") is None
 
 
+class TestHttpClientPool:
+    """Tests for per-host pooled HTTP clients."""
+
+    def test_same_host_reuses_client(self):
+        try:
+            a = _get_http_client("https://api.example.com/one")
+            b = _get_http_client("https://api.example.com/two")
+            c = _get_http_client("https://other.example.com/")
+            assert a is b
+            assert a is not c
+        finally:
+            close_http_clients()
+
+
 # ---------------------------------------------------------------------------
 # _read_json_file / _read_json_field
 # ---------------------------------------------------------------------------
@@ -302,7 +313,7 @@ class TestFetchUsageDispatch:
     def test_dispatches_to_claude(self, mock_fetch):
         result = ProviderUsageClient.fetch_usage({"id": "a1"}, "claude")
         assert result == [{"window_type": "five_hour"}]
-        mock_fetch.assert_called_once_with({"id": "a1"})
+        mock_fetch.assert_called_once_with({"id": "a1"}, timeout=_HTTP_TIMEOUT)
 
     @patch.object(ProviderUsageClient, "_fetch_codex", return_value=[])
     def test_dispatches_to_codex(self, mock_fetch):
@@ -314,6 +325,12 @@ class TestFetchUsageDispatch:
         ProviderUsageClient.fetch_usage({"id": "a3"}, "gemini")
         mock_fetch.assert_called_once()
 
+    @patch("app.services.provider_usage_client._http_get", return_value=None)
+    @patch.object(CredentialResolver, "get_claude_token", return_value="tok")
+    def test_timeout_reaches_provider_request(self, _mock_token, mock_get):
+        ProviderUsageClient.fetch_usage({"id": "a4"}, "claude", timeout=3.0)
+        assert mock_get.call_args.kwargs["timeout"] == 3.0
+
 
 # ---------------------------------------------------------------------------
 # ProviderUsageClient._fetch_claude
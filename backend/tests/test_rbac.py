@@ -8,12 +8,18 @@ Covers:
 - DB CRUD operations for user roles
 """
 
+from unittest.mock import patch
+
+from app.db.connection import get_connection
+from app.db.migrations import _migrate_108_hash_user_role_keys
 from app.db.rbac import (
     count_user_roles,
     create_user_role,
     delete_user_role,
     get_role_for_api_key,
     get_user_role,
+    hash_api_key,
+    invalidate_key_cache,
     list_user_roles,
     update_user_role,
 )
@@ -77,10 +83,35 @@ class TestUserRoleCRUD:
 
         role = get_user_role(role_id)
         assert role is not None
-        assert role["api_key"] == "key-admin-1"
+        assert role["key_prefix"] == "key"
+        assert "api_key" not in role and "key_hash" not in role
         assert role["label"] == "Admin Key"
         assert role["role"] == "admin"
 
+    def test_key_is_stored_hashed(self, isolated_db):
+        role_id = create_user_role("key-secret-123", "Hashed", "viewer")
+        with get_connection() as conn:
+            stored = conn.execute(
+                "SELECT key_hash FROM user_roles WHERE id = ?", (role_id,)
+            ).fetchone()[0]
+        assert stored == hash_api_key("key-secret-123")
+        assert "key-secret-123" not in stored
+
+    def test_hash_key_is_per_install_by_default(self, monkeypatch):
+        import app.db.rbac as rbac
+
+        monkeypatch.setattr(rbac.app_config, "API_KEY_HASH_SECRET", "")
+        hashes = []
+        for secret_key in ("install-one", "install-two"):
+            monkeypatch.setenv("SECRET_KEY", secret_key)
+            monkeypatch.setattr(rbac, "_derived_hash_secret", None)
+            hashes.append(hash_api_key("key-shared"))
+        assert hashes[0] != hashes[1]
+
+        # An explicit hashing secret takes precedence over SECRET_KEY
+        monkeypatch.setattr(rbac.app_config, "API_KEY_HASH_SECRET", "explicit")
+        assert hash_api_key("key-shared") not in hashes
+
     def test_get_role_for_api_key(self, isolated_db):
         create_user_role("key-viewer-1", "Viewer Key", "viewer")
         assert get_role_for_api_key("key-viewer-1") == "viewer"
@@ -96,10 +127,40 @@ class TestUserRoleCRUD:
 
     def test_update_user_role(self, isolated_db):
         role_id = create_user_role("key-up", "Old Label", "viewer")
+        assert get_role_for_api_key("key-up") == "viewer"
         assert update_user_role(role_id, label="New Label", role="editor")
         role = get_user_role(role_id)
         assert role["label"] == "New Label"
         assert role["role"] == "editor"
+        # The cached key -> role map is invalidated by the update
+        assert get_role_for_api_key("key-up") == "editor"
+
+    def test_delete_user_role_revokes_cached_key(self, isolated_db):
+        role_id = create_user_role("key-revoke", "Revoke", "admin")
+        assert get_role_for_api_key("key-revoke") == "admin"
+        delete_user_role(role_id)
+        assert get_role_for_api_key("key-revoke") is None
+
+    def test_migration_hashes_plaintext_keys(self, isolated_db):
+        with get_connection() as conn:
+            conn.execute("DROP TABLE user_roles")
+            conn.execute(
+                "CREATE TABLE user_roles (id TEXT PRIMARY KEY, api_key TEXT NOT NULL UNIQUE, "
+                "label TEXT NOT NULL DEFAULT '', role TEXT NOT NULL DEFAULT 'viewer', "
+                "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, "
+                "updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+            )
+            conn.execute(
+                "INSERT INTO user_roles (id, api_key, label, role) "
+                "VALUES ('role-legacy', 'legacy-plain-key', 'Legacy', 'editor')"
+            )
+            _migrate_108_hash_user_role_keys(conn)
+            _migrate_108_hash_user_role_keys(conn)  # idempotent
+            conn.commit()
+
+        invalidate_key_cache()
+        assert get_role_for_api_key("legacy-plain-key") == "editor"
+        assert get_user_role("role-legacy")["key_prefix"] == "legac"
 
     def test_update_invalid_role_rejected(self, isolated_db):
         role_id = create_user_role("key-inv", "Test", "viewer")
@@ -325,20 +386,38 @@ class TestHasAnyKeys:
     """Tests for cached has_any_keys check."""
 
     def test_false_when_empty(self, isolated_db):
-        from app.db.rbac import _has_any_keys_cache, has_any_keys
+        from app.db.rbac import has_any_keys
 
-        _has_any_keys_cache.clear()
+        invalidate_key_cache()
         assert has_any_keys() is False
 
     def test_true_after_create(self, isolated_db):
-        from app.db.rbac import _has_any_keys_cache, has_any_keys
+        from app.db.rbac import has_any_keys
 
-        _has_any_keys_cache.clear()
+        assert has_any_keys() is False
         create_user_role("k1", "Admin", "admin")
-        _has_any_keys_cache.clear()
         assert has_any_keys() is True
 
 
+class TestRequestKeyResolution:
+    """The API key is resolved once per request, from the in-process cache."""
+
+    def test_one_lookup_and_no_queries_per_request(self, client, isolated_db):
+        create_user_role("key-once", "Admin", "admin")
+        client.get("/admin/rbac/roles", headers={"X-API-Key": "key-once"})  # warm cache
+
+        with (
+            patch("app.db.rbac.get_connection") as conn,
+            patch(
+                "app.services.rbac_service.get_role_for_api_key", wraps=get_role_for_api_key
+            ) as lookup,
+        ):
+            resp = client.get("/admin/rbac/permissions", headers={"X-API-Key": "key-once"})
+        assert resp.status_code == 200
+        assert lookup.call_count == 1
+        conn.assert_not_called()
+
+
 class TestRBACOnTeamRoutes:
     """Test RBAC enforcement on existing team management routes."""
 
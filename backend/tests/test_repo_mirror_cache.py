@@ -0,0 +1,121 @@
+"""Tests for the shared bare-mirror clone cache."""
+
+import os
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+
+from app import config as app_config
+from app.services.github_service import GitHubService
+from app.services.repo_mirror_cache import RepoMirrorCache
+
+REPO_URL = "https://github.com/acme/widgets"
+
+
+def _git(*args, cwd=None):
+    return subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+def _commit(repo, filename, content):
+    with open(os.path.join(repo, filename), "w") as f:
+        f.write(content)
+    _git("add", filename, cwd=repo)
+    _git("commit", "-m", f"add {filename}", cwd=repo)
+
+
+@pytest.fixture()
+def upstream(tmp_path, monkeypatch):
+    """A local repo standing in for GitHub, with mirror state isolated per test."""
+    repo = tmp_path / "upstream"
+    repo.mkdir()
+    _git("init", "-q", "-b", "main", cwd=repo)
+    _commit(repo, "README.md", "hello\n")
+
+    mirror_clones = []
+
+    def fake_mirror_cmd(owner, name, dest):
+        mirror_clones.append((owner, name))
+        return ["git", "clone", "-q", "--mirror", str(repo), dest]
+
+    monkeypatch.setattr(app_config, "REPO_MIRROR_DIR", str(tmp_path / "mirrors"))
+    monkeypatch.setattr(app_config, "REPO_MIRROR_FRESH_SECONDS", 0)
+    monkeypatch.setattr(RepoMirrorCache, "_mirror_clone_cmd", staticmethod(fake_mirror_cmd))
+    monkeypatch.setattr(RepoMirrorCache, "_last_fetch", {})
+    monkeypatch.setattr(RepoMirrorCache, "_in_use", {})
+    monkeypatch.setattr(RepoMirrorCache, "_checkouts", {})
+    monkeypatch.setattr(RepoMirrorCache, "_sizes", {})
+    return SimpleNamespace(path=repo, mirror_clones=mirror_clones)
+
+
+class TestMirrorClone:
+    def test_clone_comes_from_mirror_with_upstream_origin(self, upstream):
+        clone = GitHubService.clone_repo(REPO_URL)
+        try:
+            assert os.path.basename(clone).startswith("agented_clone_acme_widgets_")
+            assert open(os.path.join(clone, "README.md")).read() == "hello\n"
+            # Pushes must go upstream, not into the local mirror
+            assert _git("remote", "get-url", "origin", cwd=clone) == str(upstream.path)
+            alternates = os.path.join(clone, ".git", "objects", "info", "alternates")
+            assert os.path.exists(alternates)
+        finally:
+            GitHubService.cleanup_clone(clone)
+
+    def test_mirror_is_created_once_and_fetched_incrementally(self, upstream):
+        first = GitHubService.clone_repo(REPO_URL)
+        GitHubService.cleanup_clone(first)
+
+        _commit(upstream.path, "CHANGES.md", "v2\n")
+        second = GitHubService.clone_repo(REPO_URL)
+        try:
+            assert os.path.exists(os.path.join(second, "CHANGES.md"))
+        finally:
+            GitHubService.cleanup_clone(second)
+        assert upstream.mirror_clones == [("acme", "widgets")]
+
+    def test_in_use_tracking(self, upstream):
+        clone = GitHubService.clone_repo(REPO_URL)
+        assert RepoMirrorCache._in_use == {"acme__widgets": 1}
+        GitHubService.cleanup_clone(clone)
+        assert RepoMirrorCache._in_use == {}
+
+
+class TestEviction:
+    def test_evicts_idle_mirrors_only(self, upstream):
+        idle = RepoMirrorCache.ensure_mirror("acme", "idle")
+        busy_clone = GitHubService.clone_repo(REPO_URL)
+        try:
+            evicted = RepoMirrorCache.evict(budget_bytes=0)
+            assert evicted == [idle]
+            assert not os.path.exists(idle)
+            assert os.path.isdir(RepoMirrorCache.mirror_path("acme", "widgets"))
+        finally:
+            GitHubService.cleanup_clone(busy_clone)
+
+        assert RepoMirrorCache.evict(budget_bytes=0) == [
+            RepoMirrorCache.mirror_path("acme", "widgets")
+        ]
+
+    def test_within_budget_keeps_everything(self, upstream):
+        RepoMirrorCache.ensure_mirror("acme", "widgets")
+        assert RepoMirrorCache.evict(budget_bytes=1024**3) == []
+
+    def test_eviction_uses_sizes_recorded_at_fetch(self, upstream, monkeypatch):
+        mirror = RepoMirrorCache.ensure_mirror("acme", "widgets")
+        recorded = RepoMirrorCache._sizes["acme__widgets"]
+        assert recorded > 0
+
+        def no_walk(path):
+            raise AssertionError(f"evict() rescanned {path}")
+
+        monkeypatch.setattr(RepoMirrorCache, "_dir_size", staticmethod(no_walk))
+        monkeypatch.setattr(RepoMirrorCache, "_mirror_size", classmethod(no_walk))
+        assert RepoMirrorCache.evict(budget_bytes=recorded) == []
+        assert RepoMirrorCache.evict(budget_bytes=recorded - 1) == [mirror]
+        assert RepoMirrorCache._sizes == {}
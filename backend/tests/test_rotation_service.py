@@ -855,6 +855,192 @@ class TestExecuteRotation:
         assert mock_update_event.call_args[1]["rotation_status"] == "failed"
 
 
+class TestWorkspaceRotation:
+    """Rotation hands the workspace to the continuation and resumes the session."""
+
+    def _rotate(self, env_overrides, backend_type="claude"):
+        from app.services.rotation_service import RotationService
+
+        execution = {"account_id": 1, "backend_type": backend_type, "prompt": "Run the tests"}
+        target = {"id": 2, "account_name": "account-2", "backend_type": backend_type}
+        with (
+            patch(
+                "app.services.execution_log_service.ExecutionLogService.get_execution",
+                return_value=execution,
+            ),
+            patch.object(
+                RotationService,
+                "should_rotate",
+                return_value={"should_rotate": True, "reason": "high", "utilization_pct": 85.0},
+            ),
+            patch.object(
+                RotationService, "score_accounts", return_value=[{"account": target, "score": 1}]
+            ),
+            patch(
+                "app.services.execution_log_service.ExecutionLogService.get_stdout_log",
+                return_value="step 1 done",
+            ),
+            patch.object(RotationService, "_terminate_process", return_value=True),
+            patch("app.services.process_manager.ProcessManager.cleanup"),
+            patch("app.services.execution_log_service.ExecutionLogService.finish_execution"),
+            patch(
+                "app.services.orchestration_service.OrchestrationService._build_account_env",
+                return_value=env_overrides,
+            ),
+            patch(
+                "app.services.execution_service.ExecutionService.run_trigger",
+                return_value="exec-002",
+            ) as mock_run,
+            patch("app.db.rotations.add_rotation_event", return_value="rot-ws"),
+            patch("app.db.rotations.update_rotation_event", return_value=True),
+        ):
+            assert RotationService.execute_rotation("exec-001", {"id": "t"}, "msg") == "exec-002"
+        return mock_run
+
+    def _register(self, config_dir, backend_type="claude"):
+        from app.services.execution_workspace import ExecutionWorkspace, WorkspaceRegistry
+
+        workspace = ExecutionWorkspace(
+            execution_id="exec-001",
+            cwd="/tmp/clone-1",
+            paths=["/tmp/clone-1"],
+            cloned_dirs=["/tmp/clone-1"],
+            backend_type=backend_type,
+            session_id="sid-1" if backend_type == "claude" else None,
+            config_dir=str(config_dir),
+        )
+        WorkspaceRegistry.register(workspace)
+        return workspace
+
+    def test_resumes_session_under_target_account(self, isolated_db, tmp_path):
+        from app.services.execution_workspace import WorkspaceRegistry
+        from app.services.rotation_service import RotationService
+
+        source, target = tmp_path / "acct-1", tmp_path / "acct-2"
+        session = source / "projects" / "-tmp-clone-1" / "sid-1.jsonl"
+        session.parent.mkdir(parents=True)
+        session.write_text('{"type": "user"}\n')
+        workspace = self._register(source)
+
+        mock_run = self._rotate({"CLAUDE_CONFIG_DIR": str(target)})
+
+        assert WorkspaceRegistry.is_handed_off("exec-001")
+        copied = target / "projects" / "-tmp-clone-1" / "sid-1.jsonl"
+        assert copied.read_text() == session.read_text()
+        args, kwargs = mock_run.call_args
+        assert args[1] == RotationService.RESUME_PROMPT
+        assert kwargs["workspace"] is workspace
+        assert kwargs["resume_session_id"] == "sid-1"
+
+    def test_falls_back_to_continuation_prompt_without_session(self, isolated_db, tmp_path):
+        workspace = self._register(tmp_path / "acct-1")
+
+        mock_run = self._rotate({"CLAUDE_CONFIG_DIR": str(tmp_path / "acct-2")})
+
+        args, kwargs = mock_run.call_args
+        assert args[1].startswith("CONTINUATION:")
+        assert "step 1 done" in args[1]
+        assert "still contains all changes" in args[1]
+        assert kwargs["workspace"] is workspace
+        assert kwargs["resume_session_id"] is None
+
+    def test_failed_rotation_cleans_up_handed_off_workspace(self, isolated_db, tmp_path):
+        from app.services.rotation_service import RotationService
+
+        self._register(tmp_path)
+        with (
+            patch(
+                "app.services.execution_log_service.ExecutionLogService.get_execution",
+                return_value={"account_id": 1, "backend_type": "claude", "prompt": "p"},
+            ),
+            patch.object(
+                RotationService,
+                "should_rotate",
+                return_value={"should_rotate": True, "reason": "high", "utilization_pct": 85.0},
+            ),
+            patch.object(
+                RotationService,
+                "score_accounts",
+                return_value=[{"account": {"id": 2}, "score": 1}],
+            ),
+            patch.object(RotationService, "build_continuation_prompt", return_value="C"),
+            patch("app.db.rotations.add_rotation_event", return_value="rot-ws"),
+            patch("app.db.rotations.update_rotation_event", return_value=True),
+            patch.object(RotationService, "_terminate_process", return_value=True),
+            patch("app.services.process_manager.ProcessManager.cleanup"),
+            patch(
+                "app.services.execution_log_service.ExecutionLogService.finish_execution",
+                side_effect=RuntimeError("db down"),
+            ),
+            patch("app.services.execution_service.GitHubService.cleanup_clone") as mock_cleanup,
+        ):
+            assert RotationService.execute_rotation("exec-001", {"id": "t"}, "msg") is None
+
+        mock_cleanup.assert_called_once_with("/tmp/clone-1")
+
+    def _rotate_without_termination(self, terminate):
+        from app.services.rotation_service import RotationService
+
+        with (
+            patch(
+                "app.services.execution_log_service.ExecutionLogService.get_execution",
+                return_value={"account_id": 1, "backend_type": "claude", "prompt": "p"},
+            ),
+            patch.object(
+                RotationService,
+                "should_rotate",
+                return_value={"should_rotate": True, "reason": "high", "utilization_pct": 85.0},
+            ),
+            patch.object(
+                RotationService,
+                "score_accounts",
+                return_value=[{"account": {"id": 2}, "score": 1}],
+            ),
+            patch.object(RotationService, "build_continuation_prompt", return_value="C"),
+            patch("app.db.rotations.add_rotation_event", return_value="rot-ws"),
+            patch("app.db.rotations.update_rotation_event", return_value=True) as mock_update,
+            patch.object(RotationService, "_terminate_process", side_effect=terminate),
+            patch("app.services.execution_log_service.ExecutionLogService.finish_execution"),
+            patch("app.services.execution_service.ExecutionService.run_trigger") as mock_run,
+            patch("app.services.execution_service.GitHubService.cleanup_clone") as mock_cleanup,
+        ):
+            assert RotationService.execute_rotation("exec-001", {"id": "t"}, "msg") is None
+
+        mock_run.assert_not_called()
+        assert mock_update.call_args[1]["rotation_status"] == "failed"
+        return mock_cleanup
+
+    def test_failed_termination_returns_workspace_to_running_execution(
+        self, isolated_db, tmp_path
+    ):
+        from app.services.execution_workspace import WorkspaceRegistry
+
+        self._register(tmp_path)
+
+        mock_cleanup = self._rotate_without_termination(lambda *args, **kwargs: False)
+
+        assert not WorkspaceRegistry.is_handed_off("exec-001")
+        mock_cleanup.assert_not_called()
+        # The still-running execution owns and cleans up its clones again
+        assert WorkspaceRegistry.release("exec-001") is True
+
+    def test_failed_termination_cleans_up_workspace_of_finished_execution(
+        self, isolated_db, tmp_path
+    ):
+        from app.services.execution_workspace import WorkspaceRegistry
+
+        self._register(tmp_path)
+
+        def run_ends_during_termination(*args, **kwargs):
+            # The run exits on its own and skips cleanup: its workspace is handed off
+            assert WorkspaceRegistry.release("exec-001") is False
+            return False
+
+        mock_cleanup = self._rotate_without_termination(run_ends_during_termination)
+
+        mock_cleanup.assert_called_once_with("/tmp/clone-1")
+
+
 # ===========================================================================
 # get_rotation_history() Tests
 # ===========================================================================
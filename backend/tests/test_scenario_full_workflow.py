@@ -916,7 +916,7 @@ class TestDevOpsTeamSetupScenario:
         assert resp.status_code == 200
         assert resp.get_json()["succeeded"] == 3
 
-        # Verify per-item failure isolation
+        # Verify an invalid item rejects the whole batch
         mixed_items = [
             {"name": "Good Agent"},
             {"description": "Missing name"},  # Should fail
@@ -925,8 +925,9 @@ class TestDevOpsTeamSetupScenario:
         resp = client.post("/admin/bulk/agents", json={"action": "create", "items": mixed_items})
         assert resp.status_code == 200
         data = resp.get_json()
-        assert data["succeeded"] == 2
-        assert data["failed"] == 1
+        assert data["succeeded"] == 0
+        assert data["committed"] is False
+        assert "name" in data["results"][1]["error"].lower()
 
     # -------------------------------------------------------------------------
     # Step 20: Verify full CRUD lifecycle for all entities
@@ -425,6 +425,77 @@ class TestGetSecretsForExecution:
         env = SecretVaultService.get_secrets_for_execution()
         assert env == {}
 
+    def test_scope_is_read_in_one_query_and_cached(self, isolated_db, monkeypatch):
+        """Repeat calls are served from the cache until a secret changes."""
+        from app.db import secrets as db_secrets
+
+        SecretVaultService.create_secret(name="cached_a", value="a")
+        SecretVaultService.create_secret(name="cached_b", value="b")
+
+        calls = []
+        real_fetch = db_secrets.get_secret_values
+        monkeypatch.setattr(
+            db_secrets,
+            "get_secret_values",
+            lambda scope: calls.append(scope) or real_fetch(scope),
+        )
+        monkeypatch.setattr(
+            db_secrets, "get_secret", lambda *_: pytest.fail("per-secret query issued")
+        )
+
+        first = SecretVaultService.get_secrets_for_execution(scope="global")
+        first["AGENTED_SECRET_CACHED_A"] = "mutated"
+        second = SecretVaultService.get_secrets_for_execution(scope="global")
+        assert calls == ["global"]
+        assert second["AGENTED_SECRET_CACHED_A"] == "a"
+
+        SecretVaultService.create_secret(name="cached_c", value="c")
+        third = SecretVaultService.get_secrets_for_execution(scope="global")
+        assert calls == ["global", "global"]
+        assert third["AGENTED_SECRET_CACHED_C"] == "c"
+
+    def test_cache_invalidated_on_update_and_delete(self, isolated_db):
+        """Updated and deleted secrets are reflected on the next call."""
+        sid = SecretVaultService.create_secret(name="rotating", value="v1")
+        gone = SecretVaultService.create_secret(name="gone", value="x")
+        SecretVaultService.get_secrets_for_execution()
+
+        SecretVaultService.update_secret(sid, value="v2")
+        SecretVaultService.delete_secret(gone)
+        env = SecretVaultService.get_secrets_for_execution()
+        assert env == {"AGENTED_SECRET_ROTATING": "v2"}
+
+    def test_cache_expires_after_ttl(self, isolated_db, monkeypatch):
+        """Changes made outside the service are picked up once the TTL lapses."""
+        from app.db import secrets as db_secrets
+
+        SecretVaultService.create_secret(name="ttl", value="old")
+        SecretVaultService.get_secrets_for_execution()
+        db_secrets.create_secret(name="direct", encrypted_value=SecretVaultService.encrypt("new"))
+        assert "AGENTED_SECRET_DIRECT" not in SecretVaultService.get_secrets_for_execution()
+
+        monkeypatch.setattr(SecretVaultService, "ENV_CACHE_TTL_SECONDS", 0)
+        assert SecretVaultService.get_secrets_for_execution()["AGENTED_SECRET_DIRECT"] == "new"
+
+    def test_one_audit_record_per_execution(self, isolated_db, monkeypatch):
+        """All secrets handed to an execution share a single access record."""
+        from app.services import secret_vault_service
+
+        ids = [SecretVaultService.create_secret(name=f"bulk_{i}", value=str(i)) for i in range(5)]
+
+        events = []
+        monkeypatch.setattr(
+            secret_vault_service.AuditLogService, "log", lambda **kw: events.append(kw)
+        )
+        for execution_id in ("exec-a", "exec-b"):
+            events.clear()
+            SecretVaultService.get_secrets_for_execution(execution_id=execution_id)
+            assert [e["action"] for e in events] == ["secret.access"]
+            assert events[0]["entity_id"] == execution_id
+            assert sorted(events[0]["details"]["secret_ids"]) == sorted(ids)
+
+        assert events[0]["details"]["cached"] is True
+
 
 # ---------------------------------------------------------------------------
 # ExecutionService integration tests
@@ -1,11 +1,12 @@
 """Tests for TeamMonitorService and TeamFileHandler."""
 
 import json
-import os
-from unittest.mock import MagicMock, patch
+import time
+from unittest.mock import patch
 
 import pytest
 
+from app.services.file_event_multiplexer import FileEventMultiplexer
 from app.services.team_monitor_service import TeamFileHandler, TeamMonitorService
 
 
@@ -185,37 +186,43 @@ class TestStateHelpers:
 
 
 class TestLifecycle:
-    @patch("app.services.team_monitor_service.Observer")
-    def test_start_and_stop(self, MockObserver, tmp_path, monkeypatch):
-        mock_observer_instance = MagicMock()
-        MockObserver.return_value = mock_observer_instance
-
+    @staticmethod
+    def _wait_for(predicate, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.02)
+        return False
+
+    def test_start_and_stop(self, tmp_path, monkeypatch):
         # Point home dir to tmp_path so dirs are created there
         monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+        monkeypatch.setattr(FileEventMultiplexer, "DEBOUNCE_SECONDS", 0.05)
+        teams_dir = tmp_path / ".claude" / "teams" / "myteam"
+        tasks_dir = tmp_path / ".claude" / "tasks" / "myteam"
+        teams_dir.mkdir(parents=True)
+        (teams_dir / "config.json").write_text(json.dumps({"members": ["alice"]}))
 
-        TeamMonitorService.start_monitoring("sess-a", "myteam")
+        with patch("app.services.project_session_manager.ProjectSessionManager._broadcast"):
+            TeamMonitorService.start_monitoring("sess-a", "myteam")
 
-        # Observer was started
-        mock_observer_instance.start.assert_called_once()
-        assert mock_observer_instance.daemon is True
-        # Handler was scheduled for both directories
-        assert mock_observer_instance.schedule.call_count == 2
+            # Files present before the watch are picked up immediately
+            state = TeamMonitorService.get_state("sess-a")
+            assert state["team_name"] == "myteam"
+            assert state["members"] == ["alice"]
+            assert tasks_dir.is_dir()
+            assert len(FileEventMultiplexer._subscriptions) == 2
 
-        # State is accessible
-        state = TeamMonitorService.get_state("sess-a")
-        assert state is not None
-        assert state["team_name"] == "myteam"
+            (tasks_dir / "task-1.json").write_text(json.dumps({"id": "t1", "status": "done"}))
+            assert self._wait_for(lambda: TeamMonitorService.get_state("sess-a")["tasks"])
+            assert TeamMonitorService.get_state("sess-a")["tasks"][0]["id"] == "t1"
 
-        # Directories were created
-        assert (tmp_path / ".claude" / "teams" / "myteam").is_dir()
-        assert (tmp_path / ".claude" / "tasks" / "myteam").is_dir()
+            TeamMonitorService.stop_monitoring("sess-a")
 
-        # Stop monitoring
-        TeamMonitorService.stop_monitoring("sess-a")
-
-        mock_observer_instance.stop.assert_called_once()
-        mock_observer_instance.join.assert_called_once_with(timeout=5)
         assert TeamMonitorService.get_state("sess-a") is None
+        assert FileEventMultiplexer._subscriptions == {}
+        assert FileEventMultiplexer._watches == {}
 
     def test_stop_unknown_session_is_noop(self):
         # Should not raise
@@ -268,43 +275,15 @@ class TestTeamFileHandler:
                 {"type": "task", "data": {"id": "t1", "status": "done"}},
             )
 
-    def test_on_modified_ignores_directory(self):
-        handler = TeamFileHandler("sess-1", "team")
-        event = MagicMock()
-        event.is_directory = True
-
-        with patch.object(handler, "_process_event") as mock_proc:
-            handler.on_modified(event)
-            mock_proc.assert_not_called()
-
-    def test_on_created_ignores_directory(self):
-        handler = TeamFileHandler("sess-1", "team")
-        event = MagicMock()
-        event.is_directory = True
-
-        with patch.object(handler, "_process_event") as mock_proc:
-            handler.on_created(event)
-            mock_proc.assert_not_called()
-
-    def test_on_modified_delegates_to_process_event(self):
-        handler = TeamFileHandler("sess-1", "team")
-        event = MagicMock()
-        event.is_directory = False
-        event.src_path = "/some/path/config.json"
-
-        with patch.object(handler, "_process_event") as mock_proc:
-            handler.on_modified(event)
-            mock_proc.assert_called_once_with("/some/path/config.json")
-
-    def test_on_created_delegates_to_process_event(self):
+    def test_process_batch_delegates_each_path(self):
         handler = TeamFileHandler("sess-1", "team")
-        event = MagicMock()
-        event.is_directory = False
-        event.src_path = "/some/path/task.json"
 
         with patch.object(handler, "_process_event") as mock_proc:
-            handler.on_created(event)
-            mock_proc.assert_called_once_with("/some/path/task.json")
+            handler.process_batch(["/some/path/config.json", "/some/path/task.json"])
+            assert [c.args[0] for c in mock_proc.call_args_list] == [
+                "/some/path/config.json",
+                "/some/path/task.json",
+            ]
 
     def test_process_event_handles_exception_gracefully(self):
         handler = TeamFileHandler("sess-1", "myteam")
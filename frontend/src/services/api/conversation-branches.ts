@@ -9,7 +9,10 @@ import type { ConversationBranch, BranchMessage, BranchTree } from './types';
 
 export const branchApi = {
   /** Create a new branch forking from a specific message index. */
-  createBranch: (conversationId: string, data: { fork_message_index: number; name?: string }) =>
+  createBranch: (
+    conversationId: string,
+    data: { fork_message_index: number; name?: string; parent_branch_id?: string }
+  ) =>
     apiFetch<ConversationBranch>(
       `/admin/conversations/${conversationId}/branches`,
       { method: 'POST', body: JSON.stringify(data) }
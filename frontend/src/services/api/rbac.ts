@@ -5,7 +5,7 @@ import { apiFetch } from './client';
 
 export interface UserRole {
   id: string;
-  api_key: string;
+  key_prefix: string;
   label: string;
   role: string;
   created_at: string | null;
@@ -7,6 +7,7 @@ export interface ConversationBranch {
   conversation_id: string;
   parent_branch_id: string | null;
   fork_message_id: string | null;
+  fork_index: number | null;
   name: string | null;
   status: string;
   created_at: string;